@@ -88,6 +88,7 @@ fi
 %doc README.md CHANGELOG.md
 %{_bindir}/smfc
 %{_bindir}/smfc-client
+%{_bindir}/smfc-sim
 %{python3_sitelib}/smfc/
 %{python3_sitelib}/smfc-%{version}.dist-info/
 %config(noreplace) /etc/smfc/smfc.conf
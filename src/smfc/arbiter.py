@@ -0,0 +1,117 @@
+#
+#   arbiter.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.ZoneArbiter() class implementation: incremental arbitration of the shared IPMI zones.
+#
+from bisect import bisect_left, insort
+from typing import Dict, List, Set, Tuple
+
+
+class ZoneArbiter:
+    """Incremental index of the desired fan levels per IPMI zone (zone arbitration).
+
+    The fan controllers of the shared IPMI zones report their desired level with update(). Every zone keeps its
+    contributors in a list sorted by (descending level, order of the first report), so the winner of a zone is
+    always the first element, and a changed level costs a binary search and a list insertion in the zones of
+    that controller only. A report with an unchanged level does not touch the zones at all, and changes()
+    returns only the zones touched since the previous call, so an iteration of the main loop without a level
+    change does no arbitration work.
+
+    A controller without a positive level (e.g. not calculated yet) does not contribute to its zones. If the last
+    contributor of a zone drops to 0 (e.g. `min_level=0`), the zone is reported by changes() with level 0, so it
+    is written like the zone of a controller applying its own level.
+    """
+
+    _controllers: Dict[str, Tuple[List[int], int, float]]   # Controller name -> (ipmi_zones, level, temp)
+    _order: Dict[str, int]                                   # Controller name -> order of the first report
+    _zones: Dict[int, List[Tuple[int, int, str]]]            # Zone -> sorted (-level, order, name) contributors
+    _dirty: Set[int]                                         # Zones changed since the last changes() call
+
+    def __init__(self) -> None:
+        """Initialize an empty arbiter."""
+        self._controllers = {}
+        self._order = {}
+        self._zones = {}
+        self._dirty = set()
+
+    def update(self, name: str, zones: List[int], level: int, temp: float) -> bool:
+        """Report the desired fan level of a controller.
+        Args:
+            name (str): name of the controller
+            zones (List[int]): IPMI zones of the controller
+            level (int): desired fan level (%, 0 = no level)
+            temp (float): temperature of the controller (C, 0 = no temperature), used only in log messages
+        Returns:
+            bool: True if the level (or the zones) of the controller changed
+        """
+        order = self._order.setdefault(name, len(self._order))
+        old = self._controllers.get(name)
+        self._controllers[name] = (zones, level, temp)
+        if old is not None and old[0] == zones and old[1] == level:
+            return False
+        if old is not None and old[1] > 0:
+            for zone in old[0]:
+                contributors = self._zones[zone]
+                del contributors[bisect_left(contributors, (-old[1], order, name))]
+                self._dirty.add(zone)
+        if level > 0:
+            for zone in zones:
+                insort(self._zones.setdefault(zone, []), (-level, order, name))
+                self._dirty.add(zone)
+        return True
+
+    def winner(self, zone: int) -> Tuple[int, str]:
+        """Return the winning level of a zone.
+        Args:
+            zone (int): IPMI zone
+        Returns:
+            Tuple[int, str]: (maximum desired level, name of the winner controller), (0, "") if the zone has no
+            contributor
+        """
+        contributors = self._zones.get(zone)
+        if not contributors:
+            return 0, ""
+        level, _, name = contributors[0]
+        return -level, name
+
+    def contributors(self, zone: int) -> List[Tuple[str, int, float]]:
+        """Return the contributors of a zone in the order of their first report.
+        Args:
+            zone (int): IPMI zone
+        Returns:
+            List[Tuple[str, int, float]]: list of (name, level, temp) tuples
+        """
+        result = []
+        for _, _, name in sorted(self._zones.get(zone, []), key=lambda c: c[1]):
+            _, level, temp = self._controllers[name]
+            result.append((name, level, temp))
+        return result
+
+    def desired(self) -> List[Tuple[str, List[int], int, float]]:
+        """Return the desired levels of the contributing controllers (in the order of their first report).
+        Returns:
+            List[Tuple[str, List[int], int, float]]: list of (name, ipmi_zones, level, temp) tuples
+        """
+        return [(name, zones, level, temp) for name, (zones, level, temp) in self._controllers.items() if level > 0]
+
+    def changes(self) -> List[Tuple[int, int, str]]:
+        """Return the winners of the zones changed since the previous call. A zone whose controllers are all at
+        level 0 is returned with level 0 and its first reporting controller, a zone without controllers is left
+        out (its fan level is not changed).
+        Returns:
+            List[Tuple[int, int, str]]: list of (zone, level, winner name) tuples in ascending zone order
+        """
+        if not self._dirty:
+            return []
+        result = []
+        for zone in sorted(self._dirty):
+            level, name = self.winner(zone)
+            if level == 0:
+                name = next((n for n, (zones, _, _) in self._controllers.items() if zone in zones), "")
+            if name:
+                result.append((zone, level, name))
+        self._dirty.clear()
+        return result
+
+
+# End.
@@ -18,9 +18,11 @@ from smfc.cpufc import CpuFc
 from smfc.fancontroller import FanController
 from smfc.gpufc import GpuFc
 from smfc.hdfc import HdFc
+from smfc.hwmon import HwmonIndex
 from smfc.ipmi import Ipmi
 from smfc.log import Log
 from smfc.nvmefc import NvmeFc
+from smfc.sensors import SensorRegistry
 
 
 # Exit codes (aligned with the service: 6=config, 8=ipmi, 9=udev).
@@ -35,6 +37,10 @@ CLIENT_BMC_INIT_TIMEOUT: float = 5.0
 # Snapshot fetch timeout (used when the exporter is enabled in config).
 SNAPSHOT_FETCH_TIMEOUT: float = 1.0
 
+# Freshness window of the shared sensor registry in standalone mode: long enough to cover the whole
+# report, so every physical sensor is read once even if several controllers (or rows) show it.
+REPORT_SENSOR_MAX_AGE: float = 60.0
+
 # Default configuration file path (matches systemd unit).
 DEFAULT_CONFIG_PATH: str = "/etc/smfc/smfc.conf"
 
@@ -120,7 +126,8 @@ def _wrap(text: str, color: str, enabled: bool) -> str:
 
 
 def _construct_controllers(log: Log, cfg: Config, ipmi: Ipmi, udevc: Optional[Context],
-                           sudo: bool) -> List[ControllerEntry]:
+                           sudo: bool, sensors: Optional[SensorRegistry] = None,
+                           hwmon_index: Optional[HwmonIndex] = None) -> List[ControllerEntry]:
     """Iterate enabled fan controller configs and instantiate each in a passive way.
     Each controller construction is wrapped in try/except so a failure on one controller
     (e.g. missing device) does not abort the whole report.
@@ -130,6 +137,8 @@ def _construct_controllers(log: Log, cfg: Config, ipmi: Ipmi, udevc: Optional[Co
         ipmi (Ipmi): an Ipmi instance (read-only)
         udevc (Optional[Context]): pyudev Context, shared across controllers that need it
         sudo (bool): sudo flag (passed to HdFc)
+        sensors (Optional[SensorRegistry]): shared sensor registry attached to the controllers (None = no sharing)
+        hwmon_index (Optional[HwmonIndex]): shared hwmon index (None = one udev query per device)
     Returns:
         List[ControllerEntry]: list of (section, type_label, controller, error) tuples
     """
@@ -139,7 +148,7 @@ def _construct_controllers(log: Log, cfg: Config, ipmi: Ipmi, udevc: Optional[Co
         if not cpu_cfg.enabled:
             continue
         try:
-            controller = CpuFc(log, udevc, ipmi, cpu_cfg)
+            controller = CpuFc(log, udevc, ipmi, cpu_cfg, hwmon_index)
             entries.append((cpu_cfg.section, "cpu", controller, None))
         except Exception as e:  # pylint: disable=broad-except
             entries.append((cpu_cfg.section, "cpu", None, str(e)))
@@ -148,7 +157,7 @@ def _construct_controllers(log: Log, cfg: Config, ipmi: Ipmi, udevc: Optional[Co
         if not hd_cfg.enabled:
             continue
         try:
-            controller = HdFc(log, udevc, ipmi, hd_cfg, sudo)
+            controller = HdFc(log, udevc, ipmi, hd_cfg, sudo, hwmon_index)
             entries.append((hd_cfg.section, "hd", controller, None))
         except Exception as e:  # pylint: disable=broad-except
             entries.append((hd_cfg.section, "hd", None, str(e)))
@@ -157,7 +166,7 @@ def _construct_controllers(log: Log, cfg: Config, ipmi: Ipmi, udevc: Optional[Co
         if not nvme_cfg.enabled:
             continue
         try:
-            controller = NvmeFc(log, udevc, ipmi, nvme_cfg)
+            controller = NvmeFc(log, udevc, ipmi, nvme_cfg, hwmon_index)
             entries.append((nvme_cfg.section, "nvme", controller, None))
         except Exception as e:  # pylint: disable=broad-except
             entries.append((nvme_cfg.section, "nvme", None, str(e)))
@@ -180,6 +189,10 @@ def _construct_controllers(log: Log, cfg: Config, ipmi: Ipmi, udevc: Optional[Co
         except Exception as e:  # pylint: disable=broad-except
             entries.append((const_cfg.section, "const", None, str(e)))
 
+    if sensors is not None:
+        for _, _, controller, _ in entries:
+            if isinstance(controller, FanController):
+                controller.attach_sensors(sensors)
     return entries
 
 
@@ -203,7 +216,7 @@ def _safe_temp_str(controller: Union[FanController, ConstFc, None], type_label:
 
 
 def _safe_nth_temp_str(controller: Union[FanController, None], index: int) -> str:
-    """Read a single per-device temperature via the controller's _get_nth_temp(), formatted defensively.
+    """Read a single per-device temperature via the controller's _read_nth_temp(), formatted defensively.
     Args:
         controller: controller instance (or None)
         index (int): device index in the controller's hwmon/device list
@@ -214,7 +227,7 @@ def _safe_nth_temp_str(controller: Union[FanController, None], index: int) -> st
         return "-"
     try:
         # pylint: disable=protected-access
-        return f"{controller._get_nth_temp(index):.1f} C"
+        return f"{controller._read_nth_temp(index):.1f} C"
     except Exception:  # pylint: disable=broad-except
         return "ERROR"
 
@@ -1052,7 +1065,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"ERROR: udev: {e}", file=sys.stderr, flush=True)
         return EXIT_UDEV_ERROR
 
-    entries = _construct_controllers(log, cfg, ipmi, udevc, args.sudo)
+    entries = _construct_controllers(log, cfg, ipmi, udevc, args.sudo, SensorRegistry(REPORT_SENSOR_MAX_AGE),
+                                     HwmonIndex(udevc))
     report = _format_report(ipmi, entries, args.config_file, use_color, args.verbose)
     sys.stdout.write(report)
     sys.stdout.flush()
@@ -0,0 +1,124 @@
+#
+#   clock.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   Injectable clock of the service: system clock and virtual clock of the simulation.
+#
+import time as _time
+from typing import Union
+
+
+class SystemClock:
+    """Clock of the real service: it delegates to the `time` module."""
+
+    @staticmethod
+    def monotonic() -> float:
+        """Return the monotonic time.
+        Returns:
+            float: monotonic timestamp (sec)
+        """
+        return _time.monotonic()
+
+    @staticmethod
+    def time() -> float:
+        """Return the wall-clock time.
+        Returns:
+            float: Unix timestamp (sec)
+        """
+        return _time.time()
+
+    @staticmethod
+    def sleep(seconds: float) -> None:
+        """Sleep for the specified time.
+        Args:
+            seconds (float): sleep time (sec)
+        """
+        _time.sleep(seconds)
+
+
+class VirtualClock:
+    """Virtual clock of the simulation: the time advances only when somebody sleeps, so a sleep returns
+    immediately and the main loop jumps from deadline to deadline."""
+
+    now: float      # Current monotonic time (sec)
+    epoch: float    # Unix timestamp of monotonic time 0 (sec)
+
+    def __init__(self, start: float = 0.0, epoch: float = 0.0) -> None:
+        """Initialize the virtual clock.
+        Args:
+            start (float): initial monotonic time (sec)
+            epoch (float): Unix timestamp of monotonic time 0 (sec)
+        """
+        self.now = start
+        self.epoch = epoch
+
+    def monotonic(self) -> float:
+        """Return the virtual monotonic time.
+        Returns:
+            float: monotonic timestamp (sec)
+        """
+        return self.now
+
+    def time(self) -> float:
+        """Return the virtual wall-clock time.
+        Returns:
+            float: Unix timestamp (sec)
+        """
+        return self.epoch + self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the virtual time (a negative time is ignored).
+        Args:
+            seconds (float): sleep time (sec)
+        """
+        self.now += max(seconds, 0.0)
+
+
+# Type of the clocks.
+Clock = Union[SystemClock, VirtualClock]
+
+# The clock used by the service (replaced by the simulation with a VirtualClock).
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Return the current clock.
+    Returns:
+        Clock: the current clock
+    """
+    return _clock
+
+
+def set_clock(clock: Clock) -> None:
+    """Replace the clock of the service.
+    Args:
+        clock (Clock): the new clock
+    """
+    global _clock  # pylint: disable=global-statement
+    _clock = clock
+
+
+def monotonic() -> float:
+    """Return the monotonic time of the current clock (replaces `time.monotonic()`).
+    Returns:
+        float: monotonic timestamp (sec)
+    """
+    return _clock.monotonic()
+
+
+def time() -> float:
+    """Return the wall-clock time of the current clock (replaces `time.time()`).
+    Returns:
+        float: Unix timestamp (sec)
+    """
+    return _clock.time()
+
+
+def sleep(seconds: float) -> None:
+    """Sleep with the current clock (replaces `time.sleep()`).
+    Args:
+        seconds (float): sleep time (sec)
+    """
+    _clock.sleep(seconds)
+
+
+# End.
@@ -29,6 +29,7 @@ class IpmiConfig:
     platform_name: str      # Platform name (from config or "auto" for auto-detection)
     enforce_fan_mode: bool  # Re-assert FULL fan mode if BMC drifts (default: True; False = exit on drift)
     exit_level: int         # Fan level applied to all configured zones at exit (0..100%, -1 = do not change)
+    command_timeout: float  # Timeout of an ipmitool command (sec, 0 = no timeout)
 
 
 @dataclass
@@ -41,12 +42,30 @@ class CpuConfig:
     steps: int              # Discrete steps in temperatures and fan levels
     sensitivity: float      # Temperature change to activate fan controller (C)
     polling: float          # Polling interval to read temperature (sec)
+    polling_offset: float   # Phase offset of the polling (sec)
     min_temp: float         # Minimum temperature value (C)
     max_temp: float         # Maximum temperature value (C)
     min_level: int          # Minimum fan level (0..100%)
     max_level: int          # Maximum fan level (0..100%)
     smoothing: int          # Moving average window size for temperature readings (1=disabled)
+    temp_filter: str        # Temperature filter ('sma', 'ewma', 'median' or 'kalman')
+    ewma_alpha: float       # Weight of the new sample in the EWMA filter (0..1]
+    kalman_process_noise: float  # Variance of the temperature change per sample (C^2)
+    kalman_measurement_noise: float  # Variance of the sensor noise (C^2)
     error_tolerance: int    # Consecutive failed temperature reads tolerated per device (0=disabled)
+    lut_resolution: float   # Temperature resolution of the temperature->level LUT (C)
+    hysteresis: float       # Temperature drop below a plateau required to lower the fan level (C)
+    min_dwell: float        # Minimum time a fan level is held before it can be lowered (sec)
+    ramp_up: float          # Maximum rate of fan level increase (%/sec, 0=unlimited)
+    ramp_down: float        # Maximum rate of fan level decrease (%/sec, 0=unlimited)
+    control_mode: str       # Control mode ('lut' or 'pid')
+    pid_target: float       # Target temperature of the PID controller (C)
+    pid_kp: float           # Proportional gain of the PID controller (%/C)
+    pid_ki: float           # Integral gain of the PID controller (%/(C*sec))
+    pid_kd: float           # Derivative gain of the PID controller (%*sec/C)
+    pid_d_filter: float     # Time constant of the derivative filter of the PID controller (sec, 0=disabled)
+    feedforward_rate: float     # Temperature slope activating the feed-forward term (C/sec, 0=disabled)
+    feedforward_horizon: float  # Look-ahead time of the feed-forward term (sec)
     control_function: List[Tuple[int, int]] = field(default_factory=list)  # (T,L) breakpoints, empty = legacy
 
 
@@ -60,16 +79,35 @@ class HdConfig:
     steps: int                  # Discrete steps in temperatures and fan levels
     sensitivity: float          # Temperature change to activate fan controller (C)
     polling: float              # Polling interval to read temperature (sec)
+    polling_offset: float       # Phase offset of the polling (sec)
     min_temp: float             # Minimum temperature value (C)
     max_temp: float             # Maximum temperature value (C)
     min_level: int              # Minimum fan level (0..100%)
     max_level: int              # Maximum fan level (0..100%)
     smoothing: int              # Moving average window size for temperature readings (1=disabled)
+    temp_filter: str            # Temperature filter ('sma', 'ewma', 'median' or 'kalman')
+    ewma_alpha: float           # Weight of the new sample in the EWMA filter (0..1]
+    kalman_process_noise: float  # Variance of the temperature change per sample (C^2)
+    kalman_measurement_noise: float  # Variance of the sensor noise (C^2)
     error_tolerance: int        # Consecutive failed temperature reads tolerated per device (0=disabled)
+    lut_resolution: float       # Temperature resolution of the temperature->level LUT (C)
+    hysteresis: float           # Temperature drop below a plateau required to lower the fan level (C)
+    min_dwell: float            # Minimum time a fan level is held before it can be lowered (sec)
+    ramp_up: float              # Maximum rate of fan level increase (%/sec, 0=unlimited)
+    ramp_down: float            # Maximum rate of fan level decrease (%/sec, 0=unlimited)
+    control_mode: str           # Control mode ('lut' or 'pid')
+    pid_target: float           # Target temperature of the PID controller (C)
+    pid_kp: float               # Proportional gain of the PID controller (%/C)
+    pid_ki: float               # Integral gain of the PID controller (%/(C*sec))
+    pid_kd: float               # Derivative gain of the PID controller (%*sec/C)
+    pid_d_filter: float         # Time constant of the derivative filter of the PID controller (sec, 0=disabled)
+    feedforward_rate: float        # Temperature slope activating the feed-forward term (C/sec, 0=disabled)
+    feedforward_horizon: float     # Look-ahead time of the feed-forward term (sec)
     hd_names: List[str]         # Device names of the hard disks (e.g. '/dev/disk/by-id/...')
     smartctl_path: str          # Path for 'smartctl' command
     standby_guard_enabled: bool # Standby guard feature enabled
     standby_hd_limit: int       # Number of HDs in STANDBY state before the full array goes STANDBY
+    read_timeout: float         # Timeout of a 'smartctl' command (sec, 0 = no timeout)
     control_function: List[Tuple[int, int]] = field(default_factory=list)  # (T,L) breakpoints, empty = legacy
 
 
@@ -83,12 +121,30 @@ class NvmeConfig:
     steps: int              # Discrete steps in temperatures and fan levels
     sensitivity: float      # Temperature change to activate fan controller (C)
     polling: float          # Polling interval to read temperature (sec)
+    polling_offset: float   # Phase offset of the polling (sec)
     min_temp: float         # Minimum temperature value (C)
     max_temp: float         # Maximum temperature value (C)
     min_level: int          # Minimum fan level (0..100%)
     max_level: int          # Maximum fan level (0..100%)
     smoothing: int          # Moving average window size for temperature readings (1=disabled)
+    temp_filter: str        # Temperature filter ('sma', 'ewma', 'median' or 'kalman')
+    ewma_alpha: float       # Weight of the new sample in the EWMA filter (0..1]
+    kalman_process_noise: float  # Variance of the temperature change per sample (C^2)
+    kalman_measurement_noise: float  # Variance of the sensor noise (C^2)
     error_tolerance: int    # Consecutive failed temperature reads tolerated per device (0=disabled)
+    lut_resolution: float   # Temperature resolution of the temperature->level LUT (C)
+    hysteresis: float       # Temperature drop below a plateau required to lower the fan level (C)
+    min_dwell: float        # Minimum time a fan level is held before it can be lowered (sec)
+    ramp_up: float          # Maximum rate of fan level increase (%/sec, 0=unlimited)
+    ramp_down: float        # Maximum rate of fan level decrease (%/sec, 0=unlimited)
+    control_mode: str       # Control mode ('lut' or 'pid')
+    pid_target: float       # Target temperature of the PID controller (C)
+    pid_kp: float           # Proportional gain of the PID controller (%/C)
+    pid_ki: float           # Integral gain of the PID controller (%/(C*sec))
+    pid_kd: float           # Derivative gain of the PID controller (%*sec/C)
+    pid_d_filter: float     # Time constant of the derivative filter of the PID controller (sec, 0=disabled)
+    feedforward_rate: float     # Temperature slope activating the feed-forward term (C/sec, 0=disabled)
+    feedforward_horizon: float  # Look-ahead time of the feed-forward term (sec)
     nvme_names: List[str]   # Device names of the NVMe drives (e.g. '/dev/disk/by-id/...')
     control_function: List[Tuple[int, int]] = field(default_factory=list)  # (T,L) breakpoints, empty = legacy
 
@@ -103,17 +159,36 @@ class GpuConfig:
     steps: int                  # Discrete steps in temperatures and fan levels
     sensitivity: float          # Temperature change to activate fan controller (C)
     polling: float              # Polling interval to read temperature (sec)
+    polling_offset: float       # Phase offset of the polling (sec)
     min_temp: float             # Minimum temperature value (C)
     max_temp: float             # Maximum temperature value (C)
     min_level: int              # Minimum fan level (0..100%)
     max_level: int              # Maximum fan level (0..100%)
     smoothing: int              # Moving average window size for temperature readings (1=disabled)
+    temp_filter: str            # Temperature filter ('sma', 'ewma', 'median' or 'kalman')
+    ewma_alpha: float           # Weight of the new sample in the EWMA filter (0..1]
+    kalman_process_noise: float  # Variance of the temperature change per sample (C^2)
+    kalman_measurement_noise: float  # Variance of the sensor noise (C^2)
     error_tolerance: int        # Consecutive failed temperature reads tolerated per device (0=disabled)
+    lut_resolution: float       # Temperature resolution of the temperature->level LUT (C)
+    hysteresis: float           # Temperature drop below a plateau required to lower the fan level (C)
+    min_dwell: float            # Minimum time a fan level is held before it can be lowered (sec)
+    ramp_up: float              # Maximum rate of fan level increase (%/sec, 0=unlimited)
+    ramp_down: float            # Maximum rate of fan level decrease (%/sec, 0=unlimited)
+    control_mode: str           # Control mode ('lut' or 'pid')
+    pid_target: float           # Target temperature of the PID controller (C)
+    pid_kp: float               # Proportional gain of the PID controller (%/C)
+    pid_ki: float               # Integral gain of the PID controller (%/(C*sec))
+    pid_kd: float               # Derivative gain of the PID controller (%*sec/C)
+    pid_d_filter: float         # Time constant of the derivative filter of the PID controller (sec, 0=disabled)
+    feedforward_rate: float        # Temperature slope activating the feed-forward term (C/sec, 0=disabled)
+    feedforward_horizon: float     # Look-ahead time of the feed-forward term (sec)
     gpu_type: str               # GPU type: 'nvidia' or 'amd'
     gpu_device_ids: List[int]   # GPU device IDs (indexes)
     nvidia_smi_path: str        # Path for 'nvidia-smi' command
     rocm_smi_path: str          # Path for 'rocm-smi' command
     amd_temp_sensor: int        # AMD temperature sensor (0-junction, 1-edge, 2-memory)
+    read_timeout: float         # Timeout of an SMI command (sec, 0 = no timeout)
     control_function: List[Tuple[int, int]] = field(default_factory=list)  # (T,L) breakpoints, empty = legacy
 
 
@@ -124,6 +199,7 @@ class ConstConfig:
     enabled: bool           # Fan controller enabled
     ipmi_zone: List[int]    # IPMI zone(s) assigned to the controller
     polling: float          # Polling interval to check fan level (sec)
+    polling_offset: float   # Phase offset of the polling (sec)
     level: int              # Constant fan level (0..100%)
 
 
@@ -133,6 +209,19 @@ class ExporterConfig:
     enabled: bool           # Whether to start the HTTP exporter on Service.run()
     bind_address: str       # IP to bind to ("127.0.0.1", "0.0.0.0", LAN IP, or IPv6)
     port: int               # TCP port (1..65535)
+    history_size: int       # Points per tier of the in-memory history of a series (0 = history disabled)
+
+
+@dataclass
+class ServiceConfig:
+    """Configuration for the runtime behavior of the smfc service."""
+    hotplug_monitor: bool   # Re-resolve hwmon paths on udev hotplug events (drive swap, HBA reset, module reload)
+    execution_mode: str     # Execution mode of the main loop ('sequential', 'asyncio' or 'threaded')
+    sensor_process: bool    # Read the sensors in a supervised child process
+    sensor_timeout: float   # Deadline of a sensor read in the sensor process (sec)
+    state_file: str         # Checkpoint file of the runtime state for a warm start ('' = disabled)
+    state_interval: float   # Time between two checkpoints of the runtime state (sec)
+    state_max_age: float    # Maximum age of a checkpoint restored at startup (sec)
 
 
 class Config:
@@ -146,6 +235,7 @@ class Config:
     CS_GPU: str = "GPU"         # [GPU] section name
     CS_CONST: str = "CONST"     # [CONST] section name
     CS_EXPORTER: str = "Exporter"   # [Exporter] section name
+    CS_SERVICE: str = "Service"     # [Service] section name
 
     # Shared variable names (common across multiple controller types)
     CV_ENABLED: str = "enabled"             # Fan controller enabled flag
@@ -154,12 +244,30 @@ class Config:
     CV_STEPS: str = "steps"                 # Discrete steps in temperatures and fan levels
     CV_SENSITIVITY: str = "sensitivity"     # Temperature change to activate fan controller
     CV_POLLING: str = "polling"             # Polling interval to read temperature
+    CV_POLLING_OFFSET: str = "polling_offset"  # Phase offset of the polling
     CV_MIN_TEMP: str = "min_temp"           # Minimum temperature value
     CV_MAX_TEMP: str = "max_temp"           # Maximum temperature value
     CV_MIN_LEVEL: str = "min_level"         # Minimum fan level
     CV_MAX_LEVEL: str = "max_level"         # Maximum fan level
     CV_SMOOTHING: str = "smoothing"         # Moving average window size
+    CV_TEMP_FILTER: str = "temp_filter"     # Temperature filter
+    CV_EWMA_ALPHA: str = "ewma_alpha"       # Weight of the new sample in the EWMA filter
+    CV_KALMAN_PROCESS_NOISE: str = "kalman_process_noise"           # Process noise of the Kalman filter
+    CV_KALMAN_MEASUREMENT_NOISE: str = "kalman_measurement_noise"   # Measurement noise of the Kalman filter
     CV_ERROR_TOLERANCE: str = "error_tolerance"  # Consecutive failed temperature reads tolerated per device
+    CV_LUT_RESOLUTION: str = "lut_resolution"   # Temperature resolution of the temperature->level LUT
+    CV_HYSTERESIS: str = "hysteresis"       # Temperature drop below a plateau required to lower the fan level
+    CV_MIN_DWELL: str = "min_dwell"         # Minimum time a fan level is held before it can be lowered
+    CV_RAMP_UP: str = "ramp_up"             # Maximum rate of fan level increase
+    CV_RAMP_DOWN: str = "ramp_down"         # Maximum rate of fan level decrease
+    CV_CONTROL_MODE: str = "control_mode"   # Control mode (LUT or PID)
+    CV_PID_TARGET: str = "pid_target"       # Target temperature of the PID controller
+    CV_PID_KP: str = "pid_kp"               # Proportional gain of the PID controller
+    CV_PID_KI: str = "pid_ki"               # Integral gain of the PID controller
+    CV_PID_KD: str = "pid_kd"               # Derivative gain of the PID controller
+    CV_PID_D_FILTER: str = "pid_d_filter"   # Time constant of the derivative filter of the PID controller
+    CV_FEEDFORWARD_RATE: str = "feedforward_rate"        # Temperature slope activating the feed-forward term
+    CV_FEEDFORWARD_HORIZON: str = "feedforward_horizon"  # Look-ahead time of the feed-forward term
     CV_CONTROL_FUNCTION: str = "control_function"  # User-defined T-L breakpoints (overrides min/max keys)
 
     # [Ipmi] section variable names
@@ -170,12 +278,14 @@ class Config:
     CV_IPMI_PLATFORM_NAME: str = "platform_name"            # Platform name or "auto"
     CV_IPMI_ENFORCE_FAN_MODE: str = "enforce_fan_mode"      # Re-assert FULL on BMC drift
     CV_IPMI_EXIT_LEVEL: str = "exit_level"                  # Fan level applied at exit (-1 = do not change)
+    CV_IPMI_COMMAND_TIMEOUT: str = "command_timeout"        # Timeout of an ipmitool command
 
     # [HD] section variable names
     CV_HD_NAMES: str = "hd_names"                            # HD device names
     CV_HD_SMARTCTL_PATH: str = "smartctl_path"               # Path to smartctl command
     CV_HD_STANDBY_GUARD_ENABLED: str = "standby_guard_enabled"  # Enable standby guard
     CV_HD_STANDBY_HD_LIMIT: str = "standby_hd_limit"         # Standby HD limit
+    CV_HD_READ_TIMEOUT: str = "read_timeout"                 # Timeout of a smartctl command
 
     # [NVME] section variable names
     CV_NVME_NAMES: str = "nvme_names"    # NVMe device names
@@ -186,6 +296,7 @@ class Config:
     CV_GPU_NVIDIA_SMI_PATH: str = "nvidia_smi_path" # Path to nvidia-smi command
     CV_GPU_ROCM_SMI_PATH: str = "rocm_smi_path"     # Path to rocm-smi command
     CV_GPU_AMD_TEMP_SENSOR: str = "amd_temp_sensor" # AMD temperature sensor index
+    CV_GPU_READ_TIMEOUT: str = "read_timeout"       # Timeout of an SMI command
 
     # AMD temperature sensor key names (for rocm-smi output parsing)
     CV_AMD_TEMP_JUNCTION: str = "Temperature (Sensor junction) (C)"
@@ -200,12 +311,47 @@ class Config:
     CV_EXPORTER_ENABLED: str = "enabled"            # Enable HTTP exporter
     CV_EXPORTER_BIND_ADDRESS: str = "bind_address"  # IP to bind on
     CV_EXPORTER_PORT: str = "port"                  # TCP port
+    CV_EXPORTER_HISTORY_SIZE: str = "history_size"  # Points per tier of the history of a series
+
+    # [Service] section variable names
+    CV_SERVICE_HOTPLUG_MONITOR: str = "hotplug_monitor"  # Re-resolve hwmon paths on udev hotplug events
+    CV_SERVICE_EXECUTION_MODE: str = "execution_mode"    # Execution mode of the main loop
+    CV_SERVICE_SENSOR_PROCESS: str = "sensor_process"    # Read the sensors in a supervised child process
+    CV_SERVICE_SENSOR_TIMEOUT: str = "sensor_timeout"    # Deadline of a sensor read in the sensor process
+    CV_SERVICE_STATE_FILE: str = "state_file"            # Checkpoint file of the runtime state
+    CV_SERVICE_STATE_INTERVAL: str = "state_interval"    # Time between two checkpoints
+    CV_SERVICE_STATE_MAX_AGE: str = "state_max_age"      # Maximum age of a restored checkpoint
+
+    # Constant values for the execution mode of the main loop
+    MODE_SEQUENTIAL: str = "sequential"     # Controllers read their sensors one after the other
+    MODE_ASYNCIO: str = "asyncio"           # Controllers read their sensors concurrently in an asyncio event loop
+    MODE_THREADED: str = "threaded"         # Controllers run in their own worker threads at their own polling rate
+    EXECUTION_MODES: tuple = (MODE_SEQUENTIAL, MODE_ASYNCIO, MODE_THREADED)
 
     # Constant values for temperature calculation
     CALC_MIN: int = 0   # Use minimum temperature
     CALC_AVG: int = 1   # Use average temperature
     CALC_MAX: int = 2   # Use maximum temperature
 
+    # Constant values for the control mode of the fan controllers
+    CONTROL_LUT: str = "lut"    # Temperature->level lookup table (control_function or min/max keys)
+    CONTROL_PID: str = "pid"    # PID controller with a target temperature
+    CONTROL_MODES: tuple = (CONTROL_LUT, CONTROL_PID)
+
+    # Temperature filters of the fan controllers
+    FILTER_SMA: str = "sma"         # Simple moving average over `smoothing` samples
+    FILTER_EWMA: str = "ewma"       # Exponentially weighted moving average
+    FILTER_MEDIAN: str = "median"   # Median of `smoothing` samples
+    FILTER_KALMAN: str = "kalman"   # One-dimensional Kalman filter
+    TEMP_FILTERS: tuple = (FILTER_SMA, FILTER_EWMA, FILTER_MEDIAN, FILTER_KALMAN)
+
+    # Constant values for the temperature->level LUT
+    LUT_MAX_TEMP: int = 150             # Highest temperature covered by the LUT (C)
+    MIN_LUT_RESOLUTION: float = 0.01    # Finest temperature resolution of the LUT (C)
+
+    # Constant values for the in-memory history of the exporter
+    MAX_HISTORY_SIZE: int = 86400       # Highest number of points per tier of a series
+
     # Constant values for IPMI fan zones (defaults)
     CPU_ZONE: int = 0   # Default CPU zone ID
     HD_ZONE: int = 1    # Default HD zone ID
@@ -218,12 +364,33 @@ class Config:
     DV_IPMI_PLATFORM_NAME: str = "auto"
     DV_IPMI_ENFORCE_FAN_MODE: bool = True
     DV_IPMI_EXIT_LEVEL: int = 100
+    DV_IPMI_COMMAND_TIMEOUT: float = 30.0
     # Sentinel value of `exit_level=` meaning "do not change the fan levels at exit".
     EXIT_LEVEL_NONE: int = -1
 
     # Backward-compatible platform_name aliases (legacy value -> canonical value)
     PLATFORM_NAME_ALIASES: dict = {"genericx9": "generic_x9"}
 
+    # Default values — shared by all fan controller sections
+    DV_POLLING_OFFSET: float = 0.0
+    DV_LUT_RESOLUTION: float = 1.0
+    DV_HYSTERESIS: float = 0.0
+    DV_MIN_DWELL: float = 0.0
+    DV_RAMP_UP: float = 0.0
+    DV_RAMP_DOWN: float = 0.0
+    DV_CONTROL_MODE: str = CONTROL_LUT
+    DV_PID_TARGET: float = 0.0     # Not set (mandatory in PID mode)
+    DV_PID_KP: float = 4.0
+    DV_PID_KI: float = 0.05
+    DV_PID_KD: float = 0.0
+    DV_PID_D_FILTER: float = 5.0
+    DV_FEEDFORWARD_RATE: float = 0.0
+    DV_FEEDFORWARD_HORIZON: float = 10.0
+    DV_TEMP_FILTER: str = FILTER_SMA
+    DV_EWMA_ALPHA: float = 0.3
+    DV_KALMAN_PROCESS_NOISE: float = 0.05
+    DV_KALMAN_MEASUREMENT_NOISE: float = 1.0
+
     # Default values — [CPU] section
     DV_CPU_STEPS: int = 6
     DV_CPU_SENSITIVITY: float = 3.0
@@ -247,6 +414,7 @@ class Config:
     DV_HD_ERROR_TOLERANCE: int = 3
     DV_HD_SMARTCTL_PATH: str = "/usr/sbin/smartctl"
     DV_HD_STANDBY_HD_LIMIT: int = 1
+    DV_HD_READ_TIMEOUT: float = 30.0
 
     # Default values — [NVME] section
     DV_NVME_STEPS: int = 4
@@ -274,6 +442,7 @@ class Config:
     DV_GPU_NVIDIA_SMI_PATH: str = "/usr/bin/nvidia-smi"
     DV_GPU_ROCM_SMI_PATH: str = "/usr/bin/rocm-smi"
     DV_GPU_AMD_TEMP_SENSOR: int = 0
+    DV_GPU_READ_TIMEOUT: float = 10.0
 
     # Default values — [CONST] section
     DV_CONST_POLLING: float = 30.0
@@ -283,6 +452,16 @@ class Config:
     DV_EXPORTER_ENABLED: bool = False
     DV_EXPORTER_BIND_ADDRESS: str = "127.0.0.1"
     DV_EXPORTER_PORT: int = 9099
+    DV_EXPORTER_HISTORY_SIZE: int = 720
+
+    # Default values — [Service] section
+    DV_SERVICE_HOTPLUG_MONITOR: bool = False
+    DV_SERVICE_EXECUTION_MODE: str = MODE_SEQUENTIAL
+    DV_SERVICE_SENSOR_PROCESS: bool = False
+    DV_SERVICE_SENSOR_TIMEOUT: float = 5.0
+    DV_SERVICE_STATE_FILE: str = ""
+    DV_SERVICE_STATE_INTERVAL: float = 30.0
+    DV_SERVICE_STATE_MAX_AGE: float = 300.0
 
     # Parsed configuration dataclasses
     ipmi: IpmiConfig            # IPMI configuration
@@ -292,6 +471,7 @@ class Config:
     gpu: List[GpuConfig]        # List of GPU fan controller configurations
     const: List[ConstConfig]    # List of CONST fan controller configurations
     exporter: ExporterConfig    # HTTP exporter configuration
+    service: ServiceConfig      # Service runtime configuration
 
     def __init__(self, path: str) -> None:
         """Initialize the Config class by reading and parsing the INI file.
@@ -316,6 +496,7 @@ class Config:
         self.const = self._parse_const_sections(parser)
         self._validate_no_duplicate_zones(self.const)
         self.exporter = self._parse_exporter(parser)
+        self.service = self._parse_service(parser)
 
     @staticmethod
     def _get_sections(parser: ConfigParser, base_name: str) -> List[str]:
@@ -389,8 +570,9 @@ class Config:
                 t, lvl = int(tl[0].strip()), int(tl[1].strip())
             except ValueError as e:
                 raise ValueError(f"invalid value: non-integer pair '{p}' in {cls.CV_CONTROL_FUNCTION}") from e
-            if not 0 <= t <= 100:
-                raise ValueError(f"invalid value: temperature {t} out of [0..100] in {cls.CV_CONTROL_FUNCTION}")
+            if not 0 <= t <= cls.LUT_MAX_TEMP:
+                raise ValueError(f"invalid value: temperature {t} out of [0..{cls.LUT_MAX_TEMP}] in "
+                                 f"{cls.CV_CONTROL_FUNCTION}")
             if not 0 <= lvl <= 100:
                 raise ValueError(f"invalid value: level {lvl} out of [0..100] in {cls.CV_CONTROL_FUNCTION}")
             pairs.append((t, lvl))
@@ -447,6 +629,9 @@ class Config:
             PlatformName(platform_name)
         except ValueError as e:
             raise ValueError(f"[{s}] invalid value: {self.CV_IPMI_PLATFORM_NAME}={platform_name}.") from e
+        command_timeout = parser[s].getfloat(self.CV_IPMI_COMMAND_TIMEOUT, fallback=self.DV_IPMI_COMMAND_TIMEOUT)
+        if command_timeout < 0:
+            raise ValueError(f"Negative {self.CV_IPMI_COMMAND_TIMEOUT}= parameter ({command_timeout})")
         return IpmiConfig(
             command=parser[s].get(self.CV_IPMI_COMMAND, self.DV_IPMI_COMMAND),
             fan_mode_delay=fan_mode_delay,
@@ -456,6 +641,7 @@ class Config:
             enforce_fan_mode=parser[s].getboolean(self.CV_IPMI_ENFORCE_FAN_MODE,
                                                   fallback=self.DV_IPMI_ENFORCE_FAN_MODE),
             exit_level=exit_level,
+            command_timeout=command_timeout,
         )
 
     def _parse_exporter(self, parser: ConfigParser) -> ExporterConfig:
@@ -468,7 +654,7 @@ class Config:
             ExporterConfig: parsed exporter configuration
 
         Raises:
-            ValueError: invalid configuration parameters (e.g. port out of range)
+            ValueError: invalid configuration parameters (e.g. port or history_size out of range)
         """
         s = self.CS_EXPORTER
         if s not in parser:
@@ -476,6 +662,7 @@ class Config:
                 enabled=self.DV_EXPORTER_ENABLED,
                 bind_address=self.DV_EXPORTER_BIND_ADDRESS,
                 port=self.DV_EXPORTER_PORT,
+                history_size=self.DV_EXPORTER_HISTORY_SIZE,
             )
         enabled = parser[s].getboolean(self.CV_EXPORTER_ENABLED, fallback=self.DV_EXPORTER_ENABLED)
         bind_address = parser[s].get(self.CV_EXPORTER_BIND_ADDRESS, self.DV_EXPORTER_BIND_ADDRESS).strip()
@@ -484,7 +671,56 @@ class Config:
         port = parser[s].getint(self.CV_EXPORTER_PORT, fallback=self.DV_EXPORTER_PORT)
         if not 1 <= port <= 65535:
             raise ValueError(f"Invalid {self.CV_EXPORTER_PORT}= parameter ({port}); must be in 1..65535")
-        return ExporterConfig(enabled=enabled, bind_address=bind_address, port=port)
+        history_size = parser[s].getint(self.CV_EXPORTER_HISTORY_SIZE, fallback=self.DV_EXPORTER_HISTORY_SIZE)
+        if not 0 <= history_size <= self.MAX_HISTORY_SIZE:
+            raise ValueError(f"Invalid {self.CV_EXPORTER_HISTORY_SIZE}= parameter ({history_size}); "
+                             f"must be in 0..{self.MAX_HISTORY_SIZE}")
+        return ExporterConfig(enabled=enabled, bind_address=bind_address, port=port, history_size=history_size)
+
+    def _parse_service(self, parser: ConfigParser) -> ServiceConfig:
+        """Parse [Service] section. The section is optional; defaults are used when absent.
+
+        Args:
+            parser (ConfigParser): configuration parser
+
+        Returns:
+            ServiceConfig: parsed service configuration
+
+        Raises:
+            ValueError: invalid configuration parameters (e.g. unknown execution mode, sensor_timeout <= 0)
+        """
+        s = self.CS_SERVICE
+        if s not in parser:
+            return ServiceConfig(hotplug_monitor=self.DV_SERVICE_HOTPLUG_MONITOR,
+                                 execution_mode=self.DV_SERVICE_EXECUTION_MODE,
+                                 sensor_process=self.DV_SERVICE_SENSOR_PROCESS,
+                                 sensor_timeout=self.DV_SERVICE_SENSOR_TIMEOUT,
+                                 state_file=self.DV_SERVICE_STATE_FILE,
+                                 state_interval=self.DV_SERVICE_STATE_INTERVAL,
+                                 state_max_age=self.DV_SERVICE_STATE_MAX_AGE)
+        execution_mode = parser[s].get(self.CV_SERVICE_EXECUTION_MODE, self.DV_SERVICE_EXECUTION_MODE).strip().lower()
+        if execution_mode not in self.EXECUTION_MODES:
+            raise ValueError(f"[{s}] invalid value: {self.CV_SERVICE_EXECUTION_MODE}={execution_mode}.")
+        sensor_timeout = parser[s].getfloat(self.CV_SERVICE_SENSOR_TIMEOUT, fallback=self.DV_SERVICE_SENSOR_TIMEOUT)
+        if sensor_timeout <= 0:
+            raise ValueError(f"[{s}] invalid value: {self.CV_SERVICE_SENSOR_TIMEOUT} <= 0 ({sensor_timeout}).")
+        state_interval = parser[s].getfloat(self.CV_SERVICE_STATE_INTERVAL, fallback=self.DV_SERVICE_STATE_INTERVAL)
+        if state_interval <= 0:
+            raise ValueError(f"[{s}] invalid value: {self.CV_SERVICE_STATE_INTERVAL} <= 0 ({state_interval}).")
+        state_max_age = parser[s].getfloat(self.CV_SERVICE_STATE_MAX_AGE, fallback=self.DV_SERVICE_STATE_MAX_AGE)
+        if state_max_age <= 0:
+            raise ValueError(f"[{s}] invalid value: {self.CV_SERVICE_STATE_MAX_AGE} <= 0 ({state_max_age}).")
+        return ServiceConfig(
+            hotplug_monitor=parser[s].getboolean(self.CV_SERVICE_HOTPLUG_MONITOR,
+                                                 fallback=self.DV_SERVICE_HOTPLUG_MONITOR),
+            execution_mode=execution_mode,
+            sensor_process=parser[s].getboolean(self.CV_SERVICE_SENSOR_PROCESS,
+                                                fallback=self.DV_SERVICE_SENSOR_PROCESS),
+            sensor_timeout=sensor_timeout,
+            state_file=parser[s].get(self.CV_SERVICE_STATE_FILE, self.DV_SERVICE_STATE_FILE).strip(),
+            state_interval=state_interval,
+            state_max_age=state_max_age,
+        )
 
     def _read_control_function(self, parser: ConfigParser, section: str, steps: int) -> List[Tuple[int, int]]:
         """Read control_function from a section and the cross-field constraint with `steps`
@@ -529,12 +765,33 @@ class Config:
                 steps=steps,
                 sensitivity=parser[s].getfloat(self.CV_SENSITIVITY, fallback=self.DV_CPU_SENSITIVITY),
                 polling=parser[s].getfloat(self.CV_POLLING, fallback=self.DV_CPU_POLLING),
+                polling_offset=parser[s].getfloat(self.CV_POLLING_OFFSET, fallback=self.DV_POLLING_OFFSET),
                 min_temp=parser[s].getfloat(self.CV_MIN_TEMP, fallback=self.DV_CPU_MIN_TEMP),
                 max_temp=parser[s].getfloat(self.CV_MAX_TEMP, fallback=self.DV_CPU_MAX_TEMP),
                 min_level=parser[s].getint(self.CV_MIN_LEVEL, fallback=self.DV_CPU_MIN_LEVEL),
                 max_level=parser[s].getint(self.CV_MAX_LEVEL, fallback=self.DV_CPU_MAX_LEVEL),
                 smoothing=parser[s].getint(self.CV_SMOOTHING, fallback=self.DV_CPU_SMOOTHING),
+                temp_filter=parser[s].get(self.CV_TEMP_FILTER, self.DV_TEMP_FILTER).strip().lower(),
+                ewma_alpha=parser[s].getfloat(self.CV_EWMA_ALPHA, fallback=self.DV_EWMA_ALPHA),
+                kalman_process_noise=parser[s].getfloat(self.CV_KALMAN_PROCESS_NOISE,
+                                                        fallback=self.DV_KALMAN_PROCESS_NOISE),
+                kalman_measurement_noise=parser[s].getfloat(self.CV_KALMAN_MEASUREMENT_NOISE,
+                                                            fallback=self.DV_KALMAN_MEASUREMENT_NOISE),
                 error_tolerance=parser[s].getint(self.CV_ERROR_TOLERANCE, fallback=self.DV_CPU_ERROR_TOLERANCE),
+                lut_resolution=parser[s].getfloat(self.CV_LUT_RESOLUTION, fallback=self.DV_LUT_RESOLUTION),
+                hysteresis=parser[s].getfloat(self.CV_HYSTERESIS, fallback=self.DV_HYSTERESIS),
+                min_dwell=parser[s].getfloat(self.CV_MIN_DWELL, fallback=self.DV_MIN_DWELL),
+                ramp_up=parser[s].getfloat(self.CV_RAMP_UP, fallback=self.DV_RAMP_UP),
+                ramp_down=parser[s].getfloat(self.CV_RAMP_DOWN, fallback=self.DV_RAMP_DOWN),
+                control_mode=parser[s].get(self.CV_CONTROL_MODE, self.DV_CONTROL_MODE).strip().lower(),
+                pid_target=parser[s].getfloat(self.CV_PID_TARGET, fallback=self.DV_PID_TARGET),
+                pid_kp=parser[s].getfloat(self.CV_PID_KP, fallback=self.DV_PID_KP),
+                pid_ki=parser[s].getfloat(self.CV_PID_KI, fallback=self.DV_PID_KI),
+                pid_kd=parser[s].getfloat(self.CV_PID_KD, fallback=self.DV_PID_KD),
+                pid_d_filter=parser[s].getfloat(self.CV_PID_D_FILTER, fallback=self.DV_PID_D_FILTER),
+                feedforward_rate=parser[s].getfloat(self.CV_FEEDFORWARD_RATE, fallback=self.DV_FEEDFORWARD_RATE),
+                feedforward_horizon=parser[s].getfloat(self.CV_FEEDFORWARD_HORIZON,
+                                                       fallback=self.DV_FEEDFORWARD_HORIZON),
                 control_function=self._read_control_function(parser, s, steps),
             )
             self._validate_fan_controller_config(cfg, s)
@@ -568,6 +825,9 @@ class Config:
             standby_hd_limit = parser[s].getint(self.CV_HD_STANDBY_HD_LIMIT, fallback=self.DV_HD_STANDBY_HD_LIMIT)
             if standby_guard_enabled and standby_hd_limit < 0:
                 raise ValueError(f"[{s}] {self.CV_HD_STANDBY_HD_LIMIT} < 0")
+            read_timeout = parser[s].getfloat(self.CV_HD_READ_TIMEOUT, fallback=self.DV_HD_READ_TIMEOUT)
+            if read_timeout < 0:
+                raise ValueError(f"[{s}] {self.CV_HD_READ_TIMEOUT} < 0")
             steps = parser[s].getint(self.CV_STEPS, fallback=self.DV_HD_STEPS)
             cfg = HdConfig(
                 section=s,
@@ -577,16 +837,38 @@ class Config:
                 steps=steps,
                 sensitivity=parser[s].getfloat(self.CV_SENSITIVITY, fallback=self.DV_HD_SENSITIVITY),
                 polling=parser[s].getfloat(self.CV_POLLING, fallback=self.DV_HD_POLLING),
+                polling_offset=parser[s].getfloat(self.CV_POLLING_OFFSET, fallback=self.DV_POLLING_OFFSET),
                 min_temp=parser[s].getfloat(self.CV_MIN_TEMP, fallback=self.DV_HD_MIN_TEMP),
                 max_temp=parser[s].getfloat(self.CV_MAX_TEMP, fallback=self.DV_HD_MAX_TEMP),
                 min_level=parser[s].getint(self.CV_MIN_LEVEL, fallback=self.DV_HD_MIN_LEVEL),
                 max_level=parser[s].getint(self.CV_MAX_LEVEL, fallback=self.DV_HD_MAX_LEVEL),
                 smoothing=parser[s].getint(self.CV_SMOOTHING, fallback=self.DV_HD_SMOOTHING),
+                temp_filter=parser[s].get(self.CV_TEMP_FILTER, self.DV_TEMP_FILTER).strip().lower(),
+                ewma_alpha=parser[s].getfloat(self.CV_EWMA_ALPHA, fallback=self.DV_EWMA_ALPHA),
+                kalman_process_noise=parser[s].getfloat(self.CV_KALMAN_PROCESS_NOISE,
+                                                        fallback=self.DV_KALMAN_PROCESS_NOISE),
+                kalman_measurement_noise=parser[s].getfloat(self.CV_KALMAN_MEASUREMENT_NOISE,
+                                                            fallback=self.DV_KALMAN_MEASUREMENT_NOISE),
                 error_tolerance=parser[s].getint(self.CV_ERROR_TOLERANCE, fallback=self.DV_HD_ERROR_TOLERANCE),
+                lut_resolution=parser[s].getfloat(self.CV_LUT_RESOLUTION, fallback=self.DV_LUT_RESOLUTION),
+                hysteresis=parser[s].getfloat(self.CV_HYSTERESIS, fallback=self.DV_HYSTERESIS),
+                min_dwell=parser[s].getfloat(self.CV_MIN_DWELL, fallback=self.DV_MIN_DWELL),
+                ramp_up=parser[s].getfloat(self.CV_RAMP_UP, fallback=self.DV_RAMP_UP),
+                ramp_down=parser[s].getfloat(self.CV_RAMP_DOWN, fallback=self.DV_RAMP_DOWN),
+                control_mode=parser[s].get(self.CV_CONTROL_MODE, self.DV_CONTROL_MODE).strip().lower(),
+                pid_target=parser[s].getfloat(self.CV_PID_TARGET, fallback=self.DV_PID_TARGET),
+                pid_kp=parser[s].getfloat(self.CV_PID_KP, fallback=self.DV_PID_KP),
+                pid_ki=parser[s].getfloat(self.CV_PID_KI, fallback=self.DV_PID_KI),
+                pid_kd=parser[s].getfloat(self.CV_PID_KD, fallback=self.DV_PID_KD),
+                pid_d_filter=parser[s].getfloat(self.CV_PID_D_FILTER, fallback=self.DV_PID_D_FILTER),
+                feedforward_rate=parser[s].getfloat(self.CV_FEEDFORWARD_RATE, fallback=self.DV_FEEDFORWARD_RATE),
+                feedforward_horizon=parser[s].getfloat(self.CV_FEEDFORWARD_HORIZON,
+                                                       fallback=self.DV_FEEDFORWARD_HORIZON),
                 hd_names=hd_names,
                 smartctl_path=smartctl_path,
                 standby_guard_enabled=standby_guard_enabled,
                 standby_hd_limit=standby_hd_limit,
+                read_timeout=read_timeout,
                 control_function=self._read_control_function(parser, s, steps),
             )
             self._validate_fan_controller_config(cfg, s)
@@ -619,12 +901,33 @@ class Config:
                 steps=steps,
                 sensitivity=parser[s].getfloat(self.CV_SENSITIVITY, fallback=self.DV_NVME_SENSITIVITY),
                 polling=parser[s].getfloat(self.CV_POLLING, fallback=self.DV_NVME_POLLING),
+                polling_offset=parser[s].getfloat(self.CV_POLLING_OFFSET, fallback=self.DV_POLLING_OFFSET),
                 min_temp=parser[s].getfloat(self.CV_MIN_TEMP, fallback=self.DV_NVME_MIN_TEMP),
                 max_temp=parser[s].getfloat(self.CV_MAX_TEMP, fallback=self.DV_NVME_MAX_TEMP),
                 min_level=parser[s].getint(self.CV_MIN_LEVEL, fallback=self.DV_NVME_MIN_LEVEL),
                 max_level=parser[s].getint(self.CV_MAX_LEVEL, fallback=self.DV_NVME_MAX_LEVEL),
                 smoothing=parser[s].getint(self.CV_SMOOTHING, fallback=self.DV_NVME_SMOOTHING),
+                temp_filter=parser[s].get(self.CV_TEMP_FILTER, self.DV_TEMP_FILTER).strip().lower(),
+                ewma_alpha=parser[s].getfloat(self.CV_EWMA_ALPHA, fallback=self.DV_EWMA_ALPHA),
+                kalman_process_noise=parser[s].getfloat(self.CV_KALMAN_PROCESS_NOISE,
+                                                        fallback=self.DV_KALMAN_PROCESS_NOISE),
+                kalman_measurement_noise=parser[s].getfloat(self.CV_KALMAN_MEASUREMENT_NOISE,
+                                                            fallback=self.DV_KALMAN_MEASUREMENT_NOISE),
                 error_tolerance=parser[s].getint(self.CV_ERROR_TOLERANCE, fallback=self.DV_NVME_ERROR_TOLERANCE),
+                lut_resolution=parser[s].getfloat(self.CV_LUT_RESOLUTION, fallback=self.DV_LUT_RESOLUTION),
+                hysteresis=parser[s].getfloat(self.CV_HYSTERESIS, fallback=self.DV_HYSTERESIS),
+                min_dwell=parser[s].getfloat(self.CV_MIN_DWELL, fallback=self.DV_MIN_DWELL),
+                ramp_up=parser[s].getfloat(self.CV_RAMP_UP, fallback=self.DV_RAMP_UP),
+                ramp_down=parser[s].getfloat(self.CV_RAMP_DOWN, fallback=self.DV_RAMP_DOWN),
+                control_mode=parser[s].get(self.CV_CONTROL_MODE, self.DV_CONTROL_MODE).strip().lower(),
+                pid_target=parser[s].getfloat(self.CV_PID_TARGET, fallback=self.DV_PID_TARGET),
+                pid_kp=parser[s].getfloat(self.CV_PID_KP, fallback=self.DV_PID_KP),
+                pid_ki=parser[s].getfloat(self.CV_PID_KI, fallback=self.DV_PID_KI),
+                pid_kd=parser[s].getfloat(self.CV_PID_KD, fallback=self.DV_PID_KD),
+                pid_d_filter=parser[s].getfloat(self.CV_PID_D_FILTER, fallback=self.DV_PID_D_FILTER),
+                feedforward_rate=parser[s].getfloat(self.CV_FEEDFORWARD_RATE, fallback=self.DV_FEEDFORWARD_RATE),
+                feedforward_horizon=parser[s].getfloat(self.CV_FEEDFORWARD_HORIZON,
+                                                       fallback=self.DV_FEEDFORWARD_HORIZON),
                 nvme_names=nvme_names,
                 control_function=self._read_control_function(parser, s, steps),
             )
@@ -657,6 +960,9 @@ class Config:
             rocm_smi_path = parser[s].get(self.CV_GPU_ROCM_SMI_PATH, self.DV_GPU_ROCM_SMI_PATH)
             if enabled and gpu_type == "amd" and not rocm_smi_path.strip():
                 raise ValueError(f"[{s}] {self.CV_GPU_ROCM_SMI_PATH} is empty")
+            read_timeout = parser[s].getfloat(self.CV_GPU_READ_TIMEOUT, fallback=self.DV_GPU_READ_TIMEOUT)
+            if read_timeout < 0:
+                raise ValueError(f"[{s}] {self.CV_GPU_READ_TIMEOUT} < 0")
             steps = parser[s].getint(self.CV_STEPS, fallback=self.DV_GPU_STEPS)
             cfg = GpuConfig(
                 section=s,
@@ -666,17 +972,39 @@ class Config:
                 steps=steps,
                 sensitivity=parser[s].getfloat(self.CV_SENSITIVITY, fallback=self.DV_GPU_SENSITIVITY),
                 polling=parser[s].getfloat(self.CV_POLLING, fallback=self.DV_GPU_POLLING),
+                polling_offset=parser[s].getfloat(self.CV_POLLING_OFFSET, fallback=self.DV_POLLING_OFFSET),
                 min_temp=parser[s].getfloat(self.CV_MIN_TEMP, fallback=self.DV_GPU_MIN_TEMP),
                 max_temp=parser[s].getfloat(self.CV_MAX_TEMP, fallback=self.DV_GPU_MAX_TEMP),
                 min_level=parser[s].getint(self.CV_MIN_LEVEL, fallback=self.DV_GPU_MIN_LEVEL),
                 max_level=parser[s].getint(self.CV_MAX_LEVEL, fallback=self.DV_GPU_MAX_LEVEL),
                 smoothing=parser[s].getint(self.CV_SMOOTHING, fallback=self.DV_GPU_SMOOTHING),
+                temp_filter=parser[s].get(self.CV_TEMP_FILTER, self.DV_TEMP_FILTER).strip().lower(),
+                ewma_alpha=parser[s].getfloat(self.CV_EWMA_ALPHA, fallback=self.DV_EWMA_ALPHA),
+                kalman_process_noise=parser[s].getfloat(self.CV_KALMAN_PROCESS_NOISE,
+                                                        fallback=self.DV_KALMAN_PROCESS_NOISE),
+                kalman_measurement_noise=parser[s].getfloat(self.CV_KALMAN_MEASUREMENT_NOISE,
+                                                            fallback=self.DV_KALMAN_MEASUREMENT_NOISE),
                 error_tolerance=parser[s].getint(self.CV_ERROR_TOLERANCE, fallback=self.DV_GPU_ERROR_TOLERANCE),
+                lut_resolution=parser[s].getfloat(self.CV_LUT_RESOLUTION, fallback=self.DV_LUT_RESOLUTION),
+                hysteresis=parser[s].getfloat(self.CV_HYSTERESIS, fallback=self.DV_HYSTERESIS),
+                min_dwell=parser[s].getfloat(self.CV_MIN_DWELL, fallback=self.DV_MIN_DWELL),
+                ramp_up=parser[s].getfloat(self.CV_RAMP_UP, fallback=self.DV_RAMP_UP),
+                ramp_down=parser[s].getfloat(self.CV_RAMP_DOWN, fallback=self.DV_RAMP_DOWN),
+                control_mode=parser[s].get(self.CV_CONTROL_MODE, self.DV_CONTROL_MODE).strip().lower(),
+                pid_target=parser[s].getfloat(self.CV_PID_TARGET, fallback=self.DV_PID_TARGET),
+                pid_kp=parser[s].getfloat(self.CV_PID_KP, fallback=self.DV_PID_KP),
+                pid_ki=parser[s].getfloat(self.CV_PID_KI, fallback=self.DV_PID_KI),
+                pid_kd=parser[s].getfloat(self.CV_PID_KD, fallback=self.DV_PID_KD),
+                pid_d_filter=parser[s].getfloat(self.CV_PID_D_FILTER, fallback=self.DV_PID_D_FILTER),
+                feedforward_rate=parser[s].getfloat(self.CV_FEEDFORWARD_RATE, fallback=self.DV_FEEDFORWARD_RATE),
+                feedforward_horizon=parser[s].getfloat(self.CV_FEEDFORWARD_HORIZON,
+                                                       fallback=self.DV_FEEDFORWARD_HORIZON),
                 gpu_type=gpu_type,
                 gpu_device_ids=gpu_device_ids,
                 nvidia_smi_path=nvidia_smi_path,
                 rocm_smi_path=rocm_smi_path,
                 amd_temp_sensor=amd_temp_sensor,
+                read_timeout=read_timeout,
                 control_function=self._read_control_function(parser, s, steps),
             )
             self._validate_fan_controller_config(cfg, s)
@@ -697,6 +1025,8 @@ class Config:
             polling = parser[s].getfloat(self.CV_POLLING, fallback=self.DV_CONST_POLLING)
             if polling < 0:
                 raise ValueError(f"[{s}] {self.CV_POLLING} < 0")
+            polling_offset = parser[s].getfloat(self.CV_POLLING_OFFSET, fallback=self.DV_POLLING_OFFSET)
+            self._validate_polling_offset(polling, polling_offset, s)
             level = parser[s].getint(self.CV_CONST_LEVEL, fallback=self.DV_CONST_LEVEL)
             if level not in range(1, 101):
                 raise ValueError(f"[{s}] invalid {self.CV_CONST_LEVEL}")
@@ -705,6 +1035,7 @@ class Config:
                 enabled=parser[s].getboolean(self.CV_ENABLED, fallback=False),
                 ipmi_zone=self.parse_ipmi_zones(parser[s].get(self.CV_IPMI_ZONE, str(self.HD_ZONE))),
                 polling=polling,
+                polling_offset=polling_offset,
                 level=level,
             ))
         return result
@@ -726,6 +1057,20 @@ class Config:
                     raise ValueError(f"[{cfg.section}] IPMI zone {zone} is already used by [{zone_owners[zone]}]")
                 zone_owners[zone] = cfg.section
 
+    def _validate_polling_offset(self, polling: float, polling_offset: float, section: str) -> None:
+        """Validate the phase offset of the polling: it must be in the [0, polling] range.
+        Args:
+            polling (float): polling interval (sec)
+            polling_offset (float): phase offset of the polling (sec)
+            section (str): section name for error messages
+        Raises:
+            ValueError: invalid polling offset
+        """
+        if polling_offset < 0:
+            raise ValueError(f"[{section}] {self.CV_POLLING_OFFSET} < 0")
+        if polling_offset > polling:
+            raise ValueError(f"[{section}] invalid value: {self.CV_POLLING_OFFSET} > {self.CV_POLLING}")
+
     def _validate_fan_controller_config(self, cfg, section: str) -> None:
         """Validate common fan controller configuration parameters.
         Args:
@@ -742,6 +1087,9 @@ class Config:
             raise ValueError(f"[{section}] invalid value: {self.CV_SENSITIVITY} <= 0")
         if cfg.polling < 0:
             raise ValueError(f"[{section}] {self.CV_POLLING} < 0")
+        self._validate_polling_offset(cfg.polling, cfg.polling_offset, section)
+        if cfg.control_mode not in self.CONTROL_MODES:
+            raise ValueError(f"[{section}] invalid value: {self.CV_CONTROL_MODE}={cfg.control_mode}")
         # The legacy min/max keys are only used in legacy mode; they are ignored (and not validated)
         # when control_function is defined.
         if not cfg.control_function:
@@ -762,8 +1110,50 @@ class Config:
                 raise ValueError(f"[{section}] invalid value: {self.CV_MAX_LEVEL} < {self.CV_MIN_LEVEL}")
         if cfg.smoothing < 1:
             raise ValueError(f"[{section}] invalid value: {self.CV_SMOOTHING} < 1")
+        if cfg.temp_filter not in self.TEMP_FILTERS:
+            raise ValueError(f"[{section}] invalid value: {self.CV_TEMP_FILTER}={cfg.temp_filter}")
+        if not 0 < cfg.ewma_alpha <= 1:
+            raise ValueError(f"[{section}] invalid value: {self.CV_EWMA_ALPHA} out of (0..1] ({cfg.ewma_alpha})")
+        for key, value in ((self.CV_KALMAN_PROCESS_NOISE, cfg.kalman_process_noise),
+                           (self.CV_KALMAN_MEASUREMENT_NOISE, cfg.kalman_measurement_noise)):
+            if value <= 0:
+                raise ValueError(f"[{section}] invalid value: {key} <= 0")
         if cfg.error_tolerance < 0:
             raise ValueError(f"[{section}] invalid value: {self.CV_ERROR_TOLERANCE} < 0")
+        if not self.MIN_LUT_RESOLUTION <= cfg.lut_resolution <= 1:
+            raise ValueError(f"[{section}] invalid value: {self.CV_LUT_RESOLUTION} out of "
+                             f"[{self.MIN_LUT_RESOLUTION}..1] ({cfg.lut_resolution})")
+        for key, value in ((self.CV_HYSTERESIS, cfg.hysteresis), (self.CV_MIN_DWELL, cfg.min_dwell),
+                           (self.CV_RAMP_UP, cfg.ramp_up), (self.CV_RAMP_DOWN, cfg.ramp_down),
+                           (self.CV_FEEDFORWARD_RATE, cfg.feedforward_rate),
+                           (self.CV_FEEDFORWARD_HORIZON, cfg.feedforward_horizon)):
+            if value < 0:
+                raise ValueError(f"[{section}] invalid value: {key} < 0")
+        if cfg.control_mode == self.CONTROL_PID:
+            self._validate_pid_config(cfg, section)
+
+    def _validate_pid_config(self, cfg, section: str) -> None:
+        """Validate the parameters of the PID control mode. The output of the PID controller is clamped to
+        [min_level..max_level], so these keys are validated even if control_function is defined.
+        Args:
+            cfg: configuration dataclass (CpuConfig, HdConfig, NvmeConfig, or GpuConfig)
+            section (str): section name for error messages
+        Raises:
+            ValueError: invalid PID parameters
+        """
+        if not 0 < cfg.pid_target <= self.LUT_MAX_TEMP:
+            raise ValueError(f"[{section}] invalid value: {self.CV_PID_TARGET} out of (0..{self.LUT_MAX_TEMP}] "
+                             f"({cfg.pid_target})")
+        for key, value in ((self.CV_PID_KP, cfg.pid_kp), (self.CV_PID_KI, cfg.pid_ki),
+                           (self.CV_PID_KD, cfg.pid_kd), (self.CV_PID_D_FILTER, cfg.pid_d_filter)):
+            if value < 0:
+                raise ValueError(f"[{section}] invalid value: {key} < 0")
+        if cfg.min_level < 0:
+            raise ValueError(f"[{section}] invalid value: {self.CV_MIN_LEVEL} < 0")
+        if cfg.max_level > 100:
+            raise ValueError(f"[{section}] invalid value: {self.CV_MAX_LEVEL} > 100")
+        if cfg.max_level < cfg.min_level:
+            raise ValueError(f"[{section}] invalid value: {self.CV_MAX_LEVEL} < {self.CV_MIN_LEVEL}")
 
 
 # End.
@@ -3,10 +3,12 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.ConstFc() class implementation.
 #
-import time
+from typing import Any, Dict
+from smfc import clock
 from smfc.ipmi import Ipmi
 from smfc.log import Log
 from smfc.config import ConstConfig
+from smfc.timing import ControllerTiming
 
 
 class ConstFc:  # pylint: disable=too-few-public-methods
@@ -24,6 +26,8 @@ class ConstFc:  # pylint: disable=too-few-public-methods
     last_temp: float        # Not used, but kept for interface compatibility
     last_level: int         # Last configured fan level (0..100%)
     deferred_apply: bool    # If True, skip IPMI calls (used for zone arbitration)
+    timing: ControllerTiming  # Poll lateness and apply durations of the controller
+    created_at: float       # Unix time of the creation (the timing starts here)
 
     def __init__(self, log: Log, ipmi: Ipmi, cfg: ConstConfig) -> None:
         """Initialize the CONST fan controller class and raise exception in case invalid configuration items.
@@ -43,12 +47,16 @@ class ConstFc:  # pylint: disable=too-few-public-methods
         self.last_temp = 0.0
         self.last_level = cfg.level
         self.deferred_apply = False
+        self.timing = ControllerTiming()
+        self.created_at = clock.time()
 
         # Print configuration at CONFIG log level.
         if self.log.log_level >= Log.LOG_CONFIG:
             self.log.msg(Log.LOG_CONFIG, f"{self.name} fan controller was initialized with:")
             self.log.msg(Log.LOG_CONFIG, f"   ipmi zone = {self.config.ipmi_zone}")
             self.log.msg(Log.LOG_CONFIG, f"   polling = {self.config.polling}")
+            if self.config.polling_offset:
+                self.log.msg(Log.LOG_CONFIG, f"   polling_offset = {self.config.polling_offset}")
             self.log.msg(Log.LOG_CONFIG, f"   level = {self.config.level}")
 
     def run(self) -> None:
@@ -64,26 +72,55 @@ class ConstFc:  # pylint: disable=too-few-public-methods
         current_time: float  # Current system timestamp (measured)
 
         # Step 1: check the elapsed time.
-        current_time = time.monotonic()
+        current_time = clock.monotonic()
         if (current_time - self.last_time) >= self.config.polling:
             self.last_time = current_time
+            # Step 2-4: check and set the fan level.
+            self.poll()
 
-            # Step 2: in deferred mode, just store the desired level for arbitration.
-            if self.deferred_apply:
-                self.last_level = self.config.level
-                return
-
-            # Check in all IPMI zones if the current fan level is the expected one,
-            # otherwise set the fan level again.
-            for zone in self.config.ipmi_zone:
-                level = self.ipmi.get_fan_level(zone)
-                if self.log.log_level >= Log.LOG_DEBUG:
-                    self.log.msg(Log.LOG_DEBUG, f"{self.name}: zone {zone} current={level}% "
-                                 f"expected={self.config.level}%")
-                if level != self.config.level:
-                    self.ipmi.set_fan_level(zone, self.config.level)
-                    self.log.msg(Log.LOG_INFO, f"{self.name}: set fan level > {self.config.level}% "
-                                               f"@ IPMI {self.config.ipmi_zone} zone(s).")
+    def poll(self) -> None:
+        """Check and set the fan level without checking the polling timer (steps 2-4 of run()). The scheduler
+        of the service calls this method at the polling deadlines of the controller. The lateness of the poll,
+        the duration of the IPMI reads (read) and writes (apply) are recorded in self.timing.
+        """
+        self.timing.start(self.config.polling)
+        # Step 2: in deferred mode, just store the desired level for arbitration.
+        if self.deferred_apply:
+            self.last_level = self.config.level
+            return
+
+        # Check in all IPMI zones if the current fan level is the expected one,
+        # otherwise set the fan level again.
+        for zone in self.config.ipmi_zone:
+            start = clock.monotonic()
+            level = self.ipmi.get_fan_level(zone)
+            self.timing.read.observe(clock.monotonic() - start)
+            if self.log.log_level >= Log.LOG_DEBUG:
+                self.log.msg(Log.LOG_DEBUG, f"{self.name}: zone {zone} current={level}% "
+                             f"expected={self.config.level}%")
+            if level != self.config.level:
+                start = clock.monotonic()
+                self.ipmi.set_fan_level(zone, self.config.level)
+                self.timing.applied(start)
+                self.log.msg(Log.LOG_INFO, f"{self.name}: set fan level > {self.config.level}% "
+                                           f"@ IPMI {self.config.ipmi_zone} zone(s).")
+
+    def save_state(self) -> Dict[str, Any]:
+        """Return the runtime state of the controller for a warm start checkpoint (the last fan level).
+        Returns:
+            Dict[str, Any]: JSON serializable state
+        """
+        return {"last_level": self.last_level}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore the runtime state saved by save_state() at a warm start (the last fan level, if present).
+        Args:
+            state (Dict[str, Any]): state returned by save_state()
+        Raises:
+            TypeError, ValueError: invalid state
+        """
+        if "last_level" in state:
+            self.last_level = int(state["last_level"])
 
 
 # End.
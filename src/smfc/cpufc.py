@@ -3,9 +3,10 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.CpuFc() class implementation.
 #
-from typing import List
+from typing import List, Optional
 from pyudev import Context
 from smfc.fancontroller import FanController
+from smfc.hwmon import HwmonIndex
 from smfc.ipmi import Ipmi
 from smfc.log import Log
 from smfc.config import CpuConfig
@@ -16,34 +17,47 @@ class CpuFc(FanController):
 
     config: CpuConfig
 
-    def __init__(self, log: Log, udevc: Context, ipmi: Ipmi, cfg: CpuConfig) -> None:
+    def __init__(self, log: Log, udevc: Context, ipmi: Ipmi, cfg: CpuConfig,
+                 hwmon_index: Optional[HwmonIndex] = None) -> None:
         """Initialize the CPU fan controller class and raise exception in case of invalid configuration.
         Args:
             log (Log): reference to a Log class instance
             udevc (Context): reference to an udev database connection (instance of Context from pyudev)
             ipmi (Ipmi): reference to an Ipmi class instance
             cfg (CpuConfig): CPU fan controller configuration
+            hwmon_index (Optional[HwmonIndex]): shared hwmon index (None = one udev query per device)
         Raises:
             ValueError: multiple hwmon devices reported, one expected
             RuntimeError: No HWMON device found for CPU(s)
         """
         # Store config reference first (required by base class)
         self.config = cfg
+        self.hwmon_index = hwmon_index
 
         # Build the list of paths for hwmon devices.
-        self.hwmon_path = []
-        # We are looking for either Intel (coretemp) or AMD (k10temp) CPUs.
-        for dev_filter in [{"MODALIAS": "platform:coretemp"}, {"DRIVER": "k10temp"}]:
-            self.hwmon_path = [self.get_hwmon_path(udevc, dev) for dev in udevc.list_devices(**dev_filter)]
-            # If we found results.
-            if self.hwmon_path:
-                break
+        self.hwmon_path = self.resolve_hwmon_paths(udevc)
         if not self.hwmon_path:
             raise RuntimeError("pyudev: No HWMON device(s) can be found for the CPU.")
 
         # Initialize FanController class.
         super().__init__(log, ipmi, cfg.section, len(self.hwmon_path))
 
+    def resolve_hwmon_paths(self, udevc: Context) -> List[str]:
+        """Resolve the hwmon paths of the CPUs from the udev database.
+        Args:
+            udevc (Context): pyudev Context
+        Returns:
+            List[str]: list of hwmon paths (empty list if no CPU hwmon device found)
+        """
+        paths: List[str] = []
+        # We are looking for either Intel (coretemp) or AMD (k10temp) CPUs.
+        for dev_filter in [{"MODALIAS": "platform:coretemp"}, {"DRIVER": "k10temp"}]:
+            paths = [self.get_hwmon_path(udevc, dev, self.hwmon_index) for dev in udevc.list_devices(**dev_filter)]
+            # If we found results.
+            if paths:
+                break
+        return paths
+
     def device_names(self) -> List[str]:
         """Return per-CPU device labels (cpu0, cpu1, ...) matching last_per_device_temps positionally."""
         return [f"cpu{i}" for i in range(self.count)]
@@ -1,13 +1,19 @@
 #
 #   exporter.py (C) 2020-2026, Peter Sulyok
 #   smfc package: Supermicro fan control for Linux (home) servers.
-#   HTTP exporter: serves /snapshot (JSON) and /metrics (Prometheus text format) to smfc-client and Prometheus.
+#   HTTP exporter: serves /snapshot (JSON) and /metrics (Prometheus text or OpenMetrics format) to smfc-client and
+#   Prometheus, and the in-memory history on /history (JSON).
 #
+import gzip
 import http.server
 import json
+import math
 import socketserver
 import threading
-from typing import Any, Callable, Dict, List, Optional
+import urllib.parse
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from smfc.log import Log
 
@@ -15,6 +21,7 @@ from smfc.log import Log
 SNAPSHOT_PATH: str = "/snapshot"
 METRICS_PATH: str = "/metrics"
 HEALTHZ_PATH: str = "/healthz"
+HISTORY_PATH: str = "/history"
 
 
 def _escape_label_value(value: str) -> str:
@@ -34,182 +41,540 @@ def _format_labels(pairs: List[tuple]) -> str:
     return "{" + ",".join(parts) + "}"
 
 
+@dataclass
+class _ControllerLabels:
+    """Pre-escaped label sets of the series of a fan controller."""
+
+    controller: str     # {section="...",type="..."}
+    zones: List[str]    # {section="...",type="...",zone="..."} per IPMI zone
+    devices: List[str]  # {section="...",type="...",device="..."} per device
+    standby: List[str]  # {section="...",device="..."} per device (standby guard)
+
+
+def _layout_key(snapshot: Dict[str, Any]) -> tuple:
+    """Return the identity of the label values of a snapshot: the service version, the BMC identity, the
+    sections, types, IPMI zones and device names of the fan controllers, the IPMI zones and the sensor keys.
+    Args:
+        snapshot (Dict[str, Any]): snapshot dict
+    Returns:
+        tuple: hashable layout key (equal keys give equal label sets)
+    """
+    bmc = snapshot.get("bmc", {})
+    return (str(snapshot.get("smfc_version", "")),
+            bmc.get("product_name", ""), bmc.get("firmware_rev", ""), bmc.get("manufacturer_name", ""),
+            tuple((c.get("section", ""), c.get("type", ""), tuple(c.get("ipmi_zones", []) or []),
+                   tuple(d.get("name", "") for d in (c.get("devices", []) or [])))
+                  for c in (snapshot.get("fan_controllers", []) or [])),
+            tuple(snapshot.get("zones", {}) or {}),
+            tuple(s.get("key", "") for s in ((snapshot.get("sensors") or {}).get("sensors", []) or [])))
+
+
+class _PrometheusLayout:  # pylint: disable=too-few-public-methods
+    """Pre-escaped label sets of the metric families for one snapshot layout. It is immutable after creation
+    (except the bucket label cache, which only grows), so the reader threads can share it."""
+
+    key: tuple                              # Layout key (see _layout_key())
+    up: str                                 # Label set of smfc_up
+    bmc: str                                # Label set of smfc_bmc_info
+    controllers: List[_ControllerLabels]    # Label sets per fan controller (snapshot order)
+    zones: List[Tuple[str, str]]            # (zone key, label set) sorted by zone number
+    sensors: List[str]                      # Label set per sensor (snapshot order)
+    _buckets: Dict[Tuple[str, float], str]  # Histogram bucket label set per (label set, upper bound)
+
+    def __init__(self, snapshot: Dict[str, Any], key: tuple) -> None:
+        """Build the label sets of a snapshot.
+        Args:
+            snapshot (Dict[str, Any]): snapshot dict
+            key (tuple): layout key of the snapshot
+        """
+        bmc = snapshot.get("bmc", {})
+        self.key = key
+        self.up = _format_labels([("version", str(snapshot.get("smfc_version", "")))])
+        self.bmc = _format_labels([("product_name", bmc.get("product_name", "")),
+                                   ("firmware_version", bmc.get("firmware_rev", "")),
+                                   ("manufacturer_name", bmc.get("manufacturer_name", ""))])
+        self.controllers = []
+        for c in snapshot.get("fan_controllers", []) or []:
+            section, ctype = c.get("section", ""), c.get("type", "")
+            names = [str(d.get("name", "")) for d in (c.get("devices", []) or [])]
+            self.controllers.append(_ControllerLabels(
+                controller=_format_labels([("section", section), ("type", ctype)]),
+                zones=[_format_labels([("section", section), ("type", ctype), ("zone", str(zone))])
+                       for zone in c.get("ipmi_zones", []) or []],
+                devices=[_format_labels([("section", section), ("type", ctype), ("device", name)]) for name in names],
+                standby=[_format_labels([("section", section), ("device", name)]) for name in names]))
+        self.zones = [(zone, _format_labels([("zone", zone)]))
+                      for zone in sorted(snapshot.get("zones", {}) or {}, key=int)]
+        self.sensors = [_format_labels([("sensor", str(s.get("key", "")))])
+                        for s in ((snapshot.get("sensors") or {}).get("sensors", []) or [])]
+        self._buckets = {}
+
+    def bucket(self, labels: str, bound: float, openmetrics: bool = False) -> str:
+        """Return the label set of a histogram bucket: the label set of the series extended with the `le` label.
+        Args:
+            labels (str): label set of the series (empty string = no labels)
+            bound (float): upper bound of the bucket
+            openmetrics (bool): OpenMetrics format (the bound is a canonical float, e.g. `1.0` instead of `1`)
+        Returns:
+            str: label set of the bucket
+        """
+        result = self._buckets.get((labels, bound, openmetrics))
+        if result is None:
+            le = f'le="{float(bound)!r}"' if openmetrics else f'le="{float(bound):g}"'
+            result = f"{labels[:-1]},{le}}}" if labels else f"{{{le}}}"
+            self._buckets[(labels, bound, openmetrics)] = result
+        return result
+
+
+# A series of a metric family: (label set, value, Unix time of the start of the counting).
+Series = Tuple[str, Any, float]
+
+
+class _Exposition:
+    """Builder of the exposition text: Prometheus text format 0.0.4 or OpenMetrics 1.0.0.
+
+    The differences of OpenMetrics: counter and info families are named without the `_total` and `_info` suffix
+    of their samples, counters and histograms have `_created` samples (Unix time of the start of the counting),
+    the bucket bounds are canonical floats, there are no blank lines, and the text ends with `# EOF`.
+    """
+
+    layout: _PrometheusLayout   # Label sets of the snapshot
+    openmetrics: bool           # OpenMetrics format (False = text format 0.0.4)
+    lines: List[str]            # Output lines
+    _names: set                 # Names of the metric families already added
+
+    def __init__(self, layout: _PrometheusLayout, openmetrics: bool) -> None:
+        """Initialize an empty exposition.
+        Args:
+            layout (_PrometheusLayout): label sets of the snapshot
+            openmetrics (bool): OpenMetrics format (False = text format 0.0.4)
+        """
+        self.layout = layout
+        self.openmetrics = openmetrics
+        self.lines = []
+        self._names = set()
+
+    def _header(self, name: str, kind: str, help_text: str) -> None:
+        """Append the `# HELP` and `# TYPE` lines of a metric family."""
+        if self.lines and not self.openmetrics:
+            self.lines.append("")
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        self._names.add(name)
+
+    def family(self, name: str, kind: str, help_text: str, series: List[Series]) -> None:
+        """Append a gauge, counter or info metric family.
+        Args:
+            name (str): metric name of the samples (counters with `_total`, infos with `_info` suffix)
+            kind (str): metric type (`gauge`, `counter` or `info`; an info is a gauge in text format 0.0.4)
+            help_text (str): text of the `# HELP` line
+            series (List[Series]): series of the family
+        """
+        family_name, family_kind = name, kind
+        if self.openmetrics:
+            suffix = {"counter": "_total", "info": "_info"}.get(kind)
+            if suffix:
+                family_name = name[:-len(suffix)]
+                if family_name in self._names:
+                    # The name is taken by another family (e.g. smfc_device_temp_read_errors gauge): the series
+                    # are exposed with unknown type under their sample name.
+                    family_name, family_kind = name, "unknown"
+        elif kind == "info":
+            family_kind = "gauge"
+        self._header(family_name, family_kind, help_text)
+        created = self.openmetrics and family_kind == "counter"
+        for labels, value, start in series:
+            self.lines.append(f"{name}{labels} {value}")
+            if created:
+                self.lines.append(f"{family_name}_created{labels} {float(start)}")
+
+    def histogram(self, name: str, help_text: str, series: List[Series]) -> None:
+        """Append a histogram metric family (`_bucket`, `_sum`, `_count` and in OpenMetrics `_created` samples).
+        Args:
+            name (str): metric name
+            help_text (str): text of the `# HELP` line
+            series (List[Series]): series of the family, the values are histogram snapshots (see
+                Histogram.snapshot())
+        """
+        self._header(name, "histogram", help_text)
+        for labels, hist, start in series:
+            count = int(hist.get("count", 0))
+            for bound, n in hist.get("buckets", []) or []:
+                self.lines.append(f"{name}_bucket{self.layout.bucket(labels, bound, self.openmetrics)} {int(n)}")
+            inf = f'{labels[:-1]},le="+Inf"}}' if labels else '{le="+Inf"}'
+            self.lines.append(f"{name}_bucket{inf} {count}")
+            self.lines.append(f"{name}_sum{labels} {float(hist.get('sum', 0.0))}")
+            self.lines.append(f"{name}_count{labels} {count}")
+            if self.openmetrics:
+                self.lines.append(f"{name}_created{labels} {float(start)}")
+
+    def text(self) -> str:
+        """Return the exposition text (with a trailing newline, in OpenMetrics with the `# EOF` line).
+        Returns:
+            str: exposition text
+        """
+        if self.openmetrics:
+            self.lines.append("# EOF")
+        return "\n".join(self.lines) + "\n"
+
+
+class PrometheusRegistry:
+    """Renderer of the Prometheus text format and the OpenMetrics format with pre-escaped label sets.
+
+    The label values (sections, types, IPMI zones, device names, sensor keys, BMC identity) change only when the
+    configuration is reloaded, so they are escaped and formatted once per snapshot layout (_PrometheusLayout),
+    and a scrape only formats the numeric values into the lines. The layout is rebuilt when the layout key of
+    the snapshot changes. The layout is replaced by a single reference assignment, so concurrent renders are
+    safe.
+    """
+
+    _layout: Optional[_PrometheusLayout]   # Label sets of the last rendered snapshot layout (None = no render yet)
+
+    def __init__(self) -> None:
+        """Initialize the registry without a layout (it is built at the first render)."""
+        self._layout = None
+
+    def layout(self, snapshot: Dict[str, Any]) -> _PrometheusLayout:
+        """Return the label sets of the snapshot, rebuild them if the layout of the snapshot changed.
+        Args:
+            snapshot (Dict[str, Any]): snapshot dict
+        Returns:
+            _PrometheusLayout: label sets of the snapshot
+        """
+        key = _layout_key(snapshot)
+        layout = self._layout
+        if layout is None or layout.key != key:
+            layout = _PrometheusLayout(snapshot, key)
+            self._layout = layout
+        return layout
+
+    def render(self, snapshot: Dict[str, Any]) -> str:
+        """Render a snapshot dict as Prometheus text format 0.0.4.
+
+        The output uses the standard `# HELP` / `# TYPE` headers, gauge, counter and histogram metrics. Label
+        values are properly escaped. A trailing newline is included so the response body is well-formed.
+        Args:
+            snapshot (Dict[str, Any]): snapshot dict
+        Returns:
+            str: Prometheus text format
+        """
+        return self._render(snapshot, False)
+
+    def render_openmetrics(self, snapshot: Dict[str, Any]) -> str:
+        """Render a snapshot dict as OpenMetrics 1.0.0 text format (same metrics as render(), with `_created`
+        samples of the counters and histograms and the `# EOF` terminator).
+        Args:
+            snapshot (Dict[str, Any]): snapshot dict
+        Returns:
+            str: OpenMetrics text format
+        """
+        return self._render(snapshot, True)
+
+    def _render(self, snapshot: Dict[str, Any], openmetrics: bool) -> str:
+        """Render a snapshot dict in text format 0.0.4 or OpenMetrics 1.0.0.
+        Args:
+            snapshot (Dict[str, Any]): snapshot dict
+            openmetrics (bool): OpenMetrics format
+        Returns:
+            str: exposition text
+        """
+        layout = self.layout(snapshot)
+        out = _Exposition(layout, openmetrics)
+        # The service counters count since the start of the service, the counters and the histograms of a fan
+        # controller since the creation of the controller (it is recreated by a configuration reload).
+        start = float(snapshot.get("start_time", 0.0))
+
+        # --- Service identity ---
+        out.family("smfc_up", "gauge", "smfc service is up (1); carries the running version.",
+                   [(layout.up, 1, start)])
+        out.family("smfc_start_time_seconds", "gauge", "Unix start time of the smfc service.",
+                   [("", start, start)])
+        out.family("smfc_bmc_info", "info", "BMC identity reported by ipmitool bmc info.",
+                   [(layout.bmc, 1, start)])
+        out.family("smfc_fan_mode_enforced_total", "counter",
+                   "Times smfc re-asserted FULL after the BMC fan mode drifted.",
+                   [("", int(snapshot.get("fan_mode_enforced_count", 0)), start)])
+
+        # Fan controllers with their label sets and creation times; the temperature-driven ones (all but CONST)
+        # separately.
+        controllers = [(c, cl, float(c.get("created_at") or start))
+                       for c, cl in zip(snapshot.get("fan_controllers", []) or [], layout.controllers)]
+        temp_controllers = [(c, cl, created) for c, cl, created in controllers if c.get("type") != "const"]
+
+        # --- Static config ---
+        out.family("smfc_controller_zone", "gauge", "Enabled fan-controller-to-IPMI-zone mapping (value always 1).",
+                   [(labels, 1, created) for c, cl, created in controllers if c.get("enabled", True)
+                    for labels in cl.zones])
+        out.family("smfc_controller_temperature_min_celsius", "gauge",
+                   "Controller steering-window floor (static config).",
+                   [(labels, float(c.get("temp_min_c", 0.0)), created) for c, cl, created in temp_controllers
+                    for labels in cl.zones])
+        out.family("smfc_controller_temperature_max_celsius", "gauge",
+                   "Controller steering-window ceiling (static config).",
+                   [(labels, float(c.get("temp_max_c", 0.0)), created) for c, cl, created in temp_controllers
+                    for labels in cl.zones])
+        out.family("smfc_controller_level_min_percent", "gauge", "Controller fan-level-window floor (static config).",
+                   [(labels, int(c.get("level_min_pct", 0)), created) for c, cl, created in controllers
+                    for labels in cl.zones])
+        out.family("smfc_controller_level_max_percent", "gauge",
+                   "Controller fan-level-window ceiling (static config).",
+                   [(labels, int(c.get("level_max_pct", 0)), created) for c, cl, created in controllers
+                    for labels in cl.zones])
+
+        # --- Dynamic runtime ---
+        out.family("smfc_controller_temperature_celsius", "gauge",
+                   "Per-controller temperature, per targeted zone; skipped for CONST.",
+                   [(labels, float(c.get("last_temp_c", 0.0)), created) for c, cl, created in temp_controllers
+                    for labels in cl.zones])
+        pid_series = [(labels, float(c.get("pid_target_c", 0.0)), created) for c, cl, created in controllers
+                      if c.get("control_mode") == "pid" for labels in cl.zones]
+        if pid_series:
+            out.family("smfc_controller_target_temperature_celsius", "gauge",
+                       "Target temperature of a controller in PID control mode, per targeted zone.", pid_series)
+        devices = [(d, labels, created) for c, cl, created in temp_controllers
+                   for d, labels in zip(c.get("devices", []) or [], cl.devices)]
+        out.family("smfc_device_temperature_celsius", "gauge", "Per-device temperature reading.",
+                   [(labels, float(d.get("temp_c", 0.0)), created) for d, labels, created in devices])
+        # The value is the *current* consecutive failed-read streak of the device (reset to 0 by the next
+        # successful read), not a lifetime total — hence a gauge, not a counter.
+        out.family("smfc_device_temp_read_errors", "gauge",
+                   "Consecutive failed temperature reads of the device (0=healthy); a non-zero value means the"
+                   " reported temperature is a reused, stale reading.",
+                   [(labels, int(d.get("read_errors", 0)), created) for d, labels, created in devices])
+        out.family("smfc_device_temp_read_errors_total", "counter",
+                   "Failed temperature reads of the device since smfc was started.",
+                   [(labels, int(d.get("read_errors_total", 0)), created) for d, labels, created in devices])
+        out.family("smfc_controller_level_percent", "gauge",
+                   "Fan level requested by the controller, per targeted zone.",
+                   [(labels, int(c.get("last_level_pct", 0)), created) for c, cl, created in controllers
+                    for labels in cl.zones])
+        out.family("smfc_controller_suppressed_writes_total", "counter",
+                   "Fan level changes held back by hysteresis, dwell time or ramp limits.",
+                   [(cl.controller, int(c.get("suppressed_writes", 0)), created)
+                    for c, cl, created in temp_controllers])
+        out.family("smfc_controller_direction_reversals_total", "counter",
+                   "Fan level changes reversing the direction of the previous change within the reversal window"
+                   " (fan hunting).",
+                   [(cl.controller, int(c.get("direction_reversals", 0)), created)
+                    for c, cl, created in temp_controllers])
+        out.family("smfc_controller_sensitivity_skips_total", "counter",
+                   "Polls stopped at the sensitivity gap (no fan level calculation).",
+                   [(cl.controller, int(c.get("sensitivity_skips", 0)), created)
+                    for c, cl, created in temp_controllers])
+
+        zones = snapshot.get("zones", {}) or {}
+        out.family("smfc_zone_level_percent", "gauge", "Fan level applied to the IPMI zone after arbitration.",
+                   [(labels, int(zones[zone].get("applied_level_pct", 0)), start) for zone, labels in layout.zones])
+        out.family("smfc_zone_level_changes_total", "counter", "Changes of the fan level applied to the IPMI zone.",
+                   [(labels, int(zones[zone].get("level_changes", 0)), start) for zone, labels in layout.zones])
+        out.family("smfc_zone_ipmi_writes_total", "counter", "Fan level writes issued to the BMC for the IPMI zone.",
+                   [(labels, int(zones[zone].get("ipmi_writes", 0)), start) for zone, labels in layout.zones])
+
+        standby_series: List[Series] = []
+        for c, cl, created in controllers:
+            sb = c.get("standby_guard") or {}
+            if c.get("type") == "hd" and sb.get("enabled"):
+                standby_series.extend((labels, 1 if state else 0, created)
+                                      for labels, state in zip(cl.standby, sb.get("states", []) or []))
+        if standby_series:
+            out.family("smfc_disk_standby", "gauge", "Disk standby state (1=standby, 0=active).", standby_series)
+
+        # The sensor registry is recreated by a configuration reload, its counters count since its creation.
+        registry = snapshot.get("sensors") or {}
+        sensors = list(zip(registry.get("sensors", []) or [], layout.sensors))
+        if sensors:
+            created = float(registry.get("created_at") or start)
+            out.family("smfc_sensor_reads_total", "counter",
+                       "Physical reads of the sensor issued by the shared registry.",
+                       [(labels, int(s.get("reads", 0)), created) for s, labels in sensors])
+            out.family("smfc_sensor_cache_hits_total", "counter",
+                       "Sensor reads served from the shared sensor registry.",
+                       [(labels, int(s.get("hits", 0)), created) for s, labels in sensors])
+
+        # --- Timing of the fan controllers and the main loop (histograms) ---
+        for key, name, help_text in (
+                ("lateness", "smfc_controller_poll_lateness_seconds", "Delay of the poll behind the polling period."),
+                ("read", "smfc_controller_read_duration_seconds", "Duration of the temperature read of a poll."),
+                ("decide", "smfc_controller_decide_duration_seconds",
+                 "Duration of the fan level calculation of a poll."),
+                ("apply", "smfc_controller_apply_duration_seconds", "Duration of the IPMI write of the controller.")):
+            series = [(cl.controller, c["timing"][key], created) for c, cl, created in controllers
+                      if key in (c.get("timing") or {})]
+            if series:
+                out.histogram(name, help_text, series)
+        loop_timing = (snapshot.get("timing") or {}).get("loop") or {}
+        for key, name, help_text in (
+                ("period", "smfc_loop_period_seconds", "Time between two wakeups of the main loop."),
+                ("sleep", "smfc_loop_sleep_seconds", "Time slept by the main loop until the next deadline."),
+                ("apply", "smfc_loop_apply_duration_seconds",
+                 "Duration of the IPMI writes of the shared IPMI zones.")):
+            if key in loop_timing:
+                out.histogram(name, help_text, [("", loop_timing[key], start)])
+
+        return out.text()
+
+
 def render_prometheus(snapshot: Dict[str, Any]) -> str:
-    """Render a snapshot dict as Prometheus text format.
+    """Render a snapshot dict as Prometheus text format (one-shot rendering with a new PrometheusRegistry; the
+    exporter keeps one registry for all scrapes).
 
-    The output uses the standard `# HELP` / `# TYPE` headers and gauge metrics. Label values are
+    The output uses the standard `# HELP` / `# TYPE` headers, gauge, counter and histogram metrics. Label values are
     properly escaped. A trailing newline is included so the response body is well-formed.
     """
-    lines: List[str] = []
+    return PrometheusRegistry().render(snapshot)
 
-    bmc = snapshot.get("bmc", {})
-    smfc_version = str(snapshot.get("smfc_version", ""))
-
-    # --- Service identity ---
-    lines.append("# HELP smfc_up smfc service is up (1); carries the running version.")
-    lines.append("# TYPE smfc_up gauge")
-    lines.append(f'smfc_up{_format_labels([("version", smfc_version)])} 1')
-
-    lines.append("")
-    lines.append("# HELP smfc_start_time_seconds Unix start time of the smfc service.")
-    lines.append("# TYPE smfc_start_time_seconds gauge")
-    lines.append(f"smfc_start_time_seconds {float(snapshot.get('start_time', 0.0))}")
-
-    bmc_labels = _format_labels([("product_name", bmc.get("product_name", "")),
-                                 ("firmware_version", bmc.get("firmware_rev", "")),
-                                 ("manufacturer_name", bmc.get("manufacturer_name", ""))])
-    lines.append("")
-    lines.append("# HELP smfc_bmc_info BMC identity reported by ipmitool bmc info.")
-    lines.append("# TYPE smfc_bmc_info gauge")
-    lines.append(f"smfc_bmc_info{bmc_labels} 1")
-
-    lines.append("")
-    lines.append("# HELP smfc_fan_mode_enforced_total Times smfc re-asserted FULL after the BMC fan mode drifted.")
-    lines.append("# TYPE smfc_fan_mode_enforced_total counter")
-    lines.append(f"smfc_fan_mode_enforced_total {int(snapshot.get('fan_mode_enforced_count', 0))}")
-
-    controllers = snapshot.get("fan_controllers", []) or []
-
-    # --- Static config ---
-    lines.append("")
-    lines.append("# HELP smfc_controller_zone Enabled fan-controller-to-IPMI-zone mapping (value always 1).")
-    lines.append("# TYPE smfc_controller_zone gauge")
-    for c in controllers:
-        if not c.get("enabled", True):
-            continue
-        section, ctype = c.get("section", ""), c.get("type", "")
-        for zone in c.get("ipmi_zones", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype), ("zone", str(zone))])
-            lines.append(f"smfc_controller_zone{labels} 1")
-
-    lines.append("")
-    lines.append("# HELP smfc_controller_temperature_min_celsius Controller steering-window floor (static config).")
-    lines.append("# TYPE smfc_controller_temperature_min_celsius gauge")
-    lines.append("# HELP smfc_controller_temperature_max_celsius Controller steering-window ceiling (static config).")
-    lines.append("# TYPE smfc_controller_temperature_max_celsius gauge")
-    for c in controllers:
-        if c.get("type") == "const":
-            continue
-        section, ctype = c.get("section", ""), c.get("type", "")
-        for zone in c.get("ipmi_zones", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype), ("zone", str(zone))])
-            lines.append(f"smfc_controller_temperature_min_celsius{labels} {float(c.get('temp_min_c', 0.0))}")
-            lines.append(f"smfc_controller_temperature_max_celsius{labels} {float(c.get('temp_max_c', 0.0))}")
-
-    lines.append("")
-    lines.append("# HELP smfc_controller_level_min_percent Controller fan-level-window floor (static config).")
-    lines.append("# TYPE smfc_controller_level_min_percent gauge")
-    lines.append("# HELP smfc_controller_level_max_percent Controller fan-level-window ceiling (static config).")
-    lines.append("# TYPE smfc_controller_level_max_percent gauge")
-    for c in controllers:
-        section, ctype = c.get("section", ""), c.get("type", "")
-        for zone in c.get("ipmi_zones", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype), ("zone", str(zone))])
-            lines.append(f"smfc_controller_level_min_percent{labels} {int(c.get('level_min_pct', 0))}")
-            lines.append(f"smfc_controller_level_max_percent{labels} {int(c.get('level_max_pct', 0))}")
-
-    # --- Dynamic runtime ---
-    lines.append("")
-    lines.append("# HELP smfc_controller_temperature_celsius Per-controller temperature, per targeted zone;"
-                 " skipped for CONST.")
-    lines.append("# TYPE smfc_controller_temperature_celsius gauge")
-    for c in controllers:
-        if c.get("type") == "const":
-            continue
-        section, ctype = c.get("section", ""), c.get("type", "")
-        temp = float(c.get("last_temp_c", 0.0))
-        for zone in c.get("ipmi_zones", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype), ("zone", str(zone))])
-            lines.append(f"smfc_controller_temperature_celsius{labels} {temp}")
-
-    lines.append("")
-    lines.append("# HELP smfc_device_temperature_celsius Per-device temperature reading.")
-    lines.append("# TYPE smfc_device_temperature_celsius gauge")
-    for c in controllers:
-        if c.get("type") == "const":
-            continue
-        section, ctype = c.get("section", ""), c.get("type", "")
-        for d in c.get("devices", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype),
-                                     ("device", str(d.get("name", "")))])
-            lines.append(f"smfc_device_temperature_celsius{labels} {float(d.get('temp_c', 0.0))}")
-
-    # The value is the *current* consecutive failed-read streak of the device (reset to 0 by the next
-    # successful read), not a lifetime total — hence a gauge, not a counter.
-    lines.append("")
-    lines.append("# HELP smfc_device_temp_read_errors Consecutive failed temperature reads of the device"
-                 " (0=healthy); a non-zero value means the reported temperature is a reused, stale reading.")
-    lines.append("# TYPE smfc_device_temp_read_errors gauge")
-    for c in controllers:
-        if c.get("type") == "const":
-            continue
-        section, ctype = c.get("section", ""), c.get("type", "")
-        for d in c.get("devices", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype),
-                                     ("device", str(d.get("name", "")))])
-            lines.append(f"smfc_device_temp_read_errors{labels} {int(d.get('read_errors', 0))}")
-
-    lines.append("")
-    lines.append("# HELP smfc_device_temp_read_errors_total Failed temperature reads of the device since"
-                 " smfc was started.")
-    lines.append("# TYPE smfc_device_temp_read_errors_total counter")
-    for c in controllers:
-        if c.get("type") == "const":
-            continue
-        section, ctype = c.get("section", ""), c.get("type", "")
-        for d in c.get("devices", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype),
-                                     ("device", str(d.get("name", "")))])
-            lines.append(f"smfc_device_temp_read_errors_total{labels} {int(d.get('read_errors_total', 0))}")
-
-    lines.append("")
-    lines.append("# HELP smfc_controller_level_percent Fan level requested by the controller, per targeted zone.")
-    lines.append("# TYPE smfc_controller_level_percent gauge")
-    for c in controllers:
-        section, ctype = c.get("section", ""), c.get("type", "")
-        level = int(c.get("last_level_pct", 0))
-        for zone in c.get("ipmi_zones", []) or []:
-            labels = _format_labels([("section", section), ("type", ctype), ("zone", str(zone))])
-            lines.append(f"smfc_controller_level_percent{labels} {level}")
-
-    zones = snapshot.get("zones", {}) or {}
-    lines.append("")
-    lines.append("# HELP smfc_zone_level_percent Fan level applied to the IPMI zone after arbitration.")
-    lines.append("# TYPE smfc_zone_level_percent gauge")
-    for zone, info in sorted(zones.items(), key=lambda kv: int(kv[0])):
-        labels = _format_labels([("zone", zone)])
-        lines.append(f"smfc_zone_level_percent{labels} {int(info.get('applied_level_pct', 0))}")
-
-    standby_lines: List[str] = []
-    for c in controllers:
-        if c.get("type") != "hd":
-            continue
-        sb = c.get("standby_guard") or {}
-        if not sb.get("enabled"):
-            continue
-        section = c.get("section", "")
-        names = [d.get("name", "") for d in (c.get("devices", []) or [])]
-        states = sb.get("states", []) or []
-        for name, state in zip(names, states):
-            labels = _format_labels([("section", section), ("device", name)])
-            standby_lines.append(f"smfc_disk_standby{labels} {1 if state else 0}")
-    if standby_lines:
-        lines.append("")
-        lines.append("# HELP smfc_disk_standby Disk standby state (1=standby, 0=active).")
-        lines.append("# TYPE smfc_disk_standby gauge")
-        lines.extend(standby_lines)
-
-    return "\n".join(lines) + "\n"
+
+def render_openmetrics(snapshot: Dict[str, Any]) -> str:
+    """Render a snapshot dict as OpenMetrics 1.0.0 text format (one-shot rendering with a new PrometheusRegistry).
+
+    Counters and histograms carry `_created` samples, counter and info families are named without their sample
+    suffix, and the output ends with the `# EOF` line.
+    """
+    return PrometheusRegistry().render_openmetrics(snapshot)
 
 
 SnapshotFn = Callable[[], Dict[str, Any]]
+GenerationFn = Callable[[], int]
+HistoryFn = Callable[[List[str], float], Dict[str, Any]]
+
+# Media type of the OpenMetrics format of the /metrics endpoint and the content types of the formats.
+OPENMETRICS_TYPE: str = "application/openmetrics-text"
+OPENMETRICS_CONTENT_TYPE: str = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# Content codings of the compressed /snapshot and /metrics responses (in order of preference).
+CONTENT_CODINGS: Tuple[str, ...] = ("gzip", "deflate")
+IDENTITY: str = "identity"
+COMPRESS_LEVEL: int = 6
+
+
+def _parse_quality(header: Optional[str]) -> Dict[str, float]:
+    """Parse the q-values of an Accept or Accept-Encoding request header (RFC 9110). The other parameters (e.g.
+    the version of a media type) are ignored; a value listed more than once gets its highest q-value.
+    Args:
+        header (Optional[str]): value of the header (None = header not present)
+    Returns:
+        Dict[str, float]: q-value per lowercase media type or content coding
+    """
+    weights: Dict[str, float] = {}
+    for item in (header or "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = max(q, weights.get(name, 0.0))
+    return weights
+
+
+def _negotiate_coding(accept_encoding: Optional[str]) -> str:
+    """Select the content coding of a response from the Accept-Encoding request header (RFC 9110): the coding of
+    CONTENT_CODINGS with the highest non-zero q-value (the first one on a tie), identity if none of them is
+    accepted.
+    Args:
+        accept_encoding (Optional[str]): value of the Accept-Encoding header (None = header not present)
+    Returns:
+        str: selected content coding (IDENTITY = no compression)
+    """
+    weights = _parse_quality(accept_encoding)
+    best, best_q = IDENTITY, 0.0
+    for coding in CONTENT_CODINGS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    # An explicitly preferred identity coding wins (on a tie the compression is preferred).
+    if weights.get(IDENTITY, 0.0) > best_q:
+        return IDENTITY
+    return best
+
+
+def _negotiate_openmetrics(accept: Optional[str]) -> bool:
+    """Select the format of the /metrics response from the Accept request header: OpenMetrics if the client
+    explicitly prefers `application/openmetrics-text` to `text/plain` (as Prometheus does), the text format 0.0.4
+    otherwise (also on a tie and for wildcards).
+    Args:
+        accept (Optional[str]): value of the Accept header (None = header not present)
+    Returns:
+        bool: True if the response is sent in OpenMetrics format
+    """
+    weights = _parse_quality(accept)
+    q = weights.get(OPENMETRICS_TYPE, 0.0)
+    return q > 0.0 and q > weights.get("text/plain", weights.get("text/*", weights.get("*/*", 0.0)))
+
+
+def _compress(body: bytes, coding: str) -> bytes:
+    """Compress a response body.
+    Args:
+        body (bytes): uncompressed body
+        coding (str): content coding (one of CONTENT_CODINGS)
+    Returns:
+        bytes: compressed body
+    """
+    if coding == "gzip":
+        # mtime=0: the same body is always compressed to the same bytes.
+        return gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+    # The "deflate" content coding is the zlib format (RFC 9110).
+    return zlib.compress(body, COMPRESS_LEVEL)
+
+
+class _ResponseCache:  # pylint: disable=too-few-public-methods
+    """Encoded response bodies per response and content coding, valid for one generation of the published snapshot.
+
+    The snapshot served by the exporter changes only when the main loop publishes a new generation, so the
+    JSON, Prometheus or OpenMetrics encoding of a generation is rendered once, compressed once per content coding,
+    and the bytes are reused by every request of the same generation. The render and the compression run under
+    the lock of the response: concurrent scrapers of a new generation wait for the first one and share its work.
+    The responses are identified by the path of the endpoint (SNAPSHOT_PATH, METRICS_PATH) or by OPENMETRICS_TYPE
+    (the OpenMetrics format of METRICS_PATH).
+    """
+
+    _locks: Dict[str, threading.Lock]                   # Lock per response (serializes the renders of the response)
+    _entries: Dict[str, Tuple[int, Dict[str, bytes]]]   # (generation, body per content coding) per response
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._locks = {key: threading.Lock() for key in (SNAPSHOT_PATH, METRICS_PATH, OPENMETRICS_TYPE)}
+        self._entries = {}
+
+    def get(self, endpoint: str, generation: int, render: Callable[[], bytes], coding: str = IDENTITY) -> bytes:
+        """Return the body of the response for the generation in the content coding, render or compress it if it
+        is not cached yet. A failed render is not cached.
+        Args:
+            endpoint (str): response (SNAPSHOT_PATH, METRICS_PATH or OPENMETRICS_TYPE)
+            generation (int): generation of the published snapshot
+            render (Callable[[], bytes]): function rendering the uncompressed body
+            coding (str): content coding (IDENTITY or one of CONTENT_CODINGS)
+        Returns:
+            bytes: body of the response
+        """
+        with self._locks[endpoint]:
+            entry = self._entries.get(endpoint)
+            if entry is None or entry[0] != generation:
+                entry = (generation, {IDENTITY: render()})
+                self._entries[endpoint] = entry
+            bodies = entry[1]
+            body = bodies.get(coding)
+            if body is None:
+                body = _compress(bodies[IDENTITY], coding)
+                bodies[coding] = body
+            return body
 
 
 class _ExporterHandler(http.server.BaseHTTPRequestHandler):
-    """HTTP request handler routing /snapshot, /metrics, /healthz; everything else is 404."""
+    """HTTP request handler routing /snapshot, /metrics, /healthz, /history; everything else is 404."""
 
     # Set by _ExporterServer at bind time.
     snapshot_fn: SnapshotFn
+    generation_fn: Optional[GenerationFn]
+    history_fn: Optional[HistoryFn]
+    cache: _ResponseCache
+    registry: PrometheusRegistry
     log: Optional[Log]
 
     server_version = "smfc-exporter/1.0"
@@ -220,32 +585,91 @@ class _ExporterHandler(http.server.BaseHTTPRequestHandler):
         if self.log is not None and self.log.log_level >= Log.LOG_DEBUG:
             self.log.msg(Log.LOG_DEBUG, "exporter: " + (format % args))
 
-    def _send(self, status: int, content_type: str, body: bytes) -> None:
-        """Send an HTTP response with the given status code, content type, and body."""
+    def _send(self, status: int, content_type: str, body: bytes,
+              compress: Optional[Callable[[str], bytes]] = None, vary: str = "Accept-Encoding") -> None:
+        """Send an HTTP response with the given status code, content type, and body. A compressible response
+        (compress is given) is sent in the content coding negotiated from the Accept-Encoding request header;
+        compress(coding) returns the body in that coding, vary is the value of its Vary header."""
+        coding = IDENTITY
+        if compress is not None:
+            coding = _negotiate_coding(self.headers.get("Accept-Encoding"))
+            if coding != IDENTITY:
+                body = compress(coding)
         self.send_response(status)
         self.send_header("Content-Type", content_type)
+        if compress is not None:
+            self.send_header("Vary", vary)
+        if coding != IDENTITY:
+            self.send_header("Content-Encoding", coding)
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    def _body(self, endpoint: str, encode: Callable[[Dict[str, Any]], str]) -> Tuple[bytes, Callable[[str], bytes]]:
+        """Return the encoded snapshot for the response and its compress function. With a generation function the
+        body and its compressed forms are taken from the response cache, otherwise they are produced for every
+        request.
+        Args:
+            endpoint (str): response (SNAPSHOT_PATH, METRICS_PATH or OPENMETRICS_TYPE)
+            encode (Callable[[Dict[str, Any]], str]): function encoding the snapshot dict
+        Returns:
+            Tuple[bytes, Callable[[str], bytes]]: UTF-8 encoded body, function returning it in a content coding
+        """
+        if self.generation_fn is None:
+            body = encode(self.snapshot_fn()).encode("utf-8")
+            return body, lambda coding: _compress(body, coding)
+        # The generation is read before the snapshot: a snapshot published in between is newer than the
+        # generation, so it is rendered again at the next request instead of being served as a stale body.
+        generation = self.generation_fn()
+        body = self.cache.get(endpoint, generation, lambda: encode(self.snapshot_fn()).encode("utf-8"))
+        return body, lambda coding: self.cache.get(endpoint, generation, lambda: body, coding)
+
+    def _history(self, query: str) -> None:
+        """Send the history of the series selected by the query string: series= (repeatable, all series when
+        absent) and since= (Unix time, a negative value is relative to the current time, 0 when absent).
+        Args:
+            query (str): query string of the request
+        """
+        params = urllib.parse.parse_qs(query)
+        try:
+            since = float(params.get("since", ["0"])[-1])
+            if not math.isfinite(since):
+                raise ValueError(since)
+        except ValueError:
+            self._send(400, "text/plain; charset=utf-8", b"invalid since= parameter\n")
+            return
+        try:
+            history = self.history_fn(params.get("series", []), since)
+        except KeyError as e:
+            self._send(404, "text/plain; charset=utf-8", f"unknown series: {e.args[0]}\n".encode("utf-8"))
+            return
+        body = json.dumps(history).encode("utf-8")
+        self._send(200, "application/json; charset=utf-8", body, lambda coding: _compress(body, coding))
+
     def do_GET(self) -> None:  # pylint: disable=invalid-name
-        """Route GET requests to /snapshot, /metrics, /healthz; everything else returns 404."""
-        path = self.path.split("?", 1)[0]
+        """Route GET requests to /snapshot, /metrics, /healthz, /history (if the history is enabled); everything
+        else returns 404."""
+        path, _, query = self.path.partition("?")
         try:
             if path == SNAPSHOT_PATH:
-                snap = self.snapshot_fn()
-                body = json.dumps(snap).encode("utf-8")
-                self._send(200, "application/json; charset=utf-8", body)
+                body, compress = self._body(SNAPSHOT_PATH, json.dumps)
+                self._send(200, "application/json; charset=utf-8", body, compress)
                 return
             if path == METRICS_PATH:
-                snap = self.snapshot_fn()
-                body = render_prometheus(snap).encode("utf-8")
-                # Prometheus exposition format content-type per the spec.
-                self._send(200, "text/plain; version=0.0.4; charset=utf-8", body)
+                # The text format 0.0.4 is the default, OpenMetrics is sent if the client prefers it.
+                if _negotiate_openmetrics(self.headers.get("Accept")):
+                    body, compress = self._body(OPENMETRICS_TYPE, self.registry.render_openmetrics)
+                    self._send(200, OPENMETRICS_CONTENT_TYPE, body, compress, "Accept, Accept-Encoding")
+                else:
+                    body, compress = self._body(METRICS_PATH, self.registry.render)
+                    self._send(200, PROMETHEUS_CONTENT_TYPE, body, compress, "Accept, Accept-Encoding")
                 return
             if path == HEALTHZ_PATH:
                 self._send(200, "text/plain; charset=utf-8", b"ok\n")
                 return
+            if path == HISTORY_PATH and self.history_fn is not None:
+                self._history(query)
+                return
             self._send(404, "text/plain; charset=utf-8", b"not found\n")
         except Exception as e:  # pylint: disable=broad-except
             # Never let a handler exception crash the daemon thread; log + 500.
@@ -274,7 +698,8 @@ class Exporter:
       - bound_address(): returns (host, port) actually bound (useful when port=0).
     """
 
-    def __init__(self, log: Optional[Log], bind_address: str, port: int, snapshot_fn: SnapshotFn) -> None:
+    def __init__(self, log: Optional[Log], bind_address: str, port: int, snapshot_fn: SnapshotFn,
+                 generation_fn: Optional[GenerationFn] = None, history_fn: Optional[HistoryFn] = None) -> None:
         """Create an exporter instance. The HTTP server is not yet started; call start() to bind.
 
         Args:
@@ -282,11 +707,17 @@ class Exporter:
             bind_address: IP to bind to (e.g. "127.0.0.1", "0.0.0.0", LAN IP).
             port: TCP port (1..65535, or 0 for ephemeral — useful in tests).
             snapshot_fn: callable returning the live snapshot dict for /snapshot and /metrics.
+            generation_fn: callable returning the generation of the snapshot; the encoded /snapshot and /metrics
+                bodies are cached per generation (None = no caching, every request is rendered).
+            history_fn: callable returning the history of the series (names, since) for /history (None = no
+                history, /history is 404).
         """
         self._log = log
         self._bind_address = bind_address
         self._port = port
         self._snapshot_fn = snapshot_fn
+        self._generation_fn = generation_fn
+        self._history_fn = history_fn
         self._server: Optional[_ExporterServer] = None
         self._thread: Optional[threading.Thread] = None
 
@@ -300,9 +731,15 @@ class Exporter:
         # Each per-request handler instance reads them from the class.
         log_ref = self._log
         snapshot_fn_ref = self._snapshot_fn
+        generation_fn_ref = self._generation_fn
+        history_fn_ref = self._history_fn
 
         class _BoundHandler(_ExporterHandler):
             snapshot_fn = staticmethod(snapshot_fn_ref)
+            generation_fn = staticmethod(generation_fn_ref) if generation_fn_ref is not None else None
+            history_fn = staticmethod(history_fn_ref) if history_fn_ref is not None else None
+            cache = _ResponseCache()
+            registry = PrometheusRegistry()
             log = log_ref
 
         self._server = _ExporterServer((self._bind_address, self._port), _BoundHandler)
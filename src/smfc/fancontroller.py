@@ -3,14 +3,24 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.FanController() class implementation.
 #
+import asyncio
+import bisect
 import os
-import time
+import subprocess
+from array import array
 from collections import deque
-from typing import List, Protocol, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 from pyudev import Context, Device
+from smfc import clock
 from smfc.ipmi import Ipmi
 from smfc.log import Log
 from smfc.config import Config
+from smfc.filters import TemperatureFilter, create_filter
+from smfc.hwmon import HwmonIndex
+from smfc.pid import PidController
+from smfc.sensorproc import SensorHangError, SensorProcess
+from smfc.sensors import SensorRegistry
+from smfc.timing import ControllerTiming
 
 
 class FanControllerConfig(Protocol):  # pylint: disable=too-few-public-methods
@@ -25,7 +35,24 @@ class FanControllerConfig(Protocol):  # pylint: disable=too-few-public-methods
     min_level: int                          # Minimum fan level (0..100%)
     max_level: int                          # Maximum fan level (0..100%)
     smoothing: int                          # Moving average window size (1=disabled)
+    temp_filter: str                        # Temperature filter ('sma', 'ewma', 'median' or 'kalman')
+    ewma_alpha: float                       # Weight of the new sample in the EWMA filter (0..1]
+    kalman_process_noise: float             # Variance of the temperature change per sample (C^2)
+    kalman_measurement_noise: float         # Variance of the sensor noise (C^2)
     error_tolerance: int                    # Consecutive failed temperature reads tolerated per device (0=disabled)
+    lut_resolution: float                   # Temperature resolution of the temperature->level LUT (C)
+    hysteresis: float                       # Temperature drop below a plateau required to lower the fan level (C)
+    min_dwell: float                        # Minimum time a fan level is held before it can be lowered (sec)
+    ramp_up: float                          # Maximum rate of fan level increase (%/sec, 0=unlimited)
+    ramp_down: float                        # Maximum rate of fan level decrease (%/sec, 0=unlimited)
+    control_mode: str                       # Control mode ('lut' or 'pid')
+    pid_target: float                       # Target temperature of the PID controller (C)
+    pid_kp: float                           # Proportional gain of the PID controller (%/C)
+    pid_ki: float                           # Integral gain of the PID controller (%/(C*sec))
+    pid_kd: float                           # Derivative gain of the PID controller (%*sec/C)
+    pid_d_filter: float                     # Time constant of the derivative filter (sec, 0=disabled)
+    feedforward_rate: float                 # Temperature slope activating the feed-forward term (C/sec, 0=disabled)
+    feedforward_horizon: float              # Look-ahead time of the feed-forward term (sec)
     control_function: List[Tuple[int, int]] # User-defined (T,L) breakpoints; empty = legacy mode
 
 
@@ -41,20 +68,42 @@ class FanController:
     name: str               # Name of the controller
     count: int              # Number of controlled entities
     hwmon_path: List[str]   # List of paths for HWMON devices
+    hwmon_index: Optional[HwmonIndex] = None  # Shared hwmon index (None = one udev query per device)
 
     # Measured or calculated attributes
     temp_step: float        # A temperature steps value (C) — legacy mode only, used for logging
     level_step: float       # A fan level step value (0..100%) — legacy mode only, used for logging
-    levels_lut: List[int]   # 101-element temperature->level lookup table (index = T in C)
+    levels_lut: array       # Temperature->level lookup table (index = T / lut_resolution, see build_lut())
+    pid: Optional[PidController] = None  # PID controller in PID control mode (None = LUT control mode)
     last_time: float                    # Last system time we polled temperature (timestamp)
     last_temp: float                    # Last measured (aggregated) temperature value (C)
+    raw_temp: float                     # Last aggregated temperature before the filter (C)
+    filtered_temp: float                # Last output of the temperature filter (C)
     last_per_device_temps: List[float]  # Last per-device temperature readings, one entry per device
     last_level: int                     # Last configured fan level (0..100%)
     deferred_apply: bool                # If True, skip IPMI calls (used for zone arbitration)
-    _temp_history: deque                # Circular buffer storing recent temperature readings
+    suppressed_writes: int              # Level changes held back by hysteresis, min_dwell or ramp limits
+    direction_reversals: int            # Level changes reversing the previous change within REVERSAL_WINDOW
+    sensitivity_skips: int              # Polls stopped at the sensitivity gap (no level calculation)
+    temp_slope: float                   # Last calculated temperature slope (C/sec, feed-forward only)
+    timing: ControllerTiming            # Poll lateness and read/decide/apply durations of the controller
+    created_at: float                   # Unix time of the creation (the counters and the timing start here)
+    _level_changed_at: float            # monotonic() timestamp of the last fan level change
+    _level_pending: bool                # A held back level change has to be re-evaluated at the next poll
+    _level_direction: int               # Direction of the last level change (1=up, -1=down, 0=none yet)
+    sensors: Optional[SensorRegistry] = None  # Shared sensor registry (None = every read is a physical read)
+    sensor_process: Optional[SensorProcess] = None  # Supervised sensor process (None = reads in this process)
+    temp_filter: TemperatureFilter      # Temperature filter (moving average, EWMA, median or Kalman)
+    _slope_samples: deque               # Recent (timestamp, raw temperature) pairs for the feed-forward slope
     _temp_read_errors: List[int]        # Consecutive failed temperature reads, one counter per device
     _temp_read_errors_total: List[int]  # Failed temperature reads since startup, one counter per device
 
+    # Exceptions of a per-device read handled by the error_tolerance budget
+    READ_ERRORS: Tuple[type, ...] = (OSError, ValueError, IndexError, RuntimeError)
+
+    # A level change in the opposite direction of the previous one within this time is a direction reversal (sec)
+    REVERSAL_WINDOW: float = 300.0
+
     def __init__(self, log: Log, ipmi: Ipmi, name: str, count: int) -> None:
         """Initialize the FanController class. Derived classes must set self.config before calling this.
         Args:
@@ -91,11 +140,28 @@ class FanController:
         self.temp_step = (self.config.max_temp - self.config.min_temp) / self.config.steps
         self.level_step = (self.config.max_level - self.config.min_level) / self.config.steps
         self.levels_lut = FanController.build_lut(self.config)
+        if self.config.control_mode == Config.CONTROL_PID:
+            self.pid = PidController(self.config.pid_target, self.config.pid_kp, self.config.pid_ki,
+                                     self.config.pid_kd, self.config.pid_d_filter,
+                                     self.config.min_level, self.config.max_level)
         self.last_temp = 0
         self.last_level = 0
-        self.last_time = time.monotonic() - (self.config.polling + 1)
+        self.last_time = clock.monotonic() - (self.config.polling + 1)
         self.deferred_apply = False
-        self._temp_history = deque(maxlen=self.config.smoothing)
+        self.suppressed_writes = 0
+        self.direction_reversals = 0
+        self.sensitivity_skips = 0
+        self.timing = ControllerTiming()
+        self.created_at = clock.time()
+        self._level_changed_at = 0.0
+        self._level_pending = False
+        self._level_direction = 0
+        self.temp_filter = create_filter(self.config)
+        self.raw_temp = 0.0
+        self.filtered_temp = 0.0
+        # The slope is measured over the smoothing window, but at least between the last two readings.
+        self.temp_slope = 0.0
+        self._slope_samples = deque(maxlen=max(2, self.config.smoothing))
 
         # Print configuration at CONFIG log level.
         if self.log.log_level >= Log.LOG_CONFIG:
@@ -106,35 +172,62 @@ class FanController:
             self.log.msg(Log.LOG_CONFIG, f"   temp_calc = {self.config.temp_calc} ({temp_calc_str})")
             self.log.msg(Log.LOG_CONFIG, f"   sensitivity = {self.config.sensitivity}")
             self.log.msg(Log.LOG_CONFIG, f"   polling = {self.config.polling}")
+            if self.config.polling_offset:
+                self.log.msg(Log.LOG_CONFIG, f"   polling_offset = {self.config.polling_offset}")
             # steps is logged just above the curve definition (min/max keys or control_function) because
             # it controls the digitalization of that curve.
             self.log.msg(Log.LOG_CONFIG, f"   steps = {self.config.steps}")
             # The curve is defined either by control_function (which overrides and hides the legacy
-            # min/max keys) or by the legacy min/max keys; log only the one in effect.
-            if self.config.control_function:
+            # min/max keys) or by the legacy min/max keys; log only the one in effect. In PID control mode
+            # only the level range of the output is used.
+            if self.pid is not None:
+                self.log.msg(Log.LOG_CONFIG, f"   control_mode = {self.config.control_mode}")
+                self.log.msg(Log.LOG_CONFIG, f"   pid_target = {self.config.pid_target}")
+                self.log.msg(Log.LOG_CONFIG, f"   pid_kp = {self.config.pid_kp}, pid_ki = {self.config.pid_ki}, "
+                                             f"pid_kd = {self.config.pid_kd}")
+                self.log.msg(Log.LOG_CONFIG, f"   pid_d_filter = {self.config.pid_d_filter}")
+                self.log.msg(Log.LOG_CONFIG, f"   min_level = {self.config.min_level}")
+                self.log.msg(Log.LOG_CONFIG, f"   max_level = {self.config.max_level}")
+            elif self.config.control_function:
                 self.log.msg(Log.LOG_CONFIG, f"   control_function = {self.config.control_function}")
             else:
                 self.log.msg(Log.LOG_CONFIG, f"   min_temp = {self.config.min_temp}")
                 self.log.msg(Log.LOG_CONFIG, f"   max_temp = {self.config.max_temp}")
                 self.log.msg(Log.LOG_CONFIG, f"   min_level = {self.config.min_level}")
                 self.log.msg(Log.LOG_CONFIG, f"   max_level = {self.config.max_level}")
-            self.print_temp_level_mapping()
+            if self.pid is None:
+                self.print_temp_level_mapping()
             self.log.msg(Log.LOG_CONFIG, f"   smoothing = {self.config.smoothing}")
+            if self.config.temp_filter != Config.FILTER_SMA:
+                self.log.msg(Log.LOG_CONFIG, f"   temp_filter = {self.config.temp_filter}")
+            if self.config.temp_filter == Config.FILTER_EWMA:
+                self.log.msg(Log.LOG_CONFIG, f"   ewma_alpha = {self.config.ewma_alpha}")
+            elif self.config.temp_filter == Config.FILTER_KALMAN:
+                self.log.msg(Log.LOG_CONFIG, f"   kalman_process_noise = {self.config.kalman_process_noise}, "
+                                             f"kalman_measurement_noise = {self.config.kalman_measurement_noise}")
+            for key in ("hysteresis", "min_dwell", "ramp_up", "ramp_down", "feedforward_rate"):
+                if getattr(self.config, key):
+                    self.log.msg(Log.LOG_CONFIG, f"   {key} = {getattr(self.config, key)}")
+            if self.config.feedforward_rate:
+                self.log.msg(Log.LOG_CONFIG, f"   feedforward_horizon = {self.config.feedforward_horizon}")
             self.log.msg(Log.LOG_CONFIG, f"   error_tolerance = {self.config.error_tolerance}")
             if hasattr(self, "hwmon_path"):
                 self.log.msg(Log.LOG_CONFIG, f"   hwmon_path = {[p if p else 'smartctl' for p in self.hwmon_path]}")
 
     @staticmethod
-    def get_hwmon_path(udevc: Context, parent_dev: Device) -> str:
+    def get_hwmon_path(udevc: Context, parent_dev: Device, hwmon_index: Optional[HwmonIndex] = None) -> str:
         """Get the HWMON path of a given parent device.
 
         Args:
             udevc (Context): pyudev Context
             parent_dev (Device): parent device
+            hwmon_index (Optional[HwmonIndex]): shared hwmon index; if specified, it is used instead of a udev query
 
         Returns:
             str: path for a HWMON device (empty string if not found)
         """
+        if hwmon_index is not None:
+            return hwmon_index.get_hwmon_path(parent_dev)
         try:
             [hwmon_device] = udevc.list_devices(subsystem="hwmon", parent=parent_dev)
         except ValueError:
@@ -142,6 +235,143 @@ class FanController:
             hwmon_device = None
         return (os.path.join(hwmon_device.sys_path, "temp1_input") if hwmon_device is not None else "")
 
+    @staticmethod
+    def run_command(args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Execute an external command used for reading temperatures (e.g. `smartctl`, `nvidia-smi`) with a
+        deadline. The command is killed when the deadline expires.
+
+        Args:
+            args (List[str]): command and its arguments
+            timeout (float): deadline of the command (sec, 0 = no deadline)
+
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+
+        Raises:
+            FileNotFoundError: command not found
+            TimeoutError: the command did not finish before the deadline
+        """
+        try:
+            return subprocess.run(args, check=False, capture_output=True, text=True, timeout=timeout or None)
+        except subprocess.TimeoutExpired as e:
+            raise TimeoutError(f"ERROR: command timed out after {timeout}s: {' '.join(args)}") from e
+
+    @staticmethod
+    async def run_command_async(args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Coroutine version of run_command(): the command is executed as a non-blocking subprocess, and it is
+        killed when the deadline expires.
+
+        Args:
+            args (List[str]): command and its arguments
+            timeout (float): deadline of the command (sec, 0 = no deadline)
+
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+
+        Raises:
+            FileNotFoundError: command not found
+            TimeoutError: the command did not finish before the deadline
+        """
+        # May raise FileNotFoundError if the command is not found.
+        proc = await asyncio.create_subprocess_exec(args[0], *args[1:], stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout or None)
+        except asyncio.TimeoutError as e:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+            raise TimeoutError(f"ERROR: command timed out after {timeout}s: {' '.join(args)}") from e
+        return subprocess.CompletedProcess(args, proc.returncode, stdout.decode(errors="replace"),
+                                           stderr.decode(errors="replace"))
+
+    def exec_command(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Execute an external command used for reading temperatures, in the supervised sensor process when it is
+        attached, otherwise with run_command().
+
+        Args:
+            args (List[str]): command and its arguments
+            timeout (float): deadline of the command (sec, 0 = no deadline)
+
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+
+        Raises:
+            FileNotFoundError: command not found
+            TimeoutError: the command did not finish before the deadline
+            SensorHangError: the sensor process did not answer in time (it is replaced)
+        """
+        if self.sensor_process is not None:
+            return self.sensor_process.run_command(args, timeout, self.name)
+        return self.run_command(args, timeout)
+
+    async def exec_command_async(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Coroutine version of exec_command(). The request to the sensor process is awaited in the default
+        executor, otherwise the command runs as a non-blocking subprocess (run_command_async()).
+
+        Args:
+            args (List[str]): command and its arguments
+            timeout (float): deadline of the command (sec, 0 = no deadline)
+
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+
+        Raises:
+            FileNotFoundError: command not found
+            TimeoutError: the command did not finish before the deadline
+            SensorHangError: the sensor process did not answer in time (it is replaced)
+        """
+        if self.sensor_process is not None:
+            return await asyncio.get_running_loop().run_in_executor(None, self.sensor_process.run_command,
+                                                                    args, timeout, self.name)
+        return await self.run_command_async(args, timeout)
+
+    def resolve_hwmon_paths(self, udevc: Context) -> List[str]:  # pylint: disable=unused-argument
+        """Resolve the hwmon paths of the devices from the udev database again. Must not raise an exception for
+        a device that cannot be found, it should return an empty string for it. Overridden by the child classes
+        reading hwmon devices; the default implementation (no hwmon device) returns the current list.
+
+        Args:
+            udevc (Context): pyudev Context
+
+        Returns:
+            List[str]: list of hwmon paths (one entry per device, empty string if not found)
+        """
+        return list(self.hwmon_path)
+
+    def refresh_hwmon_paths(self, udevc: Context) -> bool:
+        """Re-resolve the hwmon paths after a hotplug event (e.g. drive swap, HBA reset or kernel module reload
+        changed the `hwmonN` index) and update them in place. A device that cannot be resolved keeps its previous
+        path (its reads fail and the error_tolerance budget applies), and a changed device count is ignored.
+
+        Args:
+            udevc (Context): pyudev Context
+
+        Returns:
+            bool: True if any of the hwmon paths has changed
+        """
+        new_paths = self.resolve_hwmon_paths(udevc)
+        if len(new_paths) != self.count:
+            self.log.msg(Log.LOG_ERROR, f"{self.name}: {len(new_paths)} hwmon device(s) found after a hotplug "
+                                        f"event instead of {self.count}, hwmon paths are not changed.")
+            return False
+        paths = [new if new else old for new, old in zip(new_paths, self.hwmon_path)]
+        if paths == self.hwmon_path:
+            return False
+        if self.log.log_level >= Log.LOG_INFO:
+            for i, (old, new) in enumerate(zip(self.hwmon_path, paths)):
+                if old != new:
+                    self.log.msg(Log.LOG_INFO, f"{self.name}: hwmon path of device {i} changed: "
+                                               f"{old if old else 'smartctl'} -> {new}")
+        # Swap the whole list, so a concurrent reader sees either the old or the new list.
+        self.hwmon_path = paths
+        if self.sensors is not None:
+            for i in range(self.count):
+                self.sensors.subscribe(self.sensor_key(i), self.name)
+        return True
+
     def _get_nth_temp(self, index: int) -> float:
         """Get the temperature of the nth element in the hwmon list. Can be overridden by child classes.
 
@@ -151,9 +381,74 @@ class FanController:
         Returns:
             float: temperature value (C)
         """
+        if self.sensor_process is not None:
+            return float(self.sensor_process.read_file(self.hwmon_path[index], self.name)) / 1000
         with open(self.hwmon_path[index], "r", encoding="UTF-8") as f:
             return float(f.read()) / 1000
 
+    def sensor_key(self, index: int) -> str:
+        """Return the key of the physical sensor behind the nth device, used by the shared sensor registry.
+        Can be overridden by child classes reading sensors other than hwmon files.
+
+        Args:
+            index (int): index in hwmon list
+
+        Returns:
+            str: physical sensor key (e.g. 'hwmon:/sys/class/hwmon/hwmon3/temp1_input')
+        """
+        return f"hwmon:{self.hwmon_path[index]}"
+
+    def attach_sensors(self, sensors: SensorRegistry) -> None:
+        """Subscribe the controller to the shared sensor registry: from now on every per-device read is served
+        by the registry, so a physical sensor shared with other controllers is read only once per freshness window.
+
+        Args:
+            sensors (SensorRegistry): the shared sensor registry
+        """
+        self.sensors = sensors
+        for i in range(self.count):
+            sensors.subscribe(self.sensor_key(i), self.name)
+
+    def _read_nth_temp(self, index: int) -> float:
+        """Read the temperature of the nth device, through the shared sensor registry when attached.
+
+        Args:
+            index (int): index in hwmon list
+
+        Returns:
+            float: temperature value (C)
+        """
+        if self.sensors is None:
+            return self._get_nth_temp(index)
+        return self.sensors.read(self.sensor_key(index), self.name, lambda: self._get_nth_temp(index))
+
+    async def _get_nth_temp_async(self, index: int) -> float:
+        """Coroutine version of _get_nth_temp(). The default implementation runs _get_nth_temp() in the default
+        executor of the event loop, so a slow sysfs read does not block the other reads. Child classes reading
+        temperatures with external commands override it with a non-blocking subprocess.
+
+        Args:
+            index (int): index in hwmon list
+
+        Returns:
+            float: temperature value (C)
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._get_nth_temp, index)
+
+    async def _read_nth_temp_async(self, index: int) -> float:
+        """Coroutine version of _read_nth_temp().
+
+        Args:
+            index (int): index in hwmon list
+
+        Returns:
+            float: temperature value (C)
+        """
+        if self.sensors is None:
+            return await self._get_nth_temp_async(index)
+        return await self.sensors.read_async(self.sensor_key(index), self.name,
+                                             lambda: self._get_nth_temp_async(index))
+
     def _reuse_last_temp(self, index: int, error: Exception) -> float:
         """Handle a failed per-device temperature read: reuse the device's last known good value while the
         error_tolerance budget of the device allows it, otherwise re-raise. Both the consecutive streak
@@ -201,22 +496,86 @@ class FanController:
             float: aggregated temperature value (C)
 
         Raises:
+            SensorHangError: the sensor process did not answer in time (not covered by error_tolerance)
             Exception: the exception of the failed read, when a device has no cached value (i.e. at
                        startup) or its error_tolerance budget is exhausted
         """
         temps: List[float] = []
         for i in range(self.count):
             try:
-                temp = self._get_nth_temp(i)
-            except (OSError, ValueError, IndexError, RuntimeError) as e:
+                temp = self._read_nth_temp(i)
+            except SensorHangError:
+                raise
+            except self.READ_ERRORS as e:
                 temp = self._reuse_last_temp(i, e)
             else:
-                if self._temp_read_errors[i]:
-                    self.log.msg(Log.LOG_INFO, f"{self.name}: temperature read recovered after "
-                                 f"{self._temp_read_errors[i]} failure(s) (device={self.device_names()[i]}, "
-                                 f"total={self._temp_read_errors_total[i]})")
-                    self._temp_read_errors[i] = 0
+                self._read_succeeded(i)
+            temps.append(temp)
+        return self._aggregate_temps(temps)
+
+    async def get_temp_async(self) -> float:
+        """Coroutine version of get_temp(): the per-device reads are issued concurrently, so the wall time of
+        the call is the slowest read instead of the sum of all reads. With a sensor process the reads of the
+        controller share one channel, which serves one request at a time, so they are awaited one after the other
+        (a read never waits behind the other reads of the controller, its deadline covers its own read only).
+        Error tolerance and aggregation are the same as in get_temp().
+
+        Returns:
+            float: aggregated temperature value (C)
+
+        Raises:
+            SensorHangError: the sensor process did not answer in time (not covered by error_tolerance)
+            Exception: the exception of the failed read, when a device has no cached value (i.e. at
+                       startup) or its error_tolerance budget is exhausted
+        """
+        if self.sensor_process is not None:
+            results: List[Any] = []
+            for i in range(self.count):
+                try:
+                    results.append(await self._read_nth_temp_async(i))
+                except SensorHangError as e:
+                    results.append(e)
+                    break
+                except Exception as e:  # pylint: disable=broad-except
+                    results.append(e)
+        else:
+            results = await asyncio.gather(*(self._read_nth_temp_async(i) for i in range(self.count)),
+                                           return_exceptions=True)
+        temps: List[float] = []
+        for i, result in enumerate(results):
+            if isinstance(result, SensorHangError):
+                raise result
+            if isinstance(result, self.READ_ERRORS):
+                temp = self._reuse_last_temp(i, result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                self._read_succeeded(i)
+                temp = result
             temps.append(temp)
+        return self._aggregate_temps(temps)
+
+    def _read_succeeded(self, index: int) -> None:
+        """Reset the error streak of a device after a successful read (and log the recovery).
+
+        Args:
+            index (int): device index in the controller's device list
+        """
+        if self._temp_read_errors[index]:
+            self.log.msg(Log.LOG_INFO, f"{self.name}: temperature read recovered after "
+                         f"{self._temp_read_errors[index]} failure(s) (device={self.device_names()[index]}, "
+                         f"total={self._temp_read_errors_total[index]})")
+            self._temp_read_errors[index] = 0
+
+    def _aggregate_temps(self, temps: List[float]) -> float:
+        """Store the per-device temperatures and aggregate them with the configured calculation method.
+
+        Args:
+            temps (List[float]): per-device temperatures (C)
+
+        Returns:
+            float: aggregated temperature value (C)
+        """
         self.last_per_device_temps = temps
         if self.count == 1:
             return temps[0]
@@ -247,17 +606,74 @@ class FanController:
             level (int): new fan level [0..100]
         """
         if not self.deferred_apply:
+            start = clock.monotonic()
             self.ipmi.set_multiple_fan_levels(self.config.ipmi_zone, level)
+            self.timing.applied(start)
 
     def callback_func(self) -> None:
         """Call-back function for a child class."""
 
+    def save_state(self) -> Dict[str, Any]:
+        """Return the runtime state of the controller for a warm start checkpoint: the last fan level and
+        temperatures, the state of the temperature filter, the read error counters and the integral term of the
+        PID controller.
+
+        Returns:
+            Dict[str, Any]: JSON serializable state
+        """
+        state: Dict[str, Any] = {
+            "last_level": self.last_level,
+            "last_temp": self.last_temp,
+            "raw_temp": self.raw_temp,
+            "filtered_temp": self.filtered_temp,
+            "filter": self.temp_filter.state(),
+            "read_errors": list(self._temp_read_errors),
+            "read_errors_total": list(self._temp_read_errors_total),
+        }
+        if self.pid is not None:
+            state["pid_integral"] = self.pid.integral
+        return state
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore the runtime state saved by save_state() at a warm start. The last fan level and temperature are
+        restored only if they are present (the caller leaves them out when the BMC may not hold the saved level
+        any more, so the first poll applies the level), the read error counters only if the number of devices
+        has not changed.
+
+        Args:
+            state (Dict[str, Any]): state returned by save_state()
+        Raises:
+            KeyError, TypeError, ValueError: invalid state
+        """
+        self.temp_filter.restore(state["filter"])
+        self.raw_temp = float(state["raw_temp"])
+        self.filtered_temp = float(state["filtered_temp"])
+        if "last_level" in state:
+            self.last_level = int(state["last_level"])
+            self.last_temp = float(state["last_temp"])
+        if len(state["read_errors"]) == self.count and len(state["read_errors_total"]) == self.count:
+            self._temp_read_errors = [int(e) for e in state["read_errors"]]
+            self._temp_read_errors_total = [int(e) for e in state["read_errors_total"]]
+        if self.pid is not None and "pid_integral" in state:
+            self.pid.integral = min(max(float(state["pid_integral"]), self.pid.out_min), self.pid.out_max)
+
+    @staticmethod
+    def lut_size(resolution: float) -> int:
+        """Return the number of LUT elements covering [0..Config.LUT_MAX_TEMP] C at the given resolution.
+        Args:
+            resolution (float): temperature resolution of the LUT (C)
+        Returns:
+            int: number of LUT elements
+        """
+        return int(round(Config.LUT_MAX_TEMP / resolution)) + 1
+
     @staticmethod
-    def create_legacy_lut(min_temp: float, max_temp: float, min_level: int, max_level: int, steps: int) -> List[int]:
-        """Build a 101-element LUT from the legacy min/max temp+level keys using the original staircase formula.
+    def create_legacy_lut(min_temp: float, max_temp: float, min_level: int, max_level: int, steps: int,
+                          resolution: float = 1.0) -> array:
+        """Build a LUT from the legacy min/max temp+level keys using the original staircase formula.
 
-        Each integer temperature T in [0..100] gets mapped to its fan level the same way the previous
-        run() did at runtime:
+        Each temperature T = index * resolution in [0..Config.LUT_MAX_TEMP] gets mapped to its fan level
+        the same way the previous run() did at runtime:
             T <= min_temp        -> min_level
             T >= max_temp        -> max_level
             otherwise            -> round((T - min_temp) / temp_step) * level_step + min_level
@@ -267,83 +683,98 @@ class FanController:
             min_level (int): minimum fan level (%)
             max_level (int): maximum fan level (%)
             steps (int): discrete staircase steps
+            resolution (float): temperature resolution of the LUT (C)
         Returns:
-            List[int]: 101-element LUT (index = temperature in C, value = fan level in %)
+            array: LUT of unsigned bytes (index = temperature / resolution, value = fan level in %)
         """
         temp_step = (max_temp - min_temp) / steps
         level_step = (max_level - min_level) / steps
-        lut: List[int] = [0] * 101
-        for t in range(101):
+        size = FanController.lut_size(resolution)
+        lut = array("B", bytes(size))
+        for i in range(size):
+            t = i * resolution
             if t <= min_temp:
-                lut[t] = min_level
+                lut[i] = min_level
             elif t >= max_temp:
-                lut[t] = max_level
+                lut[i] = max_level
             else:
                 gain = int(round((t - min_temp) / temp_step))
-                lut[t] = int(round(gain * level_step)) + min_level
+                lut[i] = int(round(gain * level_step)) + min_level
         return lut
 
     @staticmethod
-    def create_control_function(pairs: List[Tuple[int, int]], steps: int) -> List[int]:
-        """Build a 101-element LUT from validated (T, L) breakpoints using interior-only digitalization
+    def create_control_function(pairs: List[Tuple[int, int]], steps: int, resolution: float = 1.0) -> array:
+        """Build a LUT from validated (T, L) breakpoints using interior-only digitalization
         with endpoint pinning. Produces `steps + 2` plateaus: 1 at t_first, `steps` in the interior,
         1 at t_last.
         Args:
             pairs (List[Tuple[int, int]]): validated breakpoints (already range-checked and strictly
                 ascending in T; see Config.parse_control_function)
             steps (int): number of interior plateaus
+            resolution (float): temperature resolution of the LUT (C)
         Returns:
-            List[int]: 101-element LUT (index = temperature in C, value = fan level in %)
+            array: LUT of unsigned bytes (index = temperature / resolution, value = fan level in %)
         """
         t_first, l_first = pairs[0]
         t_last, l_last = pairs[-1]
+        i_first = int(round(t_first / resolution))
+        i_last = int(round(t_last / resolution))
+        temps = [t for t, _ in pairs]
+
+        # Step 1: piecewise-linear LUT, with the head and tail padded to their endpoint levels.
+        size = FanController.lut_size(resolution)
+        levels = array("B", bytes(size))
+        for i in range(size):
+            if i <= i_first:
+                levels[i] = l_first
+            elif i >= i_last:
+                levels[i] = l_last
+            else:
+                t = i * resolution
+                k = bisect.bisect_right(temps, t) - 1
+                t1, l1 = pairs[k]
+                t2, l2 = pairs[k + 1]
+                levels[i] = round(l1 + ((t - t1) * (l2 - l1) / (t2 - t1)))
 
-        # Step 1: per-degree piecewise-linear LUT, with the head and tail padded to their endpoint levels.
-        levels: List[int] = [l_first] * t_first
-        for i in range(len(pairs) - 1):
-            t1, l1 = pairs[i]
-            t2, l2 = pairs[i + 1]
-            dt = t2 - t1
-            levels.extend([round(l1 + (di * (l2 - l1) / dt)) for di in range(dt)])
-        levels.extend([l_last] * (100 - t_last + 1))
-
-        # Step 2: digitalize the interior [t_first+1 .. t_last-1] into `steps` equal-width plateaus.
-        interior_len = t_last - t_first - 1
+        # Step 2: digitalize the interior [i_first+1 .. i_last-1] into `steps` equal-width plateaus.
+        interior_len = i_last - i_first - 1
         if interior_len > 0 and steps >= 1:
             base = interior_len // steps
             remainder = interior_len % steps
-            start = t_first + 1
+            start = i_first + 1
             for i in range(steps):
                 size = base + (1 if i < remainder else 0)
                 if size == 0:
                     continue
                 end = start + size - 1
                 avg = round(sum(levels[start:end + 1]) / size)
-                for t in range(start, end + 1):
-                    levels[t] = avg
+                for j in range(start, end + 1):
+                    levels[j] = avg
                 start = end + 1
 
         # Step 3: pin the user-defined endpoints (Step 2 leaves these untouched; explicit writes
         # make the endpoint contract obvious to future readers).
-        levels[t_first] = l_first
-        levels[t_last] = l_last
+        levels[i_first] = l_first
+        levels[i_last] = l_last
         return levels
 
     @classmethod
-    def build_lut(cls, config: FanControllerConfig) -> List[int]:
-        """Build the 101-element temperature->level LUT for a fan controller config.
+    def build_lut(cls, config: FanControllerConfig) -> array:
+        """Build the temperature->level LUT for a fan controller config.
 
         Dispatches between the legacy staircase formula and the new piecewise-linear control function
-        based on whether `control_function` was specified in the config.
+        based on whether `control_function` was specified in the config. The LUT covers
+        [0..Config.LUT_MAX_TEMP] C with `lut_resolution` steps (one byte per element), so a lookup is a
+        single index operation at any resolution.
         Args:
             config (FanControllerConfig): controller config (CPU/HD/NVME/GPU)
         Returns:
-            List[int]: 101-element LUT (index = temperature in C, value = fan level in %)
+            array: LUT of unsigned bytes (index = temperature / lut_resolution, value = fan level in %)
         """
         if config.control_function:
-            return cls.create_control_function(config.control_function, config.steps)
+            return cls.create_control_function(config.control_function, config.steps, config.lut_resolution)
         return cls.create_legacy_lut(config.min_temp, config.max_temp,
-                                     config.min_level, config.max_level, config.steps)
+                                     config.min_level, config.max_level, config.steps, config.lut_resolution)
 
     def run(self) -> None:
         """Run IPMI zone controller function with the following steps:
@@ -355,52 +786,252 @@ class FanController:
         * Step 3: Calculate the current gain and fan level based on the measured temperature
         * Step 4: If the new fan level is different it will be set and logged
         """
-        current_time: float  # Current system timestamp (measured)
-        current_temp: float  # Current temperature (measured)
-        current_level: int   # Current fan level (looked up from LUT)
-
         # Step 1: check the elapsed time.
-        current_time = time.monotonic()
+        if self.is_due():
+            # Step 2-4: read the temperature and apply the new fan level.
+            self.poll()
+
+    def poll(self) -> None:
+        """Read the temperature and apply the new fan level without checking the polling timer (steps 2-4 of
+        run()). The scheduler of the service calls this method at the polling deadlines of the controller.
+        The lateness of the poll and the duration of its phases are recorded in self.timing.
+        """
+        start = self.timing.start(self.config.polling)
+        try:
+            self.callback_func()
+            temp = self.get_temp()
+            decide_start = clock.monotonic()
+            self.timing.read.observe(decide_start - start)
+            self._process_temp(temp)
+            self.timing.decided(decide_start)
+        except SensorHangError as e:
+            self._apply_safe_level(e)
+
+    async def run_async(self) -> None:
+        """Coroutine version of run(): the callback function runs in the default executor and the temperature is
+        read with get_temp_async(), so the controllers due in the same loop iteration read their sensors
+        concurrently. The fan level is set in the event loop thread, so the IPMI calls remain serialized.
+        """
+        if self.is_due():
+            await self.poll_async()
+
+    async def poll_async(self) -> None:
+        """Coroutine version of poll(), see run_async()."""
+        start = self.timing.start(self.config.polling)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.callback_func)
+            temp = await self.get_temp_async()
+            decide_start = clock.monotonic()
+            self.timing.read.observe(decide_start - start)
+            self._process_temp(temp)
+            self.timing.decided(decide_start)
+        except SensorHangError as e:
+            self._apply_safe_level(e)
+
+    def _apply_safe_level(self, error: SensorHangError) -> None:
+        """Apply the highest fan level of the controller when a sensor read hung in the sensor process, so the
+        fans are not frozen at their last level while the sensors cannot be read. The next successful read
+        calculates the fan level again.
+
+        Args:
+            error (SensorHangError): the exception of the hung read
+        """
+        level = self.config.max_level if self.pid is not None else max(self.levels_lut)
+        self.log.msg(Log.LOG_ERROR, f"{self.name}: sensor read hung, sensor process restarted, "
+                                    f"safe level {level}% applied: {error}")
+        # Force a new level calculation at the next successful read (the sensitivity gap is measured from 0).
+        self.last_temp = 0.0
+        if level != self.last_level:
+            self._change_level(level)
+            self._level_pending = False
+            self.set_fan_level(level)
+
+    def is_due(self) -> bool:
+        """Check the elapsed time since the last temperature poll and start a new polling period if the polling
+        time has elapsed.
+
+        Returns:
+            bool: True if the temperature has to be read now
+        """
+        current_time = clock.monotonic()
         if (current_time - self.last_time) >= self.config.polling:
             self.last_time = current_time
+            return True
+        if self.log.log_level >= Log.LOG_DEBUG:
+            self.log.msg(Log.LOG_DEBUG, f"{self.name}: polling skipped "
+                         f"(remaining={self.config.polling - (current_time - self.last_time):.1f}s)")
+        return False
 
-            # Step 2: read the temperature, apply smoothing, and check the sensitivity gap.
-            self.callback_func()
-            raw_temp = self.get_temp()
-            self._temp_history.append(raw_temp)
-            current_temp = sum(self._temp_history) / len(self._temp_history)
+    def _process_temp(self, raw_temp: float) -> None:
+        """Apply the temperature filter and the sensitivity gap on a new temperature, then look up and set the fan
+        level (steps 2-4 of run()).
+
+        Args:
+            raw_temp (float): new aggregated temperature (C)
+        """
+        current_temp: float  # Current temperature (filtered)
+        current_level: int   # Current fan level (looked up from LUT)
+        feedforward: bool    # The temperature climbs faster than feedforward_rate
+
+        # Step 2: apply the temperature filter, and check the sensitivity gap.
+        current_temp = self.temp_filter.update(raw_temp)
+        self.raw_temp = raw_temp
+        self.filtered_temp = current_temp
+        if self.log.log_level >= Log.LOG_DEBUG:
+            if self.config.smoothing > 1 or self.config.temp_filter != Config.FILTER_SMA:
+                self.log.msg(Log.LOG_DEBUG, f"{self.name}: raw={raw_temp:.1f}C filtered={current_temp:.1f}C "
+                             f"({self.config.temp_filter})")
+            else:
+                self.log.msg(Log.LOG_DEBUG, f"{self.name}: new temperature > {current_temp:.1f}C")
+        feedforward = self._update_slope(raw_temp)
+        # A level change held back by min_dwell= or a ramp limit is re-evaluated at every poll, otherwise the
+        # fan level would be stuck until the temperature moves by the sensitivity gap again. The PID controller
+        # needs every temperature (its integral and derivative terms depend on the time), so the sensitivity
+        # gap is not applied in PID control mode. A steep temperature rise is evaluated without waiting for the
+        # sensitivity gap (the smoothed temperature lags behind).
+        new_temp = (self.pid is not None or feedforward
+                    or abs(current_temp - self.last_temp) >= self.config.sensitivity)
+        if new_temp or self._level_pending:
+            self.last_temp = current_temp
+
+            # Step 3: calculate the fan level with the PID controller or look it up for the (clamped,
+            # resolution-rounded) temperature (raised by the feed-forward term on a steep temperature rise),
+            # and apply the hysteresis, dwell time and ramp limits.
+            if self.pid is not None:
+                current_level = int(round(self.pid.update(current_temp, clock.monotonic())))
+            else:
+                current_level = self._lookup_level(current_temp)
+                if feedforward:
+                    current_level = self._feedforward_level(current_temp, current_level)
             if self.log.log_level >= Log.LOG_DEBUG:
-                if self.config.smoothing > 1:
-                    self.log.msg(Log.LOG_DEBUG, f"{self.name}: raw={raw_temp:.1f}C smoothed={current_temp:.1f}C "
-                                 f"(window {len(self._temp_history)}/{self.config.smoothing})")
-                else:
-                    self.log.msg(Log.LOG_DEBUG, f"{self.name}: new temperature > {current_temp:.1f}C")
-            if abs(current_temp - self.last_temp) >= self.config.sensitivity:
-                self.last_temp = current_temp
-
-                # Step 3: look up the fan level for the (clamped, integer-rounded) temperature.
-                idx = max(0, min(100, int(round(current_temp))))
-                current_level = self.levels_lut[idx]
-                if self.log.log_level >= Log.LOG_DEBUG:
-                    self.log.msg(Log.LOG_DEBUG, f"{self.name}: calculated level={current_level}% "
-                                 f"for temp={current_temp:.1f}C")
-
-                # Step 4: the new fan level will be set and logged.
-                if current_level != self.last_level:
-                    self.last_level = current_level
-                    self.set_fan_level(current_level)
-                    if not self.deferred_apply:
-                        self.log.msg(Log.LOG_INFO,
-                                     f"IPMI zone {self.config.ipmi_zone}: new level = {current_level}% "
-                                     f"({self.name}={current_temp:.1f}C)")
-                elif self.log.log_level >= Log.LOG_DEBUG:
-                    self.log.msg(Log.LOG_DEBUG, f"{self.name}: level unchanged at {current_level}%")
+                self.log.msg(Log.LOG_DEBUG, f"{self.name}: calculated level={current_level}% "
+                             f"for temp={current_temp:.1f}C")
+            current_level = self._limit_level(current_temp, current_level, new_temp)
+
+            # Step 4: the new fan level will be set and logged.
+            if current_level != self.last_level:
+                self._change_level(current_level)
+                self.set_fan_level(current_level)
+                if not self.deferred_apply:
+                    self.log.msg(Log.LOG_INFO,
+                                 f"IPMI zone {self.config.ipmi_zone}: new level = {current_level}% "
+                                 f"({self.name}={current_temp:.1f}C)")
             elif self.log.log_level >= Log.LOG_DEBUG:
+                self.log.msg(Log.LOG_DEBUG, f"{self.name}: level unchanged at {current_level}%")
+        else:
+            self.sensitivity_skips += 1
+            if self.log.log_level >= Log.LOG_DEBUG:
                 self.log.msg(Log.LOG_DEBUG, f"{self.name}: sensitivity not reached "
                              f"(delta={abs(current_temp - self.last_temp):.1f}C < {self.config.sensitivity:.1f}C)")
-        elif self.log.log_level >= Log.LOG_DEBUG:
-            self.log.msg(Log.LOG_DEBUG, f"{self.name}: polling skipped "
-                         f"(remaining={self.config.polling - (current_time - self.last_time):.1f}s)")
+
+    def _change_level(self, level: int) -> None:
+        """Store a new fan level and count a direction reversal: the level moves in the opposite direction of the
+        previous change within REVERSAL_WINDOW seconds (i.e. the fans are hunting). The first level set after
+        startup (last_level=0) has no direction.
+
+        Args:
+            level (int): new fan level [0..100]
+        """
+        now = clock.monotonic()
+        if self.last_level > 0:
+            direction = 1 if level > self.last_level else -1
+            if direction == -self._level_direction and now - self._level_changed_at <= self.REVERSAL_WINDOW:
+                self.direction_reversals += 1
+            self._level_direction = direction
+        self.last_level = level
+        self._level_changed_at = now
+
+    def _update_slope(self, raw_temp: float) -> bool:
+        """Store a new raw temperature and calculate the temperature slope over the smoothing window (but at
+        least between the last two readings) for the feed-forward term. The raw temperatures are used, because
+        the smoothed temperature lags behind a steep rise.
+
+        Args:
+            raw_temp (float): new aggregated temperature (C)
+        Returns:
+            bool: True if the feed-forward term is active (LUT control mode, the slope reached feedforward_rate)
+        """
+        if self.pid is not None or self.config.feedforward_rate <= 0:
+            return False
+        self._slope_samples.append((clock.monotonic(), raw_temp))
+        first_time, first_temp = self._slope_samples[0]
+        last_time, last_temp = self._slope_samples[-1]
+        self.temp_slope = (last_temp - first_temp) / (last_time - first_time) if last_time > first_time else 0.0
+        return self.temp_slope >= self.config.feedforward_rate
+
+    def _feedforward_level(self, temp: float, level: int) -> int:
+        """Pre-raise the fan level on a steep temperature rise: the level is looked up for the temperature
+        predicted `feedforward_horizon` seconds ahead with the current slope. The feed-forward term only raises
+        the level; when the rise slows down, the level follows the LUT again (with the usual limits on decrease).
+
+        Args:
+            temp (float): current (smoothed) temperature (C)
+            level (int): fan level looked up from the LUT (%)
+        Returns:
+            int: fan level raised by the feed-forward term (%)
+        """
+        predicted_temp = temp + self.temp_slope * self.config.feedforward_horizon
+        ff_level = max(level, self._lookup_level(predicted_temp))
+        if ff_level > level and self.log.log_level >= Log.LOG_DEBUG:
+            self.log.msg(Log.LOG_DEBUG, f"{self.name}: feed-forward level={ff_level}% "
+                         f"(slope={self.temp_slope:.2f}C/s, predicted temp={predicted_temp:.1f}C)")
+        return ff_level
+
+    def _lookup_level(self, temp: float) -> int:
+        """Look up the fan level of a temperature in the LUT (the temperature is clamped to the LUT range).
+
+        Args:
+            temp (float): temperature (C)
+        Returns:
+            int: fan level (%)
+        """
+        return self.levels_lut[max(0, min(len(self.levels_lut) - 1, int(round(temp / self.config.lut_resolution))))]
+
+    def _limit_level(self, temp: float, level: int, new_temp: bool) -> int:
+        """Apply the hysteresis, the dwell time and the ramp limits on a new fan level. A temperature hovering
+        on a plateau boundary would change the fan level (and issue an IPMI write) at every poll, so:
+
+        * a lower level is taken only if the temperature is at least `hysteresis` C below the current plateau
+          (LUT control mode only),
+        * a lower level is taken only if the current level has been held for at least `min_dwell` seconds,
+        * the level changes at most by `ramp_up` / `ramp_down` % per second since the last change (a partial
+          step is taken, the rest is re-evaluated at the next poll).
+
+        Increases are never delayed by the hysteresis and the dwell time. The first level is applied as is.
+        Every held back change triggered by a new temperature is counted in `suppressed_writes`.
+
+        Args:
+            temp (float): current (smoothed) temperature (C)
+            level (int): fan level looked up from the LUT (%)
+            new_temp (bool): the evaluation was triggered by a new temperature (not a re-evaluation)
+        Returns:
+            int: fan level to be applied (%)
+        """
+        cfg = self.config
+        self._level_pending = False
+        if self.last_level in (level, 0):
+            return level
+        elapsed = clock.monotonic() - self._level_changed_at
+        target = level
+        if level < self.last_level:
+            if cfg.hysteresis > 0 and self.pid is None:
+                level = max(level, min(self._lookup_level(temp + cfg.hysteresis), self.last_level))
+            if level < self.last_level and cfg.min_dwell > 0 and elapsed < cfg.min_dwell:
+                level = self.last_level
+                self._level_pending = True
+            if level < self.last_level and cfg.ramp_down > 0:
+                level = max(level, self.last_level - int(cfg.ramp_down * elapsed))
+                self._level_pending = level != target
+        elif cfg.ramp_up > 0:
+            level = min(level, self.last_level + int(cfg.ramp_up * elapsed))
+            self._level_pending = level != target
+        if level == self.last_level:
+            if new_temp:
+                self.suppressed_writes += 1
+            if self.log.log_level >= Log.LOG_DEBUG:
+                self.log.msg(Log.LOG_DEBUG, f"{self.name}: level change {self.last_level}% -> {target}% held back "
+                             f"(held for {elapsed:.1f}s)")
+        return level
 
     def print_temp_level_mapping(self) -> None:
         """Log the temperature->level plateaus at LOG_CONFIG level."""
@@ -412,13 +1043,15 @@ class FanController:
         """Walk levels_lut and return one (temperature-range string, level) tuple per plateau
         (consecutive temperatures sharing the same fan level), in ascending temperature order."""
         plateaus: List[Tuple[str, int]] = []
+        res = self.config.lut_resolution
+        size = len(self.levels_lut)
         start = 0
-        for t in range(1, 102):
-            if t == 101 or self.levels_lut[t] != self.levels_lut[start]:
-                end = t - 1
-                rng = f"T={start}C" if start == end else f"T=[{start}..{end}]C"
+        for i in range(1, size + 1):
+            if i == size or self.levels_lut[i] != self.levels_lut[start]:
+                end = i - 1
+                rng = f"T={start * res:g}C" if start == end else f"T=[{start * res:g}..{end * res:g}]C"
                 plateaus.append((rng, self.levels_lut[start]))
-                start = t
+                start = i
         return plateaus
 
 
@@ -0,0 +1,243 @@
+#
+#   filters.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   Temperature filters of the fan controllers: moving average, EWMA, windowed median and Kalman filter.
+#
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from smfc.config import Config
+
+
+class TemperatureFilter(ABC):
+    """Abstract base class of the temperature filters. A filter receives the raw (aggregated) temperatures one
+    by one and returns the filtered temperature; every update is incremental, the cost does not depend on the
+    number of processed samples.
+    """
+
+    @abstractmethod
+    def update(self, value: float) -> float:
+        """Add a new raw temperature and return the filtered temperature.
+        Args:
+            value (float): new raw temperature (C)
+        Returns:
+            float: filtered temperature (C)
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop the state of the filter (the next update is the first one)."""
+
+    @abstractmethod
+    def state(self) -> Dict[str, Any]:
+        """Return the state of the filter (JSON serializable, e.g. for a warm start checkpoint).
+        Returns:
+            Dict[str, Any]: state of the filter
+        """
+
+    @abstractmethod
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Restore the state of the filter returned by state().
+        Args:
+            state (Dict[str, Any]): state of the filter
+        Raises:
+            KeyError, TypeError, ValueError: invalid state
+        """
+
+
+class MovingAverageFilter(TemperatureFilter):
+    """Simple moving average over the last `window` samples, calculated with a running sum. The average of a
+    partially filled window is calculated from the available samples. A window of 1 disables the filtering.
+    """
+
+    window: deque       # The last samples
+    _sum: float         # Running sum of the samples in the window
+
+    def __init__(self, window: int) -> None:
+        """Initialize the filter.
+        Args:
+            window (int): number of samples in the window
+        Raises:
+            ValueError: window < 1
+        """
+        if window < 1:
+            raise ValueError(f"invalid value: window < 1 ({window})")
+        self.window = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, value: float) -> float:
+        if len(self.window) == self.window.maxlen:
+            self._sum -= self.window[0]
+        self.window.append(value)
+        self._sum += value
+        return self._sum / len(self.window)
+
+    def reset(self) -> None:
+        self.window.clear()
+        self._sum = 0.0
+
+    def state(self) -> Dict[str, Any]:
+        return {"window": list(self.window)}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.reset()
+        for value in state["window"]:
+            self.update(float(value))
+
+
+class EwmaFilter(TemperatureFilter):
+    """Exponentially weighted moving average: `y += alpha * (x - y)`. The first sample initializes the output.
+    A smaller alpha means stronger smoothing, alpha=1 disables the filtering.
+    """
+
+    alpha: float                # Weight of the new sample (0..1]
+    value: Optional[float]      # Current output (None = no sample yet)
+
+    def __init__(self, alpha: float) -> None:
+        """Initialize the filter.
+        Args:
+            alpha (float): weight of the new sample (0..1]
+        Raises:
+            ValueError: alpha out of (0..1]
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError(f"invalid value: alpha out of (0..1] ({alpha})")
+        self.alpha = alpha
+        self.value = None
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    def reset(self) -> None:
+        self.value = None
+
+    def state(self) -> Dict[str, Any]:
+        return {"value": self.value}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.value = None if state["value"] is None else float(state["value"])
+
+
+class MedianFilter(TemperatureFilter):
+    """Median of the last `window` samples. A single spike (e.g. a bogus sensor reading) is rejected completely
+    if it is shorter than half of the window. The samples are also kept in a sorted list, so an update is a
+    binary search and an insertion into a list of `window` elements instead of sorting the window.
+    """
+
+    window: deque           # The last samples in arrival order
+    _sorted: List[float]    # The same samples in ascending order
+
+    def __init__(self, window: int) -> None:
+        """Initialize the filter.
+        Args:
+            window (int): number of samples in the window
+        Raises:
+            ValueError: window < 1
+        """
+        if window < 1:
+            raise ValueError(f"invalid value: window < 1 ({window})")
+        self.window = deque(maxlen=window)
+        self._sorted = []
+
+    def update(self, value: float) -> float:
+        if len(self.window) == self.window.maxlen:
+            del self._sorted[bisect_left(self._sorted, self.window[0])]
+        self.window.append(value)
+        insort(self._sorted, value)
+        n = len(self._sorted)
+        if n % 2:
+            return self._sorted[n // 2]
+        return (self._sorted[n // 2 - 1] + self._sorted[n // 2]) / 2
+
+    def reset(self) -> None:
+        self.window.clear()
+        self._sorted = []
+
+    def state(self) -> Dict[str, Any]:
+        return {"window": list(self.window)}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.reset()
+        for value in state["window"]:
+            self.update(float(value))
+
+
+class KalmanFilter(TemperatureFilter):
+    """One-dimensional Kalman filter for a slowly changing temperature measured by a noisy sensor. The
+    temperature is modelled as a random walk with `process_noise` variance per sample, the sensor adds
+    `measurement_noise` variance. A higher measurement noise (or a lower process noise) means stronger
+    smoothing. The first sample initializes the estimate.
+    """
+
+    process_noise: float        # Variance of the temperature change per sample (C^2)
+    measurement_noise: float    # Variance of the sensor noise (C^2)
+    value: Optional[float]      # Current estimate (None = no sample yet)
+    variance: float             # Variance of the current estimate (C^2)
+
+    def __init__(self, process_noise: float, measurement_noise: float) -> None:
+        """Initialize the filter.
+        Args:
+            process_noise (float): variance of the temperature change per sample (C^2)
+            measurement_noise (float): variance of the sensor noise (C^2)
+        Raises:
+            ValueError: process_noise <= 0 or measurement_noise <= 0
+        """
+        if process_noise <= 0:
+            raise ValueError(f"invalid value: process_noise <= 0 ({process_noise})")
+        if measurement_noise <= 0:
+            raise ValueError(f"invalid value: measurement_noise <= 0 ({measurement_noise})")
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+            self.variance = self.measurement_noise
+        else:
+            self.variance += self.process_noise
+            gain = self.variance / (self.variance + self.measurement_noise)
+            self.value += gain * (value - self.value)
+            self.variance *= 1 - gain
+        return self.value
+
+    def reset(self) -> None:
+        self.value = None
+        self.variance = 0.0
+
+    def state(self) -> Dict[str, Any]:
+        return {"value": self.value, "variance": self.variance}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.value = None if state["value"] is None else float(state["value"])
+        self.variance = float(state["variance"])
+
+
+def create_filter(config) -> TemperatureFilter:
+    """Create the temperature filter of a fan controller section.
+    Args:
+        config: configuration dataclass (CpuConfig, HdConfig, NvmeConfig, or GpuConfig)
+    Returns:
+        TemperatureFilter: the filter selected by `temp_filter` (the window of the moving average and the
+        median filter is `smoothing`)
+    Raises:
+        ValueError: unknown filter or invalid filter parameter
+    """
+    if config.temp_filter == Config.FILTER_SMA:
+        return MovingAverageFilter(config.smoothing)
+    if config.temp_filter == Config.FILTER_EWMA:
+        return EwmaFilter(config.ewma_alpha)
+    if config.temp_filter == Config.FILTER_MEDIAN:
+        return MedianFilter(config.smoothing)
+    if config.temp_filter == Config.FILTER_KALMAN:
+        return KalmanFilter(config.kalman_process_noise, config.kalman_measurement_noise)
+    raise ValueError(f"invalid value: unknown temperature filter ({config.temp_filter})")
+
+
+# End.
@@ -3,10 +3,11 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.GpuFc() class implementation.
 #
+import asyncio
 import subprocess
-import time
 import json
-from typing import List
+from typing import List, Optional, Tuple
+from smfc import clock
 from smfc.fancontroller import FanController
 from smfc.ipmi import Ipmi
 from smfc.log import Log
@@ -21,6 +22,7 @@ class GpuFc(FanController):
     # GpuFc specific parameters.
     smi_called: float               # Timestamp when SMI command executed
     gpu_temperature: List[float]    # List of GPU temperatures
+    _smi_pending: Optional[asyncio.Task] = None  # SMI command execution in progress in asyncio mode
 
     def __init__(self, log: Log, ipmi: Ipmi, cfg: GpuConfig) -> None:
         """Initialize the GPU fan controller class and raise exception in case of invalid configuration.
@@ -48,9 +50,10 @@ class GpuFc(FanController):
             else:
                 self.log.msg(Log.LOG_CONFIG, f"   rocm_smi_path = {self.config.rocm_smi_path}")
                 self.log.msg(Log.LOG_CONFIG, f"   amd_temp_sensor = {self.config.amd_temp_sensor}")
+            self.log.msg(Log.LOG_CONFIG, f"   read_timeout = {self.config.read_timeout}")
 
     def _exec_smi(self, command_path: str, arguments: List[str]) -> subprocess.CompletedProcess:
-        """Execute the SMI command (nvidia-smi or rocm-smi).
+        """Execute the SMI command (nvidia-smi or rocm-smi), killed after `read_timeout` seconds.
         Args:
             command_path (str): path to the SMI command
             arguments (List[str]): list of arguments of SMI command
@@ -58,16 +61,53 @@ class GpuFc(FanController):
             subprocess.CompletedProcess: result of the executed subprocess
         Raises:
             FileNotFoundError: command not found
+            TimeoutError: command timed out
         """
-        r: subprocess.CompletedProcess  # Result of the executed process
         args: List[str] = []  # List of arguments
 
         # Execute command.
         args.append(command_path)
         args.extend(arguments)
         # May raise FileNotFoundError if command is not found.
-        r = subprocess.run(args, check=False, capture_output=True, text=True)
-        return r
+        return self.exec_command(args, self.config.read_timeout)
+
+    def _smi_command(self) -> Tuple[str, List[str]]:
+        """Return the SMI command and its arguments for the configured GPU type.
+        Returns:
+            Tuple[str, List[str]]: path to the SMI command and list of its arguments
+        """
+        if self.config.gpu_type == "nvidia":
+            return self.config.nvidia_smi_path, ["--query-gpu=temperature.gpu", "--format=csv,noheader,nounits"]
+        return self.config.rocm_smi_path, ["-t", "--json"]
+
+    def _parse_smi_output(self, output: str) -> None:
+        """Parse the output of the SMI command and store the temperatures of the configured GPUs.
+        Args:
+            output (str): standard output of the SMI command
+        Raises:
+            ValueError:         invalid temperature value
+            IndexError:         invalid GPU device id
+        """
+        if self.config.gpu_type == "nvidia":
+            temp_list = output.splitlines()
+            self.gpu_temperature = []
+            for gid in self.config.gpu_device_ids:
+                self.gpu_temperature.append(float(temp_list[gid]))
+        else:
+            try:
+                data = json.loads(output)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Failed to parse rocm-smi JSON output: {e}") from e
+            self.gpu_temperature = []
+            temp_key = Config.CV_AMD_TEMP_KEYS[self.config.amd_temp_sensor]
+            for gid in self.config.gpu_device_ids:
+                card_key = f"card{gid}"
+                if card_key not in data:
+                    raise ValueError(f"{card_key} not found in rocm-smi output")
+                card_data = data[card_key]
+                if temp_key not in card_data:
+                    raise ValueError(f"No temperature data found for {card_key}")
+                self.gpu_temperature.append(float(card_data[temp_key]))
 
     def _get_nth_temp(self, index: int) -> float:
         """Get the temperature of the nth element in the GPU device list.
@@ -79,39 +119,75 @@ class GpuFc(FanController):
             FileNotFoundError:  file or command cannot be found
             ValueError:         invalid temperature value
             IndexError:         invalid index
+            TimeoutError:       SMI command timed out
         """
-        current_time = time.monotonic()
+        current_time = clock.monotonic()
         if (current_time - self.smi_called) >= self.config.polling:
             r: subprocess.CompletedProcess  # result of the executed process
 
-            if self.config.gpu_type == "nvidia":
-                nvidia_args = ["--query-gpu=temperature.gpu", "--format=csv,noheader,nounits"]
-                r = self._exec_smi(self.config.nvidia_smi_path, nvidia_args)
-                self.smi_called = current_time
-                temp_list = r.stdout.splitlines()
-                self.gpu_temperature = []
-                for gid in self.config.gpu_device_ids:
-                    self.gpu_temperature.append(float(temp_list[gid]))
-            else:
-                r = self._exec_smi(self.config.rocm_smi_path, ["-t", "--json"])
-                self.smi_called = current_time
-                try:
-                    data = json.loads(r.stdout)
-                except json.JSONDecodeError as e:
-                    raise ValueError(f"Failed to parse rocm-smi JSON output: {e}") from e
-                self.gpu_temperature = []
-                temp_key = Config.CV_AMD_TEMP_KEYS[self.config.amd_temp_sensor]
-                for gid in self.config.gpu_device_ids:
-                    card_key = f"card{gid}"
-                    if card_key not in data:
-                        raise ValueError(f"{card_key} not found in rocm-smi output")
-                    card_data = data[card_key]
-                    if temp_key not in card_data:
-                        raise ValueError(f"No temperature data found for {card_key}")
-                    self.gpu_temperature.append(float(card_data[temp_key]))
+            command_path, arguments = self._smi_command()
+            r = self._exec_smi(command_path, arguments)
+            self.smi_called = current_time
+            self._parse_smi_output(r.stdout)
+
+        return self.gpu_temperature[index]
+
+    async def _exec_smi_async(self, command_path: str, arguments: List[str]) -> subprocess.CompletedProcess:
+        """Execute the SMI command (nvidia-smi or rocm-smi) without blocking the event loop, killed after
+        `read_timeout` seconds.
+        Args:
+            command_path (str): path to the SMI command
+            arguments (List[str]): list of arguments of SMI command
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+        Raises:
+            FileNotFoundError: command not found
+            TimeoutError: command timed out
+        """
+        return await self.exec_command_async([command_path] + arguments, self.config.read_timeout)
+
+    async def _query_smi_async(self, current_time: float) -> None:
+        """Execute the SMI command once and store the temperatures of all configured GPUs.
+        Args:
+            current_time (float): timestamp of the query
+        """
+        try:
+            command_path, arguments = self._smi_command()
+            r = await self._exec_smi_async(command_path, arguments)
+            self.smi_called = current_time
+            self._parse_smi_output(r.stdout)
+        finally:
+            self._smi_pending = None
 
+    async def _get_nth_temp_async(self, index: int) -> float:
+        """Coroutine version of _get_nth_temp(). The concurrent reads of the GPUs share one SMI command
+        execution, since one execution reports the temperature of all GPUs.
+        Args:
+            index (int): index in GPU device list
+        Returns:
+            float: temperature value
+        Raises:
+            FileNotFoundError:  file or command cannot be found
+            ValueError:         invalid temperature value
+            IndexError:         invalid index
+            TimeoutError:       SMI command timed out
+        """
+        current_time = clock.monotonic()
+        if self._smi_pending is None and (current_time - self.smi_called) >= self.config.polling:
+            self._smi_pending = asyncio.ensure_future(self._query_smi_async(current_time))
+        if self._smi_pending is not None:
+            await asyncio.shield(self._smi_pending)
         return self.gpu_temperature[index]
 
+    def sensor_key(self, index: int) -> str:
+        """Return the key of the physical sensor behind the nth GPU (GPU type and device id).
+        Args:
+            index (int): index in GPU device list
+        Returns:
+            str: physical sensor key (e.g. 'gpu:nvidia:0')
+        """
+        return f"gpu:{self.config.gpu_type}:{self.config.gpu_device_ids[index]}"
+
     def device_names(self) -> List[str]:
         """Return per-GPU device labels (gpu<id> using configured gpu_device_ids)
         matching last_per_device_temps positionally."""
@@ -3,11 +3,13 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.HdFc() class implementation.
 #
+import os
 import subprocess
-import time
-from typing import List
+from typing import List, Optional
 from pyudev import Context, Devices, DeviceNotFoundByFileError
+from smfc import clock
 from smfc.fancontroller import FanController
+from smfc.hwmon import HwmonIndex
 from smfc.ipmi import Ipmi
 from smfc.log import Log
 from smfc.config import HdConfig
@@ -27,7 +29,8 @@ class HdFc(FanController):
     standby_array_states: List[bool]    # Standby states of HDs
     sudo: bool                          # Use `sudo` command
 
-    def __init__(self, log: Log, udevc: Context, ipmi: Ipmi, cfg: HdConfig, sudo: bool) -> None:
+    def __init__(self, log: Log, udevc: Context, ipmi: Ipmi, cfg: HdConfig, sudo: bool,
+                 hwmon_index: Optional[HwmonIndex] = None) -> None:
         """Initialize the HD fan controller class and raise exception in case of invalid configuration.
 
         Args:
@@ -36,12 +39,14 @@ class HdFc(FanController):
             ipmi (Ipmi): reference to an Ipmi class instance
             cfg (HdConfig): HD fan controller configuration
             sudo (bool): sudo flag
+            hwmon_index (Optional[HwmonIndex]): shared hwmon index (None = one udev query per device)
 
         Raises:
             ValueError: invalid configuration parameters (e.g. device not reachable)
         """
         # Store config reference first (required by base class)
         self.config = cfg
+        self.hwmon_index = hwmon_index
 
         # Save HdFc class-specific parameters (validation done in Config).
         self.hd_device_names = cfg.hd_names
@@ -63,7 +68,7 @@ class HdFc(FanController):
                 raise ValueError(f"hd_names= parameter error: '{name}' cannot be reached.") \
                     from DeviceNotFoundByFileError
             # Add the hwmon path string for NVME/SATA/HDD disks or '' for SAS/SCSI disks.
-            self.hwmon_path.append(self.get_hwmon_path(udevc, block_dev.parent))
+            self.hwmon_path.append(self.get_hwmon_path(udevc, block_dev.parent, self.hwmon_index))
 
         # Initialize FanController class.
         super().__init__(log, ipmi, cfg.section, len(self.hd_device_names))
@@ -81,13 +86,14 @@ class HdFc(FanController):
             # Get the current power state of the HD array.
             n = self.check_standby_state()
             # Set calculated parameters.
-            self.standby_change_timestamp = time.monotonic()
+            self.standby_change_timestamp = clock.monotonic()
             self.standby_flag = n == self.count
 
         # Print configuration in CONFIG log level (or higher).
         if self.log.log_level >= Log.LOG_CONFIG:
             self.log.msg(Log.LOG_CONFIG, f"   hd_names = {self.hd_device_names}")
             self.log.msg(Log.LOG_CONFIG, f"   smartctl_path = {self.config.smartctl_path}")
+            self.log.msg(Log.LOG_CONFIG, f"   read_timeout = {self.config.read_timeout}")
             if self.config.standby_guard_enabled and self.count > 1:
                 self.log.msg(Log.LOG_CONFIG, "   Standby guard is enabled:")
                 self.log.msg(Log.LOG_CONFIG, f"     standby_hd_limit = {self.config.standby_hd_limit}")
@@ -103,8 +109,62 @@ class HdFc(FanController):
         """Return per-HD device labels (configured hd_names) matching last_per_device_temps positionally."""
         return list(self.hd_device_names)
 
+    def resolve_hwmon_paths(self, udevc: Context) -> List[str]:
+        """Resolve the hwmon paths of the disks from the udev database again.
+        Args:
+            udevc (Context): pyudev Context
+        Returns:
+            List[str]: list of hwmon paths (empty string for SAS/SCSI disks and for disks not found)
+        """
+        paths: List[str] = []
+        for name in self.hd_device_names:
+            try:
+                block_dev = Devices.from_device_file(udevc, name)
+            except DeviceNotFoundByFileError:
+                paths.append("")
+                continue
+            paths.append(self.get_hwmon_path(udevc, block_dev.parent, self.hwmon_index))
+        return paths
+
+    def sensor_key(self, index: int) -> str:
+        """Return the key of the physical sensor behind the nth disk: its hwmon file, or its resolved block device
+        when the temperature is read by `smartctl` (so different /dev/disk/by-id/ links of a disk share one key).
+        Args:
+            index (int): index in hwmon list
+        Returns:
+            str: physical sensor key
+        """
+        if self.hwmon_path[index]:
+            return f"hwmon:{self.hwmon_path[index]}"
+        return f"smartctl:{os.path.realpath(self.hd_device_names[index])}"
+
+    def _smartctl_args(self, arguments: List[str]) -> List[str]:
+        """Build the full argument list of a `smartctl` command (with `sudo` prefix if configured).
+        Args:
+            arguments (List[str]): list of arguments of `smartctl` command
+        Returns:
+            List[str]: full argument list of the command
+        """
+        args: List[str] = []
+        if self.sudo:
+            args.append("sudo")
+        args.append(self.config.smartctl_path)
+        args.extend(arguments)
+        return args
+
+    def _check_sudo_error(self, r: subprocess.CompletedProcess) -> None:
+        """Check the result of a `smartctl` command for a `sudo` execution problem.
+        Args:
+            r (subprocess.CompletedProcess): result of the executed subprocess
+        Raises:
+            RuntimeError: sudo error
+        """
+        # In case if sudo return code report execution problem (for smartctl it could be any SMART error)
+        if r.returncode != 0 and self.sudo and "sudo" in r.stderr:
+            raise RuntimeError(f"sudo error ({r.returncode}): {r.stderr}!")
+
     def _exec_smartctl(self, arguments: List[str]) -> subprocess.CompletedProcess:
-        """Execute the `smartctl` command.
+        """Execute the `smartctl` command (killed after `read_timeout` seconds).
         Args:
             arguments (List[str]): list of arguments of `smartctl` command
         Returns:
@@ -112,24 +172,67 @@ class HdFc(FanController):
         Raises:
             FileNotFoundError: command not found
             RuntimeError: sudo error
+            TimeoutError: command timed out
         """
         r: subprocess.CompletedProcess
-        args: List[str]
 
         # Execute `smartctl` command.
-        # Build argument list.
-        args = []
-        if self.sudo:
-            args.append("sudo")
-        args.append(self.config.smartctl_path)
-        args.extend(arguments)
         # May raise FileNotFoundError if smartctl is not found.
-        r = subprocess.run(args, check=False, capture_output=True, text=True)
-        # In case if sudo return code report execution problem (for smartctl it could be any SMART error)
-        if r.returncode != 0 and self.sudo and "sudo" in r.stderr:
-            raise RuntimeError(f"sudo error ({r.returncode}): {r.stderr}!")
+        r = self.exec_command(self._smartctl_args(arguments), self.config.read_timeout)
+        self._check_sudo_error(r)
         return r
 
+    async def _exec_smartctl_async(self, arguments: List[str]) -> subprocess.CompletedProcess:
+        """Execute the `smartctl` command without blocking the event loop (killed after `read_timeout` seconds).
+        Args:
+            arguments (List[str]): list of arguments of `smartctl` command
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+        Raises:
+            FileNotFoundError: command not found
+            RuntimeError: sudo error
+            TimeoutError: command timed out
+        """
+        r = await self.exec_command_async(self._smartctl_args(arguments), self.config.read_timeout)
+        self._check_sudo_error(r)
+        return r
+
+    def _parse_smartctl_temp(self, index: int, output: str) -> float:
+        """Parse the temperature from the output of a `smartctl -a` command.
+        Args:
+            index (int): index in hwmon list
+            output (str): standard output of the `smartctl` command
+        Returns:
+            float: temperature value
+        Raises:
+            ValueError:         temperature value not found or invalid
+            IndexError:         invalid line format
+        """
+        line: str  # One line.
+
+        for line in output.splitlines():
+            # SCSI type of temperature reporting, like:
+            # `Current Drive Temperature:     37 C`
+            if "Current Drive Temperature" in line:
+                return float(line.split(":")[-1].strip().split()[0])
+
+            # pylint: disable=C0301
+            # ATA/SATA type of temperature reporting, like:
+            # `190 Airflow_Temperature_Cel 0x0032   075   045   000    Old_age   Always       -       25`
+            # `194 Temperature_Celsius     0x0002   232   232   000    Old_age   Always       -       28 (Min/Max 17/45)`
+            # Fix issue #76: Number of words in the line is also checked to avoid such a case for SCSI disks:
+            # `Temperature Warning:  Enabled`
+            # pylint: enable=C0301
+            s = line.split()
+            if "Temperature" in line and len(s) >= 9:
+                return float(s[9])
+
+        # If we did not find any matching temperature pattern.
+        raise ValueError(
+            f"ERROR: Temperature cannot found in smartctl output "
+            f"(disk={self.hd_device_names[index]})!"
+        )
+
     def _get_nth_temp(self, index: int) -> float:
         """Get the temperature of the nth element in the hwmon list. This is a specific implementation for HD
         fan controller.
@@ -142,6 +245,7 @@ class HdFc(FanController):
             IOError:            file cannot be opened
             ValueError:         invalid temperature value
             IndexError:         invalid index
+            TimeoutError:       `smartctl` timed out
         """
         value: float = 100  # Read temperature value.
 
@@ -150,44 +254,12 @@ class HdFc(FanController):
             if hasattr(self, "log") and self.log.log_level >= Log.LOG_DEBUG:
                 self.log.msg(Log.LOG_DEBUG, f"HD: using smartctl for {self.hd_device_names[index]}")
             r: subprocess.CompletedProcess  # result of the executed process
-            output_lines: List[str]  # Lines of the output text.
-            line: str  # One line.
-            found: bool  # Temperature value was found.
 
             # Read disk temperature with calling `smartctl -a /dev/...` command.
             try:
                 r = self._exec_smartctl(["-a", self.hd_device_names[index]])
                 # Parse the output of `smartctl` command.
-                output_lines = str(r.stdout).splitlines()
-                found = False
-                for line in output_lines:
-                    # SCSI type of temperature reporting, like:
-                    # `Current Drive Temperature:     37 C`
-                    if "Current Drive Temperature" in line:
-                        value = float(line.split(":")[-1].strip().split()[0])
-                        found = True
-                        break
-
-                    # pylint: disable=C0301
-                    # ATA/SATA type of temperature reporting, like:
-                    # `190 Airflow_Temperature_Cel 0x0032   075   045   000    Old_age   Always       -       25`
-                    # `194 Temperature_Celsius     0x0002   232   232   000    Old_age   Always       -       28 (Min/Max 17/45)`
-                    # Fix issue #76: Number of words in the line is also checked to avoid such a case for SCSI disks:
-                    # `Temperature Warning:  Enabled`
-                    # pylint: enable=C0301
-                    s = line.split()
-                    if "Temperature" in line and len(s) >= 9:
-                        value = float(s[9])
-                        found = True
-                        break
-
-                # If we did not find any matching temperature pattern.
-                if not found:
-                    raise ValueError(
-                        f"ERROR: Temperature cannot found in smartctl output "
-                        f"(disk={self.hd_device_names[index]})!"
-                    )
-
+                value = self._parse_smartctl_temp(index, str(r.stdout))
             except (FileNotFoundError, RuntimeError, ValueError, IndexError) as e:
                 raise type(e)(
                     f"ERROR: Cannot read temperature from smartctl "
@@ -205,6 +277,33 @@ class HdFc(FanController):
 
         return value
 
+    async def _get_nth_temp_async(self, index: int) -> float:
+        """Coroutine version of _get_nth_temp(): `smartctl` is executed as a non-blocking subprocess, a HWMON
+        file is read in the default executor.
+        Args:
+            index (int): index in hwmon list
+        Returns:
+            float: temperature value
+        Raises:
+            FileNotFoundError:  file or command cannot be found
+            IOError:            file cannot be opened
+            ValueError:         invalid temperature value
+            IndexError:         invalid index
+            TimeoutError:       `smartctl` timed out
+        """
+        if self.hwmon_path[index]:
+            return await super()._get_nth_temp_async(index)
+        if self.log.log_level >= Log.LOG_DEBUG:
+            self.log.msg(Log.LOG_DEBUG, f"HD: using smartctl for {self.hd_device_names[index]}")
+        try:
+            r = await self._exec_smartctl_async(["-a", self.hd_device_names[index]])
+            return self._parse_smartctl_temp(index, str(r.stdout))
+        except (FileNotFoundError, RuntimeError, ValueError, IndexError) as e:
+            raise type(e)(
+                f"ERROR: Cannot read temperature from smartctl "
+                f"(disk={self.hd_device_names[index]})!"
+            ) from e
+
     def get_standby_state_str(self) -> str:
         """Get a string representing the power state of the HD array with a character.
         Returns:
@@ -230,7 +329,13 @@ class HdFc(FanController):
         # Check the current power state of the HDs
         for i in range(self.count):
             self.standby_array_states[i] = False
-            r = self._exec_smartctl(["-i", "-n", "standby", self.hd_device_names[i]])
+            try:
+                r = self._exec_smartctl(["-i", "-n", "standby", self.hd_device_names[i]])
+            except TimeoutError as e:
+                # A hung disk is considered ACTIVE, so it cannot make the array go to STANDBY.
+                self.log.msg(Log.LOG_ERROR, f"Standby guard: cannot check the power state of "
+                                            f"{self.hd_device_names[i]}: {e}")
+                continue
             if str(r.stdout).find("STANDBY") != -1:
                 self.standby_array_states[i] = True
         self.log.msg(Log.LOG_DEBUG, f"Standby guard: current state is {self.get_standby_state_str()}.")
@@ -243,7 +348,12 @@ class HdFc(FanController):
             # if the HD is ACTIVE
             if not self.standby_array_states[i]:
                 # then move it to STANDBY state
-                self._exec_smartctl(["-s", "standby,now", self.hd_device_names[i]])
+                try:
+                    self._exec_smartctl(["-s", "standby,now", self.hd_device_names[i]])
+                except TimeoutError as e:
+                    self.log.msg(Log.LOG_ERROR, f"Standby guard: cannot put {self.hd_device_names[i]} to "
+                                                f"STANDBY state: {e}")
+                    continue
                 self.standby_array_states[i] = True
 
     def run_standby_guard(self):
@@ -261,7 +371,7 @@ class HdFc(FanController):
 
         # Step 1: check the current power state of the HD array
         hds_in_standby = self.check_standby_state()
-        cur_time = time.monotonic()
+        cur_time = clock.monotonic()
 
         # Step 2: check if the array is going to STANDBY state.
         if self.log.log_level >= Log.LOG_DEBUG:
@@ -0,0 +1,306 @@
+#
+#   history.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   In-memory time-series history of the temperatures and the fan levels: fixed-size ring buffers per series with
+#   downsampling into coarser tiers.
+#
+import math
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from smfc import clock
+
+
+HISTORY_SCHEMA_VERSION: int = 1
+
+# Resolution of the tiers of a series (sec): the raw samples (one per main loop iteration), then the 1 minute and
+# the 15 minute buckets. Every tier holds the same number of points, so the coarser tiers reach further back.
+TIER_RESOLUTIONS: Tuple[float, ...] = (0.0, 60.0, 900.0)
+# Fields of the points of the raw tier and of the bucket tiers.
+RAW_FIELDS: Tuple[str, ...] = ("time", "value")
+BUCKET_FIELDS: Tuple[str, ...] = ("time", "avg", "min", "max")
+
+# Kinds of the series (the first part of the series names).
+SERIES_TEMP: str = "temp"       # Temperature of a fan controller or of one of its devices (C)
+SERIES_LEVEL: str = "level"     # Applied fan level of an IPMI zone (%)
+
+
+class RingBuffer:
+    """Fixed-size ring buffer of points. The fields of the points are stored in arrays of doubles (one array per
+    field, the first field is the time) allocated at creation, so the memory of the buffer never grows: a new
+    point overwrites the oldest one when the buffer is full."""
+
+    size: int               # Capacity of the buffer (points)
+    count: int              # Number of stored points
+    _fields: List[array]    # Values of the points per field
+    _next: int              # Index of the next write
+
+    def __init__(self, size: int, fields: int) -> None:
+        """Initialize an empty ring buffer.
+        Args:
+            size (int): capacity of the buffer (points)
+            fields (int): number of fields of a point
+        Raises:
+            ValueError: invalid size or number of fields
+        """
+        if size < 1 or fields < 1:
+            raise ValueError(f"invalid value: ring buffer size and fields must be positive ({size}, {fields})")
+        self.size = size
+        self.count = 0
+        self._fields = [array("d", bytes(8 * size)) for _ in range(fields)]
+        self._next = 0
+
+    def append(self, *values: float) -> None:
+        """Append a point (overwrites the oldest point of a full buffer).
+        Args:
+            values (float): fields of the point
+        """
+        for column, value in zip(self._fields, values):
+            column[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def full(self) -> bool:
+        """Return True if the buffer is full (the next point overwrites the oldest one)."""
+        return self.count == self.size
+
+    def oldest(self) -> Optional[float]:
+        """Return the time of the oldest point.
+        Returns:
+            Optional[float]: time of the oldest point, None if the buffer is empty
+        """
+        if not self.count:
+            return None
+        return self._fields[0][(self._next - self.count) % self.size]
+
+    def points(self, since: float, resolution: float = 0.0) -> List[List[float]]:
+        """Return the points covering any time after since in chronological order (a point covers the interval
+        [time, time + resolution)).
+        Args:
+            since (float): start time (Unix time)
+            resolution (float): time interval covered by a point (sec)
+        Returns:
+            List[List[float]]: fields of the points
+        """
+        first = self._next - self.count
+        times = self._fields[0]
+        indices = [(first + i) % self.size for i in range(self.count)]
+        return [[column[i] for column in self._fields] for i in indices if times[i] + resolution > since]
+
+
+class _Tier:
+    """Downsampling tier of a series: the samples are aggregated into buckets of the resolution of the tier
+    (aligned to the Unix epoch), the closed buckets are stored in a ring buffer."""
+
+    resolution: float           # Time interval of a bucket (sec)
+    buffer: RingBuffer          # Closed buckets (time, avg, min, max)
+    _start: Optional[float]     # Start time of the open bucket (None = no open bucket)
+    _sum: float                 # Sum of the samples of the open bucket
+    _count: int                 # Number of samples of the open bucket
+    _min: float                 # Minimum of the samples of the open bucket
+    _max: float                 # Maximum of the samples of the open bucket
+
+    def __init__(self, resolution: float, size: int) -> None:
+        """Initialize an empty tier.
+        Args:
+            resolution (float): time interval of a bucket (sec)
+            size (int): number of closed buckets kept
+        """
+        self.resolution = resolution
+        self.buffer = RingBuffer(size, len(BUCKET_FIELDS))
+        self._start = None
+        self._sum = 0.0
+        self._count = 0
+        self._min = 0.0
+        self._max = 0.0
+
+    def add(self, time: float, value: float) -> None:
+        """Add a sample to its bucket. A sample of a new bucket closes the open bucket.
+        Args:
+            time (float): time of the sample (Unix time)
+            value (float): value of the sample
+        """
+        start = math.floor(time / self.resolution) * self.resolution
+        if self._start is not None and start != self._start:
+            self.buffer.append(self._start, self._sum / self._count, self._min, self._max)
+            self._start = None
+        if self._start is None:
+            self._start, self._sum, self._count, self._min, self._max = start, 0.0, 0, value, value
+        self._sum += value
+        self._count += 1
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+
+    def points(self, since: float) -> List[List[float]]:
+        """Return the buckets covering any time after since, including the open bucket.
+        Args:
+            since (float): start time (Unix time)
+        Returns:
+            List[List[float]]: (time, avg, min, max) of the buckets in chronological order
+        """
+        points = self.buffer.points(since, self.resolution)
+        if self._start is not None and self._start + self.resolution > since:
+            points.append([self._start, self._sum / self._count, self._min, self._max])
+        return points
+
+
+class SeriesHistory:
+    """History of a series: the raw samples and the downsampling tiers (see TIER_RESOLUTIONS)."""
+
+    raw: RingBuffer     # Raw samples (time, value)
+    tiers: List[_Tier]  # Bucket tiers from the finest to the coarsest
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty history.
+        Args:
+            size (int): number of points per tier
+        """
+        self.raw = RingBuffer(size, len(RAW_FIELDS))
+        self.tiers = [_Tier(resolution, size) for resolution in TIER_RESOLUTIONS[1:]]
+
+    @staticmethod
+    def memory(size: int) -> int:
+        """Return the memory of the ring buffers of a series (the memory of a series does not depend on the number
+        of its samples).
+        Args:
+            size (int): number of points per tier
+        Returns:
+            int: memory of the ring buffers (bytes)
+        """
+        return 8 * size * (len(RAW_FIELDS) + len(BUCKET_FIELDS) * (len(TIER_RESOLUTIONS) - 1))
+
+    def add(self, time: float, value: float) -> None:
+        """Add a sample to the raw samples and to the tiers.
+        Args:
+            time (float): time of the sample (Unix time)
+            value (float): value of the sample
+        """
+        self.raw.append(time, value)
+        for tier in self.tiers:
+            tier.add(time, value)
+
+    def query(self, since: float) -> Dict[str, Any]:
+        """Return the points after since from the finest tier holding the whole requested time range: a tier holds
+        it if it was not full yet (nothing was overwritten) or its oldest point is not newer than since. The
+        coarsest tier is used if no tier reaches back to since.
+        Args:
+            since (float): start time (Unix time)
+        Returns:
+            Dict[str, Any]: {"resolution": float, "fields": [...], "points": [[...], ...]}
+        """
+        if not self.raw.full() or since >= self.raw.oldest():
+            resolution, fields, points = TIER_RESOLUTIONS[0], RAW_FIELDS, self.raw.points(since)
+        else:
+            tier = next((t for t in self.tiers if not t.buffer.full() or since >= t.buffer.oldest()), self.tiers[-1])
+            resolution, fields, points = tier.resolution, BUCKET_FIELDS, tier.points(since)
+        return {"resolution": resolution, "fields": list(fields),
+                "points": [[round(v, 3) for v in point] for point in points]}
+
+
+class History:
+    """In-memory history of the service: the temperature of the fan controllers and of their devices, and the
+    applied fan level of the IPMI zones. It is fed with the snapshots published by the main loop (the single
+    writer) and queried by the exporter threads.
+
+    The series are named "<kind>/<name>":
+      - temp/<section>: temperature of a fan controller (e.g. temp/HD:1)
+      - temp/<section>/<device>: temperature of a device of a fan controller (e.g. temp/CPU/cpu0)
+      - level/<zone>: applied fan level of an IPMI zone (e.g. level/0)
+
+    Every tier of a series holds `size` points, so the memory of the history is bounded by the number of the
+    series (fixed by the configuration) and SeriesHistory.memory(size). When the series of the snapshots change
+    (e.g. a section or a device is renamed or removed at a configuration reload), the series not present in the
+    new snapshots are dropped.
+    """
+
+    size: int                           # Number of points per tier of a series
+    _series: Dict[str, SeriesHistory]   # History per series name
+    _layout: Set[str]                   # Series names of the last recorded snapshot
+    _lock: threading.Lock               # Lock between the writer and the reader threads
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty history.
+        Args:
+            size (int): number of points per tier of a series
+        Raises:
+            ValueError: invalid size
+        """
+        if size < 1:
+            raise ValueError(f"invalid value: history size must be positive ({size})")
+        self.size = size
+        self._series = {}
+        self._layout = set()
+        self._lock = threading.Lock()
+
+    def _add(self, layout: Set[str], name: str, time: float, value: Optional[float]) -> None:
+        """Add a sample to a series (the series is created by its first sample).
+        Args:
+            layout (Set[str]): series names of the snapshot, the name is added to it
+            name (str): name of the series
+            time (float): time of the sample (Unix time)
+            value (Optional[float]): value of the sample (None = the series has no sample in this snapshot)
+        """
+        layout.add(name)
+        if value is None:
+            return
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = SeriesHistory(self.size)
+        series.add(time, value)
+
+    def record(self, snapshot: Dict[str, Any]) -> None:
+        """Add the temperatures and the fan levels of a snapshot to the history (main loop only). A temperature of
+        0 C means no temperature (e.g. the controller has not polled yet, or its read hung), it is not recorded.
+        Args:
+            snapshot (Dict[str, Any]): snapshot dict built by build_snapshot()
+        """
+        time = float(snapshot.get("generated_at", 0.0))
+        layout: Set[str] = set()
+        with self._lock:
+            for c in snapshot.get("fan_controllers", []) or []:
+                section = c.get("section", "")
+                if c.get("type") != "const":
+                    temp = float(c.get("last_temp_c", 0.0))
+                    self._add(layout, f"{SERIES_TEMP}/{section}", time, temp if temp > 0.0 else None)
+                for d in c.get("devices", []) or []:
+                    temp = float(d.get("temp_c", 0.0))
+                    self._add(layout, f"{SERIES_TEMP}/{section}/{d.get('name', '')}", time,
+                              temp if temp > 0.0 else None)
+            for zone, z in (snapshot.get("zones", {}) or {}).items():
+                self._add(layout, f"{SERIES_LEVEL}/{zone}", time, float(z.get("applied_level_pct", 0)))
+            if layout != self._layout:
+                for name in [name for name in self._series if name not in layout]:
+                    del self._series[name]
+                self._layout = layout
+
+    def names(self) -> List[str]:
+        """Return the names of the series (any thread).
+        Returns:
+            List[str]: names of the series in creation order
+        """
+        with self._lock:
+            return list(self._series)
+
+    def query(self, names: List[str], since: float = 0.0) -> Dict[str, Any]:
+        """Return the points of series after a start time (any thread, see SeriesHistory.query()).
+        Args:
+            names (List[str]): names of the series (empty = all series)
+            since (float): start time (Unix time, a negative value is relative to the current time)
+        Returns:
+            Dict[str, Any]: {"version": int, "since": float, "series": {name: {...}, ...}}
+        Raises:
+            KeyError: unknown series name
+        """
+        if since < 0:
+            since += clock.time()
+        with self._lock:
+            for name in names:
+                if name not in self._series:
+                    raise KeyError(name)
+            selected = names or list(self._series)
+            return {"version": HISTORY_SCHEMA_VERSION, "since": since,
+                    "series": {name: self._series[name].query(since) for name in selected}}
+
+
+# End.
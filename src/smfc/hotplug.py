@@ -0,0 +1,107 @@
+#
+#   hotplug.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.HotplugMonitor() class implementation: re-resolves hwmon paths on udev hotplug events.
+#
+from typing import List, Optional, Union
+from pyudev import Context, Device, Monitor, MonitorObserver
+from smfc.constfc import ConstFc
+from smfc.fancontroller import FanController
+from smfc.hwmon import HwmonIndex
+from smfc.log import Log
+
+
+class HotplugMonitor:
+    """Background udev monitor keeping the hwmon paths of the fan controllers up to date.
+
+    The `hwmonN` index of a device changes after a drive swap, an HBA reset or a kernel module reload. Without
+    this monitor the reads of the old path fail until the error_tolerance budget runs out and the service exits.
+    The monitor listens to the `add`, `remove` and `change` events of the `hwmon` and `block` subsystems in a
+    background thread, and re-resolves the hwmon paths of the fan controllers on every event.
+    """
+
+    SUBSYSTEMS: List[str] = ["hwmon", "block"]          # Monitored udev subsystems
+    ACTIONS: List[str] = ["add", "remove", "change"]    # Monitored udev actions
+
+    log: Log                                            # Reference to a Log class instance
+    udevc: Context                                      # Reference to a pyudev Context instance
+    controllers: List[Union[FanController, ConstFc]]    # Fan controllers to be updated
+    hwmon_index: Optional[HwmonIndex]                   # Shared hwmon index of the fan controllers (if any)
+    events: int                                         # Number of processed udev events
+    refreshes: int                                      # Number of hwmon path changes applied to controllers
+    _observer: Optional[MonitorObserver]                # Background thread of the udev monitor
+
+    def __init__(self, log: Log, udevc: Context, controllers: List[Union[FanController, ConstFc]],
+                 hwmon_index: Optional[HwmonIndex] = None) -> None:
+        """Initialize the hotplug monitor (the background thread is started by `start()`).
+        Args:
+            log (Log): reference to a Log class instance
+            udevc (Context): reference to a pyudev Context instance
+            controllers (List[Union[FanController, ConstFc]]): fan controllers to be updated
+            hwmon_index (Optional[HwmonIndex]): shared hwmon index, rebuilt once per event before the refresh
+        """
+        self.log = log
+        self.udevc = udevc
+        self.controllers = controllers
+        self.hwmon_index = hwmon_index
+        self.events = 0
+        self.refreshes = 0
+        self._observer = None
+
+    def start(self) -> None:
+        """Create a netlink udev monitor and start its background thread.
+        Raises:
+            OSError: the netlink socket cannot be created (e.g. missing permission in a container)
+        """
+        monitor = Monitor.from_netlink(self.udevc)
+        for subsystem in self.SUBSYSTEMS:
+            monitor.filter_by(subsystem)
+        self._observer = MonitorObserver(monitor, callback=self._handle_event, name="smfc-hotplug")
+        self._observer.daemon = True
+        self._observer.start()
+        self.log.msg(Log.LOG_INFO, f"Hotplug monitor started (subsystems: {', '.join(self.SUBSYSTEMS)}).")
+
+    def stop(self) -> None:
+        """Stop the background thread (no-op if not started)."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+    def _handle_event(self, device: Device) -> None:
+        """Process one udev event (called in the background thread).
+        Args:
+            device (Device): the udev device of the event
+        """
+        if device.action not in self.ACTIONS:
+            return
+        self.events += 1
+        if self.log.log_level >= Log.LOG_DEBUG:
+            self.log.msg(Log.LOG_DEBUG, f"Hotplug event: {device.action} {device.subsystem} {device.sys_path}")
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Rebuild the shared hwmon index (if any) and re-resolve the hwmon paths of all fan controllers. An
+        exception is logged and does not stop the monitor thread.
+        Returns:
+            int: number of controllers with changed hwmon paths
+        """
+        changed = 0
+        if self.hwmon_index is not None:
+            try:
+                self.hwmon_index.rebuild()
+            except Exception as e:  # pylint: disable=broad-except
+                self.log.msg(Log.LOG_ERROR, f"Cannot rebuild the hwmon index ({e}).")
+                return 0
+        for fc in self.controllers:
+            if not isinstance(fc, FanController):
+                continue
+            try:
+                if fc.refresh_hwmon_paths(self.udevc):
+                    changed += 1
+            except Exception as e:  # pylint: disable=broad-except
+                self.log.msg(Log.LOG_ERROR, f"{fc.name}: cannot refresh hwmon paths ({e}).")
+        self.refreshes += changed
+        return changed
+
+
+# End.
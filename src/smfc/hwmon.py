@@ -0,0 +1,70 @@
+#
+#   hwmon.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.HwmonIndex() class implementation: hwmon device index built by a single udev enumeration.
+#
+import os
+from typing import Dict, List, Optional
+from pyudev import Context, Device
+
+
+class HwmonIndex:
+    """Index of the hwmon devices keyed by the sys_path of their ancestor devices.
+
+    `FanController.get_hwmon_path()` runs a separate `list_devices(subsystem="hwmon", parent=...)` udev query
+    for every device, which dominates the startup time on hosts with many disks. This index enumerates the
+    hwmon subsystem only once and answers the same question with a dictionary lookup: every hwmon device is
+    registered under its own sys_path and under the sys_path of all its ancestors, so a parent device (e.g.
+    the SCSI device of a disk or the PCI device of an NVMe drive) finds the hwmon devices in its subtree. The
+    index is built lazily at the first lookup and can be rebuilt (e.g. after a udev hotplug event).
+    """
+
+    DEVICES_ROOT: str = "/sys/devices"  # Root of the device hierarchy in sysfs
+
+    udevc: Context                              # Reference to a pyudev Context instance
+    _index: Optional[Dict[str, List[str]]]      # Ancestor sys_path -> hwmon sys_paths (None = not built yet)
+
+    def __init__(self, udevc: Context) -> None:
+        """Initialize an empty (not yet built) hwmon index.
+        Args:
+            udevc (Context): reference to a pyudev Context instance
+        """
+        self.udevc = udevc
+        self._index = None
+
+    def rebuild(self) -> None:
+        """Enumerate the hwmon subsystem once and (re)build the index."""
+        index: Dict[str, List[str]] = {}
+        for hwmon in self.udevc.list_devices(subsystem="hwmon"):
+            for path in self._ancestors(hwmon.sys_path):
+                index.setdefault(path, []).append(hwmon.sys_path)
+        self._index = index
+
+    @classmethod
+    def _ancestors(cls, sys_path: str) -> List[str]:
+        """Return a sys_path together with the sys_paths of all its ancestors below the device root.
+        Args:
+            sys_path (str): sys_path of a device
+        Returns:
+            List[str]: the sys_path itself, then its parent directories up to (excluding) the device root
+        """
+        paths = []
+        while len(sys_path) > len(cls.DEVICES_ROOT) and sys_path.startswith(cls.DEVICES_ROOT):
+            paths.append(sys_path)
+            sys_path = os.path.dirname(sys_path)
+        return paths
+
+    def get_hwmon_path(self, parent_dev: Device) -> str:
+        """Get the HWMON path of a given parent device (same result as `FanController.get_hwmon_path()`).
+        Args:
+            parent_dev (Device): parent device
+        Returns:
+            str: path for a HWMON device (empty string if not found or if more than one found)
+        """
+        if self._index is None:
+            self.rebuild()
+        hwmons = self._index.get(parent_dev.sys_path, [])
+        return os.path.join(hwmons[0], "temp1_input") if len(hwmons) == 1 else ""
+
+
+# End.
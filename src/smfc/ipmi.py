@@ -4,8 +4,8 @@
 #   smfc.Ipmi() class implementation.
 #
 import subprocess
-import time
-from typing import List
+from typing import Dict, List
+from smfc import clock
 from smfc.log import Log
 from smfc.platform import FanMode, Platform
 from smfc.platform_factory import create_platform
@@ -27,6 +27,7 @@ class Ipmi:
     bmc_product_id: int             # BMC product ID
     bmc_product_name: str           # BMC product name
     platform: Platform              # Platform implementation for fan control
+    zone_writes: Dict[int, int]     # Fan level writes issued per IPMI zone (monotonic counters)
 
     # Backward-compatible fan mode constants (use FanMode enum for new code):
     STANDARD_MODE: int = FanMode.STANDARD
@@ -69,6 +70,7 @@ class Ipmi:
         self.config = cfg
         self.log = log
         self.sudo = sudo
+        self.zone_writes = {}
 
         # Validate configuration
         # Check 1: fan_mode_delay must be positive.
@@ -97,7 +99,7 @@ class Ipmi:
                 # (in 5 seconds steps), otherwise reraise the exception.
                 if "ipmitool" in e.args[0]:
                     self.log.msg(Log.LOG_INFO, "BMC is not ready, waiting 5 seconds.")
-                    time.sleep(5)
+                    clock.sleep(5)
                     bmc_timeout += 5
                     if bmc_timeout < bmc_init_timeout:
                         continue
@@ -110,7 +112,7 @@ class Ipmi:
                 self.log.msg(Log.LOG_INFO, "BMC fan sensors still not ready after timeout, continuing.")
                 break
             self.log.msg(Log.LOG_INFO, "BMC fan sensors are not ready, waiting 5 seconds.")
-            time.sleep(5)
+            clock.sleep(5)
             bmc_timeout += 5
 
         # Retrieve and parse BMC information.
@@ -156,6 +158,7 @@ class Ipmi:
                 if self.config.exit_level == Config.EXIT_LEVEL_NONE else ""
             self.log.msg(Log.LOG_CONFIG, f"   {Config.CV_IPMI_EXIT_LEVEL} = "
                                          f"{self.config.exit_level}{exit_level_suffix}")
+            self.log.msg(Log.LOG_CONFIG, f"   {Config.CV_IPMI_COMMAND_TIMEOUT} = {self.config.command_timeout}")
             self.log.msg(Log.LOG_CONFIG, "BMC information:")
             self.log.msg(Log.LOG_CONFIG, f"   manufacturer name (id) = {self.bmc_manufacturer_name} "
                                          f"({self.bmc_manufacturer_id})")
@@ -194,7 +197,8 @@ class Ipmi:
             subprocess.CompletedProcess: result of the executed subprocess
         Raises:
             FileNotFoundError: ipmitool cannot be found
-            RuntimeError: ipmitool execution problem (e.g. non-root user, incompatible IPMI system/motherboard)
+            RuntimeError: ipmitool execution problem (e.g. non-root user, incompatible IPMI system/motherboard) or
+                          timeout
         """
         r: subprocess.CompletedProcess  # result of the executed process
         arguments: List[str]  # Command arguments
@@ -213,8 +217,13 @@ class Ipmi:
         arguments.extend(args)
         if hasattr(self, "log") and self.log.log_level >= Log.LOG_DEBUG:
             self.log.msg(Log.LOG_DEBUG, f"ipmitool exec: {' '.join(arguments)}")
-        # May raise FileNotFoundError if ipmitool is not found.
-        r = subprocess.run(arguments, check=False, capture_output=True, text=True)
+        # May raise FileNotFoundError if ipmitool is not found. A hung ipmitool (e.g. an unresponsive BMC) is killed
+        # after the timeout.
+        try:
+            r = subprocess.run(arguments, check=False, capture_output=True, text=True,
+                               timeout=self.config.command_timeout or None)
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"ipmitool timed out after {self.config.command_timeout}s.") from e
         if hasattr(self, "log") and self.log.log_level >= Log.LOG_DEBUG:
             self.log.msg(Log.LOG_DEBUG, f"ipmitool result: rc={r.returncode} stdout='{r.stdout.strip()}'")
         # Check error code.
@@ -271,7 +280,7 @@ class Ipmi:
             self.log.msg(Log.LOG_DEBUG, f"Setting fan mode to {self.get_fan_mode_name(mode)} ({mode})")
         self.platform.set_fan_mode(mode)
         # Give time for IPMI system/fans to apply changes in the new fan mode.
-        time.sleep(self.config.fan_mode_delay)
+        clock.sleep(self.config.fan_mode_delay)
 
     def set_fan_level(self, zone: int, level: int) -> None:
         """Set the fan level in the specified IPMI zone.
@@ -286,8 +295,9 @@ class Ipmi:
         if hasattr(self, "log") and self.log.log_level >= Log.LOG_DEBUG:
             self.log.msg(Log.LOG_DEBUG, f"Setting fan level: zone={zone} level={level}%")
         self.platform.set_fan_level(zone, level)
+        self._count_writes([zone])
         # Give time for IPMI and fans to spin up/down.
-        time.sleep(self.config.fan_level_delay)
+        clock.sleep(self.config.fan_level_delay)
 
     def set_multiple_fan_levels(self, zone_list: List[int], level: int) -> None:
         """Set the fan level in multiple IPMI zones.
@@ -300,8 +310,17 @@ class Ipmi:
             RuntimeError: ipmitool execution problem (e.g. non-root user, incompatible IPMI system/motherboard)
         """
         self.platform.set_multiple_fan_levels(zone_list, level)
+        self._count_writes(zone_list)
         # Give time for IPMI and fans to spin up/down.
-        time.sleep(self.config.fan_level_delay)
+        clock.sleep(self.config.fan_level_delay)
+
+    def _count_writes(self, zone_list: List[int]) -> None:
+        """Count a successful fan level write in the IPMI zones (published as smfc_zone_ipmi_writes_total).
+        Args:
+            zone_list (List[int]): List of IPMI zones
+        """
+        for zone in zone_list:
+            self.zone_writes[zone] = self.zone_writes.get(zone, 0) + 1
 
     def get_fan_level(self, zone: int) -> int:
         """Get the current fan level in a specific IPMI zone.
@@ -3,9 +3,10 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.NvmeFc() class implementation.
 #
-from typing import List
+from typing import List, Optional
 from pyudev import Context, Devices, DeviceNotFoundByFileError
 from smfc.fancontroller import FanController
+from smfc.hwmon import HwmonIndex
 from smfc.ipmi import Ipmi
 from smfc.log import Log
 from smfc.config import NvmeConfig
@@ -19,7 +20,8 @@ class NvmeFc(FanController):
     # NvmeFc specific parameters.
     nvme_device_names: List[str]    # Device names of the NVMe drives in '/dev/disk/by-id/...' format.
 
-    def __init__(self, log: Log, udevc: Context, ipmi: Ipmi, cfg: NvmeConfig) -> None:
+    def __init__(self, log: Log, udevc: Context, ipmi: Ipmi, cfg: NvmeConfig,
+                 hwmon_index: Optional[HwmonIndex] = None) -> None:
         """Initialize the NVME fan controller class and raise exception in case of invalid configuration.
 
         Args:
@@ -27,12 +29,14 @@ class NvmeFc(FanController):
             udevc (Context): reference to an udev database connection (instance of Context from pyudev)
             ipmi (Ipmi): reference to an Ipmi class instance
             cfg (NvmeConfig): NVME fan controller configuration
+            hwmon_index (Optional[HwmonIndex]): shared hwmon index (None = one udev query per device)
 
         Raises:
             ValueError: invalid configuration parameters (e.g. device not reachable)
         """
         # Store config reference first (required by base class)
         self.config = cfg
+        self.hwmon_index = hwmon_index
 
         # Save NvmeFc class-specific parameters (validation done in Config).
         self.nvme_device_names = cfg.nvme_names
@@ -47,7 +51,7 @@ class NvmeFc(FanController):
                 raise ValueError(f"nvme_names= parameter error: '{name}' cannot be reached."
                         ) from DeviceNotFoundByFileError
             # Get the hwmon path for NVMe device.
-            hwmon = self.get_hwmon_path(udevc, block_dev.parent)
+            hwmon = self.get_hwmon_path(udevc, block_dev.parent, self.hwmon_index)
             if not hwmon:
                 raise ValueError(f"nvme_names= parameter error: '{name}' has no hwmon path.")
             self.hwmon_path.append(hwmon)
@@ -59,6 +63,23 @@ class NvmeFc(FanController):
         if self.log.log_level >= Log.LOG_CONFIG:
             self.log.msg(Log.LOG_CONFIG, f"   nvme_names = {self.nvme_device_names}")
 
+    def resolve_hwmon_paths(self, udevc: Context) -> List[str]:
+        """Resolve the hwmon paths of the NVMe devices from the udev database again.
+        Args:
+            udevc (Context): pyudev Context
+        Returns:
+            List[str]: list of hwmon paths (empty string for devices not found)
+        """
+        paths: List[str] = []
+        for name in self.nvme_device_names:
+            try:
+                block_dev = Devices.from_device_file(udevc, name)
+            except DeviceNotFoundByFileError:
+                paths.append("")
+                continue
+            paths.append(self.get_hwmon_path(udevc, block_dev.parent, self.hwmon_index))
+        return paths
+
     def device_names(self) -> List[str]:
         """Return per-NVMe device labels (configured nvme_names) matching last_per_device_temps positionally."""
         return list(self.nvme_device_names)
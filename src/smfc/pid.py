@@ -0,0 +1,100 @@
+#
+#   pid.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.PidController() class implementation: PID control mode of the fan controllers.
+#
+from typing import Optional
+
+
+class PidController:
+    """Discrete PID controller calculating a fan level from a temperature and a target temperature.
+
+    The error is `temperature - target`, so a temperature above the target increases the fan level. The output
+    is the fan level itself: the integral term holds the steady-state fan level (it starts from `out_min`), the
+    proportional and the derivative terms move the level around it. The controller has the following features:
+
+    * the output is clamped to `[out_min..out_max]`,
+    * anti-windup: while the error pushes the output into saturation, the integral term grows only until the
+      output reaches the limit (so it does not wind up), and the integral term itself is clamped to
+      `[out_min..out_max]`,
+    * the derivative term is calculated on the temperature (not on the error), and it is filtered by a first-order
+      low-pass filter with `d_filter` time constant, so sensor noise and a changed target do not cause spikes.
+
+    The time between two updates is measured by the caller's timestamps, so the controller works with any polling
+    interval. The first update has no integral and derivative contribution.
+    """
+
+    target: float                   # Target temperature (C)
+    kp: float                       # Proportional gain (%/C)
+    ki: float                       # Integral gain (%/(C*sec))
+    kd: float                       # Derivative gain (%*sec/C)
+    d_filter: float                 # Time constant of the derivative low-pass filter (sec, 0=disabled)
+    out_min: float                  # Minimum output (fan level, %)
+    out_max: float                  # Maximum output (fan level, %)
+    integral: float                 # Integral term (%)
+    derivative: float               # Filtered derivative of the temperature (C/sec)
+    _last_temp: Optional[float]     # Temperature of the previous update (None = no update yet)
+    _last_time: Optional[float]     # Timestamp of the previous update (None = no update yet)
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, target: float, kp: float, ki: float, kd: float, d_filter: float,
+                 out_min: float, out_max: float) -> None:
+        """Initialize the PID controller.
+        Args:
+            target (float): target temperature (C)
+            kp (float): proportional gain (%/C)
+            ki (float): integral gain (%/(C*sec))
+            kd (float): derivative gain (%*sec/C)
+            d_filter (float): time constant of the derivative low-pass filter (sec, 0=disabled)
+            out_min (float): minimum output (fan level, %)
+            out_max (float): maximum output (fan level, %)
+        Raises:
+            ValueError: out_max < out_min
+        """
+        if out_max < out_min:
+            raise ValueError(f"invalid value: out_max < out_min ({out_max} < {out_min})")
+        self.target = target
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.d_filter = d_filter
+        self.out_min = out_min
+        self.out_max = out_max
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the state of the controller (the integral term starts from the minimum output)."""
+        self.integral = self.out_min
+        self.derivative = 0.0
+        self._last_temp = None
+        self._last_time = None
+
+    def update(self, temp: float, now: float) -> float:
+        """Calculate the output for a new temperature.
+        Args:
+            temp (float): current temperature (C)
+            now (float): timestamp of the temperature (sec, e.g. time.monotonic())
+        Returns:
+            float: the output clamped to [out_min..out_max] (fan level, %)
+        """
+        error = temp - self.target
+        dt = now - self._last_time if self._last_time is not None else 0.0
+        integral = self.integral
+        if dt > 0:
+            raw_derivative = (temp - self._last_temp) / dt
+            alpha = dt / (self.d_filter + dt) if self.d_filter > 0 else 1.0
+            self.derivative += alpha * (raw_derivative - self.derivative)
+            integral += self.ki * error * dt
+        self._last_temp = temp
+        self._last_time = now
+        pd = self.kp * error + self.kd * self.derivative
+        # Anti-windup: the integral term grows only until the output reaches the saturation.
+        if pd + integral > self.out_max and error > 0:
+            integral = min(integral, max(self.integral, self.out_max - pd))
+        elif pd + integral < self.out_min and error < 0:
+            integral = max(integral, min(self.integral, self.out_min - pd))
+        self.integral = min(max(integral, self.out_min), self.out_max)
+        return min(max(pd + self.integral, self.out_min), self.out_max)
+
+
+# End.
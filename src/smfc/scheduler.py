@@ -0,0 +1,133 @@
+#
+#   scheduler.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.Scheduler() class implementation: deadline-driven scheduler of the main loop.
+#
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+from smfc import clock
+
+
+@dataclass
+class ScheduledJob:
+    """A periodic job of the scheduler."""
+    name: str           # Name of the job (used for logging)
+    period: float       # Period of the job (sec, 0 = every wakeup)
+    target: Any         # Object handed back to the caller when the job is due (e.g. a fan controller)
+    deadline: float     # monotonic() timestamp of the next run
+    runs: int = 0       # Number of times the job was due
+
+
+class Scheduler:
+    """Deadline-driven scheduler of the periodic jobs of the main loop.
+
+    The jobs (fan controller polls, fan mode checks, etc.) are kept in a heap ordered by their next deadline.
+    `wait()` sleeps until exactly the earliest deadline and returns all jobs due by then, so the process wakes
+    up only when there is something to do. The deadlines advance by whole periods from the first deadline
+    (fixed rate), so a late wakeup does not shift the phase of the later runs; runs missed because of an
+    overrunning iteration are skipped, not replayed. An optional phase offset delays the first deadline of a
+    job, so expensive polls with the same period do not fall on the same tick.
+    """
+
+    _heap: List[Tuple[float, int, ScheduledJob]]    # Heap of (deadline, sequence number, job)
+    _seq: int                                       # Sequence number (keeps the insertion order on equal deadlines)
+    _sleep_func: Optional[Callable[[float], Any]]   # Sleep function of wait() (None = clock.sleep())
+    wakeups: int                                    # Number of wait() calls
+    max_lateness: float                             # Largest delay of a job behind its deadline (sec)
+
+    def __init__(self, sleep_func: Optional[Callable[[float], Any]] = None) -> None:
+        """Initialize an empty scheduler.
+        Args:
+            sleep_func (Optional[Callable[[float], Any]]): sleep function of wait(), e.g. `threading.Event.wait`
+                for an interruptible sleep (default: clock.sleep())
+        """
+        self._heap = []
+        self._sleep_func = sleep_func
+        self._seq = 0
+        self.wakeups = 0
+        self.max_lateness = 0.0
+
+    def add(self, name: str, period: float, target: Any, offset: float = 0.0) -> ScheduledJob:
+        """Add a periodic job. The first deadline is `offset` seconds from now.
+        Args:
+            name (str): name of the job
+            period (float): period of the job (sec, 0 = due at every wakeup)
+            target (Any): object returned by wait() when the job is due
+            offset (float): phase offset of the job (sec)
+        Returns:
+            ScheduledJob: the new job
+        Raises:
+            ValueError: negative period or offset
+        """
+        if period < 0:
+            raise ValueError(f"invalid value: period < 0 ({period})")
+        if offset < 0:
+            raise ValueError(f"invalid value: offset < 0 ({offset})")
+        job = ScheduledJob(name=name, period=period, target=target, deadline=clock.monotonic() + offset)
+        self._push(job)
+        return job
+
+    def _push(self, job: ScheduledJob) -> None:
+        """Push a job to the heap with its current deadline.
+        Args:
+            job (ScheduledJob): the job
+        """
+        heapq.heappush(self._heap, (job.deadline, self._seq, job))
+        self._seq += 1
+
+    def jobs(self) -> List[ScheduledJob]:
+        """Return the jobs in the order of their next deadline.
+        Returns:
+            List[ScheduledJob]: list of jobs
+        """
+        return [job for _, _, job in sorted(self._heap)]
+
+    def next_deadline(self) -> float:
+        """Return the earliest deadline.
+        Returns:
+            float: monotonic() timestamp of the earliest deadline
+        Raises:
+            IndexError: the scheduler has no jobs
+        """
+        return self._heap[0][0]
+
+    def pop_due(self, now: float) -> List[ScheduledJob]:
+        """Remove the jobs due at `now` from the heap, reschedule them, and return them in deadline order.
+        Args:
+            now (float): monotonic() timestamp
+        Returns:
+            List[ScheduledJob]: list of due jobs (empty if none)
+        """
+        due: List[ScheduledJob] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+            self.max_lateness = max(self.max_lateness, now - job.deadline)
+            job.runs += 1
+            due.append(job)
+        for job in due:
+            if job.period > 0:
+                # Next deadline is the first slot in the phase of the job after `now` (missed slots are skipped).
+                job.deadline += job.period * (int((now - job.deadline) // job.period) + 1)
+            else:
+                job.deadline = now
+            self._push(job)
+        return due
+
+    def wait(self) -> List[Any]:
+        """Sleep until the earliest deadline and return the targets of all jobs due by then. The sleep is
+        executed even if a deadline has already passed (with zero length), so every call yields the CPU.
+        Returns:
+            List[Any]: targets of the due jobs in deadline order
+        Raises:
+            IndexError: the scheduler has no jobs
+        """
+        deadline = self.next_deadline()
+        sleep = self._sleep_func if self._sleep_func is not None else clock.sleep
+        sleep(max(deadline - clock.monotonic(), 0.0))
+        self.wakeups += 1
+        # A wakeup before the deadline (e.g. an interrupted sleep) still dispatches the earliest job.
+        return [job.target for job in self.pop_due(max(clock.monotonic(), deadline))]
+
+
+# End.
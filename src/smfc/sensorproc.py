@@ -0,0 +1,289 @@
+#
+#   sensorproc.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.SensorProcess() class implementation: sensor reads in supervised child processes.
+#
+import multiprocessing
+import signal
+import subprocess
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class SensorHangError(TimeoutError):
+    """A sensor read did not finish in the sensor process before its deadline (the process was replaced)."""
+
+
+def _execute(request: Tuple[Any, ...]) -> Any:
+    """Execute one request in the sensor process.
+    Args:
+        request (Tuple[Any, ...]): ('read', path) or ('run', args, timeout)
+    Returns:
+        Any: content of the file, or (returncode, stdout, stderr) of the command
+    Raises:
+        OSError: file or command error
+        TimeoutError: the command timed out
+        ValueError: unknown request
+    """
+    if request[0] == "read":
+        with open(request[1], "r", encoding="UTF-8") as f:
+            return f.read()
+    if request[0] == "run":
+        args, timeout = request[1], request[2]
+        try:
+            r = subprocess.run(args, check=False, capture_output=True, text=True, timeout=timeout or None)
+        except subprocess.TimeoutExpired as e:
+            raise TimeoutError(f"ERROR: command timed out after {timeout}s: {' '.join(args)}") from e
+        return r.returncode, r.stdout, r.stderr
+    raise ValueError(f"unknown request: {request[0]}")
+
+
+def _serve(conn: Connection) -> None:
+    """Main function of the sensor process: execute the requests of the service until the pipe is closed.
+    Args:
+        conn (Connection): child end of the pipe
+    """
+    # The service handles the signals, the sensor process is stopped by closing the pipe or killing it.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send(("ok", _execute(request)))
+        except Exception as e:  # pylint: disable=broad-except
+            conn.send(("error", e))
+
+
+class _SensorChannel:  # pylint: disable=too-few-public-methods
+    """A sensor process with its pipe and lock, serving the requests of one fan controller."""
+
+    name: str                                           # Name of the channel (name of the fan controller)
+    lock: threading.Lock                                # Serializes the requests of the channel
+    process: Optional[multiprocessing.process.BaseProcess]  # The sensor process (None = not started)
+    conn: Optional[Connection]                          # Parent end of the pipe
+
+    def __init__(self, name: str) -> None:
+        """Initialize the channel (the process is started by spawn()).
+        Args:
+            name (str): name of the channel
+        """
+        self.name = name
+        self.lock = threading.Lock()
+        self.process = None
+        self.conn = None
+
+    def spawn(self, ctx: Any) -> None:
+        """Start a new sensor process.
+        Args:
+            ctx (Any): multiprocessing context
+        """
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child_conn,), name=f"smfc-sensors-{self.name}", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def terminate(self, kill: bool = False) -> None:
+        """Close the pipe and stop the sensor process (killed if it does not exit in time).
+        Args:
+            kill (bool): kill the process immediately (e.g. it is stuck in a read)
+        """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            if not kill:
+                self.process.join(0.5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(0.5)
+            self.process = None
+
+
+class SensorProcess:
+    """Supervised child processes executing the temperature reads (hwmon files, `smartctl` and SMI commands).
+
+    A read of a dying disk or a command against a wedged HBA may put the reading process into uninterruptible
+    sleep (D state). The sensor process takes this risk instead of the service: every request is sent over a
+    pipe and the answer is awaited with a deadline. If the deadline expires, the stuck process is killed (a
+    process in D state exits only when its I/O completes, so it is left behind), a new process is started for
+    the next request, and SensorHangError is raised, so the fan controller can apply a safe fan level.
+
+    Every fan controller has its own channel (a sensor process with its pipe and lock), so a slow `smartctl`
+    of the HD controller does not delay the reads of the other controllers in any execution mode. The requests
+    of a channel are serialized, and the wait for the channel is limited by the deadline of the request too.
+    """
+
+    DEFAULT_CHANNEL: str = "default"                    # Channel of the requests without a channel name
+
+    timeout: float                                      # Deadline of a file read (sec), added to command deadlines
+    hangs: int                                          # Number of requests exceeding their deadline
+    respawns: int                                       # Number of replaced sensor processes
+    _lock: threading.Lock                               # Protects the channel table and the counters
+    _ctx: Any                                           # multiprocessing context
+    _channels: Dict[str, _SensorChannel]                # Channels by name
+
+    def __init__(self, timeout: float) -> None:
+        """Initialize the instance (the processes are started by start() or at the first request of a channel).
+        Args:
+            timeout (float): deadline of a file read (sec), also the grace time added to command deadlines
+        Raises:
+            ValueError: timeout <= 0
+        """
+        if timeout <= 0:
+            raise ValueError(f"invalid value: timeout <= 0 ({timeout})")
+        self.timeout = timeout
+        self.hangs = 0
+        self.respawns = 0
+        self._lock = threading.Lock()
+        # A spawned process does not inherit the threads (exporter, hotplug monitor) of the service.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._channels = {}
+
+    def start(self, channels: Iterable[str] = (DEFAULT_CHANNEL,)) -> None:
+        """Start the sensor processes of the channels (if they are not running).
+        Args:
+            channels (Iterable[str]): names of the channels
+        Raises:
+            SensorHangError: a channel is still busy after the deadline
+        """
+        for name in channels:
+            channel = self._channel(name)
+            self._acquire(channel, self.timeout)
+            try:
+                if channel.process is None:
+                    channel.spawn(self._ctx)
+            finally:
+                channel.lock.release()
+
+    def stop(self) -> None:
+        """Stop the sensor processes: close the pipes and wait shortly for their exit, then kill them. A channel
+        still busy after the deadline is killed without waiting for its request."""
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            locked = channel.lock.acquire(timeout=self.timeout)
+            try:
+                channel.terminate(kill=not locked)
+            finally:
+                if locked:
+                    channel.lock.release()
+
+    @property
+    def pids(self) -> Dict[str, int]:
+        """Return the process ids of the running sensor processes by channel name."""
+        with self._lock:
+            channels = list(self._channels.values())
+        return {c.name: c.process.pid for c in channels if c.process is not None}
+
+    def _channel(self, name: str) -> _SensorChannel:
+        """Return the channel of a name (created at the first use).
+        Args:
+            name (str): name of the channel
+        Returns:
+            _SensorChannel: the channel
+        """
+        with self._lock:
+            channel = self._channels.get(name)
+            if channel is None:
+                channel = self._channels[name] = _SensorChannel(name)
+            return channel
+
+    def _count(self, hangs: int = 0, respawns: int = 0) -> None:
+        """Increment the counters (the channels are used from several threads).
+        Args:
+            hangs (int): number of new hangs
+            respawns (int): number of new sensor processes
+        """
+        with self._lock:
+            self.hangs += hangs
+            self.respawns += respawns
+
+    def _acquire(self, channel: _SensorChannel, timeout: float) -> None:
+        """Wait for the lock of a channel until the deadline.
+        Args:
+            channel (_SensorChannel): the channel
+            timeout (float): deadline of the wait (sec)
+        Raises:
+            SensorHangError: the channel is still busy after the deadline
+        """
+        if not channel.lock.acquire(timeout=timeout):
+            self._count(hangs=1)
+            raise SensorHangError(f"ERROR: sensor channel {channel.name} is still busy after {timeout}s")
+
+    def _request(self, channel_name: str, request: Tuple[Any, ...], timeout: float) -> Any:
+        """Send a request to the sensor process of a channel and wait for its answer.
+        Args:
+            channel_name (str): name of the channel
+            request (Tuple[Any, ...]): the request
+            timeout (float): deadline of the answer and of the wait for the channel (sec, > 0)
+        Returns:
+            Any: the result of the request
+        Raises:
+            SensorHangError: the channel is busy or no answer arrived before the deadline (the process is replaced)
+            OSError: the sensor process terminated unexpectedly (it is replaced at the next request)
+            Exception: the exception raised by the request in the sensor process
+        """
+        channel = self._channel(channel_name)
+        self._acquire(channel, timeout)
+        try:
+            if channel.process is None:
+                channel.spawn(self._ctx)
+            elif not channel.process.is_alive():
+                channel.terminate()
+                channel.spawn(self._ctx)
+                self._count(respawns=1)
+            try:
+                channel.conn.send(request)
+                answer = channel.conn.recv() if channel.conn.poll(timeout) else None
+            except (EOFError, OSError) as e:
+                raise OSError(f"ERROR: sensor process terminated unexpectedly ({e!r})") from e
+            if answer is None:
+                channel.terminate(kill=True)
+                channel.spawn(self._ctx)
+                self._count(hangs=1, respawns=1)
+                target = request[1] if isinstance(request[1], str) else " ".join(request[1])
+                raise SensorHangError(f"ERROR: sensor read did not finish in {timeout}s: {target}")
+        finally:
+            channel.lock.release()
+        status, value = answer
+        if status == "error":
+            raise value
+        return value
+
+    def read_file(self, path: str, channel: str = DEFAULT_CHANNEL) -> str:
+        """Read a (sysfs) file in the sensor process of a channel.
+        Args:
+            path (str): path of the file
+            channel (str): name of the channel (name of the fan controller)
+        Returns:
+            str: content of the file
+        Raises:
+            SensorHangError: the read did not finish before the deadline
+            OSError: file error
+        """
+        return self._request(channel, ("read", path), self.timeout)
+
+    def run_command(self, args: List[str], timeout: float, channel: str = DEFAULT_CHANNEL
+                    ) -> subprocess.CompletedProcess:
+        """Execute an external command in the sensor process of a channel, see FanController.run_command(). The
+        answer is awaited until the command deadline plus the deadline of the sensor process, so a command without
+        a deadline is awaited for the deadline of the sensor process only.
+        Args:
+            args (List[str]): command and its arguments
+            timeout (float): deadline of the command (sec, 0 = no deadline)
+            channel (str): name of the channel (name of the fan controller)
+        Returns:
+            subprocess.CompletedProcess: result of the executed subprocess
+        Raises:
+            SensorHangError: the command did not finish (or could not be killed) before the deadline
+            FileNotFoundError: command not found
+            TimeoutError: the command timed out
+        """
+        returncode, stdout, stderr = self._request(channel, ("run", args, timeout), timeout + self.timeout)
+        return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+# End.
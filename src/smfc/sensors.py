@@ -0,0 +1,165 @@
+#
+#   sensors.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.SensorRegistry() class implementation: shared, deduplicated temperature cache.
+#
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+from smfc import clock
+
+
+@dataclass
+class SensorEntry:
+    """Cached state of one physical temperature sensor."""
+    key: str                        # Physical sensor key (e.g. 'hwmon:/sys/...', 'smartctl:/dev/sda', 'gpu:nvidia:0')
+    value: float = 0.0              # Last successfully read temperature (C)
+    read_at: float = float("-inf")  # monotonic() timestamp of the last successful read (-inf = never read)
+    reads: int = 0                  # Number of physical reads issued (successful or not)
+    hits: int = 0                   # Number of requests served from the cache
+    errors: int = 0                 # Number of failed physical reads
+    subscribers: List[str] = field(default_factory=list)  # Names of the fan controllers reading this sensor
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)  # Serializes reads
+
+
+class SensorRegistry:
+    """Central registry of physical temperature sensors shared by all fan controllers.
+
+    Several fan controllers may read the same physical sensor (e.g. the same disk listed in two [HD:n]
+    sections, or the same CPU package feeding two [CPU:n] curves). The registry reads each sensor at most
+    once per freshness window (`max_age`) and hands the cached value to every subscribed controller. A
+    failed read is never cached, so the error_tolerance logic of every controller still sees the failure.
+    The registry is thread-safe: in threaded mode a controller requesting a sensor while another one is reading
+    it waits for that read and gets its value.
+    """
+
+    max_age: float                      # Freshness window of a cached value (sec)
+    created_at: float                   # Unix time of the creation (the read counters start here)
+    _lock: threading.Lock               # Protects the sensor entries dictionary
+    _entries: Dict[str, SensorEntry]    # Sensor entries keyed by physical sensor key
+    _pending: Dict[str, asyncio.Task]   # Physical reads in progress in asyncio mode, keyed by physical sensor key
+
+    def __init__(self, max_age: float) -> None:
+        """Initialize an empty sensor registry.
+        Args:
+            max_age (float): freshness window (sec); a cached value younger than this is reused
+        Raises:
+            ValueError: negative max_age
+        """
+        if max_age < 0:
+            raise ValueError(f"invalid value: max_age < 0 ({max_age})")
+        self.max_age = max_age
+        self.created_at = clock.time()
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pending = {}
+
+    def subscribe(self, key: str, name: str) -> SensorEntry:
+        """Register a fan controller as a reader of a physical sensor.
+        Args:
+            key (str): physical sensor key
+            name (str): name of the subscribing fan controller
+        Returns:
+            SensorEntry: the (possibly new) entry of the sensor
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = SensorEntry(key=key)
+                self._entries[key] = entry
+            if name not in entry.subscribers:
+                entry.subscribers.append(name)
+        return entry
+
+    def read(self, key: str, name: str, reader: Callable[[], float]) -> float:
+        """Return the temperature of a physical sensor, reading it only if the cached value is not fresh.
+        Args:
+            key (str): physical sensor key
+            name (str): name of the requesting fan controller (subscribed implicitly)
+            reader (Callable[[], float]): function performing the physical read
+        Returns:
+            float: temperature value (C)
+        Raises:
+            Exception: any exception of `reader`; failed reads are not cached
+        """
+        entry = self.subscribe(key, name)
+        with entry.lock:
+            now = clock.monotonic()
+            if (now - entry.read_at) < self.max_age:
+                entry.hits += 1
+                return entry.value
+            entry.reads += 1
+            try:
+                value = reader()
+            except Exception:
+                entry.errors += 1
+                raise
+            entry.value = value
+            entry.read_at = now
+            return value
+
+    async def read_async(self, key: str, name: str, reader: Callable[[], Awaitable[float]]) -> float:
+        """Coroutine version of read(). Concurrent requests of a sensor share the physical read in progress,
+        so a sensor is read only once even if all of its subscribers ask for it in the same loop iteration.
+        Args:
+            key (str): physical sensor key
+            name (str): name of the requesting fan controller (subscribed implicitly)
+            reader (Callable[[], Awaitable[float]]): coroutine function performing the physical read
+        Returns:
+            float: temperature value (C)
+        Raises:
+            Exception: any exception of `reader`; failed reads are not cached
+        """
+        entry = self.subscribe(key, name)
+        if (clock.monotonic() - entry.read_at) < self.max_age:
+            entry.hits += 1
+            return entry.value
+        task = self._pending.get(key)
+        if task is not None:
+            entry.hits += 1
+        else:
+            entry.reads += 1
+            task = asyncio.ensure_future(self._physical_read_async(entry, reader))
+            self._pending[key] = task
+        return await asyncio.shield(task)
+
+    async def _physical_read_async(self, entry: SensorEntry, reader: Callable[[], Awaitable[float]]) -> float:
+        """Perform a physical read of a sensor in asyncio mode and update its entry.
+        Args:
+            entry (SensorEntry): entry of the sensor
+            reader (Callable[[], Awaitable[float]]): coroutine function performing the physical read
+        Returns:
+            float: temperature value (C)
+        """
+        now = clock.monotonic()
+        try:
+            value = await reader()
+        except Exception:
+            entry.errors += 1
+            raise
+        finally:
+            del self._pending[entry.key]
+        entry.value = value
+        entry.read_at = now
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the read statistics of the registry in a JSON-serializable form.
+        Returns:
+            Dict[str, Any]: totals and one dict per physical sensor (sorted by key)
+        """
+        with self._lock:
+            entries = [self._entries[k] for k in sorted(self._entries)]
+        return {
+            "max_age_s": float(self.max_age),
+            "created_at": float(self.created_at),
+            "reads": sum(e.reads for e in entries),
+            "hits": sum(e.hits for e in entries),
+            "errors": sum(e.errors for e in entries),
+            "sensors": [{"key": e.key, "reads": e.reads, "hits": e.hits, "errors": e.errors,
+                         "subscribers": list(e.subscribers)} for e in entries],
+        }
+
+
+# End.
@@ -3,50 +3,83 @@
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   smfc.Service() class implementation.
 #
+import asyncio
 import atexit
 import os
 import signal
 import sys
-import time
 from typing import Dict, List, Optional, Set, Tuple, Union
 from importlib.metadata import version
 from argparse import ArgumentParser, Namespace
 from pyudev import Context
+from smfc import clock
 from smfc.constfc import ConstFc
+from smfc.arbiter import ZoneArbiter
 from smfc.exporter import Exporter
 from smfc.fancontroller import FanController
 from smfc.gpufc import GpuFc
 from smfc.cpufc import CpuFc
 from smfc.hdfc import HdFc
+from smfc.history import History, SeriesHistory
+from smfc.hotplug import HotplugMonitor
+from smfc.hwmon import HwmonIndex
 from smfc.nvmefc import NvmeFc
 from smfc.ipmi import Ipmi
 from smfc.log import Log
-from smfc.config import Config
-from smfc.snapshot import build_snapshot
+from smfc.config import Config, CpuConfig, GpuConfig, HdConfig, NvmeConfig
+from smfc.scheduler import Scheduler
+from smfc.sensorproc import SensorProcess
+from smfc.sensors import SensorRegistry
+from smfc.state import StateStore
+from smfc.timing import LoopTiming
+from smfc.snapshot import SnapshotPublisher
+from smfc.worker import ControllerRecord, ControllerWorker, DesiredLevels
 
 
 class Service:
     """Service class contains all resources/functions for the execution."""
 
+    WORKER_STOP_TIMEOUT: float = 1.0                           # Waiting time for the worker threads at a stop (sec)
+
     # Service data.
     config: Config                                             # Instance for a parsed configuration
+    config_file: str                                           # Path of the configuration file (re-read on SIGHUP)
+    reload_requested: bool                                     # Configuration reload requested by SIGHUP
     sudo: bool                                                 # Use sudo command
     log: Log                                                   # Instance for a Log class
     udevc: Context                                             # Reference to a pyudev Context instance
+    hwmon_index: HwmonIndex                                    # Shared hwmon index of the fan controllers
     ipmi: Ipmi                                                 # Instance for an Ipmi class
     controllers: List[Union[FanController, ConstFc]]           # List of enabled fan controller instances
     applied_levels: Dict[int, int]                             # Cache of last applied fan levels per IPMI zone
+    zone_level_changes: Dict[int, int]                         # Changes of the applied fan level per IPMI zone
     shared_zones: Set[int]                                     # Set of IPMI zone IDs shared between controllers
-    last_desired: List[Tuple[str, List[int], int, float]]      # Cache of last desired levels for change detection
+    arbiter: ZoneArbiter                                       # Desired fan levels per shared IPMI zone
     last_fan_mode: int                                         # Last observed BMC fan mode (from _check_fan_mode)
     last_fan_mode_at: float                                    # monotonic() timestamp of last_fan_mode
     start_time: float                                          # Unix wall-clock start time of the service
     fan_mode_enforced_count: int                               # Count of detected drift-from-FULL corrections
     exporter: Optional[Exporter]                               # HTTP exporter (None when disabled or bind failed)
+    publisher: Optional[SnapshotPublisher]                     # Snapshot published for the exporter (None=no exporter)
+    sensors: SensorRegistry                                    # Shared sensor registry of the fan controllers
+    hotplug: Optional[HotplugMonitor]                          # udev hotplug monitor (None when disabled or failed)
+    scheduler: Scheduler                                       # Deadline-driven scheduler of the main loop
+    sensor_process: Optional[SensorProcess]                    # Supervised sensor process (None when disabled)
+    state: Optional[StateStore]                                # Checkpoint of the runtime state (None when disabled)
+    timing: LoopTiming                                         # Period, sleep and apply durations of the main loop
+    workers: List[ControllerWorker]                            # Worker threads of the fan controllers (threaded mode)
+
+    def __init__(self) -> None:
+        """Initialize the counters and the instrumentation of the service. The other resources are created by
+        run(), the exporter publishes snapshots only if it is started."""
+        self.zone_level_changes = {}
+        self.timing = LoopTiming()
+        self.publisher = None
+        self.workers = []
 
     def _sigterm_handler(self, signum, frame) -> None:  # pylint: disable=unused-argument
         """Handle SIGTERM (the default kill signal of systemd) by requesting a normal interpreter shutdown, so
-        the registered `atexit` handler runs. `time.sleep()` in the main loop is interrupted by the signal and
+        the registered `atexit` handler runs. `clock.sleep()` in the main loop is interrupted by the signal and
         the raised SystemExit propagates out of it.
         Args:
             signum (int): signal number (unused)
@@ -54,6 +87,15 @@ class Service:
         """
         sys.exit(0)
 
+    def _sighup_handler(self, signum, frame) -> None:  # pylint: disable=unused-argument
+        """Handle SIGHUP by requesting a configuration reload. The reload is executed by the main loop between two
+        iterations (see `reload_config()`), so the signal never interrupts a running fan controller.
+        Args:
+            signum (int): signal number (unused)
+            frame: current stack frame (unused)
+        """
+        self.reload_requested = True
+
     def _exit_zones(self) -> List[int]:
         """Collect the IPMI zones the exit level has to be applied to.
 
@@ -84,6 +126,20 @@ class Service:
                 self.exporter.stop()
             except Exception:  # pylint: disable=broad-except
                 pass
+        if getattr(self, "hotplug", None) is not None:
+            try:
+                self.hotplug.stop()
+            except Exception:  # pylint: disable=broad-except
+                pass
+        if getattr(self, "sensor_process", None) is not None:
+            try:
+                self.sensor_process.stop()
+            except Exception:  # pylint: disable=broad-except
+                pass
+        # Write the last checkpoint of the runtime state. The applied fan levels are kept in it only if the exit
+        # level does not overwrite them.
+        if getattr(self, "state", None) is not None and hasattr(self, "controllers"):
+            self._save_state(self.config.ipmi.exit_level != Config.EXIT_LEVEL_NONE)
         # Configure fans. The configuration is always loaded before the Ipmi instance is created, so both
         # attributes are present together in practice.
         if hasattr(self, "ipmi") and hasattr(self, "config"):
@@ -168,40 +224,50 @@ class Service:
         # All required run-time dependencies are available.
         return ""
 
-    def _collect_desired_levels(self) -> List[Tuple[str, List[int], int, float]]:
+    def _collect_desired_levels(self, controllers: Optional[List[Union[FanController, ConstFc]]] = None
+                                ) -> List[Tuple[str, List[int], int, float]]:
         """Collect desired fan levels from deferred controllers only (non-deferred controllers handle their own zones).
+        A level of 0 is collected too: it removes the controller from the contributors of its zones in the arbiter.
 
+        Args:
+            controllers (Optional[List[Union[FanController, ConstFc]]]): controllers to collect from (e.g. the
+                controllers polled in this iteration), None = all controllers
         Returns:
             List[Tuple[str, List[int], int, float]]: list of (name, ipmi_zones, last_level, last_temp) tuples
         """
         levels: List[Tuple[str, List[int], int, float]] = []
-        for fc in self.controllers:
-            if fc.deferred_apply and fc.last_level > 0:
+        for fc in self.controllers if controllers is None else controllers:
+            if fc.deferred_apply:
                 levels.append((fc.name, fc.config.ipmi_zone, fc.last_level, fc.last_temp))
         return levels
 
-    def _apply_fan_levels(self) -> None:
-        """Apply the maximum desired fan level per IPMI zone across all controllers."""
-        desired = self._collect_desired_levels()
-        if self.log.log_level >= Log.LOG_DEBUG and desired != self.last_desired:
-            self.log.msg(Log.LOG_DEBUG, f"Arbitration desired levels: "
-                         f"{[(n, z, l, f'{t:.1f}C') for n, z, l, t in desired]}")
-            self.last_desired = desired
-        # Build zone -> (max_level, winner_name) mapping and collect all contributors per zone
-        zone_levels: Dict[int, Tuple[int, str]] = {}
-        zone_contributors: Dict[int, List[Tuple[str, int, float]]] = {}
+    def _apply_fan_levels(self, desired: Optional[List[Tuple[str, List[int], int, float]]] = None) -> None:
+        """Apply the maximum desired fan level per IPMI zone across all controllers. The desired levels are
+        reported to the zone arbiter, which touches only the zones of the controllers with a changed level, so
+        only these zones are arbitrated and written (nothing is done if no level changed).
+        Args:
+            desired (Optional[List[Tuple[str, List[int], int, float]]]): list of (name, ipmi_zones, level, temp)
+                tuples (e.g. published by the worker threads), None = collected from the deferred controllers
+        """
+        if desired is None:
+            desired = self._collect_desired_levels()
+        changed = False
         for name, zones, level, temp in desired:
-            for zone in zones:
-                zone_contributors.setdefault(zone, []).append((name, level, temp))
-                if zone not in zone_levels or level > zone_levels[zone][0]:
-                    zone_levels[zone] = (level, name)
+            changed |= self.arbiter.update(name, zones, level, temp)
+        if not changed:
+            return
+        if self.log.log_level >= Log.LOG_DEBUG:
+            self.log.msg(Log.LOG_DEBUG, f"Arbitration desired levels: "
+                         f"{[(n, z, l, f'{t:.1f}C') for n, z, l, t in self.arbiter.desired()]}")
         # Apply only changed levels (non-deferred controllers handle their own zones directly).
-        for zone, (level, winner) in zone_levels.items():
+        for zone, level, winner in self.arbiter.changes():
             if self.applied_levels.get(zone) == level:
                 continue
+            start = clock.monotonic()
             self.ipmi.set_fan_level(zone, level)
-            self.applied_levels[zone] = level
-            contributors = zone_contributors.get(zone, [])
+            self.timing.apply.observe(clock.monotonic() - start)
+            self._set_applied_level(zone, level)
+            contributors = self.arbiter.contributors(zone)
             if len(contributors) > 1:
                 winner_str = ""
                 loser_parts = []
@@ -218,7 +284,21 @@ class Service:
                 n, l, t = contributors[0]
                 detail = f"{n}={t:.1f}C" if t > 0.0 else f"{n}"
                 self.log.msg(Log.LOG_INFO, f"IPMI zone [{zone}]: new level = {l}% ({detail})")
+            else:
+                self.log.msg(Log.LOG_INFO, f"IPMI zone [{zone}]: new level = {level}% ({winner})")
+
 
+    def _set_applied_level(self, zone: int, level: int) -> None:
+        """Store the applied fan level of an IPMI zone and count the level changes of the zone (the first level
+        of a zone is not a change).
+        Args:
+            zone (int): IPMI zone
+            level (int): applied fan level [0..100]
+        """
+        previous = self.applied_levels.get(zone)
+        if previous is not None and previous != level:
+            self.zone_level_changes[zone] = self.zone_level_changes.get(zone, 0) + 1
+        self.applied_levels[zone] = level
 
     def _check_shared_zones(self) -> Set[int]:
         """Check if any IPMI zones are shared between enabled controllers.
@@ -255,7 +335,7 @@ class Service:
             return
 
         self.last_fan_mode = mode
-        self.last_fan_mode_at = time.monotonic()
+        self.last_fan_mode_at = clock.monotonic()
 
         if mode == Ipmi.FULL_MODE:
             return
@@ -273,7 +353,7 @@ class Service:
         try:
             self.ipmi.set_fan_mode(Ipmi.FULL_MODE)
             self.last_fan_mode = Ipmi.FULL_MODE
-            self.last_fan_mode_at = time.monotonic()
+            self.last_fan_mode_at = clock.monotonic()
             for zone, level in self.applied_levels.items():
                 self.ipmi.set_fan_level(zone, level)
         except (RuntimeError, ValueError) as e:
@@ -283,24 +363,444 @@ class Service:
     def _start_exporter(self) -> None:
         """Build and start the HTTP exporter; tolerate bind failures.
 
-        Stores the live `Exporter` on `self.exporter`, or `None` if bind failed.
+        Stores the live `Exporter` on `self.exporter`, or `None` if bind failed. The exporter serves the snapshot
+        published by the main loop (see SnapshotPublisher), the first one is published here. The published snapshots
+        are recorded in the in-memory history served on /history (unless history_size=0), except this first one:
+        the fan controllers have not polled yet, so it has no temperature and fan level to record.
         """
         self.exporter = None
+        history_size = self.config.exporter.history_size
+        history = History(history_size) if history_size > 0 else None
+        self.publisher = SnapshotPublisher(history)
+        self._publish_snapshot(record=False)
         if self.log.log_level >= Log.LOG_CONFIG:
             self.log.msg(Log.LOG_CONFIG, "HTTP Exporter was initialized with:")
             self.log.msg(Log.LOG_CONFIG, f"   {Config.CV_EXPORTER_BIND_ADDRESS} = {self.config.exporter.bind_address}")
             self.log.msg(Log.LOG_CONFIG, f"   {Config.CV_EXPORTER_PORT} = {self.config.exporter.port}")
+            self.log.msg(Log.LOG_CONFIG, f"   {Config.CV_EXPORTER_HISTORY_SIZE} = {history_size} "
+                                         f"({SeriesHistory.memory(history_size)} bytes per series)")
         try:
             self.exporter = Exporter(
                 log=self.log,
                 bind_address=self.config.exporter.bind_address,
                 port=self.config.exporter.port,
-                snapshot_fn=lambda: build_snapshot(self),
+                snapshot_fn=self.publisher.snapshot,
+                generation_fn=self.publisher.generation,
+                history_fn=history.query if history is not None else None,
             )
             self.exporter.start()
         except OSError as e:
             self.log.msg(Log.LOG_ERROR, f"Exporter failed to start ({e}); continuing without it.")
             self.exporter = None
+            self.publisher = None
+
+    def _start_hotplug_monitor(self) -> None:
+        """Build and start the udev hotplug monitor; tolerate start failures.
+
+        Stores the live `HotplugMonitor` on `self.hotplug`, or `None` if it could not be started.
+        """
+        self.hotplug = None
+        try:
+            self.hotplug = HotplugMonitor(self.log, self.udevc, self.controllers, self.hwmon_index)
+            self.hotplug.start()
+        except (OSError, ImportError) as e:
+            self.log.msg(Log.LOG_ERROR, f"Hotplug monitor failed to start ({e}); continuing without it.")
+            self.hotplug = None
+
+    def _start_sensor_process(self) -> None:
+        """Start the supervised sensor processes (one channel per fan controller) and attach them to the fan
+        controllers. A start failure is logged and the service continues with reading the sensors in its own
+        process."""
+        fcs = [fc for fc in self.controllers if isinstance(fc, FanController)]
+        try:
+            self.sensor_process = SensorProcess(self.config.service.sensor_timeout)
+            self.sensor_process.start([fc.name for fc in fcs])
+        except OSError as e:
+            self.log.msg(Log.LOG_ERROR, f"Sensor process failed to start ({e}); continuing without it.")
+            self.sensor_process = None
+            return
+        self.log.msg(Log.LOG_DEBUG, f"Sensor process started (pids={self.sensor_process.pids}, "
+                                    f"{Config.CV_SERVICE_SENSOR_TIMEOUT}={self.sensor_process.timeout})")
+        for fc in fcs:
+            fc.sensor_process = self.sensor_process
+
+    @staticmethod
+    def _enabled_configs(config: Config) -> list:
+        """Collect the enabled fan controller sections of a configuration.
+        Args:
+            config (Config): parsed configuration
+        Returns:
+            list: configuration dataclasses of the enabled sections in CPU, HD, NVME, GPU, CONST order
+        """
+        return [cfg for cfg_list in (config.cpu, config.hd, config.nvme, config.gpu, config.const)
+                for cfg in cfg_list if cfg.enabled]
+
+    def _create_controller(self, cfg) -> Union[FanController, ConstFc]:
+        """Create the fan controller of an enabled configuration section.
+        Args:
+            cfg: configuration dataclass (CpuConfig, HdConfig, NvmeConfig, GpuConfig, or ConstConfig)
+        Returns:
+            Union[FanController, ConstFc]: the new fan controller
+        Raises:
+            ValueError: invalid configuration or device
+            RuntimeError: the devices of the fan controller cannot be found
+        """
+        if isinstance(cfg, CpuConfig):
+            self.log.msg(Log.LOG_DEBUG, f"CPU fan controller [{cfg.section}] enabled")
+            return CpuFc(self.log, self.udevc, self.ipmi, cfg, self.hwmon_index)
+        if isinstance(cfg, HdConfig):
+            self.log.msg(Log.LOG_DEBUG, f"HD fan controller [{cfg.section}] enabled")
+            return HdFc(self.log, self.udevc, self.ipmi, cfg, self.sudo, self.hwmon_index)
+        if isinstance(cfg, NvmeConfig):
+            self.log.msg(Log.LOG_DEBUG, f"NVME fan controller [{cfg.section}] enabled")
+            return NvmeFc(self.log, self.udevc, self.ipmi, cfg, self.hwmon_index)
+        if isinstance(cfg, GpuConfig):
+            self.log.msg(Log.LOG_DEBUG, f"GPU fan controller [{cfg.section}] enabled")
+            return GpuFc(self.log, self.ipmi, cfg)
+        self.log.msg(Log.LOG_DEBUG, f"CONST fan controller [{cfg.section}] enabled")
+        return ConstFc(self.log, self.ipmi, cfg)
+
+    def _setup_controllers(self) -> None:
+        """Prepare the fan controllers for the main loop (at startup and after a configuration reload): detect the
+        shared IPMI zones and enable deferred apply for the affected controllers, then attach the fan controllers
+        to a new shared sensor registry and to the sensor process (if any)."""
+        # Deferred apply is enabled only for the controllers of the shared zones. In threaded mode all controllers
+        # are deferred, so the worker threads never access the BMC.
+        self.shared_zones = self._check_shared_zones()
+        threaded = self.config.service.execution_mode == Config.MODE_THREADED
+        for fc in self.controllers:
+            fc.deferred_apply = threaded or bool(set(fc.config.ipmi_zone) & self.shared_zones)
+
+        # Share the physical sensors between the fan controllers: a sensor read by several controllers
+        # is read only once within a loop iteration (the freshness window is half of the shortest polling).
+        self.sensors = SensorRegistry(min(fc.config.polling for fc in self.controllers) / 2)
+        for fc in self.controllers:
+            if isinstance(fc, FanController):
+                fc.attach_sensors(self.sensors)
+                if getattr(self, "sensor_process", None) is not None:
+                    fc.sensor_process = self.sensor_process
+
+    def reload_config(self) -> bool:
+        """Reload the configuration file and apply it without restarting the service (requested by SIGHUP).
+
+        The new configuration is compared with the running fan controllers section by section: a controller with
+        an unchanged section is kept with its whole state (e.g. temperature filter history, last level), a changed
+        or new section gets a new controller, and the controller of a removed or disabled section is dropped. The
+        Ipmi instance (no new BMC handshake or fan mode change), the cache of the applied fan levels and the
+        hwmon index are kept, the hwmon index is rebuilt before the first new CPU, HD or NVME controller is
+        created (a disk may be swapped or added since startup). A kept controller which is not deferred anymore
+        applies its last level right away (see `_apply_undeferred_levels()`). Changes of the `[Ipmi]`, `[Exporter]`
+        and `[Service]` sections need a restart, so they are reported and ignored. If the new configuration is
+        invalid or a new fan controller cannot be created, the running configuration is kept.
+        Returns:
+            bool: True if the new configuration was applied
+        """
+        self.reload_requested = False
+        self.log.msg(Log.LOG_INFO, f"Reloading configuration file ({self.config_file})")
+        try:
+            config = Config(self.config_file)
+        except (FileNotFoundError, ValueError) as e:
+            self.log.msg(Log.LOG_ERROR, f"Configuration reload failed, running configuration kept: {e}")
+            return False
+        for section, old, new in ((Config.CS_IPMI, self.config.ipmi, config.ipmi),
+                                  (Config.CS_EXPORTER, self.config.exporter, config.exporter),
+                                  (Config.CS_SERVICE, self.config.service, config.service)):
+            if old != new:
+                self.log.msg(Log.LOG_ERROR, f"Configuration reload: changes of the [{section}] section are "
+                                            f"ignored, they need a service restart")
+        config.ipmi, config.exporter, config.service = self.config.ipmi, self.config.exporter, self.config.service
+
+        # Keep the controllers of the unchanged sections, create the new ones (nothing is replaced on failure).
+        running = {fc.config.section: fc for fc in self.controllers}
+        controllers: List[Union[FanController, ConstFc]] = []
+        kept = changed = 0
+        rebuilt = False
+        try:
+            for cfg in self._enabled_configs(config):
+                fc = running.get(cfg.section)
+                if fc is not None and fc.config == cfg:
+                    kept += 1
+                else:
+                    changed += fc is not None
+                    if not rebuilt and isinstance(cfg, (CpuConfig, HdConfig, NvmeConfig)):
+                        self._rebuild_hwmon_index()
+                        rebuilt = True
+                    fc = self._create_controller(cfg)
+                controllers.append(fc)
+        except (ValueError, RuntimeError) as e:
+            self.log.msg(Log.LOG_ERROR, f"Configuration reload failed, running configuration kept: {e}")
+            return False
+        if not controllers:
+            self.log.msg(Log.LOG_ERROR, "Configuration reload failed, none of the fan controllers are enabled, "
+                                        "running configuration kept")
+            return False
+        added = len(controllers) - kept - changed
+        removed = len(self.controllers) - kept - changed
+
+        # The list is updated in place, because it is shared with the hotplug monitor.
+        self.config = config
+        deferred = {fc.name: fc.deferred_apply for fc in controllers if fc in self.controllers}
+        self.controllers[:] = controllers
+        zones = {zone for fc in controllers for zone in fc.config.ipmi_zone}
+        self.applied_levels = {z: level for z, level in self.applied_levels.items() if z in zones}
+        self._setup_controllers()
+        self.arbiter = ZoneArbiter()
+        if self.shared_zones:
+            # Re-arbitrate the shared zones with the levels of the kept controllers.
+            self._apply_fan_levels()
+        self._apply_undeferred_levels([fc for fc in controllers if deferred.get(fc.name) and not fc.deferred_apply])
+        self.scheduler = self._create_scheduler(self.config.service.execution_mode != Config.MODE_THREADED)
+        self.log.msg(Log.LOG_INFO, f"Configuration reloaded: {kept} fan controller(s) kept, {changed} changed, "
+                                   f"{added} added, {removed} removed")
+        return True
+
+    def _rebuild_hwmon_index(self) -> None:
+        """Rebuild the shared hwmon index before new fan controllers resolve their hwmon paths at a configuration
+        reload (without the hotplug monitor the index is built only at startup). A failure is logged, and the
+        previous index is used."""
+        try:
+            self.hwmon_index.rebuild()
+        except Exception as e:  # pylint: disable=broad-except
+            self.log.msg(Log.LOG_ERROR, f"Cannot rebuild the hwmon index ({e}).")
+
+    def _apply_undeferred_levels(self, controllers: List[Union[FanController, ConstFc]]) -> None:
+        """Apply the last level of the kept controllers that apply their own level again after a configuration
+        reload (e.g. their zone is not shared anymore). Their last level was arbitrated, so it may not be the level
+        of their zones, and they write their level only at the next level change. A failed write is logged, the
+        zone is written again at the next level change.
+        Args:
+            controllers (List[Union[FanController, ConstFc]]): kept controllers, deferred before the reload only
+        """
+        for fc in controllers:
+            if fc.last_level <= 0:
+                continue
+            for zone in fc.config.ipmi_zone:
+                if self.applied_levels.get(zone) == fc.last_level:
+                    continue
+                try:
+                    start = clock.monotonic()
+                    self.ipmi.set_fan_level(zone, fc.last_level)
+                    self.timing.apply.observe(clock.monotonic() - start)
+                except (RuntimeError, ValueError) as e:
+                    self.log.msg(Log.LOG_ERROR, f"{fc.name}: cannot apply fan level after reload: {e}")
+                    continue
+                self._set_applied_level(zone, fc.last_level)
+                self.log.msg(Log.LOG_INFO, f"IPMI zone [{zone}]: new level = {fc.last_level}% ({fc.name})")
+
+    def _save_state(self, drop_levels: bool = False) -> None:
+        """Write a checkpoint of the runtime state (periodically and at exit). A failed write is logged and the
+        service continues.
+        Args:
+            drop_levels (bool): leave the applied fan levels out of the checkpoint (e.g. the exit level is applied)
+        """
+        records = self._worker_records()
+        states = {name: record.state for name, record in records.items()} if records is not None else None
+        try:
+            self.state.save(self.controllers, {} if drop_levels else dict(self.applied_levels), states)
+        except (OSError, TypeError, ValueError) as e:
+            self.log.msg(Log.LOG_ERROR, f"Cannot write the state file ({self.state.path}): {e}")
+
+    def _restore_state(self, keep_levels: bool) -> None:
+        """Restore the runtime state from a fresh checkpoint at startup (warm start). The state of a fan controller
+        is restored only if its configuration section is unchanged. The applied fan levels are restored only if
+        the BMC may still hold them, and a fan controller applying its own level gets its last level back only if
+        all of its zones hold that level, so the first poll does not repeat a fan level already applied, but it
+        always applies a level the BMC does not hold.
+        Args:
+            keep_levels (bool): the BMC may still hold the saved fan levels (False if the fan mode was changed)
+        """
+        state = self.state.load()
+        if state is None:
+            self.log.msg(Log.LOG_DEBUG, f"No fresh state file ({self.state.path}), cold start")
+            return
+        zones = {zone for fc in self.controllers for zone in fc.config.ipmi_zone}
+        applied = {z: level for z, level in state["applied_levels"].items() if z in zones} if keep_levels else {}
+        restored = []
+        for fc in self.controllers:
+            fc_state = state["controllers"].get(fc.name)
+            if not isinstance(fc_state, dict) or fc_state.get("config") != StateStore.fingerprint(fc.config):
+                continue
+            if not fc.deferred_apply and any(applied.get(z) != fc_state.get("last_level") for z in fc.config.ipmi_zone):
+                fc_state = {k: v for k, v in fc_state.items() if k not in ("last_level", "last_temp")}
+            try:
+                fc.restore_state(fc_state)
+            except (KeyError, TypeError, ValueError) as e:
+                self.log.msg(Log.LOG_ERROR, f"{fc.name}: invalid state in {self.state.path}: {e}")
+                continue
+            restored.append(fc.name)
+        self.applied_levels.update(applied)
+        self.log.msg(Log.LOG_INFO, f"Warm start from {self.state.path}: state of {restored} restored, "
+                                   f"applied levels = {applied}")
+
+    async def _poll_controllers_async(self, controllers: List[Union[FanController, ConstFc]]) -> None:
+        """Poll the due fan controllers of one iteration of the main loop in asyncio mode. The sensor reads of
+        the fan controllers run concurrently, while the constant fan controllers (without sensors) run directly.
+        Args:
+            controllers (List[Union[FanController, ConstFc]]): fan controllers due in this iteration
+        """
+        tasks = []
+        for fc in controllers:
+            if isinstance(fc, FanController):
+                tasks.append(fc.poll_async())
+            else:
+                fc.poll()
+        await asyncio.gather(*tasks)
+
+    def _poll_controllers(self, controllers: List[Union[FanController, ConstFc]],
+                          loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Poll the due fan controllers of one iteration of the main loop (sequentially, or concurrently in the
+        event loop in asyncio mode), then apply the fan levels of the shared IPMI zones.
+        Args:
+            controllers (List[Union[FanController, ConstFc]]): fan controllers due in this iteration
+            loop (Optional[asyncio.AbstractEventLoop]): event loop in asyncio mode (None = sequential mode)
+        """
+        if loop is not None:
+            loop.run_until_complete(self._poll_controllers_async(controllers))
+        else:
+            for fc in controllers:
+                fc.poll()
+        for fc in controllers:
+            # Record applied levels for non-deferred controllers so every zone shows up in the
+            # snapshot. Deferred controllers (shared zones) are recorded by _apply_fan_levels().
+            if not fc.deferred_apply:
+                for zone in fc.config.ipmi_zone:
+                    self._set_applied_level(zone, fc.last_level)
+        if self.shared_zones:
+            # Only the controllers polled in this iteration may have a new level.
+            self._apply_fan_levels(self._collect_desired_levels(controllers))
+
+    def _run_iteration(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Run one iteration of the main loop: sleep until the next deadline (the sleep time and the loop period
+        are recorded in self.timing), poll the due fan controllers, then execute the other due jobs.
+        Args:
+            loop (Optional[asyncio.AbstractEventLoop]): event loop in asyncio mode (None = sequential mode)
+        """
+        sleep_start = clock.monotonic()
+        due = self.scheduler.wait()
+        self.timing.woke_up(sleep_start)
+        controllers = [t for t in due if isinstance(t, (FanController, ConstFc))]
+        if controllers:
+            self._poll_controllers(controllers, loop)
+        for target in due:
+            if target not in controllers:
+                target()
+        self._publish_snapshot()
+
+    def _worker_records(self) -> Optional[Dict[str, ControllerRecord]]:
+        """Return the state of the fan controllers published by their worker threads after their last poll
+        (threaded mode). The worker threads change the controllers meanwhile, so the snapshot and the state
+        checkpoint are built from these records instead of the live objects.
+        Returns:
+            Optional[Dict[str, ControllerRecord]]: records by controller name, None if the fan controllers are
+                polled by the main thread (no worker threads)
+        """
+        if not self.workers:
+            return None
+        return {worker.fc.name: worker.record for worker in self.workers}
+
+    def _publish_snapshot(self, record: bool = True) -> None:
+        """Publish the state of the completed main loop iteration for the exporter threads (if the exporter is
+        running). Fan control is not gated on the exporter: a failed publication is logged, and the exporter keeps
+        serving the previous snapshot.
+        Args:
+            record (bool): record the snapshot in the history (False for the startup snapshot)
+        """
+        if self.publisher is not None:
+            records = self._worker_records()
+            try:
+                self.publisher.publish(self, {name: record.entry for name, record in records.items()}
+                                       if records is not None else None, record)
+            except Exception as e:  # pylint: disable=broad-except
+                self.log.msg(Log.LOG_ERROR, f"Snapshot publication failed: {e}")
+
+    def _create_scheduler(self, with_controllers: bool = True) -> Scheduler:
+        """Create the scheduler of the main loop: one job per fan controller (with its polling interval and
+        phase offset) and the periodic fan mode check (with the shortest polling interval).
+        Args:
+            with_controllers (bool): add the jobs of the fan controllers (False in threaded mode, where every
+                fan controller is scheduled by its own worker thread)
+        Returns:
+            Scheduler: the scheduler
+        """
+        scheduler = Scheduler()
+        if with_controllers:
+            for fc in self.controllers:
+                scheduler.add(fc.name, fc.config.polling, fc, fc.config.polling_offset)
+        scheduler.add("fan mode check", min(fc.config.polling for fc in self.controllers), self._check_fan_mode)
+        if getattr(self, "state", None) is not None:
+            interval = self.config.service.state_interval
+            scheduler.add("state checkpoint", interval, self._save_state, interval)
+        if self.log.log_level >= Log.LOG_DEBUG:
+            for job in scheduler.jobs():
+                self.log.msg(Log.LOG_DEBUG, f"Scheduler: {job.name} every {job.period} sec")
+        return scheduler
+
+    def _run_threaded(self) -> None:
+        """Main loop of the threaded execution mode. Every fan controller is polled by its own worker thread
+        at its own polling rate and publishes its desired fan level; this thread is the single IPMI writer: it
+        applies the maximum desired level per IPMI zone whenever a new level is published and runs the other
+        periodic jobs (e.g. the fan mode check) of the scheduler. An exception raised in a worker is re-raised
+        here, so it terminates the service like in the other execution modes.
+        """
+        levels = DesiredLevels()
+        self.workers = self._start_workers(levels)
+        try:
+            while True:
+                if self.reload_requested:
+                    # The workers are stopped during the reload (an ongoing poll is completed), and new workers
+                    # are started for the new set of fan controllers. A worker stuck in a read is abandoned, the
+                    # main thread (the only IPMI writer) is never blocked by it.
+                    stuck = self._stop_workers(self.workers, self.WORKER_STOP_TIMEOUT)
+                    if stuck:
+                        self.log.msg(Log.LOG_ERROR, f"Worker thread(s) {[w.name for w in stuck]} did not stop in "
+                                                    f"{self.WORKER_STOP_TIMEOUT}s (stuck in a read?), abandoned")
+                    self.workers = []
+                    self.reload_config()
+                    levels = DesiredLevels()
+                    self.workers = self._start_workers(levels)
+                sleep_start = clock.monotonic()
+                published = levels.wait(max(self.scheduler.next_deadline() - sleep_start, 0.0))
+                self.timing.woke_up(sleep_start)
+                if published:
+                    if levels.error is not None:
+                        raise levels.error
+                    self._apply_fan_levels(levels.snapshot())
+                for job in self.scheduler.pop_due(clock.monotonic()):
+                    job.target()
+                self._publish_snapshot()
+        finally:
+            # A worker still polling after the timeout keeps its last record for the final state checkpoint.
+            self._stop_workers(self.workers, self.WORKER_STOP_TIMEOUT)
+
+    def _start_workers(self, levels: DesiredLevels) -> List[ControllerWorker]:
+        """Start a worker thread for every fan controller (threaded execution mode).
+        Args:
+            levels (DesiredLevels): exchange of the desired fan levels
+        Returns:
+            List[ControllerWorker]: the started worker threads
+        """
+        workers = [ControllerWorker(fc, levels) for fc in self.controllers]
+        for worker in workers:
+            worker.start()
+        return workers
+
+    @staticmethod
+    def _stop_workers(workers: List[ControllerWorker], timeout: float) -> List[ControllerWorker]:
+        """Stop the worker threads and wait for them until a common deadline. A worker still running after the
+        deadline (e.g. stuck in a hwmon read without sensor process) is left behind: it is a daemon thread, and
+        it exits when its read returns.
+        Args:
+            workers (List[ControllerWorker]): worker threads
+            timeout (float): timeout of waiting for all workers (sec)
+        Returns:
+            List[ControllerWorker]: the workers still running
+        """
+        for worker in workers:
+            worker.stop()
+        deadline = clock.monotonic() + timeout
+        for worker in workers:
+            worker.join(timeout=max(deadline - clock.monotonic(), 0.0))
+        return [worker for worker in workers if worker.is_alive()]
 
     @staticmethod
     def _parse_args() -> Namespace:
@@ -351,7 +851,7 @@ class Service:
         self.sudo = parsed_results.s
 
         # Record service start time and reset the fan-mode enforcement counter (exposed via /metrics).
-        self.start_time = time.time()
+        self.start_time = clock.time()
         self.fan_mode_enforced_count = 0
 
         # Create a Log class instance (in theory, this cannot fail).
@@ -374,6 +874,7 @@ class Service:
             self.log.msg(Log.LOG_CONFIG, f"   log_output = {self.log.log_output} ({output_str})")
 
         # Parse and load configuration file.
+        self.config_file = parsed_results.config_file
         try:
             self.config = Config(parsed_results.config_file)
         except (FileNotFoundError, ValueError) as e:
@@ -399,7 +900,7 @@ class Service:
         try:
             self.ipmi = Ipmi(self.log, self.config.ipmi, self.sudo)
             self.last_fan_mode = self.ipmi.get_fan_mode()
-            self.last_fan_mode_at = time.monotonic()
+            self.last_fan_mode_at = clock.monotonic()
         except (ValueError, FileNotFoundError, RuntimeError) as e:
             self.log.msg(Log.LOG_ERROR, f"{e}.")
             sys.exit(8)
@@ -424,10 +925,11 @@ class Service:
         # fires on firmware that boots into a non-FULL default; the X11SCH-LN4F comes up already in FULL even
         # after a full PSU-off cold start (verified across warm, BIOS-change, and PSU-off boots), so this
         # branch routinely skips on this board.
-        if self.last_fan_mode != Ipmi.FULL_MODE:
+        fan_mode_changed = self.last_fan_mode != Ipmi.FULL_MODE
+        if fan_mode_changed:
             self.ipmi.set_fan_mode(Ipmi.FULL_MODE)
             self.last_fan_mode = Ipmi.FULL_MODE
-            self.last_fan_mode_at = time.monotonic()
+            self.last_fan_mode_at = clock.monotonic()
             self.log.msg(Log.LOG_DEBUG, f"Set IPMI fan mode = {self.ipmi.get_fan_mode_name(Ipmi.FULL_MODE)}")
 
         # Initialize connection to udev database
@@ -436,68 +938,73 @@ class Service:
         except ImportError as e:
             self.log.msg(Log.LOG_ERROR, f"pyudev error: Could not interface with libudev: {e}.")
             sys.exit(9)
+        # The hwmon devices are enumerated only once (at the first lookup) and shared by all fan controllers.
+        self.hwmon_index = HwmonIndex(self.udevc)
 
         # Initialize the applied levels cache for zone arbitration.
         self.applied_levels = {}
-        self.last_desired = []
+        self.arbiter = ZoneArbiter()
 
         # Create enabled fan controller instances.
-        self.controllers = []
-        for cfg in self.config.cpu:
-            if cfg.enabled:
-                self.log.msg(Log.LOG_DEBUG, f"CPU fan controller [{cfg.section}] enabled")
-                self.controllers.append(CpuFc(self.log, self.udevc, self.ipmi, cfg))
-        for cfg in self.config.hd:
-            if cfg.enabled:
-                self.log.msg(Log.LOG_DEBUG, f"HD fan controller [{cfg.section}] enabled")
-                self.controllers.append(HdFc(self.log, self.udevc, self.ipmi, cfg, self.sudo))
-        for cfg in self.config.nvme:
-            if cfg.enabled:
-                self.log.msg(Log.LOG_DEBUG, f"NVME fan controller [{cfg.section}] enabled")
-                self.controllers.append(NvmeFc(self.log, self.udevc, self.ipmi, cfg))
-        for cfg in self.config.gpu:
-            if cfg.enabled:
-                self.log.msg(Log.LOG_DEBUG, f"GPU fan controller [{cfg.section}] enabled")
-                self.controllers.append(GpuFc(self.log, self.ipmi, cfg))
-        for cfg in self.config.const:
-            if cfg.enabled:
-                self.log.msg(Log.LOG_DEBUG, f"CONST fan controller [{cfg.section}] enabled")
-                self.controllers.append(ConstFc(self.log, self.ipmi, cfg))
+        self.controllers = [self._create_controller(cfg) for cfg in self._enabled_configs(self.config)]
 
         # If none of the fan controllers is enabled.
         if not self.controllers:
             self.log.msg(Log.LOG_ERROR, "None of the fan controllers are enabled, service terminated.")
             sys.exit(10)
 
-        # Check for shared IPMI zones and enable deferred apply only for affected controllers.
-        self.shared_zones = self._check_shared_zones()
-        if self.shared_zones:
-            for fc in self.controllers:
-                if set(fc.config.ipmi_zone) & self.shared_zones:
-                    fc.deferred_apply = True
+        # Check for shared IPMI zones, enable deferred apply for the affected controllers and share the sensors.
+        self.sensor_process = None
+        self._setup_controllers()
+
+        # Warm start: restore the state of the fan controllers and the applied fan levels from a fresh checkpoint
+        # of the previous run (the BMC may not hold the saved levels if the fan mode was changed above).
+        self.state = None
+        if self.config.service.state_file:
+            self.state = StateStore(self.config.service.state_file, self.config.service.state_max_age)
+            self._restore_state(not fan_mode_changed)
 
-        # Calculate the wait time in the main loop.
-        wait = min(fc.config.polling for fc in self.controllers) / 2
-        self.log.msg(Log.LOG_DEBUG, f"Main loop sleep time = {wait} sec")
+        # Read the sensors in a supervised child process if enabled: a read stuck in uninterruptible sleep (dying
+        # disk, wedged HBA) blocks the child only, which is replaced while the fan controller applies a safe level.
+        if self.config.service.sensor_process:
+            self._start_sensor_process()
 
         # Start the HTTP exporter if enabled (smfc-client + Prometheus). Bind failure is logged
         # and the daemon continues — fan-control behavior must not be gated on the listener.
         if self.config.exporter.enabled:
             self._start_exporter()
 
-        # Main execution loop.
-        while True:
-            for fc in self.controllers:
-                fc.run()
-                # Record applied levels for non-deferred controllers so every zone shows up in the
-                # snapshot. Deferred controllers (shared zones) are recorded by _apply_fan_levels().
-                if not fc.deferred_apply:
-                    for zone in fc.config.ipmi_zone:
-                        self.applied_levels[zone] = fc.last_level
-            if self.shared_zones:
-                self._apply_fan_levels()
-            self._check_fan_mode()
-            time.sleep(wait)
+        # Start the udev hotplug monitor if enabled: hwmon paths changed by a drive swap, an HBA reset or a
+        # module reload are re-resolved in the background instead of failing reads and a service restart.
+        self.hotplug = None
+        if self.config.service.hotplug_monitor:
+            self._start_hotplug_monitor()
+
+        # Main execution loop. The scheduler sleeps until the next deadline and returns the due jobs: the fan
+        # controllers are polled first, then the other periodic jobs (e.g. the fan mode check) are executed.
+        # In asyncio mode the controllers due in a loop iteration read their sensors concurrently in one event
+        # loop, so an iteration takes as long as the slowest read. In threaded mode the controllers run in
+        # their own worker threads (see _run_threaded()). SIGHUP requests a configuration reload, which is
+        # executed by the main loop between two iterations.
+        threaded = self.config.service.execution_mode == Config.MODE_THREADED
+        self.scheduler = self._create_scheduler(not threaded)
+        self.log.msg(Log.LOG_DEBUG, f"Execution mode = {self.config.service.execution_mode}")
+        self.reload_requested = False
+        signal.signal(signal.SIGHUP, self._sighup_handler)
+        if threaded:
+            self._run_threaded()
+            return
+        loop: Optional[asyncio.AbstractEventLoop] = None
+        if self.config.service.execution_mode == Config.MODE_ASYNCIO:
+            loop = asyncio.new_event_loop()
+        try:
+            while True:
+                if self.reload_requested:
+                    self.reload_config()
+                self._run_iteration(loop)
+        finally:
+            if loop is not None:
+                loop.close()
 
 
 # End.
@@ -0,0 +1,541 @@
+#
+#   simulator.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc-sim: virtual-time simulation of the service with synthetic or recorded temperature traces.
+#
+import argparse
+import bisect
+import csv
+import math
+import random
+import sys
+from abc import ABC, abstractmethod
+from importlib.metadata import version
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+from smfc import clock
+from smfc.arbiter import ZoneArbiter
+from smfc.clock import VirtualClock
+from smfc.config import Config, ConstConfig, GpuConfig, HdConfig, IpmiConfig, NvmeConfig
+from smfc.constfc import ConstFc
+from smfc.fancontroller import FanController
+from smfc.ipmi import Ipmi
+from smfc.log import Log
+from smfc.platform import FanMode, Platform, validate_input_range
+from smfc.service import Service
+
+
+# Exit codes (aligned with the service: 6=config, 10=no fan controller).
+EXIT_OK: int = 0
+EXIT_CONFIG_ERROR: int = 6
+EXIT_NO_CONTROLLER: int = 10
+
+# Default length of a simulation without a recorded trace (sec).
+DEFAULT_DURATION: float = 86400.0
+
+
+class TemperatureTrace(ABC):  # pylint: disable=too-few-public-methods
+    """Source of the temperatures of the simulated devices."""
+
+    @abstractmethod
+    def temperature(self, name: str, index: int, t: float) -> float:
+        """Return the temperature of a device at a point of time.
+        Args:
+            name (str): name of the fan controller (section name, e.g. 'HD:1')
+            index (int): index of the device in the fan controller
+            t (float): time from the start of the simulation (sec)
+        Returns:
+            float: temperature (C)
+        Raises:
+            ValueError: no temperature for the device
+        """
+
+
+class SyntheticTrace(TemperatureTrace):  # pylint: disable=too-few-public-methods
+    """Synthetic daily thermal profile: every device follows a cosine wave between `low` and `high` (starting at
+    `low`, peaking at half of `period`) with Gaussian noise. The noise is seeded, so a simulation is repeatable."""
+
+    low: float              # Lowest temperature of the profile (C)
+    high: float             # Highest temperature of the profile (C)
+    period: float           # Period of the profile (sec)
+    noise: float            # Standard deviation of the noise (C)
+    _random: random.Random  # Seeded random generator of the noise
+
+    def __init__(self, low: float = 35.0, high: float = 65.0, period: float = DEFAULT_DURATION, noise: float = 0.5,
+                 seed: int = 0) -> None:
+        """Initialize the synthetic profile.
+        Args:
+            low (float): lowest temperature (C)
+            high (float): highest temperature (C)
+            period (float): period of the profile (sec)
+            noise (float): standard deviation of the noise (C)
+            seed (int): seed of the noise
+        Raises:
+            ValueError: invalid parameters
+        """
+        if high < low:
+            raise ValueError(f"invalid value: high < low ({high} < {low})")
+        if period <= 0:
+            raise ValueError(f"invalid value: period <= 0 ({period})")
+        if noise < 0:
+            raise ValueError(f"invalid value: noise < 0 ({noise})")
+        self.low = low
+        self.high = high
+        self.period = period
+        self.noise = noise
+        self._random = random.Random(seed)
+
+    def temperature(self, name: str, index: int, t: float) -> float:
+        """Return the temperature of the profile at a point of time (the same for all devices, except the noise).
+        Args:
+            name (str): name of the fan controller (unused)
+            index (int): index of the device (unused)
+            t (float): time from the start of the simulation (sec)
+        Returns:
+            float: temperature (C)
+        """
+        base = self.low + (self.high - self.low) * (1.0 - math.cos(2.0 * math.pi * t / self.period)) / 2.0
+        if self.noise:
+            base += self._random.gauss(0.0, self.noise)
+        return base
+
+
+class RecordedTrace(TemperatureTrace):  # pylint: disable=too-few-public-methods
+    """Recorded temperature trace in a CSV file. The first column is the time (sec, from the start of the trace,
+    ascending), every further column is the temperature of all devices of a fan controller (header: section name,
+    e.g. `CPU` or `HD:1`) or of one device (header: section name and device index, e.g. `HD:1/2`). Temperatures
+    between two samples are interpolated linearly, the first and the last sample are held outside of the trace.
+    An empty cell means no sample of that column at that time."""
+
+    _series: Dict[str, Tuple[List[float], List[float]]]     # Column name -> (times, temperatures)
+    duration: float                                         # Time of the last sample (sec)
+
+    def __init__(self, path: str) -> None:
+        """Load a trace file.
+        Args:
+            path (str): path of the CSV file
+        Raises:
+            FileNotFoundError: file not found
+            ValueError: invalid file content
+        """
+        self._series = {}
+        self.duration = 0.0
+        with open(path, "r", encoding="UTF-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header or len(header) < 2:
+                raise ValueError(f"{path}: a time column and at least one temperature column expected")
+            columns = [name.strip() for name in header[1:]]
+            for name in columns:
+                self._series[name] = ([], [])
+            last_time = -math.inf
+            for row in reader:
+                if not row:
+                    continue
+                try:
+                    t = float(row[0])
+                    if t < last_time:
+                        raise ValueError(f"time is not ascending ({t})")
+                    last_time = t
+                    for name, cell in zip(columns, row[1:]):
+                        if cell.strip():
+                            times, temps = self._series[name]
+                            times.append(t)
+                            temps.append(float(cell))
+                except ValueError as e:
+                    raise ValueError(f"{path}, line {reader.line_num}: {e}") from e
+                self.duration = t
+        for name, (times, _) in self._series.items():
+            if not times:
+                raise ValueError(f"{path}: no samples in column {name}")
+
+    def temperature(self, name: str, index: int, t: float) -> float:
+        """Return the (interpolated) temperature of a device at a point of time.
+        Args:
+            name (str): name of the fan controller (section name)
+            index (int): index of the device
+            t (float): time from the start of the simulation (sec)
+        Returns:
+            float: temperature (C)
+        Raises:
+            ValueError: no column for the device
+        """
+        series = self._series.get(f"{name}/{index}") or self._series.get(name)
+        if series is None:
+            raise ValueError(f"no temperature column for {name} (device {index}) in the trace")
+        times, temps = series
+        i = bisect.bisect_right(times, t)
+        if i == 0:
+            return temps[0]
+        if i == len(times):
+            return temps[-1]
+        t0, t1 = times[i - 1], times[i]
+        return temps[i - 1] + (temps[i] - temps[i - 1]) * (t - t0) / (t1 - t0)
+
+
+class Timeline:
+    """Timeline of a simulation: the polls of the fan controllers (with their levels and temperatures), the BMC
+    writes and the fan mode changes in the order of their virtual time."""
+
+    # Columns of the CSV output.
+    COLUMNS: Tuple[str, ...] = ("time", "event", "name", "zone", "level", "raw_temp", "temp")
+
+    # Event types.
+    EVENT_POLL: str = "poll"
+    EVENT_WRITE: str = "write"
+    EVENT_MODE: str = "mode"
+
+    rows: List[Tuple[float, str, str, Optional[int], int, Optional[float], Optional[float]]]  # Recorded events
+
+    def __init__(self) -> None:
+        """Initialize an empty timeline."""
+        self.rows = []
+
+    def poll(self, t: float, fc: Union[FanController, ConstFc]) -> None:
+        """Record the poll of a fan controller.
+        Args:
+            t (float): time of the poll (sec)
+            fc (Union[FanController, ConstFc]): the polled fan controller
+        """
+        if isinstance(fc, FanController):
+            self.rows.append((t, self.EVENT_POLL, fc.name, None, fc.last_level, fc.raw_temp, fc.last_temp))
+        else:
+            self.rows.append((t, self.EVENT_POLL, fc.name, None, fc.last_level, None, None))
+
+    def write(self, zone: int, level: int) -> None:
+        """Record a fan level write of the BMC.
+        Args:
+            zone (int): IPMI zone
+            level (int): fan level (%)
+        """
+        self.rows.append((clock.monotonic(), self.EVENT_WRITE, "", zone, level, None, None))
+
+    def mode(self, mode: int) -> None:
+        """Record a fan mode change of the BMC.
+        Args:
+            mode (int): fan mode
+        """
+        self.rows.append((clock.monotonic(), self.EVENT_MODE, Ipmi.get_fan_mode_name(mode), None, mode, None, None))
+
+    def save(self, f: TextIO) -> None:
+        """Write the timeline in CSV format.
+        Args:
+            f (TextIO): output stream
+        """
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(self.COLUMNS)
+        for t, event, name, zone, level, raw_temp, temp in self.rows:
+            writer.writerow([f"{t:.3f}", event, name, "" if zone is None else zone, level,
+                             "" if raw_temp is None else f"{raw_temp:.2f}", "" if temp is None else f"{temp:.2f}"])
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the timeline.
+        Returns:
+            Dict[str, Any]: number of polls per fan controller, number of BMC writes and (min, max) fan levels per
+            IPMI zone
+        """
+        polls: Dict[str, int] = {}
+        writes: Dict[int, int] = {}
+        levels: Dict[int, Tuple[int, int]] = {}
+        for _, event, name, zone, level, _, _ in self.rows:
+            if event == self.EVENT_POLL:
+                polls[name] = polls.get(name, 0) + 1
+            elif event == self.EVENT_WRITE:
+                writes[zone] = writes.get(zone, 0) + 1
+                low, high = levels.get(zone, (level, level))
+                levels[zone] = (min(low, level), max(high, level))
+        return {"polls": polls, "writes": dict(sorted(writes.items())), "levels": dict(sorted(levels.items()))}
+
+
+class SimulatedBmc(Platform):
+    """Simulated BMC: it keeps the fan mode and the fan levels of the IPMI zones and records every change in the
+    timeline. It never executes `ipmitool`."""
+
+    mode: int                   # Current fan mode
+    levels: Dict[int, int]      # Current fan level per IPMI zone
+    timeline: Timeline          # Timeline of the simulation
+
+    def __init__(self, timeline: Timeline) -> None:
+        """Initialize the simulated BMC in FULL fan mode.
+        Args:
+            timeline (Timeline): timeline of the simulation
+        """
+        super().__init__("Simulated BMC", self._no_ipmitool)
+        self.mode = FanMode.FULL
+        self.levels = {}
+        self.timeline = timeline
+
+    @staticmethod
+    def _no_ipmitool(args: List[str]) -> Any:
+        """Placeholder of the `ipmitool` execution callback.
+        Args:
+            args (List[str]): command line parameters
+        Raises:
+            RuntimeError: always
+        """
+        raise RuntimeError(f"ipmitool is not available in the simulation ({' '.join(args)})")
+
+    def get_fan_mode(self) -> int:
+        return self.mode
+
+    def get_fan_level(self, zone: int) -> int:
+        return self.levels.get(zone, 100)
+
+    def start(self) -> None:
+        pass
+
+    def end(self, zones: List[int], level: int) -> None:
+        self.set_multiple_fan_levels(zones, level)
+
+    def set_fan_mode(self, mode: int) -> None:
+        validate_input_range(mode, "fan mode", FanMode.STANDARD, FanMode.HEAVY_IO)
+        self.mode = mode
+        self.timeline.mode(mode)
+
+    def set_fan_level(self, zone: int, level: int) -> None:
+        validate_input_range(level, "level", 0, 100)
+        self.levels[zone] = level
+        self.timeline.write(zone, level)
+
+    def set_multiple_fan_levels(self, zone_list: List[int], level: int) -> None:
+        for zone in zone_list:
+            self.set_fan_level(zone, level)
+
+
+class SimulatedIpmi(Ipmi):
+    """Ipmi interface of the simulation: the fan mode and fan level operations (with the configured delays) are
+    executed on a simulated BMC."""
+
+    def __init__(self, log: Log, cfg: IpmiConfig, bmc: SimulatedBmc) -> None:  # pylint: disable=super-init-not-called
+        """Initialize the Ipmi interface with a simulated BMC (the BMC readiness gate and `bmc info` are skipped).
+        Args:
+            log (Log): a Log class instance
+            cfg (IpmiConfig): IPMI configuration (the fan_mode_delay and fan_level_delay are used)
+            bmc (SimulatedBmc): the simulated BMC
+        """
+        self.config = cfg
+        self.log = log
+        self.sudo = False
+        self.bmc_device_id = 0
+        self.bmc_device_rev = 0
+        self.bmc_firmware_rev = "0.0"
+        self.bmc_ipmi_version = "2.0"
+        self.bmc_manufacturer_id = 0
+        self.bmc_manufacturer_name = "smfc-sim"
+        self.bmc_product_id = 0
+        self.bmc_product_name = bmc.name
+        self.platform = bmc
+        self.zone_writes = {}
+
+
+class SimulatedFc(FanController):
+    """Temperature-driven fan controller of the simulation (CPU, HD, NVME or GPU section): the temperatures of its
+    devices are taken from the trace at the virtual time. The whole control path (filter, curve or PID, hysteresis,
+    ramps, feed-forward, zone arbitration) is the same as in the real fan controllers, device specific features
+    (e.g. the standby guard of HD) are not simulated."""
+
+    trace: TemperatureTrace     # Source of the temperatures
+
+    def __init__(self, log: Log, ipmi: Ipmi, cfg: Any, trace: TemperatureTrace) -> None:
+        """Initialize the simulated fan controller.
+        Args:
+            log (Log): reference to a Log class instance
+            ipmi (Ipmi): reference to an Ipmi class instance
+            cfg: configuration dataclass (CpuConfig, HdConfig, NvmeConfig or GpuConfig)
+            trace (TemperatureTrace): source of the temperatures
+        Raises:
+            ValueError: no temperature for a device in the trace
+        """
+        self.config = cfg
+        self.trace = trace
+        super().__init__(log, ipmi, cfg.section, self.device_count(cfg))
+
+    @staticmethod
+    def device_count(cfg: Any) -> int:
+        """Return the number of devices of a section (one CPU package for a CPU section).
+        Args:
+            cfg: configuration dataclass
+        Returns:
+            int: number of devices
+        """
+        if isinstance(cfg, HdConfig):
+            return len(cfg.hd_names)
+        if isinstance(cfg, NvmeConfig):
+            return len(cfg.nvme_names)
+        if isinstance(cfg, GpuConfig):
+            return len(cfg.gpu_device_ids)
+        return 1
+
+    def _get_nth_temp(self, index: int) -> float:
+        return self.trace.temperature(self.name, index, clock.monotonic())
+
+    def sensor_key(self, index: int) -> str:
+        return f"sim:{self.name}/{index}"
+
+    def device_names(self) -> List[str]:
+        return [f"{self.name}/{i}" for i in range(self.count)]
+
+
+class Simulator(Service):
+    """Virtual-time simulation of the service: the main loop of the sequential execution mode drives the fan
+    controllers and the simulated BMC with a virtual clock, so a long thermal profile replays in seconds."""
+
+    trace: TemperatureTrace     # Source of the temperatures
+    timeline: Timeline          # Timeline of the simulation
+    bmc: SimulatedBmc           # Simulated BMC
+    clock: VirtualClock         # Virtual clock of the simulation
+
+    def __init__(self, log: Log, config: Config, trace: TemperatureTrace) -> None:
+        """Initialize the simulation.
+        Args:
+            log (Log): a Log class instance
+            config (Config): parsed configuration
+            trace (TemperatureTrace): source of the temperatures
+        """
+        super().__init__()
+        self.log = log
+        self.config = config
+        self.trace = trace
+        self.timeline = Timeline()
+        self.bmc = SimulatedBmc(self.timeline)
+        self.clock = VirtualClock(epoch=clock.time())
+
+    def _create_controller(self, cfg) -> Union[FanController, ConstFc]:
+        if isinstance(cfg, ConstConfig):
+            return super()._create_controller(cfg)
+        self.log.msg(Log.LOG_DEBUG, f"Simulated fan controller [{cfg.section}] enabled")
+        return SimulatedFc(self.log, self.ipmi, cfg, self.trace)
+
+    def _poll_controllers(self, controllers: List[Union[FanController, ConstFc]], loop: Any) -> None:
+        # The polls are recorded at the start of the iteration (the BMC writes advance the virtual time).
+        now = clock.monotonic()
+        super()._poll_controllers(controllers, loop)
+        for fc in controllers:
+            self.timeline.poll(now, fc)
+
+    def _setup(self) -> None:
+        """Create the simulated BMC interface and the fan controllers (with the virtual clock).
+        Raises:
+            ValueError: invalid configuration, no fan controller enabled, or no temperature for a device
+        """
+        # Every execution mode is simulated in the sequential main loop (the reads of the trace take no time).
+        if self.config.service.execution_mode != Config.MODE_SEQUENTIAL:
+            self.log.msg(Log.LOG_INFO, f"Execution mode {self.config.service.execution_mode} is simulated in "
+                                       f"{Config.MODE_SEQUENTIAL} mode")
+            self.config.service.execution_mode = Config.MODE_SEQUENTIAL
+        self.ipmi = SimulatedIpmi(self.log, self.config.ipmi, self.bmc)
+        self.start_time = clock.time()
+        self.fan_mode_enforced_count = 0
+        self.last_fan_mode = self.ipmi.get_fan_mode()
+        self.last_fan_mode_at = clock.monotonic()
+        self.applied_levels = {}
+        self.arbiter = ZoneArbiter()
+        self.sensor_process = None
+        self.state = None
+        self.exporter = None
+        self.hotplug = None
+        self.reload_requested = False
+        self.controllers = [self._create_controller(cfg) for cfg in self._enabled_configs(self.config)]
+        if not self.controllers:
+            raise ValueError("none of the fan controllers are enabled")
+        self._setup_controllers()
+        self.scheduler = self._create_scheduler()
+
+    def simulate(self, duration: float) -> Timeline:
+        """Run the main loop for a virtual time period.
+        Args:
+            duration (float): length of the simulation (sec)
+        Returns:
+            Timeline: timeline of the simulation
+        Raises:
+            ValueError: invalid configuration, no fan controller enabled, or no temperature for a device
+        """
+        previous = clock.get_clock()
+        clock.set_clock(self.clock)
+        try:
+            self._setup()
+            end = clock.monotonic() + duration
+            while self.scheduler.next_deadline() <= end:
+                self._run_iteration(None)
+        finally:
+            clock.set_clock(previous)
+        return self.timeline
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments for smfc-sim.
+    Args:
+        argv (Optional[List[str]]): argument list (None = sys.argv[1:])
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="smfc-sim",
+        description="Replay a temperature trace through the fan controllers of a configuration in virtual time "
+                    "and write the timeline of the fan levels, BMC writes and temperatures in CSV format. "
+                    "Without a trace a synthetic daily thermal profile is used.",
+    )
+    parser.add_argument("-c", "--config", action="store", dest="config_file", required=True, metavar="FILE",
+                        help="config file to simulate")
+    parser.add_argument("-t", "--trace", action="store", dest="trace_file", default=None, metavar="FILE",
+                        help="recorded temperature trace in CSV format (default: synthetic profile)")
+    parser.add_argument("-d", "--duration", type=float, default=None, metavar="SEC",
+                        help=f"simulated time (default: length of the trace, or {DEFAULT_DURATION:.0f} sec)")
+    parser.add_argument("-o", "--output", action="store", dest="output_file", default=None, metavar="FILE",
+                        help="timeline output file (default: stdout)")
+    parser.add_argument("--low", type=float, default=35.0, help="synthetic profile: lowest temperature (C)")
+    parser.add_argument("--high", type=float, default=65.0, help="synthetic profile: highest temperature (C)")
+    parser.add_argument("--period", type=float, default=DEFAULT_DURATION,
+                        help="synthetic profile: period (sec)")
+    parser.add_argument("--noise", type=float, default=0.5, help="synthetic profile: noise (C)")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic profile: seed of the noise")
+    parser.add_argument("-l", type=int, choices=[0, 1, 2, 3, 4], default=1,
+                        help="set log level: 0-NONE, 1-ERROR(default), 2-CONFIG, 3-INFO, 4-DEBUG (to stderr)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s " + version("smfc"))
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the smfc-sim console script.
+    Args:
+        argv (Optional[List[str]]): argument list (None = sys.argv[1:])
+    Returns:
+        int: process exit code
+    """
+    args = _parse_args(argv)
+    log = Log(args.l, Log.LOG_STDERR)
+    try:
+        config = Config(args.config_file)
+        if args.trace_file:
+            trace: TemperatureTrace = RecordedTrace(args.trace_file)
+            duration = args.duration if args.duration is not None else trace.duration
+        else:
+            trace = SyntheticTrace(args.low, args.high, args.period, args.noise, args.seed)
+            duration = args.duration if args.duration is not None else DEFAULT_DURATION
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr, flush=True)
+        return EXIT_CONFIG_ERROR
+
+    if not Service._enabled_configs(config):  # pylint: disable=protected-access
+        print("ERROR: none of the fan controllers are enabled", file=sys.stderr, flush=True)
+        return EXIT_NO_CONTROLLER
+    try:
+        timeline = Simulator(log, config, trace).simulate(duration)
+    except (ValueError, RuntimeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr, flush=True)
+        return EXIT_CONFIG_ERROR
+
+    if args.output_file:
+        with open(args.output_file, "w", encoding="UTF-8", newline="") as f:
+            timeline.save(f)
+    else:
+        timeline.save(sys.stdout)
+    summary = timeline.summary()
+    print(f"Simulated {duration:.0f} sec: polls = {summary['polls']}, BMC writes = {summary['writes']}, "
+          f"fan levels (min, max) = {summary['levels']}", file=sys.stderr, flush=True)
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# End.
@@ -2,18 +2,23 @@
 #   snapshot.py (C) 2020-2026, Peter Sulyok
 #   smfc package: Supermicro fan control for Linux (home) servers.
 #   build_snapshot(): produce the live-state dict consumed by smfc-client and the Prometheus exporter.
+#   SnapshotPublisher(): publish one snapshot per main loop iteration for the exporter threads.
 #
-import time
+from dataclasses import dataclass
+from functools import lru_cache
 from importlib.metadata import version
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from smfc import clock
 from smfc.constfc import ConstFc
 from smfc.cpufc import CpuFc
 from smfc.gpufc import GpuFc
 from smfc.hdfc import HdFc
-from smfc.config import PlatformName
+from smfc.history import History
+from smfc.config import Config, PlatformName
 from smfc.ipmi import Ipmi
 from smfc.nvmefc import NvmeFc
+from smfc.timing import ControllerTiming, LoopTiming
 
 if TYPE_CHECKING:  # pragma: no cover
     from smfc.service import Service
@@ -22,6 +27,13 @@ if TYPE_CHECKING:  # pragma: no cover
 SNAPSHOT_SCHEMA_VERSION: int = 1
 
 
+@lru_cache(maxsize=1)
+def _smfc_version() -> str:
+    """Return the installed version of the smfc package. The package metadata is read from the disk only once,
+    the version cannot change while the service is running."""
+    return version("smfc")
+
+
 def _controller_type_label(controller) -> str:
     """Map a controller instance to its short type label used in the JSON schema and metric labels.
 
@@ -39,8 +51,9 @@ def _controller_type_label(controller) -> str:
     return "cpu"
 
 
-def _build_controller_entry(controller) -> Dict[str, Any]:
-    """Build the JSON dict for a single controller (FanController subclass or ConstFc)."""
+def build_controller_entry(controller) -> Dict[str, Any]:
+    """Build the JSON dict for a single controller (FanController subclass or ConstFc). In threaded mode it is
+    called by the worker thread of the controller after a poll (see ControllerRecord)."""
     type_label = _controller_type_label(controller)
     cfg = controller.config
     entry: Dict[str, Any] = {
@@ -53,6 +66,11 @@ def _build_controller_entry(controller) -> Dict[str, Any]:
         "last_temp_c": float(getattr(controller, "last_temp", 0.0)),
         "last_level_pct": int(getattr(controller, "last_level", 0)),
     }
+    # Histograms of the poll lateness and of the read/decide/apply durations of the controller (sec).
+    timing = getattr(controller, "timing", None)
+    entry["timing"] = (timing if isinstance(timing, ControllerTiming) else ControllerTiming()).snapshot()
+    # Unix time of the creation of the controller: its counters and histograms start here (0.0=unknown).
+    entry["created_at"] = float(getattr(controller, "created_at", 0.0))
     if type_label == "const":
         # ConstFc has no underlying device set; expose its target level explicitly.
         entry["device_count"] = 0
@@ -68,8 +86,14 @@ def _build_controller_entry(controller) -> Dict[str, Any]:
         # Surface the curve's actual envelope instead, taken from the first and last pair —
         # this keeps the band-colour logic in smfc-client (which keys off these fields) honest
         # and lets the verbose Window: line match what the curve is actually doing.
+        # In PID control mode the output is clamped to the legacy [min_level, max_level] keys, and the
+        # curve is not used for steering.
+        pid = getattr(cfg, "control_mode", None) == Config.CONTROL_PID
+        entry["control_mode"] = Config.CONTROL_PID if pid else Config.CONTROL_LUT
+        if pid:
+            entry["pid_target_c"] = float(cfg.pid_target)
         curve = list(getattr(cfg, "control_function", []) or [])
-        if curve:
+        if curve and not pid:
             first_t, first_l = curve[0]
             last_t, last_l = curve[-1]
             entry["temp_min_c"] = float(first_t)
@@ -84,6 +108,19 @@ def _build_controller_entry(controller) -> Dict[str, Any]:
         # The raw breakpoints — empty list when no curve is configured. smfc-client renders this
         # as a `Curve:` line under `Window:` so the user sees the active LUT directly.
         entry["control_function"] = [[int(t), int(l)] for t, l in curve]
+        # The last aggregated temperature before and after the temperature filter of the section. last_temp_c
+        # is the filtered temperature of the last evaluation (it moves only by the sensitivity gap).
+        temp_filter = getattr(cfg, "temp_filter", None)
+        entry["temp_filter"] = temp_filter if temp_filter in Config.TEMP_FILTERS else Config.FILTER_SMA
+        entry["raw_temp_c"] = float(getattr(controller, "raw_temp", 0.0))
+        entry["filtered_temp_c"] = float(getattr(controller, "filtered_temp", 0.0))
+        # Level changes held back by the hysteresis, min_dwell= or ramp limits (monotonic counter): the
+        # number of IPMI writes saved by the write suppression.
+        entry["suppressed_writes"] = int(getattr(controller, "suppressed_writes", 0))
+        # Fan hunting indicators (monotonic counters): level changes reversing the previous change within
+        # FanController.REVERSAL_WINDOW, and polls stopped at the sensitivity gap.
+        entry["direction_reversals"] = int(getattr(controller, "direction_reversals", 0))
+        entry["sensitivity_skips"] = int(getattr(controller, "sensitivity_skips", 0))
         # Per-device temperature readings cached by the loop's last get_temp() call. Names come
         # from the controller (HD/NVMe expose configured paths; CPU/GPU synthesize ordinal labels).
         # When the loop hasn't run yet temps may be shorter than names — pad with 0.0 so the
@@ -122,42 +159,57 @@ def _build_controller_entry(controller) -> Dict[str, Any]:
     return entry
 
 
-def build_snapshot(service: "Service") -> Dict[str, Any]:
+def build_snapshot(service: "Service", entries: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Build a JSON-serializable snapshot of the live smfc service state.
 
     The function reads only already-cached state on the Service, its controllers, and the Ipmi
     instance. It issues no subprocesses (no ipmitool, no smartctl) and is safe to call from a
     non-loop thread (e.g. an HTTP request handler) without any synchronization primitive — see
-    "Concurrency & freshness" in CLIENT_SERVER.md for the design rationale.
+    "Concurrency & freshness" in CLIENT_SERVER.md for the design rationale. In threaded mode the
+    controllers are polled by their worker threads meanwhile, so their entries are taken from the
+    records published by the workers after their last poll instead of the live objects.
 
     Args:
         service (Service): the running Service instance.
+        entries (Optional[Dict[str, Dict[str, Any]]]): controller entries by controller name (threaded
+            mode), None = the entries are built from the controllers.
 
     Returns:
         dict: JSON-serializable snapshot dict with schema version SNAPSHOT_SCHEMA_VERSION.
     """
     ipmi: Ipmi = service.ipmi
-    now = time.time()
+    now = clock.time()
 
     last_fan_mode = int(service.last_fan_mode)
     last_fan_mode_at = float(service.last_fan_mode_at)
-    age_s = max(0.0, time.monotonic() - last_fan_mode_at)
+    age_s = max(0.0, clock.monotonic() - last_fan_mode_at)
 
     controllers_section: List[Dict[str, Any]] = [
-        _build_controller_entry(fc) for fc in service.controllers
+        entries[fc.name] if entries is not None else build_controller_entry(fc) for fc in service.controllers
     ]
 
-    # Defensive copy: applied_levels is mutated by the main loop on every iteration.
+    # Defensive copy: applied_levels is mutated by the main loop on every iteration. The level changes and the
+    # IPMI writes of the zones are monotonic counters (the writes are counted by the Ipmi instance).
     applied_levels = dict(service.applied_levels)
+    changes = getattr(service, "zone_level_changes", None)
+    changes = dict(changes) if isinstance(changes, dict) else {}
+    writes = getattr(ipmi, "zone_writes", None)
+    writes = dict(writes) if isinstance(writes, dict) else {}
     zones_section: Dict[str, Dict[str, int]] = {
-        str(zone): {"applied_level_pct": int(level)}
+        str(zone): {"applied_level_pct": int(level),
+                    "level_changes": int(changes.get(zone, 0)),
+                    "ipmi_writes": int(writes.get(zone, 0))}
         for zone, level in sorted(applied_levels.items())
     }
 
+    # Histograms of the loop period, the sleep time and the shared-zone IPMI writes of the main loop (sec).
+    timing = getattr(service, "timing", None)
+    loop_timing = (timing if isinstance(timing, LoopTiming) else LoopTiming()).snapshot()
+
     return {
         "version": SNAPSHOT_SCHEMA_VERSION,
         "generated_at": now,
-        "smfc_version": version("smfc"),
+        "smfc_version": _smfc_version(),
         "start_time": float(getattr(service, "start_time", 0.0)),
         "fan_mode_enforced_count": int(getattr(service, "fan_mode_enforced_count", 0)),
         "bmc": {
@@ -179,7 +231,87 @@ def build_snapshot(service: "Service") -> Dict[str, Any]:
         },
         "fan_controllers": controllers_section,
         "zones": zones_section,
+        "sensors": (service.sensors.stats() if getattr(service, "sensors", None) is not None
+                    else {"max_age_s": 0.0, "created_at": 0.0, "reads": 0, "hits": 0, "errors": 0, "sensors": []}),
+        "timing": {"loop": loop_timing},
     }
 
 
+@dataclass(frozen=True)
+class PublishedSnapshot:
+    """A snapshot published by the main loop. Neither the object nor its snapshot dict is modified after the
+    publication, so any number of reader threads can use it without synchronization."""
+    generation: int             # Sequence number of the publication (starts at 1)
+    snapshot: Dict[str, Any]    # Snapshot dict built by build_snapshot() (read-only)
+
+
+class SnapshotPublisher:
+    """Read-copy-update publication of the service state for the HTTP exporter.
+
+    The main loop (the single writer) builds a new snapshot at the end of every iteration, when the state of the
+    iteration is complete, and publishes it by replacing a single reference (an atomic operation). The exporter
+    threads (the readers) only take the current reference: they never touch the live controller objects, so
+    they cannot see a half-updated state, and the cost of a scrape does not depend on the scrape frequency.
+    Every published snapshot is also recorded in the in-memory history (if there is one).
+    """
+
+    history: Optional[History]              # History of the published snapshots (None = no history)
+    _current: Optional[PublishedSnapshot]   # The last published snapshot (None = nothing published yet)
+
+    def __init__(self, history: Optional[History] = None) -> None:
+        """Initialize the publisher without a published snapshot.
+        Args:
+            history (Optional[History]): history recording the published snapshots (None = no history)
+        """
+        self.history = history
+        self._current = None
+
+    def publish(self, service: "Service", entries: Optional[Dict[str, Dict[str, Any]]] = None,
+                record: bool = True) -> PublishedSnapshot:
+        """Build a new snapshot of the service and publish it (main loop only).
+        Args:
+            service (Service): the running Service instance
+            entries (Optional[Dict[str, Dict[str, Any]]]): controller entries by controller name (threaded mode),
+                see build_snapshot()
+            record (bool): record the snapshot in the history (False = publish only, e.g. the startup snapshot)
+        Returns:
+            PublishedSnapshot: the new publication
+        """
+        current = self._current
+        published = PublishedSnapshot(current.generation + 1 if current is not None else 1,
+                                      build_snapshot(service, entries))
+        self._current = published
+        if record and self.history is not None:
+            self.history.record(published.snapshot)
+        return published
+
+    def current(self) -> Optional[PublishedSnapshot]:
+        """Return the last published snapshot (any thread).
+        Returns:
+            Optional[PublishedSnapshot]: the last publication, None if nothing was published yet
+        """
+        return self._current
+
+    def generation(self) -> int:
+        """Return the generation of the last publication (any thread). The exporter caches its encoded responses
+        per generation.
+        Returns:
+            int: generation of the last publication, 0 if nothing was published yet
+        """
+        current = self._current
+        return current.generation if current is not None else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the snapshot dict of the last publication (the snapshot function of the exporter).
+        Returns:
+            Dict[str, Any]: the last published snapshot (read-only)
+        Raises:
+            RuntimeError: nothing was published yet
+        """
+        current = self._current
+        if current is None:
+            raise RuntimeError("no snapshot published yet")
+        return current.snapshot
+
+
 # End.
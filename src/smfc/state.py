@@ -0,0 +1,110 @@
+#
+#   state.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.StateStore() class implementation: checkpoint of the runtime state for a warm start.
+#
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+from smfc import clock
+
+
+class StateStore:
+    """Checkpoint of the runtime state of the service in a small JSON file (e.g. `/run/smfc/state.json`).
+
+    The checkpoint holds the state of every fan controller (see `save_state()` of the fan controllers) and the
+    fan levels applied per IPMI zone. It is written periodically and at exit, and it is restored at startup if it
+    is not older than `max_age` seconds, so after a restart the temperature filters do not have to refill and
+    the first poll does not repeat the fan levels the BMC already holds. The state of a fan controller is
+    restored only if its configuration section is unchanged (see `fingerprint()`).
+
+    The file is replaced atomically (a temporary file in the same directory is renamed over it), so a crash
+    during a checkpoint never leaves a truncated file behind. `/run` is a tmpfs, so a checkpoint never survives
+    a reboot.
+    """
+
+    VERSION: int = 1        # Version of the checkpoint format
+
+    path: str               # Path of the checkpoint file
+    max_age: float          # Maximum age of a restored checkpoint (sec)
+
+    def __init__(self, path: str, max_age: float) -> None:
+        """Initialize the state store.
+        Args:
+            path (str): path of the checkpoint file
+            max_age (float): maximum age of a restored checkpoint (sec)
+        Raises:
+            ValueError: empty path or max_age <= 0
+        """
+        if not path:
+            raise ValueError("invalid value: empty path")
+        if max_age <= 0:
+            raise ValueError(f"invalid value: max_age <= 0 ({max_age})")
+        self.path = path
+        self.max_age = max_age
+
+    @staticmethod
+    def fingerprint(config: Any) -> str:
+        """Return the fingerprint of a fan controller configuration (the state of a controller is restored only
+        if the fingerprint of its section is unchanged).
+        Args:
+            config: configuration dataclass of the fan controller
+        Returns:
+            str: fingerprint (hex string)
+        """
+        return hashlib.sha256(repr(config).encode()).hexdigest()[:16]
+
+    def save(self, controllers: List[Any], applied_levels: Dict[int, int],
+             states: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Write a checkpoint of the fan controllers and the applied fan levels (atomically).
+        Args:
+            controllers (List[Any]): fan controllers (FanController or ConstFc)
+            applied_levels (Dict[int, int]): applied fan levels per IPMI zone
+            states (Optional[Dict[str, Dict[str, Any]]]): states of the fan controllers by name, taken by their
+                worker threads (threaded mode), None = the states are taken from the fan controllers
+        Raises:
+            OSError: the file cannot be written
+        """
+        state = {
+            "version": self.VERSION,
+            "saved_at": clock.time(),
+            "applied_levels": {str(zone): level for zone, level in applied_levels.items()},
+            "controllers": {fc.name: dict(states[fc.name] if states is not None else fc.save_state(),
+                                          config=self.fingerprint(fc.config))
+                            for fc in controllers},
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".state", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the checkpoint if it exists, it is valid and it is not older than `max_age`.
+        Returns:
+            Optional[Dict[str, Any]]: the checkpoint (the zones of `applied_levels` are converted to int), or None
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != self.VERSION:
+                return None
+            age = clock.time() - float(state["saved_at"])
+            if not 0 <= age <= self.max_age:
+                return None
+            state["applied_levels"] = {int(zone): int(level) for zone, level in state["applied_levels"].items()}
+            if not isinstance(state["controllers"], dict):
+                return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return state
+
+
+# End.
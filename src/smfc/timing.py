@@ -0,0 +1,164 @@
+#
+#   timing.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   Timing instrumentation of the main loop and the fan controllers: fixed-bucket duration histograms.
+#
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+from smfc import clock
+
+
+# Bucket upper bounds (sec) of the phase durations (sensor reads, level calculation, IPMI writes, lateness).
+DURATION_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bucket upper bounds (sec) of the loop period and the sleep time of the main loop.
+PERIOD_BUCKETS: Tuple[float, ...] = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class Histogram:
+    """Duration histogram with fixed bucket bounds (Prometheus semantics: a bucket counts the observations less
+    than or equal to its upper bound). An observation costs a binary search and two additions, so the histogram
+    can be updated at every poll. The histogram is updated by a single thread (the main loop or the worker thread
+    of a fan controller); the readers (e.g. the HTTP exporter) take a snapshot() of it.
+    """
+
+    bounds: Tuple[float, ...]   # Upper bounds of the buckets (sec, ascending, the +Inf bucket is implicit)
+    counts: List[int]           # Observations per bucket (not cumulative, the last one is the +Inf bucket)
+    sum: float                  # Sum of the observations (sec)
+    count: int                  # Number of observations
+
+    def __init__(self, bounds: Tuple[float, ...] = DURATION_BUCKETS) -> None:
+        """Initialize an empty histogram.
+        Args:
+            bounds (Tuple[float, ...]): upper bounds of the buckets (sec)
+        Raises:
+            ValueError: the bounds are empty or not strictly ascending
+        """
+        if not bounds or any(a >= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError(f"invalid value: bucket bounds must be strictly ascending ({bounds})")
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add an observation (a negative value is counted as 0).
+        Args:
+            value (float): observed duration (sec)
+        """
+        value = max(value, 0.0)
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON serializable copy of the histogram with cumulative bucket counts.
+        Returns:
+            Dict[str, Any]: {"buckets": [[upper bound, cumulative count], ...], "sum": float, "count": int}
+        """
+        counts = list(self.counts)
+        buckets: List[List[float]] = []
+        total = 0
+        for bound, n in zip(self.bounds, counts):
+            total += n
+            buckets.append([bound, total])
+        return {"buckets": buckets, "sum": round(self.sum, 6), "count": total + counts[-1]}
+
+
+class ControllerTiming:
+    """Timing of the polls of a fan controller: the lateness of the poll behind its polling period, the duration
+    of the temperature read, of the fan level calculation and of the IPMI write of the controller.
+    """
+
+    lateness: Histogram             # Delay of the poll behind the polling period of the controller
+    read: Histogram                 # Duration of the temperature read (callback function and get_temp())
+    decide: Histogram               # Duration of the fan level calculation (without the IPMI write)
+    apply: Histogram                # Duration of the IPMI write of the controller (non-deferred controllers only)
+    _last_start: Optional[float]    # monotonic() timestamp of the start of the previous poll (None = no poll yet)
+    _apply_time: float              # Duration of the IPMI writes in the current poll (sec)
+
+    def __init__(self) -> None:
+        """Initialize empty histograms."""
+        self.lateness = Histogram()
+        self.read = Histogram()
+        self.decide = Histogram()
+        self.apply = Histogram()
+        self._last_start = None
+        self._apply_time = 0.0
+
+    def start(self, polling: float) -> float:
+        """Record the start of a poll: the lateness is measured from the start of the previous poll plus the
+        polling period (the first poll is not measured).
+        Args:
+            polling (float): polling period of the controller (sec)
+        Returns:
+            float: monotonic() timestamp of the start of the poll
+        """
+        now = clock.monotonic()
+        if self._last_start is not None:
+            self.lateness.observe(now - self._last_start - polling)
+        self._last_start = now
+        self._apply_time = 0.0
+        return now
+
+    def applied(self, start: float) -> None:
+        """Record an IPMI write of the controller.
+        Args:
+            start (float): monotonic() timestamp of the start of the write
+        """
+        duration = clock.monotonic() - start
+        self.apply.observe(duration)
+        self._apply_time += duration
+
+    def decided(self, start: float) -> None:
+        """Record the end of the fan level calculation (the IPMI writes in the meantime are not counted).
+        Args:
+            start (float): monotonic() timestamp of the start of the calculation
+        """
+        self.decide.observe(clock.monotonic() - start - self._apply_time)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON serializable copy of the histograms.
+        Returns:
+            Dict[str, Any]: histogram snapshots by phase name
+        """
+        return {"lateness": self.lateness.snapshot(), "read": self.read.snapshot(),
+                "decide": self.decide.snapshot(), "apply": self.apply.snapshot()}
+
+
+class LoopTiming:
+    """Timing of the main loop: the period between two wakeups, the sleep time and the duration of the IPMI
+    writes of the shared IPMI zones (applied by the main loop after the zone arbitration).
+    """
+
+    period: Histogram               # Time between two wakeups of the main loop
+    sleep: Histogram                # Time slept by the main loop until the next deadline
+    apply: Histogram                # Duration of the IPMI writes of the shared IPMI zones
+    _last_wakeup: Optional[float]   # monotonic() timestamp of the previous wakeup (None = no wakeup yet)
+
+    def __init__(self) -> None:
+        """Initialize empty histograms."""
+        self.period = Histogram(PERIOD_BUCKETS)
+        self.sleep = Histogram(PERIOD_BUCKETS)
+        self.apply = Histogram()
+        self._last_wakeup = None
+
+    def woke_up(self, sleep_start: float) -> None:
+        """Record a wakeup of the main loop (the period of the first wakeup is not measured).
+        Args:
+            sleep_start (float): monotonic() timestamp of the start of the sleep
+        """
+        now = clock.monotonic()
+        self.sleep.observe(now - sleep_start)
+        if self._last_wakeup is not None:
+            self.period.observe(now - self._last_wakeup)
+        self._last_wakeup = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON serializable copy of the histograms.
+        Returns:
+            Dict[str, Any]: histogram snapshots by phase name
+        """
+        return {"period": self.period.snapshot(), "sleep": self.sleep.snapshot(), "apply": self.apply.snapshot()}
+
+
+# End.
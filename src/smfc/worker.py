@@ -0,0 +1,155 @@
+#
+#   worker.py (C) 2020-2026, Peter Sulyok
+#   smfc package: Supermicro fan control for Linux (home) servers.
+#   smfc.DesiredLevels(), smfc.ControllerRecord() and smfc.ControllerWorker() class implementations: threaded
+#   execution mode.
+#
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+from smfc.constfc import ConstFc
+from smfc.fancontroller import FanController
+from smfc.scheduler import Scheduler
+from smfc.snapshot import build_controller_entry
+
+
+class DesiredLevels:
+    """Thread-safe exchange of the desired fan levels between the controller workers and the IPMI writer.
+
+    Every worker publishes the desired level of its controller after a poll, and the IPMI writer (the main
+    thread) waits for a change, then takes a consistent snapshot of all desired levels for the zone arbitration.
+    The first exception of a worker is also passed to the IPMI writer, which re-raises it (as in the sequential
+    mode, an exhausted error tolerance budget terminates the service).
+    """
+
+    _cond: threading.Condition                              # Protects all members below
+    _levels: Dict[str, Tuple[List[int], int, float]]        # Controller name -> (ipmi_zones, level, temp)
+    _changed: bool                                          # New level published since the last snapshot
+    _error: Optional[BaseException]                         # First exception raised in a worker
+
+    def __init__(self) -> None:
+        """Initialize an empty exchange."""
+        self._cond = threading.Condition()
+        self._levels = {}
+        self._changed = False
+        self._error = None
+
+    def publish(self, name: str, zones: List[int], level: int, temp: float) -> None:
+        """Publish the desired fan level of a controller and wake up the IPMI writer if the level changed (an
+        unchanged level only updates the temperature, there is nothing to arbitrate).
+        Args:
+            name (str): name of the controller
+            zones (List[int]): IPMI zones of the controller
+            level (int): desired fan level (%)
+            temp (float): temperature of the controller (C, 0 = no temperature)
+        """
+        with self._cond:
+            old = self._levels.get(name)
+            self._levels[name] = (zones, level, temp)
+            if old is None or old[1] != level or old[0] != zones:
+                self._changed = True
+                self._cond.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        """Pass the exception of a worker to the IPMI writer (only the first one is kept).
+        Args:
+            error (BaseException): exception raised in the worker
+        """
+        with self._cond:
+            if self._error is None:
+                self._error = error
+            self._cond.notify_all()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait until a new level is published, a worker fails, or the timeout expires.
+        Args:
+            timeout (float): maximum waiting time (sec)
+        Returns:
+            bool: True if a new level was published or a worker failed
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._changed or self._error is not None, timeout)
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Return the first exception raised in a worker (None if no worker failed)."""
+        with self._cond:
+            return self._error
+
+    def snapshot(self) -> List[Tuple[str, List[int], int, float]]:
+        """Return the published desired levels (in the order of the first publication) and clear the change flag.
+        A level of 0 is returned too, so the zone arbiter can remove the controller from its zones.
+        Returns:
+            List[Tuple[str, List[int], int, float]]: list of (name, ipmi_zones, level, temp) tuples
+        """
+        with self._cond:
+            self._changed = False
+            return [(name, zones, level, temp) for name, (zones, level, temp) in self._levels.items()]
+
+
+@dataclass(frozen=True)
+class ControllerRecord:
+    """State of a fan controller taken by its worker thread between two polls. Neither the object nor its dicts
+    are modified after the publication, so the main thread builds the snapshot and the state checkpoint from it
+    without seeing a half-updated controller."""
+    entry: Dict[str, Any]       # Snapshot entry of the controller (see build_controller_entry())
+    state: Dict[str, Any]       # Warm start state of the controller (see save_state() of the fan controllers)
+
+
+class ControllerWorker(threading.Thread):
+    """Worker thread polling one fan controller at its own polling rate (threaded execution mode).
+
+    The controller runs in deferred mode, so it never accesses the BMC: after every poll the worker publishes
+    the desired level of the controller in a `DesiredLevels` exchange, and the IPMI writer applies it. A slow
+    poll (e.g. `smartctl` on many disks) delays only its own controller. The worker also publishes the state of
+    the controller after every poll as an immutable `ControllerRecord`, the main thread reads only this record.
+    """
+
+    fc: Union[FanController, ConstFc]   # The fan controller
+    levels: DesiredLevels               # Exchange of the desired fan levels
+    record: ControllerRecord            # State of the controller after its last poll (replaced by the worker)
+    _stop_event: threading.Event        # Set by stop()
+    _scheduler: Scheduler               # Polling deadlines of the controller
+
+    def __init__(self, fc: Union[FanController, ConstFc], levels: DesiredLevels) -> None:
+        """Initialize the worker thread (started by `start()`). The first record of the controller is taken here,
+        before the thread starts polling it.
+        Args:
+            fc (Union[FanController, ConstFc]): the fan controller
+            levels (DesiredLevels): exchange of the desired fan levels
+        """
+        super().__init__(name=f"smfc-{fc.name}", daemon=True)
+        self.fc = fc
+        self.levels = levels
+        self.record = self._take_record()
+        self._stop_event = threading.Event()
+        self._scheduler = Scheduler(self._stop_event.wait)
+        self._scheduler.add(fc.name, fc.config.polling, fc, fc.config.polling_offset)
+
+    def _take_record(self) -> ControllerRecord:
+        """Take the state of the controller (in the worker thread, between two polls).
+        Returns:
+            ControllerRecord: the state of the controller
+        """
+        return ControllerRecord(build_controller_entry(self.fc), self.fc.save_state())
+
+    def run(self) -> None:
+        """Poll the controller at its polling deadlines until stopped or an exception is raised."""
+        try:
+            while not self._stop_event.is_set():
+                self._scheduler.wait()
+                if self._stop_event.is_set():
+                    break
+                self.fc.poll()
+                # Replacing the reference is atomic: the main thread sees either the previous or the new record.
+                self.record = self._take_record()
+                self.levels.publish(self.fc.name, self.fc.config.ipmi_zone, self.fc.last_level, self.fc.last_temp)
+        except Exception as e:  # pylint: disable=broad-except
+            self.levels.fail(e)
+
+    def stop(self) -> None:
+        """Ask the worker to stop (it stops at the next wakeup, an ongoing poll is completed)."""
+        self._stop_event.set()
+
+
+# End.
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+#   test_arbiter.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.ZoneArbiter() class.
+#
+from smfc.arbiter import ZoneArbiter
+
+
+class TestZoneArbiter:
+    """Unit test class for smfc.ZoneArbiter() class"""
+
+    def test_update_winner(self) -> None:
+        """Positive unit test for ZoneArbiter.update() and winner() methods. It contains the following steps:
+        - report CPU (zones 0, 1) at 50%, HD (zone 1) at 65% and NVME (zone 1) at 65%
+        - ASSERT: the zones carry the maximum level, the first reported controller wins a tie
+        - lower HD to 40%, then NVME to 30%
+        - ASSERT: the winner of zone 1 follows the changes
+        - ASSERT: an unknown zone has no winner
+        """
+        arbiter = ZoneArbiter()
+        assert arbiter.update("CPU", [0, 1], 50, 45.0) is True
+        assert arbiter.update("HD", [1], 65, 38.0) is True
+        assert arbiter.update("NVME", [1], 65, 42.0) is True
+        assert arbiter.winner(0) == (50, "CPU")
+        assert arbiter.winner(1) == (65, "HD")
+        arbiter.update("HD", [1], 40, 36.0)
+        assert arbiter.winner(1) == (65, "NVME")
+        arbiter.update("NVME", [1], 30, 36.0)
+        assert arbiter.winner(1) == (50, "CPU")
+        assert arbiter.winner(5) == (0, "")
+
+    def test_changes(self) -> None:
+        """Positive unit test for ZoneArbiter.changes() method. It contains the following steps:
+        - report CPU (zones 0, 1) at 50% and HD (zone 1) at 65%
+        - ASSERT: changes() returns the winners of both zones once, then nothing
+        - report the same levels with new temperatures
+        - ASSERT: the reports return False and changes() returns nothing (no arbitration work)
+        - ASSERT: the contributors carry the latest temperatures in the order of the first report
+        - raise CPU to 70%
+        - ASSERT: changes() returns both zones of CPU with CPU as winner
+        """
+        arbiter = ZoneArbiter()
+        arbiter.update("CPU", [0, 1], 50, 45.0)
+        arbiter.update("HD", [1], 65, 38.0)
+        assert arbiter.changes() == [(0, 50, "CPU"), (1, 65, "HD")]
+        assert not arbiter.changes()
+        assert arbiter.update("CPU", [0, 1], 50, 46.0) is False
+        assert arbiter.update("HD", [1], 65, 39.0) is False
+        assert not arbiter.changes()
+        assert arbiter.contributors(1) == [("CPU", 50, 46.0), ("HD", 65, 39.0)]
+        arbiter.update("CPU", [0, 1], 70, 55.0)
+        assert arbiter.changes() == [(0, 70, "CPU"), (1, 70, "CPU")]
+
+    def test_zero_level(self) -> None:
+        """Positive unit test for ZoneArbiter.update() method with a zero level. It contains the following steps:
+        - report HD (zone 1) at 0%, then CPU (zone 1) at 50%, then HD at 60%, then HD at 0% again
+        - ASSERT: a controller without a positive level does not contribute, a zone is left out of changes() until
+          a level is calculated, and the order of the first report is kept for the tie-break
+        - drop CPU to 0% and move HD to zone 2
+        - ASSERT: zone 1 is returned with level 0 once all of its controllers dropped to 0
+        - ASSERT: a zone left by all of its controllers is not returned
+        """
+        arbiter = ZoneArbiter()
+        arbiter.update("HD", [1], 0, 0.0)
+        assert not arbiter.changes()
+        assert not arbiter.desired()
+        arbiter.update("CPU", [1], 50, 45.0)
+        arbiter.update("HD", [1], 60, 40.0)
+        assert arbiter.changes() == [(1, 60, "HD")]
+        assert arbiter.desired() == [("HD", [1], 60, 40.0), ("CPU", [1], 50, 45.0)]
+        arbiter.update("HD", [1], 0, 0.0)
+        assert arbiter.changes() == [(1, 50, "CPU")]
+        arbiter.update("CPU", [1], 0, 0.0)
+        assert arbiter.changes() == [(1, 0, "HD")]
+        assert arbiter.winner(1) == (0, "")
+        arbiter.update("CPU", [1], 40, 42.0)
+        arbiter.update("CPU", [3], 40, 42.0)
+        assert arbiter.changes() == [(1, 0, "HD"), (3, 40, "CPU")]
+        arbiter.update("HD", [2], 0, 0.0)
+        assert not arbiter.changes()
+
+
+# End.
@@ -9,7 +9,9 @@ from typing import Any, List, Optional, Tuple
 from unittest.mock import MagicMock
 import pytest
 from pytest_mock import MockerFixture
-from smfc import client
+from smfc import client, ConstFc, FanController
+from smfc.hwmon import HwmonIndex
+from smfc.sensors import SensorRegistry
 from smfc.client import (
     EXIT_OK,
     EXIT_CONFIG_ERROR,
@@ -252,7 +254,7 @@ class TestFormatReport:
     def test_standby_guard_section_present(self) -> None:
         """Positive unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and an HD controller stub with standby enabled, 4 disks, 2 in standby
-        - mock device_names() and _get_nth_temp() on the HD controller
+        - mock device_names() and _read_nth_temp() on the HD controller
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: Standby Guard line appears with the limit
         - ASSERT: Standby Guard line is folded into the [HD] block
@@ -266,7 +268,7 @@ class TestFormatReport:
                                       standby_hd_limit=1,
                                       standby_states=[False, False, True, True])
         hd.device_names.return_value = ["/dev/sda", "/dev/sdb", "/dev/sdc", "/dev/sdd"]
-        hd._get_nth_temp.side_effect = lambda i: [33.0, 34.5, 36.1, 39.0][i]
+        hd._read_nth_temp.side_effect = lambda i: [33.0, 34.5, 36.1, 39.0][i]
         entries = [("HD", "hd", hd, None)]
         out = client._format_report(ipmi, entries, "x.conf", use_color=False, verbose=True)
         assert "Standby Guard: enabled (limit=1)" in out
@@ -284,14 +286,14 @@ class TestFormatReport:
     def test_standby_guard_section_absent(self) -> None:
         """Positive unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and an HD controller stub with standby disabled
-        - mock device_names() and _get_nth_temp() on the HD controller
+        - mock device_names() and _read_nth_temp() on the HD controller
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: Standby Guard line is omitted from the output
         """
         ipmi = _make_fake_ipmi()
         hd = _make_fake_hd_controller(zones=[1], count=4, standby_enabled=False)
         hd.device_names.return_value = [f"/dev/sd{chr(ord('a') + i)}" for i in range(4)]
-        hd._get_nth_temp.side_effect = lambda i: 34.1
+        hd._read_nth_temp.side_effect = lambda i: 34.1
         entries = [("HD", "hd", hd, None)]
         out = client._format_report(ipmi, entries, "x.conf", use_color=False, verbose=True)
         assert "Standby Guard" not in out
@@ -314,7 +316,7 @@ class TestFormatReport:
     def test_devices_section_with_verbose(self) -> None:
         """Positive unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and an HD controller stub with 2 disks
-        - mock device_names() and _get_nth_temp() on the HD controller
+        - mock device_names() and _read_nth_temp() on the HD controller
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: [HD] block header is present
         - ASSERT: Window: line is present
@@ -325,11 +327,11 @@ class TestFormatReport:
         - ASSERT: full /dev/ prefix is stripped from HD names
         """
         ipmi = _make_fake_ipmi()
-        # An HD controller with two disks; mock device_names() and _get_nth_temp() so we don't shell out.
+        # An HD controller with two disks; mock device_names() and _read_nth_temp() so we don't shell out.
         hd = _make_fake_hd_controller(zones=[1], count=2, standby_enabled=False,
                                       hd_names=["/dev/sda", "/dev/sdb"])
         hd.device_names.return_value = ["/dev/sda", "/dev/sdb"]
-        hd._get_nth_temp.side_effect = lambda i: [33.0, 34.5][i]
+        hd._read_nth_temp.side_effect = lambda i: [33.0, 34.5][i]
         entries = [("HD", "hd", hd, None)]
         out = client._format_report(ipmi, entries, "x.conf", use_color=False, verbose=True)
         # Verbose mode emits a per-controller block: header, window, current, then a Device table.
@@ -347,7 +349,7 @@ class TestFormatReport:
     def test_devices_section_per_device_error_isolated(self) -> None:
         """Negative unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and an HD controller stub with 2 disks
-        - mock device_names() and make _get_nth_temp() raise RuntimeError for the second disk
+        - mock device_names() and make _read_nth_temp() raise RuntimeError for the second disk
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: the healthy disk row renders its temperature (33.0 C)
         - ASSERT: the failing disk row renders ERROR
@@ -361,7 +363,7 @@ class TestFormatReport:
             if i == 1:
                 raise RuntimeError("smartctl failed")
             return 33.0
-        hd._get_nth_temp.side_effect = _read
+        hd._read_nth_temp.side_effect = _read
         entries = [("HD", "hd", hd, None)]
         out = client._format_report(ipmi, entries, "x.conf", use_color=False, verbose=True)
         assert "33.0 C" in out
@@ -385,7 +387,7 @@ class TestFormatReport:
     def test_devices_section_device_names_error(self) -> None:
         """Negative unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and a CPU controller stub whose device_names() raises RuntimeError
-        - build a healthy HD controller stub with mocked device_names() and _get_nth_temp()
+        - build a healthy HD controller stub with mocked device_names() and _read_nth_temp()
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: the HD basename (sda) still renders
         - ASSERT: full /dev/ prefix is stripped
@@ -397,7 +399,7 @@ class TestFormatReport:
         # Add a healthy HD so the Devices section still renders for the surviving controller.
         hd = _make_fake_hd_controller(zones=[1], count=1, hd_names=["/dev/sda"])
         hd.device_names.return_value = ["/dev/sda"]
-        hd._get_nth_temp.side_effect = lambda i: 33.0
+        hd._read_nth_temp.side_effect = lambda i: 33.0
         entries = [("CPU", "cpu", cpu, None), ("HD", "hd", hd, None)]
         out = client._format_report(ipmi, entries, "x.conf", use_color=False, verbose=True)
         # HD name renders as basename only.
@@ -524,6 +526,7 @@ class TestMain:
         - mock smfc.client.Ipmi, Context, and _construct_controllers to return successful stubs
         - call main() with -c dummy and -nc (force no-color)
         - ASSERT: main returns EXIT_OK
+        - ASSERT: the controllers are built with a shared sensor registry and hwmon index
         - ASSERT: stdout contains the smfc-client banner
         - ASSERT: stdout contains the BMC section
         - ASSERT: stdout contains the Fan controllers section
@@ -536,10 +539,12 @@ class TestMain:
         mocker.patch("smfc.client.Ipmi", return_value=fake_ipmi)
         mocker.patch("smfc.client.Context", return_value=MagicMock())
         cpu = _make_fake_cpu_controller()
-        mocker.patch("smfc.client._construct_controllers", return_value=[("CPU", "cpu", cpu, None)])
+        construct = mocker.patch("smfc.client._construct_controllers", return_value=[("CPU", "cpu", cpu, None)])
         # Force no-color so output is deterministic.
         rc = client.main(["-c", "/dummy.conf", "-nc"])
         assert rc == EXIT_OK
+        assert isinstance(construct.call_args.args[5], SensorRegistry)
+        assert isinstance(construct.call_args.args[6], HwmonIndex)
         captured = capsys.readouterr()
         assert "smfc-client" in captured.out
         assert "BMC" in captured.out
@@ -747,12 +752,12 @@ class TestSafeHelpers:
 
     def test_safe_nth_temp_str_raises(self) -> None:
         """Negative unit test for smfc.client._safe_nth_temp_str() helper. It contains the following steps:
-        - build a MagicMock controller whose _get_nth_temp() raises RuntimeError
+        - build a MagicMock controller whose _read_nth_temp() raises RuntimeError
         - call _safe_nth_temp_str() with index 0
         - ASSERT: returns 'ERROR' sentinel
         """
         controller = MagicMock()
-        controller._get_nth_temp.side_effect = RuntimeError("smartctl failed")
+        controller._read_nth_temp.side_effect = RuntimeError("smartctl failed")
         assert client._safe_nth_temp_str(controller, 0) == "ERROR"
 
     def test_display_device_name_strips_hd_path(self) -> None:
@@ -823,7 +828,7 @@ class TestFormatReportErrorPaths:
     def test_standby_states_truncated(self) -> None:
         """Negative unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and an HD controller stub with 4 disks but only 2 standby states
-        - mock device_names() and _get_nth_temp() on the HD controller
+        - mock device_names() and _read_nth_temp() on the HD controller
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: first two basenames (sda, sdb) appear
         - ASSERT: trailing basenames (sdc, sdd) appear even without state mapping
@@ -836,7 +841,7 @@ class TestFormatReportErrorPaths:
                                       standby_hd_limit=1, standby_states=[False, False],
                                       hd_names=["/dev/sda", "/dev/sdb", "/dev/sdc", "/dev/sdd"])
         hd.device_names.return_value = ["/dev/sda", "/dev/sdb", "/dev/sdc", "/dev/sdd"]
-        hd._get_nth_temp.side_effect = lambda i: 33.0 + i
+        hd._read_nth_temp.side_effect = lambda i: 33.0 + i
         out = client._format_report(ipmi, [("HD", "hd", hd, None)], "x.conf", use_color=False, verbose=True)
         # Device names render as the basename — full /dev/ paths get stripped for HD/NVMe.
         assert "  sda" in out
@@ -862,7 +867,7 @@ class TestFormatReportErrorPaths:
         hd = _make_fake_hd_controller(zones=[1], count=2, standby_enabled=True,
                                       standby_hd_limit=1, standby_states=[False, True])
         hd.device_names.return_value = ["/dev/sda", "/dev/sdb"]
-        hd._get_nth_temp.side_effect = lambda i: 33.0
+        hd._read_nth_temp.side_effect = lambda i: 33.0
         hd.get_standby_state_str.side_effect = RuntimeError("boom")
         out = client._format_report(ipmi, [("HD", "hd", hd, None)], "x.conf", use_color=False, verbose=True)
         assert "  sda" in out
@@ -887,7 +892,7 @@ class TestFormatReportErrorPaths:
     def test_standby_states_attribute_missing(self) -> None:
         """Negative unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and an HD controller stub with standby enabled but no states attribute
-        - mock device_names() and _get_nth_temp() on the HD controller
+        - mock device_names() and _read_nth_temp() on the HD controller
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: Standby Guard line is omitted when standby_array_states is missing
         """
@@ -897,7 +902,7 @@ class TestFormatReportErrorPaths:
         hd = _make_fake_hd_controller(zones=[1], count=4, standby_enabled=True,
                                       standby_hd_limit=1, standby_states=None)
         hd.device_names.return_value = [f"/dev/sd{chr(ord('a') + i)}" for i in range(4)]
-        hd._get_nth_temp.side_effect = lambda i: 33.0
+        hd._read_nth_temp.side_effect = lambda i: 33.0
         out = client._format_report(ipmi, [("HD", "hd", hd, None)], "x.conf", use_color=False, verbose=True)
         assert "Standby Guard" not in out
 
@@ -916,7 +921,7 @@ class TestFormatReportErrorPaths:
     def test_verbose_block_curve_path(self) -> None:
         """Positive unit test for smfc.client._format_report() function. It contains the following steps:
         - build a fake Ipmi MagicMock and a CPU controller stub with control_function endpoints [[35,35],[85,100]]
-        - mock device_names() and _get_nth_temp() on the CPU controller
+        - mock device_names() and _read_nth_temp() on the CPU controller
         - call _format_report() with use_color=False and verbose=True
         - ASSERT: Window line shows the curve's temperature endpoints (T=[35..85]C)
         """
@@ -924,7 +929,7 @@ class TestFormatReportErrorPaths:
         cpu = _make_fake_cpu_controller(zones=[0], count=1, temp=42.3)
         cpu.config.control_function = [[35, 35], [85, 100]]
         cpu.device_names.return_value = ["cpu0"]
-        cpu._get_nth_temp.return_value = 42.3
+        cpu._read_nth_temp.return_value = 42.3
         out = client._format_report(ipmi, [("CPU", "cpu", cpu, None)], "x.conf", use_color=False, verbose=True)
         assert "Window: T=[35..85]C" in out
 
@@ -1022,6 +1027,31 @@ class TestConstructControllers:
             ("CONST", "const", const_obj, None),
         ]
 
+    def test_shared_hwmon_index_and_sensor_registry(self, mocker: MockerFixture) -> None:
+        """Positive unit test for smfc.client._construct_controllers() function. It contains the following steps:
+        - build a Config-like MagicMock with one enabled CPU, HD, NVME and CONST entry
+        - mock the constructors to return FanController-like (and ConstFc-like) MagicMocks
+        - call _construct_controllers() with a shared hwmon index and sensor registry
+        - ASSERT: the CPU, HD and NVME constructors receive the shared hwmon index
+        - ASSERT: every temperature based controller is attached to the sensor registry, CONST is not
+        """
+        cfg = self._make_cfg(cpu=[self._entry("CPU")], hd=[self._entry("HD")], nvme=[self._entry("NVME")],
+                             const=[self._entry("CONST")])
+        objs = [MagicMock(spec=FanController) for _ in range(3)]
+        ctors = [mocker.patch(f"smfc.client.{name}", return_value=obj)
+                 for name, obj in zip(("CpuFc", "HdFc", "NvmeFc"), objs)]
+        const_obj = MagicMock(spec=ConstFc)
+        mocker.patch("smfc.client.ConstFc", return_value=const_obj)
+        sensors = MagicMock()
+        hwmon_index = MagicMock()
+        entries = client._construct_controllers(MagicMock(), cfg, MagicMock(), MagicMock(), False, sensors,
+                                                hwmon_index)
+        assert [e[2] for e in entries] == objs + [const_obj]
+        for ctor, obj in zip(ctors, objs):
+            assert ctor.call_args.args[-1] is hwmon_index
+            obj.attach_sensors.assert_called_once_with(sensors)
+        assert not hasattr(const_obj, "attach_sensors")
+
     def test_per_controller_failures_become_error_rows(self, mocker: MockerFixture) -> None:
         """Negative unit test for smfc.client._construct_controllers() function. It contains the following steps:
         - build a Config-like MagicMock with one enabled entry of each controller type
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+#
+#   test_clock.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.clock module.
+#
+from mock import MagicMock
+from pytest_mock import MockerFixture
+from smfc import clock
+from smfc.clock import SystemClock, VirtualClock
+
+
+class TestClock:
+    """Unit test class for smfc.clock module"""
+
+    def test_system_clock(self, mocker: MockerFixture) -> None:
+        """Positive unit test for SystemClock class. It contains the following steps:
+        - mock time.monotonic(), time.time() and time.sleep()
+        - ASSERT: the module functions of the default clock delegate to the time module at call time
+        """
+        mocker.patch("time.monotonic", MagicMock(return_value=12.5))
+        mocker.patch("time.time", MagicMock(return_value=1000.0))
+        mock_sleep = MagicMock()
+        mocker.patch("time.sleep", mock_sleep)
+        assert isinstance(clock.get_clock(), SystemClock)
+        assert clock.monotonic() == 12.5
+        assert clock.time() == 1000.0
+        clock.sleep(3.0)
+        mock_sleep.assert_called_once_with(3.0)
+
+    def test_virtual_clock(self) -> None:
+        """Positive unit test for VirtualClock class. It contains the following steps:
+        - install a virtual clock starting at 10 sec with an epoch of 1000, sleep 5 sec, then a negative time
+        - ASSERT: the module functions use the virtual clock, a sleep advances the virtual time, a negative sleep
+          is ignored
+        - restore the previous clock
+        - ASSERT: the previous clock is used again
+        """
+        previous = clock.get_clock()
+        virtual = VirtualClock(10.0, 1000.0)
+        clock.set_clock(virtual)
+        try:
+            assert clock.get_clock() is virtual
+            assert clock.monotonic() == 10.0
+            assert clock.time() == 1010.0
+            clock.sleep(5.0)
+            clock.sleep(-1.0)
+            assert clock.monotonic() == 15.0
+            assert virtual.now == 15.0
+        finally:
+            clock.set_clock(previous)
+        assert clock.get_clock() is previous
+
+
+# End.
@@ -138,6 +138,7 @@ class TestConfigStaticMethods:
                          id="4-point-comma"),
             pytest.param("30-35 65-100", [(30, 35), (65, 100)], id="space-separator"),
             pytest.param("0-0, 100-100", [(0, 0), (100, 100)], id="endpoints-0-and-100"),
+            pytest.param("90-60, 150-100", [(90, 60), (150, 100)], id="temp-up-to-150"),
             pytest.param("  30-35 ,   65-100  ", [(30, 35), (65, 100)], id="extra-whitespace"),
         ],
     )
@@ -159,7 +160,7 @@ class TestConfigStaticMethods:
             pytest.param("30.5-35, 65-100", id="non-integer-temp"),
             pytest.param("30-35, 65-abc", id="non-integer-level"),
             pytest.param("-1-35, 65-100", id="temp-negative"),
-            pytest.param("30-35, 101-100", id="temp-over-100"),
+            pytest.param("30-35, 151-100", id="temp-over-150"),
             pytest.param("30-35, 65-150", id="level-over-100"),
             pytest.param("30--5, 65-100", id="level-negative"),
             pytest.param("60-35, 30-100", id="non-ascending-temps"),
@@ -388,9 +389,11 @@ class TestIpmiConfigParsing:
         - ASSERT: ipmi.platform_name equals Config.DV_IPMI_PLATFORM_NAME
         - ASSERT: ipmi.enforce_fan_mode equals Config.DV_IPMI_ENFORCE_FAN_MODE
         - ASSERT: ipmi.exit_level equals Config.DV_IPMI_EXIT_LEVEL
+        - ASSERT: ipmi.command_timeout equals Config.DV_IPMI_COMMAND_TIMEOUT
         """
         cfg = create_config("[Ipmi]\n")
         assert cfg.ipmi.exit_level == Config.DV_IPMI_EXIT_LEVEL
+        assert cfg.ipmi.command_timeout == Config.DV_IPMI_COMMAND_TIMEOUT
         assert cfg.ipmi.command == Config.DV_IPMI_COMMAND
         assert cfg.ipmi.fan_mode_delay == Config.DV_IPMI_FAN_MODE_DELAY
         assert cfg.ipmi.fan_level_delay == Config.DV_IPMI_FAN_LEVEL_DELAY
@@ -401,7 +404,7 @@ class TestIpmiConfigParsing:
     def test_ipmi_custom_values(self, create_config):
         """Positive unit test for the [Ipmi] section parser inside Config.__init__(). It contains the following steps:
         - mock the on-disk config via the create_config fixture (tmp_path-backed)
-        - write [Ipmi] with all seven keys populated and instantiate Config
+        - write [Ipmi] with all eight keys populated and instantiate Config
         - inspect every IpmiConfig attribute
         - ASSERT: ipmi.command equals "/opt/ipmitool"
         - ASSERT: ipmi.fan_mode_delay equals 5
@@ -410,6 +413,7 @@ class TestIpmiConfigParsing:
         - ASSERT: ipmi.platform_name equals "X10QBi"
         - ASSERT: ipmi.enforce_fan_mode is False
         - ASSERT: ipmi.exit_level equals 60
+        - ASSERT: ipmi.command_timeout equals 12.5
         """
         cfg = create_config("""
 [Ipmi]
@@ -420,8 +424,10 @@ remote_parameters = -I lanplus -U admin -P secret -H 192.168.1.100
 platform_name = X10QBi
 enforce_fan_mode = false
 exit_level = 60
+command_timeout = 12.5
 """)
         assert cfg.ipmi.exit_level == 60
+        assert cfg.ipmi.command_timeout == 12.5
         assert cfg.ipmi.command == "/opt/ipmitool"
         assert cfg.ipmi.fan_mode_delay == 5
         assert cfg.ipmi.fan_level_delay == 1
@@ -537,12 +543,13 @@ exit_level = 60
         [
             pytest.param("fan_mode_delay", "-1", id="negative-mode-delay"),
             pytest.param("fan_level_delay", "-5", id="negative-level-delay"),
+            pytest.param("command_timeout", "-1", id="negative-command-timeout"),
         ],
     )
     def test_ipmi_invalid_values(self, create_config_file, param: str, value: str):
         """Negative unit test for the [Ipmi] section parser inside Config.__init__(). It contains the following steps:
         - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
-        - write [Ipmi] with a negative fan_mode_delay or fan_level_delay and call Config(path)
+        - write [Ipmi] with a negative fan_mode_delay, fan_level_delay or command_timeout and call Config(path)
         - ASSERT: Config(path) raises ValueError
         """
         config_path = create_config_file(f"[Ipmi]\n{param} = {value}\n")
@@ -562,21 +569,24 @@ class TestExporterConfigParsing:
         - ASSERT: exporter.enabled equals Config.DV_EXPORTER_ENABLED
         - ASSERT: exporter.bind_address equals Config.DV_EXPORTER_BIND_ADDRESS
         - ASSERT: exporter.port equals Config.DV_EXPORTER_PORT
+        - ASSERT: exporter.history_size equals Config.DV_EXPORTER_HISTORY_SIZE
         """
         cfg = create_config("[Ipmi]\n")
         assert cfg.exporter.enabled is Config.DV_EXPORTER_ENABLED
         assert cfg.exporter.bind_address == Config.DV_EXPORTER_BIND_ADDRESS
         assert cfg.exporter.port == Config.DV_EXPORTER_PORT
+        assert cfg.exporter.history_size == Config.DV_EXPORTER_HISTORY_SIZE
 
     def test_exporter_custom_values(self, create_config):
         """Positive unit test for the [Exporter] section parser inside Config.__init__(). It contains the following
         steps:
         - mock the on-disk config via the create_config fixture (tmp_path-backed)
-        - write [Exporter] with enabled=true, bind_address=0.0.0.0, port=8080 and instantiate Config
+        - write [Exporter] with enabled=true, bind_address=0.0.0.0, port=8080, history_size=0 and instantiate Config
         - inspect every ExporterConfig attribute
         - ASSERT: exporter.enabled is True
         - ASSERT: exporter.bind_address equals "0.0.0.0"
         - ASSERT: exporter.port equals 8080
+        - ASSERT: exporter.history_size equals 0
         """
         cfg = create_config("""
 [Ipmi]
@@ -584,10 +594,12 @@ class TestExporterConfigParsing:
 enabled = true
 bind_address = 0.0.0.0
 port = 8080
+history_size = 0
 """)
         assert cfg.exporter.enabled is True
         assert cfg.exporter.bind_address == "0.0.0.0"
         assert cfg.exporter.port == 8080
+        assert cfg.exporter.history_size == 0
 
     def test_exporter_section_present_keys_absent(self, create_config):
         """Positive unit test for the [Exporter] section parser inside Config.__init__(). It contains the following
@@ -598,11 +610,13 @@ port = 8080
         - ASSERT: exporter.enabled equals Config.DV_EXPORTER_ENABLED
         - ASSERT: exporter.bind_address equals Config.DV_EXPORTER_BIND_ADDRESS
         - ASSERT: exporter.port equals Config.DV_EXPORTER_PORT
+        - ASSERT: exporter.history_size equals Config.DV_EXPORTER_HISTORY_SIZE
         """
         cfg = create_config("[Ipmi]\n[Exporter]\n")
         assert cfg.exporter.enabled is Config.DV_EXPORTER_ENABLED
         assert cfg.exporter.bind_address == Config.DV_EXPORTER_BIND_ADDRESS
         assert cfg.exporter.port == Config.DV_EXPORTER_PORT
+        assert cfg.exporter.history_size == Config.DV_EXPORTER_HISTORY_SIZE
 
     @pytest.mark.parametrize(
         "port",
@@ -624,6 +638,18 @@ port = 8080
         with pytest.raises(ValueError, match="port"):
             Config(config_path)
 
+    @pytest.mark.parametrize("history_size", ["-1", str(Config.MAX_HISTORY_SIZE + 1)], ids=["negative", "over-max"])
+    def test_exporter_invalid_history_size_rejected(self, create_config_file, history_size: str):
+        """Negative unit test for the [Exporter] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write [Exporter] with an out-of-range history_size (-1, MAX_HISTORY_SIZE + 1) and call Config(path)
+        - ASSERT: Config(path) raises ValueError whose message matches "history_size"
+        """
+        config_path = create_config_file(f"[Ipmi]\n[Exporter]\nhistory_size = {history_size}\n")
+        with pytest.raises(ValueError, match="history_size"):
+            Config(config_path)
+
     def test_exporter_empty_bind_address_rejected(self, create_config_file):
         """Negative unit test for the [Exporter] section parser inside Config.__init__(). It contains the following
         steps:
@@ -636,6 +662,143 @@ port = 8080
             Config(config_path)
 
 
+class TestServiceConfigParsing:
+    """Unit tests for [Service] section parsing."""
+
+    @pytest.mark.parametrize(
+        "content, hotplug_monitor",
+        [
+            pytest.param("[Ipmi]\n", Config.DV_SERVICE_HOTPLUG_MONITOR, id="section-absent"),
+            pytest.param("[Ipmi]\n[Service]\n", Config.DV_SERVICE_HOTPLUG_MONITOR, id="keys-absent"),
+            pytest.param("[Ipmi]\n[Service]\nhotplug_monitor = 1\n", True, id="hotplug-on"),
+            pytest.param("[Ipmi]\n[Service]\nhotplug_monitor = false\n", False, id="hotplug-off"),
+        ],
+    )
+    def test_service_section(self, create_config, content: str, hotplug_monitor: bool):
+        """Positive unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write the parametrized [Service] section (absent, empty or with values) and instantiate Config
+        - ASSERT: service.hotplug_monitor equals the expected value (default when absent)
+        """
+        cfg = create_config(content)
+        assert cfg.service.hotplug_monitor is hotplug_monitor
+
+    def test_service_invalid_bool_rejected(self, create_config_file):
+        """Negative unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write [Service] with a non-boolean hotplug_monitor value and call Config(path)
+        - ASSERT: Config(path) raises ValueError
+        """
+        config_path = create_config_file("[Ipmi]\n[Service]\nhotplug_monitor = maybe\n")
+        with pytest.raises(ValueError):
+            Config(config_path)
+
+    @pytest.mark.parametrize(
+        "content, execution_mode",
+        [
+            pytest.param("[Ipmi]\n", Config.MODE_SEQUENTIAL, id="section-absent"),
+            pytest.param("[Ipmi]\n[Service]\n", Config.MODE_SEQUENTIAL, id="key-absent"),
+            pytest.param("[Ipmi]\n[Service]\nexecution_mode = sequential\n", Config.MODE_SEQUENTIAL, id="sequential"),
+            pytest.param("[Ipmi]\n[Service]\nexecution_mode = AsyncIO\n", Config.MODE_ASYNCIO, id="asyncio"),
+            pytest.param("[Ipmi]\n[Service]\nexecution_mode = threaded\n", Config.MODE_THREADED, id="threaded"),
+        ],
+    )
+    def test_service_execution_mode(self, create_config, content: str, execution_mode: str):
+        """Positive unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write the parametrized [Service] section and instantiate Config
+        - ASSERT: service.execution_mode equals the expected (lower-case) value, the default when absent
+        """
+        cfg = create_config(content)
+        assert cfg.service.execution_mode == execution_mode
+
+    def test_service_invalid_execution_mode_rejected(self, create_config_file):
+        """Negative unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write [Service] with an unknown execution_mode value and call Config(path)
+        - ASSERT: Config(path) raises ValueError
+        """
+        config_path = create_config_file("[Ipmi]\n[Service]\nexecution_mode = parallel\n")
+        with pytest.raises(ValueError):
+            Config(config_path)
+
+    @pytest.mark.parametrize(
+        "content, sensor_process, sensor_timeout",
+        [
+            pytest.param("[Ipmi]\n", Config.DV_SERVICE_SENSOR_PROCESS, Config.DV_SERVICE_SENSOR_TIMEOUT,
+                         id="section-absent"),
+            pytest.param("[Ipmi]\n[Service]\n", Config.DV_SERVICE_SENSOR_PROCESS, Config.DV_SERVICE_SENSOR_TIMEOUT,
+                         id="keys-absent"),
+            pytest.param("[Ipmi]\n[Service]\nsensor_process = 1\nsensor_timeout = 2.5\n", True, 2.5, id="enabled"),
+        ],
+    )
+    def test_service_sensor_process(self, create_config, content: str, sensor_process: bool,
+                                    sensor_timeout: float):
+        """Positive unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write the parametrized [Service] section and instantiate Config
+        - ASSERT: service.sensor_process and service.sensor_timeout equal the expected values (defaults when absent)
+        """
+        cfg = create_config(content)
+        assert cfg.service.sensor_process is sensor_process
+        assert cfg.service.sensor_timeout == sensor_timeout
+
+    @pytest.mark.parametrize("value", ["0", "-1.5"])
+    def test_service_invalid_sensor_timeout_rejected(self, create_config_file, value: str):
+        """Negative unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write [Service] with a zero or negative sensor_timeout value and call Config(path)
+        - ASSERT: Config(path) raises ValueError
+        """
+        config_path = create_config_file(f"[Ipmi]\n[Service]\nsensor_timeout = {value}\n")
+        with pytest.raises(ValueError):
+            Config(config_path)
+
+    @pytest.mark.parametrize(
+        "content, state_file, state_interval, state_max_age",
+        [
+            pytest.param("[Ipmi]\n", Config.DV_SERVICE_STATE_FILE, Config.DV_SERVICE_STATE_INTERVAL,
+                         Config.DV_SERVICE_STATE_MAX_AGE, id="section-absent"),
+            pytest.param("[Ipmi]\n[Service]\n", Config.DV_SERVICE_STATE_FILE, Config.DV_SERVICE_STATE_INTERVAL,
+                         Config.DV_SERVICE_STATE_MAX_AGE, id="keys-absent"),
+            pytest.param("[Ipmi]\n[Service]\nstate_file = /run/smfc/state.json \nstate_interval = 10\n"
+                         "state_max_age = 120\n", "/run/smfc/state.json", 10.0, 120.0, id="enabled"),
+        ],
+    )
+    def test_service_state(self, create_config, content: str, state_file: str, state_interval: float,
+                           state_max_age: float):
+        """Positive unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write the parametrized [Service] section and instantiate Config
+        - ASSERT: service.state_file, service.state_interval and service.state_max_age equal the expected values
+          (defaults when absent)
+        """
+        cfg = create_config(content)
+        assert cfg.service.state_file == state_file
+        assert cfg.service.state_interval == state_interval
+        assert cfg.service.state_max_age == state_max_age
+
+    @pytest.mark.parametrize("key, value", [("state_interval", "0"), ("state_interval", "-5"),
+                                            ("state_max_age", "0"), ("state_max_age", "-1")])
+    def test_service_invalid_state_rejected(self, create_config_file, key: str, value: str):
+        """Negative unit test for the [Service] section parser inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write [Service] with a zero or negative state_interval or state_max_age value and call Config(path)
+        - ASSERT: Config(path) raises ValueError
+        """
+        config_path = create_config_file(f"[Ipmi]\n[Service]\n{key} = {value}\n")
+        with pytest.raises(ValueError):
+            Config(config_path)
+
+
 class TestCpuConfigParsing:
     """Unit tests for [CPU] section parsing."""
 
@@ -663,6 +826,11 @@ class TestCpuConfigParsing:
         assert cpu.max_level == Config.DV_CPU_MAX_LEVEL
         assert cpu.smoothing == Config.DV_CPU_SMOOTHING
         assert cpu.error_tolerance == Config.DV_CPU_ERROR_TOLERANCE
+        assert cpu.lut_resolution == Config.DV_LUT_RESOLUTION
+        assert cpu.hysteresis == Config.DV_HYSTERESIS
+        assert cpu.min_dwell == Config.DV_MIN_DWELL
+        assert cpu.ramp_up == Config.DV_RAMP_UP
+        assert cpu.ramp_down == Config.DV_RAMP_DOWN
 
     def test_cpu_custom_values(self, create_config):
         """Positive unit test for the [CPU] section parser inside Config.__init__(). It contains the following steps:
@@ -765,17 +933,32 @@ class TestHdConfigParsing:
             pytest.param("smoothing", "-1", id="smoothing-negative"),
             pytest.param("error_tolerance", "-1", id="error-tolerance-negative"),
             pytest.param("error_tolerance", "abc", id="error-tolerance-not-an-int"),
+            pytest.param("lut_resolution", "0.001", id="lut-resolution-too-fine"),
+            pytest.param("lut_resolution", "2", id="lut-resolution-over-1"),
+            pytest.param("hysteresis", "-1", id="hysteresis-negative"),
+            pytest.param("min_dwell", "-1", id="min-dwell-negative"),
+            pytest.param("ramp_up", "-1", id="ramp-up-negative"),
+            pytest.param("ramp_down", "-0.5", id="ramp-down-negative"),
+            pytest.param("feedforward_rate", "-1", id="feedforward-rate-negative"),
+            pytest.param("feedforward_horizon", "-5", id="feedforward-horizon-negative"),
+            pytest.param("control_mode", "fuzzy", id="control-mode-invalid"),
+            pytest.param("temp_filter", "lowpass", id="temp-filter-invalid"),
+            pytest.param("ewma_alpha", "0", id="ewma-alpha-zero"),
+            pytest.param("ewma_alpha", "1.5", id="ewma-alpha-over-1"),
+            pytest.param("kalman_process_noise", "0", id="kalman-process-noise-zero"),
+            pytest.param("kalman_measurement_noise", "-1", id="kalman-measurement-noise-negative"),
             pytest.param("min_temp", "-1", id="min-temp-negative"),
             pytest.param("max_temp", "201", id="max-temp-over-200"),
             pytest.param("min_level", "-1", id="min-level-negative"),
             pytest.param("max_level", "101", id="max-level-over-100"),
+            pytest.param("read_timeout", "-1", id="read-timeout-negative"),
         ],
     )
     def test_hd_validation_errors(self, create_config_file, param: str, value: str):
         """Negative unit test for the [HD] section parser inside Config.__init__(). It contains the following steps:
         - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
         - write [HD] with one invalid numeric parameter (temp_calc, steps, sensitivity, polling, smoothing,
-          error_tolerance, min/max temp/level) and call Config(path)
+          error_tolerance, min/max temp/level, read_timeout) and call Config(path)
         - ASSERT: Config(path) raises ValueError
         """
         config_path = create_config_file(f"[Ipmi]\n[HD]\nenabled = 1\nhd_names = /dev/sda\n{param} = {value}\n")
@@ -832,7 +1015,7 @@ class TestHdConfigParsing:
         - inspect the single HdConfig in cfg.hd
         - ASSERT: exactly one HD entry is parsed
         - ASSERT: section/enabled/ipmi_zone, every default-valued numeric field, hd_names, smartctl_path,
-          standby_guard_enabled and standby_hd_limit each match DV_HD_*
+          standby_guard_enabled, standby_hd_limit and read_timeout each match DV_HD_*
         """
         cfg = create_config("[Ipmi]\n[HD]\nenabled = 1\nhd_names = /dev/sda\n")
         assert len(cfg.hd) == 1
@@ -854,6 +1037,7 @@ class TestHdConfigParsing:
         assert hd.smartctl_path == Config.DV_HD_SMARTCTL_PATH
         assert hd.standby_guard_enabled is False
         assert hd.standby_hd_limit == Config.DV_HD_STANDBY_HD_LIMIT
+        assert hd.read_timeout == Config.DV_HD_READ_TIMEOUT
 
     def test_hd_multi_names_newline(self, create_config):
         """Positive unit test for the [HD] section parser inside Config.__init__(). It contains the following steps:
@@ -984,6 +1168,20 @@ class TestNvmeConfigParsing:
             pytest.param("smoothing", "-1", id="smoothing-negative"),
             pytest.param("error_tolerance", "-1", id="error-tolerance-negative"),
             pytest.param("error_tolerance", "abc", id="error-tolerance-not-an-int"),
+            pytest.param("lut_resolution", "0.001", id="lut-resolution-too-fine"),
+            pytest.param("lut_resolution", "2", id="lut-resolution-over-1"),
+            pytest.param("hysteresis", "-1", id="hysteresis-negative"),
+            pytest.param("min_dwell", "-1", id="min-dwell-negative"),
+            pytest.param("ramp_up", "-1", id="ramp-up-negative"),
+            pytest.param("ramp_down", "-0.5", id="ramp-down-negative"),
+            pytest.param("feedforward_rate", "-1", id="feedforward-rate-negative"),
+            pytest.param("feedforward_horizon", "-5", id="feedforward-horizon-negative"),
+            pytest.param("control_mode", "fuzzy", id="control-mode-invalid"),
+            pytest.param("temp_filter", "lowpass", id="temp-filter-invalid"),
+            pytest.param("ewma_alpha", "0", id="ewma-alpha-zero"),
+            pytest.param("ewma_alpha", "1.5", id="ewma-alpha-over-1"),
+            pytest.param("kalman_process_noise", "0", id="kalman-process-noise-zero"),
+            pytest.param("kalman_measurement_noise", "-1", id="kalman-measurement-noise-negative"),
             pytest.param("min_temp", "-1", id="min-temp-negative"),
             pytest.param("max_temp", "201", id="max-temp-over-200"),
             pytest.param("min_level", "-1", id="min-level-negative"),
@@ -1120,17 +1318,32 @@ class TestGpuConfigParsing:
             pytest.param("smoothing", "-1", id="smoothing-negative"),
             pytest.param("error_tolerance", "-1", id="error-tolerance-negative"),
             pytest.param("error_tolerance", "abc", id="error-tolerance-not-an-int"),
+            pytest.param("lut_resolution", "0.001", id="lut-resolution-too-fine"),
+            pytest.param("lut_resolution", "2", id="lut-resolution-over-1"),
+            pytest.param("hysteresis", "-1", id="hysteresis-negative"),
+            pytest.param("min_dwell", "-1", id="min-dwell-negative"),
+            pytest.param("ramp_up", "-1", id="ramp-up-negative"),
+            pytest.param("ramp_down", "-0.5", id="ramp-down-negative"),
+            pytest.param("feedforward_rate", "-1", id="feedforward-rate-negative"),
+            pytest.param("feedforward_horizon", "-5", id="feedforward-horizon-negative"),
+            pytest.param("control_mode", "fuzzy", id="control-mode-invalid"),
+            pytest.param("temp_filter", "lowpass", id="temp-filter-invalid"),
+            pytest.param("ewma_alpha", "0", id="ewma-alpha-zero"),
+            pytest.param("ewma_alpha", "1.5", id="ewma-alpha-over-1"),
+            pytest.param("kalman_process_noise", "0", id="kalman-process-noise-zero"),
+            pytest.param("kalman_measurement_noise", "-1", id="kalman-measurement-noise-negative"),
             pytest.param("min_temp", "-1", id="min-temp-negative"),
             pytest.param("max_temp", "201", id="max-temp-over-200"),
             pytest.param("min_level", "-1", id="min-level-negative"),
             pytest.param("max_level", "101", id="max-level-over-100"),
+            pytest.param("read_timeout", "-1", id="read-timeout-negative"),
         ],
     )
     def test_gpu_validation_errors(self, create_config_file, param: str, value: str):
         """Negative unit test for the [GPU] section parser inside Config.__init__(). It contains the following steps:
         - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
         - write [GPU] with one invalid numeric parameter (temp_calc, steps, sensitivity, polling, smoothing,
-          error_tolerance, min/max temp/level) and call Config(path)
+          error_tolerance, min/max temp/level, read_timeout) and call Config(path)
         - ASSERT: Config(path) raises ValueError
         """
         config_path = create_config_file(f"[Ipmi]\n[GPU]\nenabled = 1\n{param} = {value}\n")
@@ -1184,7 +1397,7 @@ class TestGpuConfigParsing:
         - write [GPU] with enabled = 1 only and instantiate Config
         - inspect the single GpuConfig in cfg.gpu
         - ASSERT: exactly one GPU entry is parsed
-        - ASSERT: section "GPU", enabled is True, gpu_type/device_ids/paths/temp keys match DV_GPU_*
+        - ASSERT: section "GPU", enabled is True, gpu_type/device_ids/paths/temp keys/read_timeout match DV_GPU_*
         """
         cfg = create_config("[Ipmi]\n[GPU]\nenabled = 1\n")
         assert len(cfg.gpu) == 1
@@ -1199,6 +1412,7 @@ class TestGpuConfigParsing:
         assert gpu.min_temp == Config.DV_GPU_MIN_TEMP
         assert gpu.max_temp == Config.DV_GPU_MAX_TEMP
         assert gpu.error_tolerance == Config.DV_GPU_ERROR_TOLERANCE
+        assert gpu.read_timeout == Config.DV_GPU_READ_TIMEOUT
 
     def test_gpu_amd_type(self, create_config):
         """Positive unit test for the [GPU] section parser inside Config.__init__(). It contains the following steps:
@@ -1400,6 +1614,20 @@ class TestFanControllerValidation:
             pytest.param("smoothing", "-1", id="smoothing-negative"),
             pytest.param("error_tolerance", "-1", id="error-tolerance-negative"),
             pytest.param("error_tolerance", "abc", id="error-tolerance-not-an-int"),
+            pytest.param("lut_resolution", "0.001", id="lut-resolution-too-fine"),
+            pytest.param("lut_resolution", "2", id="lut-resolution-over-1"),
+            pytest.param("hysteresis", "-1", id="hysteresis-negative"),
+            pytest.param("min_dwell", "-1", id="min-dwell-negative"),
+            pytest.param("ramp_up", "-1", id="ramp-up-negative"),
+            pytest.param("ramp_down", "-0.5", id="ramp-down-negative"),
+            pytest.param("feedforward_rate", "-1", id="feedforward-rate-negative"),
+            pytest.param("feedforward_horizon", "-5", id="feedforward-horizon-negative"),
+            pytest.param("control_mode", "fuzzy", id="control-mode-invalid"),
+            pytest.param("temp_filter", "lowpass", id="temp-filter-invalid"),
+            pytest.param("ewma_alpha", "0", id="ewma-alpha-zero"),
+            pytest.param("ewma_alpha", "1.5", id="ewma-alpha-over-1"),
+            pytest.param("kalman_process_noise", "0", id="kalman-process-noise-zero"),
+            pytest.param("kalman_measurement_noise", "-1", id="kalman-measurement-noise-negative"),
             pytest.param("min_temp", "-1", id="min-temp-negative"),
             pytest.param("max_temp", "201", id="max-temp-over-200"),
             pytest.param("min_level", "-1", id="min-level-negative"),
@@ -1484,6 +1712,198 @@ error_tolerance = 0
         assert cfg.nvme[0].error_tolerance == 4
         assert cfg.gpu[0].error_tolerance == 0
 
+    def test_lut_resolution_parsed_in_all_sections(self, create_config):
+        """Positive unit test for the lut_resolution parameter of all temperature-driven sections. It contains
+        the following steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write [CPU], [HD], [NVME] and [GPU] with different explicit lut_resolution values (NVME without it)
+        - instantiate Config
+        - ASSERT: the sections carry their written value, [NVME] carries the default value
+        """
+        cfg = create_config("""
+[Ipmi]
+[CPU]
+enabled = 1
+lut_resolution = 0.1
+[HD]
+enabled = 1
+ipmi_zone = 1
+hd_names = /dev/sda
+lut_resolution = 0.5
+[NVME]
+enabled = 1
+ipmi_zone = 3
+nvme_names = /dev/nvme0n1
+[GPU]
+enabled = 1
+ipmi_zone = 4
+lut_resolution = 0.01
+""")
+        assert cfg.cpu[0].lut_resolution == 0.1
+        assert cfg.hd[0].lut_resolution == 0.5
+        assert cfg.nvme[0].lut_resolution == Config.DV_LUT_RESOLUTION
+        assert cfg.gpu[0].lut_resolution == 0.01
+
+    def test_write_limits_parsed_in_all_sections(self, create_config):
+        """Positive unit test for the hysteresis, min_dwell, ramp_up and ramp_down parameters of all
+        temperature-driven sections. It contains the following steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write [CPU], [HD], [NVME] and [GPU] with different explicit values (GPU without them)
+        - instantiate Config
+        - ASSERT: the sections carry their written values, [GPU] carries the default values
+        """
+        cfg = create_config("""
+[Ipmi]
+[CPU]
+enabled = 1
+hysteresis = 1.5
+ramp_up = 10
+ramp_down = 2
+[HD]
+enabled = 1
+ipmi_zone = 1
+hd_names = /dev/sda
+min_dwell = 60
+[NVME]
+enabled = 1
+ipmi_zone = 3
+nvme_names = /dev/nvme0n1
+hysteresis = 3
+min_dwell = 20
+[GPU]
+enabled = 1
+ipmi_zone = 4
+""")
+        limits = [(c.hysteresis, c.min_dwell, c.ramp_up, c.ramp_down)
+                  for c in (cfg.cpu[0], cfg.hd[0], cfg.nvme[0], cfg.gpu[0])]
+        assert limits == [(1.5, 0.0, 10.0, 2.0), (0.0, 60.0, 0.0, 0.0), (3.0, 20.0, 0.0, 0.0),
+                          (Config.DV_HYSTERESIS, Config.DV_MIN_DWELL, Config.DV_RAMP_UP, Config.DV_RAMP_DOWN)]
+
+    def test_temp_filter_parsed_in_all_sections(self, create_config):
+        """Positive unit test for the temp_filter, ewma_alpha, kalman_process_noise and kalman_measurement_noise
+        parameters of all temperature-driven sections. It contains the following steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write [CPU] with an EWMA filter, [HD] with a median filter, [NVME] with a Kalman filter, [GPU] without
+          filter parameters
+        - instantiate Config
+        - ASSERT: the sections carry their written values (temp_filter is case-insensitive), [GPU] carries the
+          default values
+        """
+        cfg = create_config("""
+[Ipmi]
+[CPU]
+enabled = 1
+temp_filter = EWMA
+ewma_alpha = 0.5
+[HD]
+enabled = 1
+ipmi_zone = 1
+hd_names = /dev/sda
+temp_filter = median
+smoothing = 5
+[NVME]
+enabled = 1
+ipmi_zone = 3
+nvme_names = /dev/nvme0n1
+temp_filter = kalman
+kalman_process_noise = 0.2
+kalman_measurement_noise = 4
+[GPU]
+enabled = 1
+ipmi_zone = 4
+""")
+        values = [(c.temp_filter, c.ewma_alpha, c.kalman_process_noise, c.kalman_measurement_noise)
+                  for c in (cfg.cpu[0], cfg.hd[0], cfg.nvme[0], cfg.gpu[0])]
+        dv = (Config.DV_EWMA_ALPHA, Config.DV_KALMAN_PROCESS_NOISE, Config.DV_KALMAN_MEASUREMENT_NOISE)
+        assert values == [(Config.FILTER_EWMA, 0.5, dv[1], dv[2]), (Config.FILTER_MEDIAN, *dv),
+                          (Config.FILTER_KALMAN, dv[0], 0.2, 4.0), (Config.DV_TEMP_FILTER, *dv)]
+        assert cfg.hd[0].smoothing == 5
+
+    def test_feedforward_parsed_in_all_sections(self, create_config):
+        """Positive unit test for the feedforward_rate and feedforward_horizon parameters of all
+        temperature-driven sections. It contains the following steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write [CPU] and [GPU] with explicit values, [HD] and [NVME] without them
+        - instantiate Config
+        - ASSERT: the sections carry their written values, the others carry the default values
+        """
+        cfg = create_config("""
+[Ipmi]
+[CPU]
+enabled = 1
+feedforward_rate = 1.5
+feedforward_horizon = 6
+[HD]
+enabled = 1
+ipmi_zone = 1
+hd_names = /dev/sda
+[NVME]
+enabled = 1
+ipmi_zone = 3
+nvme_names = /dev/nvme0n1
+[GPU]
+enabled = 1
+ipmi_zone = 4
+feedforward_rate = 0.5
+""")
+        values = [(c.feedforward_rate, c.feedforward_horizon)
+                  for c in (cfg.cpu[0], cfg.hd[0], cfg.nvme[0], cfg.gpu[0])]
+        default = (Config.DV_FEEDFORWARD_RATE, Config.DV_FEEDFORWARD_HORIZON)
+        assert values == [(1.5, 6.0), default, default, (0.5, Config.DV_FEEDFORWARD_HORIZON)]
+
+    def test_pid_mode_parsed(self, create_config):
+        """Positive unit test for the PID control mode parameters of the temperature-driven sections. It contains
+        the following steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write [CPU] in PID mode with all PID parameters, and [HD] without control_mode
+        - instantiate Config
+        - ASSERT: [CPU] carries the written values (control_mode is case-insensitive)
+        - ASSERT: [HD] is in LUT mode with the default PID parameters
+        """
+        cfg = create_config("""
+[Ipmi]
+[CPU]
+enabled = 1
+control_mode = PID
+pid_target = 55
+pid_kp = 3
+pid_ki = 0.2
+pid_kd = 1.5
+pid_d_filter = 10
+[HD]
+enabled = 1
+ipmi_zone = 1
+hd_names = /dev/sda
+""")
+        cpu, hd = cfg.cpu[0], cfg.hd[0]
+        assert (cpu.control_mode, cpu.pid_target, cpu.pid_kp, cpu.pid_ki, cpu.pid_kd, cpu.pid_d_filter) == \
+            (Config.CONTROL_PID, 55.0, 3.0, 0.2, 1.5, 10.0)
+        assert (hd.control_mode, hd.pid_target, hd.pid_kp, hd.pid_ki, hd.pid_kd, hd.pid_d_filter) == \
+            (Config.CONTROL_LUT, Config.DV_PID_TARGET, Config.DV_PID_KP, Config.DV_PID_KI, Config.DV_PID_KD,
+             Config.DV_PID_D_FILTER)
+
+    @pytest.mark.parametrize("content", [
+        pytest.param("", id="target-missing"),
+        pytest.param("pid_target = 151\n", id="target-over-150"),
+        pytest.param("pid_target = 50\npid_kp = -1\n", id="kp-negative"),
+        pytest.param("pid_target = 50\npid_ki = -0.1\n", id="ki-negative"),
+        pytest.param("pid_target = 50\npid_kd = -1\n", id="kd-negative"),
+        pytest.param("pid_target = 50\npid_d_filter = -1\n", id="d-filter-negative"),
+        pytest.param("pid_target = 50\ncontrol_function = 30-35, 65-100\nmin_level = 80\nmax_level = 40\n",
+                     id="level-range-with-control-function"),
+    ])
+    def test_pid_mode_invalid(self, create_config_file, content: str):
+        """Negative unit test for the PID control mode parameters. It contains the following steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write [NVME] in PID mode with a missing target, an out-of-range or negative PID parameter, or an
+          inverted level range next to a control_function (the level range is the output range of the PID)
+        - ASSERT: Config(path) raises ValueError
+        """
+        config_path = create_config_file("[Ipmi]\n[NVME]\nenabled = 1\nnvme_names = /dev/nvme0n1\n"
+                                         f"control_mode = pid\n{content}")
+        with pytest.raises(ValueError):
+            Config(config_path)
+
     def test_const_ignores_error_tolerance(self, create_config):
         """Positive unit test for the [CONST] section parser inside Config.__init__(). It contains the following
         steps:
@@ -1496,6 +1916,54 @@ error_tolerance = 0
         assert len(cfg.const) == 1
         assert not hasattr(cfg.const[0], "error_tolerance")
 
+    @pytest.mark.parametrize(
+        "section, attr",
+        [
+            pytest.param("CPU", "cpu", id="cpu"),
+            pytest.param("HD", "hd", id="hd"),
+            pytest.param("NVME", "nvme", id="nvme"),
+            pytest.param("GPU", "gpu", id="gpu"),
+            pytest.param("CONST", "const", id="const"),
+        ],
+    )
+    def test_polling_offset(self, create_config, section: str, attr: str):
+        """Positive unit test for the polling_offset parameter inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config fixture (tmp_path-backed)
+        - write the section without and with polling_offset = 1.5 (polling = 4) and instantiate Config
+        - ASSERT: polling_offset defaults to Config.DV_POLLING_OFFSET and the written value is parsed
+        """
+        cfg = create_config(f"[Ipmi]\n[{section}]\nenabled = 0\n")
+        assert getattr(cfg, attr)[0].polling_offset == Config.DV_POLLING_OFFSET
+        cfg = create_config(f"[Ipmi]\n[{section}]\nenabled = 0\npolling = 4\npolling_offset = 1.5\n")
+        assert getattr(cfg, attr)[0].polling_offset == 1.5
+
+    @pytest.mark.parametrize(
+        "section",
+        [
+            pytest.param("CPU", id="cpu"),
+            pytest.param("HD", id="hd"),
+            pytest.param("NVME", id="nvme"),
+            pytest.param("GPU", id="gpu"),
+            pytest.param("CONST", id="const"),
+        ],
+    )
+    @pytest.mark.parametrize("value", [
+        pytest.param("-1", id="negative"),
+        pytest.param("5", id="over-polling"),
+    ])
+    def test_polling_offset_invalid(self, create_config_file, section: str, value: str):
+        """Negative unit test for the polling_offset parameter inside Config.__init__(). It contains the following
+        steps:
+        - mock the on-disk config via the create_config_file fixture (tmp_path-backed)
+        - write the section with polling = 4 and a negative or too large polling_offset and call Config(path)
+        - ASSERT: Config(path) raises ValueError whose message names polling_offset
+        """
+        config_path = create_config_file(f"[Ipmi]\n[{section}]\nenabled = 0\npolling = 4\n"
+                                         f"polling_offset = {value}\n")
+        with pytest.raises(ValueError, match="polling_offset"):
+            Config(config_path)
+
 
 class TestConfigConstants:
     """Unit tests for Config class constants."""
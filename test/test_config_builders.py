@@ -15,7 +15,8 @@ def create_ipmi_config(command=Config.DV_IPMI_COMMAND, fan_mode_delay=Config.DV_
                        remote_parameters=Config.DV_IPMI_REMOTE_PARAMETERS,
                        platform_name=Config.DV_IPMI_PLATFORM_NAME,
                        enforce_fan_mode=Config.DV_IPMI_ENFORCE_FAN_MODE,
-                       exit_level=Config.DV_IPMI_EXIT_LEVEL):
+                       exit_level=Config.DV_IPMI_EXIT_LEVEL,
+                       command_timeout=Config.DV_IPMI_COMMAND_TIMEOUT):
     """Factory function to create IpmiConfig instances for testing without needing a config file.
 
     Args:
@@ -26,21 +27,33 @@ def create_ipmi_config(command=Config.DV_IPMI_COMMAND, fan_mode_delay=Config.DV_
         platform_name (str): Platform name (default: "auto")
         enforce_fan_mode (bool): Re-assert FULL fan mode on BMC drift (default: True)
         exit_level (int): Fan level applied to all configured zones at exit (default: 100)
+        command_timeout (float): Timeout of an ipmitool command (default: 30.0)
 
     Returns:
         IpmiConfig: configured IpmiConfig instance
     """
     return IpmiConfig(command=command, fan_mode_delay=fan_mode_delay, fan_level_delay=fan_level_delay,
                       remote_parameters=remote_parameters, platform_name=platform_name,
-                      enforce_fan_mode=enforce_fan_mode, exit_level=exit_level)
+                      enforce_fan_mode=enforce_fan_mode, exit_level=exit_level,
+                      command_timeout=command_timeout)
 
 
 def create_cpu_config(section="CPU", enabled=False, ipmi_zone=None, temp_calc=Config.CALC_AVG,
                       steps=Config.DV_CPU_STEPS, sensitivity=Config.DV_CPU_SENSITIVITY,
-                      polling=Config.DV_CPU_POLLING, min_temp=Config.DV_CPU_MIN_TEMP,
+                      polling=Config.DV_CPU_POLLING, polling_offset=Config.DV_POLLING_OFFSET,
+                      min_temp=Config.DV_CPU_MIN_TEMP,
                       max_temp=Config.DV_CPU_MAX_TEMP, min_level=Config.DV_CPU_MIN_LEVEL,
                       max_level=Config.DV_CPU_MAX_LEVEL, smoothing=Config.DV_CPU_SMOOTHING,
-                      error_tolerance=Config.DV_CPU_ERROR_TOLERANCE, control_function=None):
+                      temp_filter=Config.DV_TEMP_FILTER, ewma_alpha=Config.DV_EWMA_ALPHA,
+                      kalman_process_noise=Config.DV_KALMAN_PROCESS_NOISE,
+                      kalman_measurement_noise=Config.DV_KALMAN_MEASUREMENT_NOISE,
+                      error_tolerance=Config.DV_CPU_ERROR_TOLERANCE,
+                      lut_resolution=Config.DV_LUT_RESOLUTION, hysteresis=Config.DV_HYSTERESIS,
+                      min_dwell=Config.DV_MIN_DWELL, ramp_up=Config.DV_RAMP_UP, ramp_down=Config.DV_RAMP_DOWN,
+                      control_mode=Config.DV_CONTROL_MODE, pid_target=Config.DV_PID_TARGET, pid_kp=Config.DV_PID_KP,
+                      pid_ki=Config.DV_PID_KI, pid_kd=Config.DV_PID_KD, pid_d_filter=Config.DV_PID_D_FILTER,
+                      feedforward_rate=Config.DV_FEEDFORWARD_RATE, feedforward_horizon=Config.DV_FEEDFORWARD_HORIZON,
+                      control_function=None):
     """Factory function to create CpuConfig instances for testing without needing a config file.
 
     Args:
@@ -51,32 +64,68 @@ def create_cpu_config(section="CPU", enabled=False, ipmi_zone=None, temp_calc=Co
         steps (int): discrete steps (default: 6) - matches Config._parse_cpu_sections
         sensitivity (float): temperature change sensitivity (default: 3.0) - matches Config._parse_cpu_sections
         polling (float): polling interval (default: 2.0)
+        polling_offset (float): phase offset of the polling (default: 0.0)
         min_temp (float): minimum temperature (default: 30.0)
         max_temp (float): maximum temperature (default: 60.0) - matches Config._parse_cpu_sections
         min_level (int): minimum fan level (default: 35)
         max_level (int): maximum fan level (default: 100)
         smoothing (int): smoothing window size (default: 1)
+        temp_filter (str): temperature filter, "sma", "ewma", "median" or "kalman" (default: "sma")
+        ewma_alpha (float): weight of the new sample in the EWMA filter (default: 0.3)
+        kalman_process_noise (float): process noise of the Kalman filter (default: 0.05)
+        kalman_measurement_noise (float): measurement noise of the Kalman filter (default: 1.0)
         error_tolerance (int): consecutive failed temperature reads tolerated per device (default: 3)
+        lut_resolution (float): temperature resolution of the LUT (default: 1.0)
+        hysteresis (float): temperature drop required to lower the fan level (default: 0.0)
+        min_dwell (float): minimum time a fan level is held before it can be lowered (default: 0.0)
+        ramp_up (float): maximum rate of fan level increase in %/sec (default: 0.0 = unlimited)
+        ramp_down (float): maximum rate of fan level decrease in %/sec (default: 0.0 = unlimited)
+        control_mode (str): control mode, "lut" or "pid" (default: "lut")
+        pid_target (float): target temperature of the PID controller (default: 0.0 = not set)
+        pid_kp (float): proportional gain of the PID controller (default: 4.0)
+        pid_ki (float): integral gain of the PID controller (default: 0.05)
+        pid_kd (float): derivative gain of the PID controller (default: 0.0)
+        pid_d_filter (float): time constant of the derivative filter in sec (default: 5.0)
+        feedforward_rate (float): temperature slope activating the feed-forward term in C/sec (default: 0.0 = disabled)
+        feedforward_horizon (float): look-ahead time of the feed-forward term in sec (default: 10.0)
 
     Returns:
         CpuConfig: configured CpuConfig instance
     """
     zones = ipmi_zone if ipmi_zone is not None else [Config.CPU_ZONE]
     return CpuConfig(section=section, enabled=enabled, ipmi_zone=zones,
-                     temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling, min_temp=min_temp,
+                     temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling,
+                     polling_offset=polling_offset, min_temp=min_temp,
                      max_temp=max_temp, min_level=min_level, max_level=max_level, smoothing=smoothing,
-                     error_tolerance=error_tolerance,
+                     temp_filter=temp_filter, ewma_alpha=ewma_alpha, kalman_process_noise=kalman_process_noise,
+                     kalman_measurement_noise=kalman_measurement_noise,
+                     error_tolerance=error_tolerance, lut_resolution=lut_resolution, hysteresis=hysteresis,
+                     min_dwell=min_dwell, ramp_up=ramp_up, ramp_down=ramp_down,
+                     control_mode=control_mode, pid_target=pid_target, pid_kp=pid_kp, pid_ki=pid_ki,
+                     pid_kd=pid_kd, pid_d_filter=pid_d_filter,
+                     feedforward_rate=feedforward_rate, feedforward_horizon=feedforward_horizon,
                      control_function=control_function if control_function is not None else [])
 
 
 def create_hd_config(section="HD", enabled=False, ipmi_zone=None, temp_calc=Config.CALC_AVG,
                      steps=Config.DV_HD_STEPS, sensitivity=Config.DV_HD_SENSITIVITY,
-                     polling=Config.DV_HD_POLLING, min_temp=Config.DV_HD_MIN_TEMP,
+                     polling=Config.DV_HD_POLLING, polling_offset=Config.DV_POLLING_OFFSET,
+                     min_temp=Config.DV_HD_MIN_TEMP,
                      max_temp=Config.DV_HD_MAX_TEMP, min_level=Config.DV_HD_MIN_LEVEL,
                      max_level=Config.DV_HD_MAX_LEVEL, smoothing=Config.DV_HD_SMOOTHING,
-                     error_tolerance=Config.DV_HD_ERROR_TOLERANCE, hd_names=None,
+                     temp_filter=Config.DV_TEMP_FILTER, ewma_alpha=Config.DV_EWMA_ALPHA,
+                     kalman_process_noise=Config.DV_KALMAN_PROCESS_NOISE,
+                     kalman_measurement_noise=Config.DV_KALMAN_MEASUREMENT_NOISE,
+                     error_tolerance=Config.DV_HD_ERROR_TOLERANCE,
+                     lut_resolution=Config.DV_LUT_RESOLUTION, hysteresis=Config.DV_HYSTERESIS,
+                     min_dwell=Config.DV_MIN_DWELL, ramp_up=Config.DV_RAMP_UP, ramp_down=Config.DV_RAMP_DOWN,
+                     control_mode=Config.DV_CONTROL_MODE, pid_target=Config.DV_PID_TARGET, pid_kp=Config.DV_PID_KP,
+                     pid_ki=Config.DV_PID_KI, pid_kd=Config.DV_PID_KD, pid_d_filter=Config.DV_PID_D_FILTER,
+                     feedforward_rate=Config.DV_FEEDFORWARD_RATE, feedforward_horizon=Config.DV_FEEDFORWARD_HORIZON,
+                     hd_names=None,
                      smartctl_path=Config.DV_HD_SMARTCTL_PATH, standby_guard_enabled=False,
-                     standby_hd_limit=Config.DV_HD_STANDBY_HD_LIMIT, control_function=None):
+                     standby_hd_limit=Config.DV_HD_STANDBY_HD_LIMIT, read_timeout=Config.DV_HD_READ_TIMEOUT,
+                     control_function=None):
     """Factory function to create HdConfig instances for testing without needing a config file.
 
     Args:
@@ -87,36 +136,73 @@ def create_hd_config(section="HD", enabled=False, ipmi_zone=None, temp_calc=Conf
         steps (int): discrete steps (default: 4)
         sensitivity (float): temperature change sensitivity (default: 2.0)
         polling (float): polling interval (default: 10.0)
+        polling_offset (float): phase offset of the polling (default: 0.0)
         min_temp (float): minimum temperature (default: 32.0)
         max_temp (float): maximum temperature (default: 46.0)
         min_level (int): minimum fan level (default: 35)
         max_level (int): maximum fan level (default: 100)
         smoothing (int): smoothing window size (default: 1)
+        temp_filter (str): temperature filter, "sma", "ewma", "median" or "kalman" (default: "sma")
+        ewma_alpha (float): weight of the new sample in the EWMA filter (default: 0.3)
+        kalman_process_noise (float): process noise of the Kalman filter (default: 0.05)
+        kalman_measurement_noise (float): measurement noise of the Kalman filter (default: 1.0)
         error_tolerance (int): consecutive failed temperature reads tolerated per device (default: 3)
+        lut_resolution (float): temperature resolution of the LUT (default: 1.0)
+        hysteresis (float): temperature drop required to lower the fan level (default: 0.0)
+        min_dwell (float): minimum time a fan level is held before it can be lowered (default: 0.0)
+        ramp_up (float): maximum rate of fan level increase in %/sec (default: 0.0 = unlimited)
+        ramp_down (float): maximum rate of fan level decrease in %/sec (default: 0.0 = unlimited)
+        control_mode (str): control mode, "lut" or "pid" (default: "lut")
+        pid_target (float): target temperature of the PID controller (default: 0.0 = not set)
+        pid_kp (float): proportional gain of the PID controller (default: 4.0)
+        pid_ki (float): integral gain of the PID controller (default: 0.05)
+        pid_kd (float): derivative gain of the PID controller (default: 0.0)
+        pid_d_filter (float): time constant of the derivative filter in sec (default: 5.0)
+        feedforward_rate (float): temperature slope activating the feed-forward term in C/sec (default: 0.0 = disabled)
+        feedforward_horizon (float): look-ahead time of the feed-forward term in sec (default: 10.0)
         hd_names (list): HD device names (default: [])
         smartctl_path (str): path to smartctl (default: "/usr/sbin/smartctl")
         standby_guard_enabled (bool): standby guard flag (default: False)
         standby_hd_limit (int): standby HD limit (default: 1)
+        read_timeout (float): timeout of a smartctl command (default: 30.0)
 
     Returns:
         HdConfig: configured HdConfig instance
     """
     zones = ipmi_zone if ipmi_zone is not None else [Config.HD_ZONE]
     return HdConfig(section=section, enabled=enabled, ipmi_zone=zones,
-                    temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling, min_temp=min_temp,
+                    temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling,
+                    polling_offset=polling_offset, min_temp=min_temp,
                     max_temp=max_temp, min_level=min_level, max_level=max_level, smoothing=smoothing,
-                    error_tolerance=error_tolerance,
+                    temp_filter=temp_filter, ewma_alpha=ewma_alpha, kalman_process_noise=kalman_process_noise,
+                    kalman_measurement_noise=kalman_measurement_noise,
+                    error_tolerance=error_tolerance, lut_resolution=lut_resolution, hysteresis=hysteresis,
+                    min_dwell=min_dwell, ramp_up=ramp_up, ramp_down=ramp_down,
+                    control_mode=control_mode, pid_target=pid_target, pid_kp=pid_kp, pid_ki=pid_ki,
+                    pid_kd=pid_kd, pid_d_filter=pid_d_filter,
+                    feedforward_rate=feedforward_rate, feedforward_horizon=feedforward_horizon,
                     hd_names=hd_names if hd_names is not None else [], smartctl_path=smartctl_path,
                     standby_guard_enabled=standby_guard_enabled, standby_hd_limit=standby_hd_limit,
+                    read_timeout=read_timeout,
                     control_function=control_function if control_function is not None else [])
 
 
 def create_nvme_config(section="NVME", enabled=False, ipmi_zone=None, temp_calc=Config.CALC_AVG,
                        steps=Config.DV_NVME_STEPS, sensitivity=Config.DV_NVME_SENSITIVITY,
-                       polling=Config.DV_NVME_POLLING, min_temp=Config.DV_NVME_MIN_TEMP,
+                       polling=Config.DV_NVME_POLLING, polling_offset=Config.DV_POLLING_OFFSET,
+                       min_temp=Config.DV_NVME_MIN_TEMP,
                        max_temp=Config.DV_NVME_MAX_TEMP, min_level=Config.DV_NVME_MIN_LEVEL,
                        max_level=Config.DV_NVME_MAX_LEVEL, smoothing=Config.DV_NVME_SMOOTHING,
-                       error_tolerance=Config.DV_NVME_ERROR_TOLERANCE, nvme_names=None, control_function=None):
+                       temp_filter=Config.DV_TEMP_FILTER, ewma_alpha=Config.DV_EWMA_ALPHA,
+                       kalman_process_noise=Config.DV_KALMAN_PROCESS_NOISE,
+                       kalman_measurement_noise=Config.DV_KALMAN_MEASUREMENT_NOISE,
+                       error_tolerance=Config.DV_NVME_ERROR_TOLERANCE,
+                       lut_resolution=Config.DV_LUT_RESOLUTION, hysteresis=Config.DV_HYSTERESIS,
+                       min_dwell=Config.DV_MIN_DWELL, ramp_up=Config.DV_RAMP_UP, ramp_down=Config.DV_RAMP_DOWN,
+                       control_mode=Config.DV_CONTROL_MODE, pid_target=Config.DV_PID_TARGET, pid_kp=Config.DV_PID_KP,
+                       pid_ki=Config.DV_PID_KI, pid_kd=Config.DV_PID_KD, pid_d_filter=Config.DV_PID_D_FILTER,
+                       feedforward_rate=Config.DV_FEEDFORWARD_RATE, feedforward_horizon=Config.DV_FEEDFORWARD_HORIZON,
+                       nvme_names=None, control_function=None):
     """Factory function to create NvmeConfig instances for testing without needing a config file.
 
     Args:
@@ -127,12 +213,30 @@ def create_nvme_config(section="NVME", enabled=False, ipmi_zone=None, temp_calc=
         steps (int): discrete steps (default: 4)
         sensitivity (float): temperature change sensitivity (default: 2.0)
         polling (float): polling interval (default: 10.0)
+        polling_offset (float): phase offset of the polling (default: 0.0)
         min_temp (float): minimum temperature (default: 35.0)
         max_temp (float): maximum temperature (default: 70.0)
         min_level (int): minimum fan level (default: 35)
         max_level (int): maximum fan level (default: 100)
         smoothing (int): smoothing window size (default: 1)
+        temp_filter (str): temperature filter, "sma", "ewma", "median" or "kalman" (default: "sma")
+        ewma_alpha (float): weight of the new sample in the EWMA filter (default: 0.3)
+        kalman_process_noise (float): process noise of the Kalman filter (default: 0.05)
+        kalman_measurement_noise (float): measurement noise of the Kalman filter (default: 1.0)
         error_tolerance (int): consecutive failed temperature reads tolerated per device (default: 3)
+        lut_resolution (float): temperature resolution of the LUT (default: 1.0)
+        hysteresis (float): temperature drop required to lower the fan level (default: 0.0)
+        min_dwell (float): minimum time a fan level is held before it can be lowered (default: 0.0)
+        ramp_up (float): maximum rate of fan level increase in %/sec (default: 0.0 = unlimited)
+        ramp_down (float): maximum rate of fan level decrease in %/sec (default: 0.0 = unlimited)
+        control_mode (str): control mode, "lut" or "pid" (default: "lut")
+        pid_target (float): target temperature of the PID controller (default: 0.0 = not set)
+        pid_kp (float): proportional gain of the PID controller (default: 4.0)
+        pid_ki (float): integral gain of the PID controller (default: 0.05)
+        pid_kd (float): derivative gain of the PID controller (default: 0.0)
+        pid_d_filter (float): time constant of the derivative filter in sec (default: 5.0)
+        feedforward_rate (float): temperature slope activating the feed-forward term in C/sec (default: 0.0 = disabled)
+        feedforward_horizon (float): look-ahead time of the feed-forward term in sec (default: 10.0)
         nvme_names (list): NVMe device names (default: [])
 
     Returns:
@@ -140,21 +244,39 @@ def create_nvme_config(section="NVME", enabled=False, ipmi_zone=None, temp_calc=
     """
     zones = ipmi_zone if ipmi_zone is not None else [Config.HD_ZONE]
     return NvmeConfig(section=section, enabled=enabled, ipmi_zone=zones,
-                      temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling, min_temp=min_temp,
+                      temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling,
+                      polling_offset=polling_offset, min_temp=min_temp,
                       max_temp=max_temp, min_level=min_level, max_level=max_level, smoothing=smoothing,
-                      error_tolerance=error_tolerance,
+                      temp_filter=temp_filter, ewma_alpha=ewma_alpha, kalman_process_noise=kalman_process_noise,
+                      kalman_measurement_noise=kalman_measurement_noise,
+                      error_tolerance=error_tolerance, lut_resolution=lut_resolution, hysteresis=hysteresis,
+                      min_dwell=min_dwell, ramp_up=ramp_up, ramp_down=ramp_down,
+                      control_mode=control_mode, pid_target=pid_target, pid_kp=pid_kp, pid_ki=pid_ki,
+                      pid_kd=pid_kd, pid_d_filter=pid_d_filter,
+                      feedforward_rate=feedforward_rate, feedforward_horizon=feedforward_horizon,
                       nvme_names=nvme_names if nvme_names is not None else [],
                       control_function=control_function if control_function is not None else [])
 
 
 def create_gpu_config(section="GPU", enabled=False, ipmi_zone=None, temp_calc=Config.CALC_AVG,
                       steps=Config.DV_GPU_STEPS, sensitivity=Config.DV_GPU_SENSITIVITY,
-                      polling=Config.DV_GPU_POLLING, min_temp=Config.DV_GPU_MIN_TEMP,
+                      polling=Config.DV_GPU_POLLING, polling_offset=Config.DV_POLLING_OFFSET,
+                      min_temp=Config.DV_GPU_MIN_TEMP,
                       max_temp=Config.DV_GPU_MAX_TEMP, min_level=Config.DV_GPU_MIN_LEVEL,
                       max_level=Config.DV_GPU_MAX_LEVEL, smoothing=Config.DV_GPU_SMOOTHING,
-                      error_tolerance=Config.DV_GPU_ERROR_TOLERANCE, gpu_type=Config.DV_GPU_TYPE, gpu_device_ids=None,
+                      temp_filter=Config.DV_TEMP_FILTER, ewma_alpha=Config.DV_EWMA_ALPHA,
+                      kalman_process_noise=Config.DV_KALMAN_PROCESS_NOISE,
+                      kalman_measurement_noise=Config.DV_KALMAN_MEASUREMENT_NOISE,
+                      error_tolerance=Config.DV_GPU_ERROR_TOLERANCE,
+                      lut_resolution=Config.DV_LUT_RESOLUTION, hysteresis=Config.DV_HYSTERESIS,
+                      min_dwell=Config.DV_MIN_DWELL, ramp_up=Config.DV_RAMP_UP, ramp_down=Config.DV_RAMP_DOWN,
+                      control_mode=Config.DV_CONTROL_MODE, pid_target=Config.DV_PID_TARGET, pid_kp=Config.DV_PID_KP,
+                      pid_ki=Config.DV_PID_KI, pid_kd=Config.DV_PID_KD, pid_d_filter=Config.DV_PID_D_FILTER,
+                      feedforward_rate=Config.DV_FEEDFORWARD_RATE, feedforward_horizon=Config.DV_FEEDFORWARD_HORIZON,
+                      gpu_type=Config.DV_GPU_TYPE, gpu_device_ids=None,
                       nvidia_smi_path=Config.DV_GPU_NVIDIA_SMI_PATH, rocm_smi_path=Config.DV_GPU_ROCM_SMI_PATH,
-                      amd_temp_sensor=Config.DV_GPU_AMD_TEMP_SENSOR, control_function=None):
+                      amd_temp_sensor=Config.DV_GPU_AMD_TEMP_SENSOR, read_timeout=Config.DV_GPU_READ_TIMEOUT,
+                      control_function=None):
     """Factory function to create GpuConfig instances for testing without needing a config file.
 
     Args:
@@ -165,17 +287,36 @@ def create_gpu_config(section="GPU", enabled=False, ipmi_zone=None, temp_calc=Co
         steps (int): discrete steps (default: 5)
         sensitivity (float): temperature change sensitivity (default: 2.0)
         polling (float): polling interval (default: 2.0)
+        polling_offset (float): phase offset of the polling (default: 0.0)
         min_temp (float): minimum temperature (default: 40.0)
         max_temp (float): maximum temperature (default: 70.0)
         min_level (int): minimum fan level (default: 35)
         max_level (int): maximum fan level (default: 100)
         smoothing (int): smoothing window size (default: 1)
+        temp_filter (str): temperature filter, "sma", "ewma", "median" or "kalman" (default: "sma")
+        ewma_alpha (float): weight of the new sample in the EWMA filter (default: 0.3)
+        kalman_process_noise (float): process noise of the Kalman filter (default: 0.05)
+        kalman_measurement_noise (float): measurement noise of the Kalman filter (default: 1.0)
         error_tolerance (int): consecutive failed temperature reads tolerated per device (default: 3)
+        lut_resolution (float): temperature resolution of the LUT (default: 1.0)
+        hysteresis (float): temperature drop required to lower the fan level (default: 0.0)
+        min_dwell (float): minimum time a fan level is held before it can be lowered (default: 0.0)
+        ramp_up (float): maximum rate of fan level increase in %/sec (default: 0.0 = unlimited)
+        ramp_down (float): maximum rate of fan level decrease in %/sec (default: 0.0 = unlimited)
+        control_mode (str): control mode, "lut" or "pid" (default: "lut")
+        pid_target (float): target temperature of the PID controller (default: 0.0 = not set)
+        pid_kp (float): proportional gain of the PID controller (default: 4.0)
+        pid_ki (float): integral gain of the PID controller (default: 0.05)
+        pid_kd (float): derivative gain of the PID controller (default: 0.0)
+        pid_d_filter (float): time constant of the derivative filter in sec (default: 5.0)
+        feedforward_rate (float): temperature slope activating the feed-forward term in C/sec (default: 0.0 = disabled)
+        feedforward_horizon (float): look-ahead time of the feed-forward term in sec (default: 10.0)
         gpu_type (str): GPU type - "nvidia" or "amd" (default: "nvidia")
         gpu_device_ids (list): GPU device IDs (default: [0])
         nvidia_smi_path (str): path to nvidia-smi (default: "/usr/bin/nvidia-smi")
         rocm_smi_path (str): path to rocm-smi (default: "/usr/bin/rocm-smi")
         amd_temp_sensor (int): AMD temperature sensor index (default: 0)
+        read_timeout (float): timeout of an SMI command (default: 10.0)
 
     Returns:
         GpuConfig: configured GpuConfig instance
@@ -183,14 +324,24 @@ def create_gpu_config(section="GPU", enabled=False, ipmi_zone=None, temp_calc=Co
     zones = ipmi_zone if ipmi_zone is not None else [Config.HD_ZONE]
     device_ids = gpu_device_ids if gpu_device_ids is not None else Config.parse_gpu_ids(Config.DV_GPU_DEVICE_IDS)
     return GpuConfig(section=section, enabled=enabled, ipmi_zone=zones,
-                     temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling, min_temp=min_temp,
+                     temp_calc=temp_calc, steps=steps, sensitivity=sensitivity, polling=polling,
+                     polling_offset=polling_offset, min_temp=min_temp,
                      max_temp=max_temp, min_level=min_level, max_level=max_level, smoothing=smoothing,
-                     error_tolerance=error_tolerance, gpu_type=gpu_type, gpu_device_ids=device_ids,
+                     temp_filter=temp_filter, ewma_alpha=ewma_alpha, kalman_process_noise=kalman_process_noise,
+                     kalman_measurement_noise=kalman_measurement_noise,
+                     error_tolerance=error_tolerance, lut_resolution=lut_resolution, hysteresis=hysteresis,
+                     min_dwell=min_dwell, ramp_up=ramp_up, ramp_down=ramp_down,
+                     control_mode=control_mode, pid_target=pid_target, pid_kp=pid_kp, pid_ki=pid_ki,
+                     pid_kd=pid_kd, pid_d_filter=pid_d_filter,
+                     feedforward_rate=feedforward_rate, feedforward_horizon=feedforward_horizon,
+                     gpu_type=gpu_type, gpu_device_ids=device_ids,
                      nvidia_smi_path=nvidia_smi_path, rocm_smi_path=rocm_smi_path, amd_temp_sensor=amd_temp_sensor,
+                     read_timeout=read_timeout,
                      control_function=control_function if control_function is not None else [])
 
 
 def create_const_config(section="CONST", enabled=False, ipmi_zone=None, polling=Config.DV_CONST_POLLING,
+                        polling_offset=Config.DV_POLLING_OFFSET,
                         level=Config.DV_CONST_LEVEL):
     """Factory function to create ConstConfig instances for testing without needing a config file.
 
@@ -199,6 +350,7 @@ def create_const_config(section="CONST", enabled=False, ipmi_zone=None, polling=
         enabled (bool): fan controller enabled flag (default: False)
         ipmi_zone (list): IPMI zones (default: [1])
         polling (float): polling interval (default: 30.0)
+        polling_offset (float): phase offset of the polling (default: 0.0)
         level (int): constant fan level 0-100 (default: 50)
 
     Returns:
@@ -206,7 +358,7 @@ def create_const_config(section="CONST", enabled=False, ipmi_zone=None, polling=
     """
     zones = ipmi_zone if ipmi_zone is not None else [Config.HD_ZONE]
     return ConstConfig(section=section, enabled=enabled, ipmi_zone=zones,
-                       polling=polling, level=level)
+                       polling=polling, polling_offset=polling_offset, level=level)
 
 
 # End.
@@ -3,11 +3,12 @@
 #   test_constfc.py (C) 2021-2026, Peter Sulyok
 #   Unit tests for smfc.ConstFc() class.
 #
+import time
 from typing import List, Tuple
 import pytest
 from mock import MagicMock
 from pytest_mock import MockerFixture
-from smfc import Log, Ipmi, ConstFc
+from smfc import Log, Ipmi, ConstFc, clock
 from smfc.config import Config
 from .test_config_builders import create_const_config
 
@@ -48,7 +49,9 @@ class TestConstFc:
         - ASSERT: fc.config.ipmi_zone matches the configured value
         - ASSERT: fc.config.polling matches the configured value
         - ASSERT: fc.config.level matches the configured value
+        - ASSERT: fc.created_at is the current wall-clock time
         """
+        before = clock.time()
         fc, log, ipmi = _make_const_fc(mocker, ipmi_zone=ipmi_zone, polling=polling, level=level)
         assert fc.log is log
         assert fc.ipmi is ipmi
@@ -56,6 +59,7 @@ class TestConstFc:
         assert fc.config.ipmi_zone == ipmi_zone
         assert fc.config.polling == polling
         assert fc.config.level == level
+        assert before <= fc.created_at <= clock.time()
 
     def test_init_applies_defaults(self, mocker: MockerFixture):
         """Positive unit test for ConstFc.__init__() method with default configuration. It contains the following steps:
@@ -154,5 +158,40 @@ class TestConstFc:
         assert mock_get.call_count == 0
         assert mock_set.call_count == 0
 
+    def test_poll_ignores_polling_timer(self, mocker: MockerFixture):
+        """Positive unit test for ConstFc.poll() method. It contains the following steps:
+        - mock print(), Ipmi.get_fan_level() (returns 30) and Ipmi.set_fan_level()
+        - instantiate ConstFc via _make_const_fc() helper with level=50 and a polling timer that has not expired
+        - call ConstFc.run(), then ConstFc.poll()
+        - ASSERT: run() does nothing, poll() checks and sets the fan level regardless of the polling timer
+        """
+        mock_get = MagicMock(return_value=30)
+        mocker.patch("smfc.Ipmi.get_fan_level", mock_get)
+        mock_set = MagicMock()
+        mocker.patch("smfc.Ipmi.set_fan_level", mock_set)
+        fc, _, _ = _make_const_fc(mocker, ipmi_zone=[0], polling=1000.0, level=50)
+        fc.last_time = time.monotonic()
+        fc.run()
+        assert mock_get.call_count == 0
+        fc.poll()
+        mock_get.assert_called_once_with(0)
+        mock_set.assert_called_once_with(0, 50)
+
+    def test_save_restore_state(self, mocker: MockerFixture):
+        """Positive unit test for ConstFc.save_state() and restore_state() methods. It contains the following steps:
+        - instantiate ConstFc via _make_const_fc() helper with level=50, save its state and restore it into a new
+          ConstFc with a zero last level
+        - ASSERT: the last level is saved and restored, a state without the last level changes nothing
+        """
+        fc, _, _ = _make_const_fc(mocker, ipmi_zone=[0], level=50)
+        state = fc.save_state()
+        assert state == {"last_level": 50}
+        new_fc, _, _ = _make_const_fc(mocker, ipmi_zone=[0], level=50)
+        new_fc.last_level = 0
+        new_fc.restore_state({})
+        assert new_fc.last_level == 0
+        new_fc.restore_state(state)
+        assert new_fc.last_level == 50
+
 
 # End.
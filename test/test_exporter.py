@@ -4,20 +4,32 @@
 #   Unit tests for smfc.exporter (HTTP server + Prometheus rendering).
 #
 # pylint: disable=protected-access,redefined-outer-name,missing-function-docstring
+import gzip
 import json
 import re
+import threading
+import time
 import urllib.error
 import urllib.request
+import zlib
 from typing import Any, Dict, Iterator, List
 import pytest
 from smfc.exporter import (
     Exporter,
     HEALTHZ_PATH,
+    HISTORY_PATH,
     METRICS_PATH,
+    PrometheusRegistry,
     SNAPSHOT_PATH,
     _escape_label_value,
+    _ResponseCache,
+    _negotiate_coding,
+    _negotiate_openmetrics,
+    render_openmetrics,
     render_prometheus,
 )
+from smfc.history import History
+from smfc.timing import ControllerTiming, LoopTiming
 
 
 def _sample_snapshot() -> Dict[str, Any]:
@@ -44,6 +56,8 @@ def _sample_snapshot() -> Dict[str, Any]:
                 "ipmi_zones": [0], "device_count": 1, "polling": 2.0,
                 "last_temp_c": 42.3, "last_level_pct": 45, "deferred_apply": False,
                 "temp_min_c": 30.0, "temp_max_c": 70.0, "level_min_pct": 25, "level_max_pct": 100,
+                "suppressed_writes": 12, "direction_reversals": 3, "sensitivity_skips": 40,
+                "control_mode": "pid", "pid_target_c": 50.0,
                 "devices": [{"name": "cpu0", "temp_c": 42.3, "read_errors": 0, "read_errors_total": 0}],
             },
             {
@@ -70,8 +84,9 @@ def _sample_snapshot() -> Dict[str, Any]:
                 "target_level_pct": 50, "level_min_pct": 50, "level_max_pct": 50,
             },
         ],
-        "zones": {"0": {"applied_level_pct": 45}, "1": {"applied_level_pct": 55},
-                  "2": {"applied_level_pct": 50}},
+        "zones": {"0": {"applied_level_pct": 45, "level_changes": 7, "ipmi_writes": 8},
+                  "1": {"applied_level_pct": 55},
+                  "2": {"applied_level_pct": 50, "level_changes": 0, "ipmi_writes": 1}},
     }
 
 
@@ -297,6 +312,58 @@ class TestPrometheusRenderer:
             block = out.split(metric, 1)[1].split("# HELP")[0]
             assert 'section="CONST"' not in block
 
+    def test_suppressed_writes_emitted(self) -> None:
+        """Positive unit test for render_prometheus() function. It contains the following steps:
+        - build a sample snapshot dict via the _sample_snapshot() fixture helper, where the CPU controller has
+          12 suppressed writes and the HD controller has no suppressed_writes field
+        - call render_prometheus() with the snapshot
+        - ASSERT: smfc_controller_suppressed_writes_total is a counter with the value of the controllers
+          (0 for the missing field), and it is not emitted for the CONST section
+        """
+        out = render_prometheus(_sample_snapshot())
+        assert "# TYPE smfc_controller_suppressed_writes_total counter" in out
+        assert 'smfc_controller_suppressed_writes_total{section="CPU",type="cpu"} 12' in out
+        assert 'smfc_controller_suppressed_writes_total{section="HD",type="hd"} 0' in out
+        assert 'smfc_controller_suppressed_writes_total{section="CONST"' not in out
+
+    def test_churn_counters_emitted(self) -> None:
+        """Positive unit test for render_prometheus() function. It contains the following steps:
+        - build a sample snapshot dict via the _sample_snapshot() fixture helper, where the CPU controller has
+          3 direction reversals and 40 sensitivity skips, the HD controller has no such fields, zone 0 has 7 level
+          changes and 8 IPMI writes, and zone 1 has no counters
+        - call render_prometheus() with the snapshot
+        - ASSERT: the controller counters are emitted for the non-CONST sections (0 for the missing fields)
+        - ASSERT: the zone counters are emitted for every zone (0 for the missing fields)
+        """
+        out = render_prometheus(_sample_snapshot())
+        for metric in ("smfc_controller_direction_reversals_total", "smfc_controller_sensitivity_skips_total",
+                       "smfc_zone_level_changes_total", "smfc_zone_ipmi_writes_total"):
+            assert f"# TYPE {metric} counter" in out, f"missing TYPE for {metric}"
+        assert 'smfc_controller_direction_reversals_total{section="CPU",type="cpu"} 3' in out
+        assert 'smfc_controller_direction_reversals_total{section="HD",type="hd"} 0' in out
+        assert 'smfc_controller_sensitivity_skips_total{section="CPU",type="cpu"} 40' in out
+        assert 'smfc_controller_sensitivity_skips_total{section="CONST"' not in out
+        assert 'smfc_zone_level_changes_total{zone="0"} 7' in out
+        assert 'smfc_zone_level_changes_total{zone="1"} 0' in out
+        assert 'smfc_zone_ipmi_writes_total{zone="0"} 8' in out
+        assert 'smfc_zone_ipmi_writes_total{zone="2"} 1' in out
+
+    def test_pid_target_emitted(self) -> None:
+        """Positive unit test for render_prometheus() function. It contains the following steps:
+        - build a sample snapshot dict via the _sample_snapshot() fixture helper, where the CPU controller is in
+          PID control mode with 50C target and the HD controller has no control_mode field
+        - call render_prometheus() with the snapshot, then again without PID controllers
+        - ASSERT: smfc_controller_target_temperature_celsius is emitted only for the PID controller
+        - ASSERT: the metric family is left out when there is no PID controller
+        """
+        snap = _sample_snapshot()
+        out = render_prometheus(snap)
+        assert "# TYPE smfc_controller_target_temperature_celsius gauge" in out
+        assert 'smfc_controller_target_temperature_celsius{section="CPU",type="cpu",zone="0"} 50.0' in out
+        assert 'smfc_controller_target_temperature_celsius{section="HD"' not in out
+        snap["fan_controllers"][0]["control_mode"] = "lut"
+        assert "smfc_controller_target_temperature_celsius" not in render_prometheus(snap)
+
     def test_per_device_read_errors_default_zero(self) -> None:
         """Positive unit test for render_prometheus() function with a device entry that carries no
         read_errors key (an older snapshot). It contains the following steps:
@@ -373,6 +440,56 @@ class TestPrometheusRenderer:
         out = render_prometheus(snap)
         assert "smfc_disk_standby" not in out
 
+    def test_sensor_counters(self) -> None:
+        """Positive unit test for render_prometheus() function. It contains the following steps:
+        - build a sample snapshot dict via the _sample_snapshot() fixture helper
+        - ASSERT: the sensor registry counters are absent without a sensors block
+        - add a sensors block with one shared sensor and render again
+        - ASSERT: smfc_sensor_reads_total and smfc_sensor_cache_hits_total are emitted for the sensor
+        """
+        snap = _sample_snapshot()
+        assert "smfc_sensor_" not in render_prometheus(snap)
+        snap["sensors"] = {"max_age_s": 1.0, "reads": 3, "hits": 5, "errors": 0,
+                           "sensors": [{"key": "smartctl:/dev/sda", "reads": 3, "hits": 5, "errors": 0,
+                                        "subscribers": ["HD:0", "HD:1"]}]}
+        out = render_prometheus(snap)
+        assert "# TYPE smfc_sensor_reads_total counter" in out
+        assert 'smfc_sensor_reads_total{sensor="smartctl:/dev/sda"} 3' in out
+        assert 'smfc_sensor_cache_hits_total{sensor="smartctl:/dev/sda"} 5' in out
+
+    def test_timing_histograms(self) -> None:
+        """Positive unit test for render_prometheus() function. It contains the following steps:
+        - build a sample snapshot dict via the _sample_snapshot() fixture helper
+        - ASSERT: the timing histograms are absent without timing blocks
+        - add a timing block to the CPU controller and the main loop, then render again
+        - ASSERT: the histograms have HELP/TYPE headers, cumulative _bucket lines with an +Inf bucket, _sum and
+          _count lines, labeled by controller (controller histograms) or without labels (loop histograms)
+        """
+        snap = _sample_snapshot()
+        out = render_prometheus(snap)
+        assert "_seconds_bucket" not in out
+        hist = {"buckets": [[0.01, 1], [0.1, 3]], "sum": 0.25, "count": 4}
+        empty = {"buckets": [[0.01, 0], [0.1, 0]], "sum": 0.0, "count": 0}
+        snap["fan_controllers"][0]["timing"] = {"lateness": empty, "read": hist, "decide": empty, "apply": empty}
+        snap["timing"] = {"loop": {"period": hist, "sleep": empty, "apply": empty}}
+        out = render_prometheus(snap)
+        assert "# HELP smfc_controller_read_duration_seconds " in out
+        assert "# TYPE smfc_controller_read_duration_seconds histogram" in out
+        labels = 'section="CPU",type="cpu"'
+        assert f'smfc_controller_read_duration_seconds_bucket{{{labels},le="0.01"}} 1' in out
+        assert f'smfc_controller_read_duration_seconds_bucket{{{labels},le="0.1"}} 3' in out
+        assert f'smfc_controller_read_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in out
+        assert f"smfc_controller_read_duration_seconds_sum{{{labels}}} 0.25" in out
+        assert f"smfc_controller_read_duration_seconds_count{{{labels}}} 4" in out
+        assert 'section="HD"' not in "".join(ln for ln in out.splitlines() if "_duration_seconds" in ln)
+        for metric in ("smfc_controller_poll_lateness_seconds", "smfc_controller_decide_duration_seconds",
+                       "smfc_controller_apply_duration_seconds", "smfc_loop_period_seconds",
+                       "smfc_loop_sleep_seconds", "smfc_loop_apply_duration_seconds"):
+            assert f"# TYPE {metric} histogram" in out, f"missing TYPE for {metric}"
+        assert 'smfc_loop_period_seconds_bucket{le="+Inf"} 4' in out
+        assert "smfc_loop_period_seconds_sum 0.25" in out
+        assert "smfc_loop_period_seconds_count 4" in out
+
     def test_label_lines_match_prometheus_grammar(self) -> None:
         """Positive unit test for render_prometheus() function. It contains the following steps:
         - build a sample snapshot dict via the _sample_snapshot() fixture helper
@@ -402,6 +519,144 @@ class TestPrometheusRenderer:
         assert _escape_label_value("a\nb") == "a\\nb"
 
 
+class TestPrometheusRegistry:
+    """Unit tests for smfc.exporter.PrometheusRegistry class."""
+
+    def test_layout_reused(self) -> None:
+        """Positive unit test for PrometheusRegistry.render() method. It contains the following steps:
+        - create a registry and render the sample snapshot
+        - change only numeric values of the snapshot and render it again
+        - ASSERT: the output equals the output of render_prometheus(), the label sets are not rebuilt, and the new
+          values are rendered
+        """
+        registry = PrometheusRegistry()
+        snap = _sample_snapshot()
+        assert registry.render(snap) == render_prometheus(snap)
+        layout = registry._layout
+        snap["fan_controllers"][1]["devices"][0]["temp_c"] = 41.5
+        snap["zones"]["0"]["applied_level_pct"] = 80
+        out = registry.render(snap)
+        assert registry._layout is layout
+        assert out == render_prometheus(snap)
+        assert 'smfc_device_temperature_celsius{section="HD",type="hd",device="/dev/sda"} 41.5' in out
+        assert 'smfc_zone_level_percent{zone="0"} 80' in out
+
+    def test_layout_rebuilt(self) -> None:
+        """Positive unit test for PrometheusRegistry.render() method. It contains the following steps:
+        - create a registry and render the sample snapshot
+        - rename a section, replace a device and add an IPMI zone (e.g. configuration reload), render it again
+        - ASSERT: the label sets are rebuilt, and the output equals the output of render_prometheus()
+        """
+        registry = PrometheusRegistry()
+        snap = _sample_snapshot()
+        registry.render(snap)
+        layout = registry._layout
+        snap["fan_controllers"][0]["section"] = "CPU:1"
+        snap["fan_controllers"][1]["devices"][3]["name"] = '/dev/"sde"'
+        snap["zones"]["3"] = {"applied_level_pct": 30}
+        out = registry.render(snap)
+        assert registry._layout is not layout
+        assert out == render_prometheus(snap)
+        assert 'smfc_controller_level_percent{section="CPU:1",type="cpu",zone="0"} 45' in out
+        assert 'smfc_device_temperature_celsius{section="HD",type="hd",device="/dev/\\"sde\\""} 39.0' in out
+        assert 'smfc_zone_level_percent{zone="3"} 30' in out
+
+
+class TestOpenMetricsRenderer:
+    """Unit tests for render_openmetrics() (no HTTP server involved)."""
+
+    def test_well_formed_output(self) -> None:
+        """Positive unit test for render_openmetrics() function. It contains the following steps:
+        - build a sample snapshot dict and render it in OpenMetrics format
+        - ASSERT: the output ends with the `# EOF` line, it has no blank lines
+        - ASSERT: every metric family has exactly one `# TYPE` line, and its samples follow it without
+          interleaving
+        - ASSERT: the output has the same samples as the text format 0.0.4 (except the `_created` samples)
+        """
+        out = render_openmetrics(_sample_snapshot())
+        assert out.endswith("\n# EOF\n")
+        lines = out.splitlines()
+        assert "" not in lines
+        families = [line.split()[2] for line in lines if line.startswith("# TYPE ")]
+        assert len(families) == len(set(families))
+        current = None
+        for line in lines[:-1]:
+            if line.startswith("# TYPE "):
+                current = line.split()[2]
+            elif not line.startswith("#"):
+                assert line.startswith(current), f"sample out of its family: {line}"
+        samples = [line for line in lines if not line.startswith("#") and "_created" not in line]
+        text = [line for line in render_prometheus(_sample_snapshot()).splitlines() if line and line[0] != "#"]
+        assert sorted(samples) == sorted(text)
+
+    def test_counters_and_info(self) -> None:
+        """Positive unit test for render_openmetrics() function. It contains the following steps:
+        - build a sample snapshot dict with a creation time of the CPU controller and render it in OpenMetrics
+          format
+        - ASSERT: the counter and info families are named without their sample suffix
+        - ASSERT: the service counters are created at the start time of the service, the counters of the CPU
+          controller at its creation time, the counters of a controller without creation time at the start time
+        - ASSERT: the per-device error counter, whose name is taken by the per-device error gauge, is exposed with
+          unknown type and without `_created` samples
+        """
+        snap = _sample_snapshot()
+        snap["fan_controllers"][0]["created_at"] = 1716903000.0
+        out = render_openmetrics(snap)
+        assert "# TYPE smfc_fan_mode_enforced counter\nsmfc_fan_mode_enforced_total 2\n" \
+               "smfc_fan_mode_enforced_created 1716902400.0\n" in out
+        assert "# TYPE smfc_bmc info\nsmfc_bmc_info{" in out
+        assert 'smfc_controller_suppressed_writes_created{section="CPU",type="cpu"} 1716903000.0' in out
+        assert 'smfc_controller_suppressed_writes_created{section="HD",type="hd"} 1716902400.0' in out
+        assert 'smfc_zone_level_changes_created{zone="0"} 1716902400.0' in out
+        assert "# TYPE smfc_device_temp_read_errors gauge" in out
+        assert "# TYPE smfc_device_temp_read_errors_total unknown" in out
+        assert "smfc_device_temp_read_errors_created" not in out
+        assert "# TYPE smfc_controller_temperature_celsius gauge" in out
+
+    def test_sensor_counters_created(self) -> None:
+        """Positive unit test for render_openmetrics() function. It contains the following steps:
+        - add a sensors block with a creation time of the sensor registry to the sample snapshot and render it in
+          OpenMetrics format
+        - ASSERT: the sensor registry counters are created at the creation time of the registry
+        - remove the creation time and render again
+        - ASSERT: the sensor registry counters are created at the start time of the service
+        """
+        snap = _sample_snapshot()
+        snap["sensors"] = {"max_age_s": 1.0, "created_at": 1716903000.0, "reads": 3, "hits": 5, "errors": 0,
+                           "sensors": [{"key": "smartctl:/dev/sda", "reads": 3, "hits": 5, "errors": 0,
+                                        "subscribers": ["HD:0", "HD:1"]}]}
+        out = render_openmetrics(snap)
+        assert 'smfc_sensor_reads_created{sensor="smartctl:/dev/sda"} 1716903000.0' in out
+        assert 'smfc_sensor_cache_hits_created{sensor="smartctl:/dev/sda"} 1716903000.0' in out
+        del snap["sensors"]["created_at"]
+        out = render_openmetrics(snap)
+        assert 'smfc_sensor_reads_created{sensor="smartctl:/dev/sda"} 1716902400.0' in out
+        assert 'smfc_sensor_cache_hits_created{sensor="smartctl:/dev/sda"} 1716902400.0' in out
+
+    def test_histograms(self) -> None:
+        """Positive unit test for render_openmetrics() function. It contains the following steps:
+        - attach a controller histogram and a loop histogram to the sample snapshot and render it in OpenMetrics
+          format
+        - ASSERT: the histograms have canonical float bucket bounds, `_sum`, `_count` and `_created` samples
+        """
+        snap = _sample_snapshot()
+        hist = ControllerTiming()
+        hist.read.observe(0.003)
+        snap["fan_controllers"][0]["timing"] = hist.snapshot()
+        snap["fan_controllers"][0]["created_at"] = 1716903000.0
+        snap["timing"] = {"loop": LoopTiming().snapshot()}
+        out = render_openmetrics(snap)
+        labels = 'section="CPU",type="cpu"'
+        assert "# TYPE smfc_controller_read_duration_seconds histogram" in out
+        assert f'smfc_controller_read_duration_seconds_bucket{{{labels},le="0.005"}} 1' in out
+        assert f'smfc_controller_read_duration_seconds_bucket{{{labels},le="1.0"}} 1' in out
+        assert f'smfc_controller_read_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in out
+        assert f"smfc_controller_read_duration_seconds_count{{{labels}}} 1" in out
+        assert f"smfc_controller_read_duration_seconds_created{{{labels}}} 1716903000.0" in out
+        assert 'smfc_loop_period_seconds_bucket{le="300.0"} 0' in out
+        assert "smfc_loop_period_seconds_created 1716902400.0" in out
+
+
 class TestExporterHTTP:
     """Integration tests: real HTTP server bound to an ephemeral port on 127.0.0.1."""
 
@@ -441,6 +696,27 @@ class TestExporterHTTP:
         assert "# HELP smfc_up " in text
         assert 'smfc_zone_level_percent{zone="0"} 45' in text
 
+    def test_openmetrics_endpoint(self, running_exporter: Exporter) -> None:
+        """Positive unit test for the format negotiation of the Exporter HTTP handler for METRICS_PATH. It contains
+        the following steps:
+        - use the running_exporter fixture
+        - issue GET requests to /metrics with the Accept header of Prometheus and without Accept header
+        - ASSERT: the OpenMetrics content type and body are sent when the client prefers OpenMetrics
+        - ASSERT: the text format 0.0.4 is sent by default
+        """
+        host, port = running_exporter.bound_address()
+        accept = ("application/openmetrics-text;version=1.0.0,application/openmetrics-text;version=0.0.1;q=0.75,"
+                  "text/plain;version=0.0.4;q=0.5,*/*;q=0.1")
+        req = urllib.request.Request(f"http://{host}:{port}{METRICS_PATH}", method="GET", headers={"Accept": accept})
+        with urllib.request.urlopen(req, timeout=2.0) as resp:
+            ctype, body = resp.headers.get("Content-Type", ""), resp.read()
+        assert ctype.startswith("application/openmetrics-text; version=1.0.0")
+        assert body.endswith(b"# EOF\n")
+        status, ctype, body = _get(f"http://{host}:{port}{METRICS_PATH}")
+        assert status == 200
+        assert ctype.startswith("text/plain; version=0.0.4")
+        assert not body.endswith(b"# EOF\n")
+
     def test_healthz_endpoint(self, running_exporter: Exporter) -> None:
         """Positive unit test for the Exporter HTTP handler for HEALTHZ_PATH. It contains the following steps:
         - use the running_exporter fixture (wires a snapshot_fn callable returning _sample_snapshot())
@@ -499,6 +775,131 @@ class TestExporterHTTP:
         finally:
             exporter.stop()
 
+    def test_responses_cached_per_generation(self) -> None:
+        """Positive unit test for the response cache of the Exporter HTTP handler. It contains the following steps:
+        - construct an Exporter with a counting snapshot_fn and a generation_fn returning a variable generation
+        - issue two GET requests to /snapshot and /metrics with the same generation
+        - ASSERT: the snapshot is rendered only once per endpoint, the bodies of the same generation are equal
+        - increment the generation, change the snapshot and issue a GET request to /snapshot again
+        - ASSERT: the body of the new generation is rendered again and carries the new state
+        """
+        state = {"generation": 1, "calls": 0, "snap": _sample_snapshot()}
+
+        def snapshot_fn() -> Dict[str, Any]:
+            state["calls"] += 1
+            return state["snap"]
+
+        exporter = Exporter(log=None, bind_address="127.0.0.1", port=0, snapshot_fn=snapshot_fn,
+                            generation_fn=lambda: state["generation"])
+        exporter.start()
+        try:
+            host, port = exporter.bound_address()
+            first = _get(f"http://{host}:{port}{SNAPSHOT_PATH}")[2]
+            second = _get(f"http://{host}:{port}{SNAPSHOT_PATH}")[2]
+            _get(f"http://{host}:{port}{METRICS_PATH}")
+            _get(f"http://{host}:{port}{METRICS_PATH}")
+            assert state["calls"] == 2
+            assert first == second
+            state["generation"] = 2
+            state["snap"] = dict(_sample_snapshot(), fan_mode_enforced_count=7)
+            third = _get(f"http://{host}:{port}{SNAPSHOT_PATH}")[2]
+            assert state["calls"] == 3
+            assert json.loads(third.decode("utf-8"))["fan_mode_enforced_count"] == 7
+        finally:
+            exporter.stop()
+
+    def test_compressed_responses(self) -> None:
+        """Positive unit test for the content coding negotiation of the Exporter HTTP handler. It contains the
+        following steps:
+        - construct an Exporter with a counting snapshot_fn and a constant generation_fn
+        - issue GET requests to /metrics without compression, with gzip (twice) and with deflate
+        - ASSERT: the plain response has no Content-Encoding header, and every response has a Vary header
+        - ASSERT: the compressed responses carry the negotiated Content-Encoding and decompress to the plain body
+        - ASSERT: the snapshot is rendered only once, the gzip body is compressed once per generation
+        - issue a GET request to /snapshot with gzip
+        - ASSERT: the JSON response is compressed too
+        """
+        calls: List[int] = []
+
+        def snapshot_fn() -> Dict[str, Any]:
+            calls.append(1)
+            return _sample_snapshot()
+
+        def get(url: str, coding: str) -> tuple:
+            req = urllib.request.Request(url, method="GET", headers={"Accept-Encoding": coding})
+            with urllib.request.urlopen(req, timeout=2.0) as resp:
+                return resp.headers, resp.read()
+
+        exporter = Exporter(log=None, bind_address="127.0.0.1", port=0, snapshot_fn=snapshot_fn,
+                            generation_fn=lambda: 1)
+        exporter.start()
+        try:
+            host, port = exporter.bound_address()
+            url = f"http://{host}:{port}{METRICS_PATH}"
+            headers, plain = get(url, "identity")
+            assert headers.get("Content-Encoding") is None
+            assert headers.get("Vary") == "Accept, Accept-Encoding"
+            headers, body = get(url, "gzip, deflate")
+            assert headers.get("Content-Encoding") == "gzip"
+            assert headers.get("Vary") == "Accept, Accept-Encoding"
+            assert int(headers.get("Content-Length")) == len(body) < len(plain)
+            assert gzip.decompress(body) == plain
+            assert get(url, "gzip")[1] == body
+            headers, body = get(url, "deflate")
+            assert headers.get("Content-Encoding") == "deflate"
+            assert zlib.decompress(body) == plain
+            assert len(calls) == 1
+            headers, body = get(f"http://{host}:{port}{SNAPSHOT_PATH}", "gzip")
+            assert headers.get("Content-Encoding") == "gzip"
+            assert json.loads(gzip.decompress(body).decode("utf-8"))["version"] == 1
+        finally:
+            exporter.stop()
+
+    def test_history_endpoint(self, running_exporter: Exporter) -> None:
+        """Positive and negative unit test for the Exporter HTTP handler for HISTORY_PATH. It contains the following
+        steps:
+        - record 3 snapshots in a History, construct an Exporter with its query function and start it
+        - issue GET requests to /history with series= and since= parameters, and without parameters
+        - ASSERT: the JSON response holds the points of the selected series after since (all series without
+          series=), the response is compressed on request
+        - ASSERT: an unknown series is 404, an invalid since= is 400
+        - ASSERT: /history is 404 on an exporter without history (running_exporter fixture)
+        """
+        history = History(10)
+        for t in range(3):
+            snap = _sample_snapshot()
+            snap["generated_at"] = 100.0 + t
+            history.record(snap)
+        exporter = Exporter(log=None, bind_address="127.0.0.1", port=0, snapshot_fn=_sample_snapshot,
+                            history_fn=history.query)
+        exporter.start()
+        try:
+            host, port = exporter.bound_address()
+            url = f"http://{host}:{port}{HISTORY_PATH}"
+            status, ctype, body = _get(f"{url}?series=level/0&series=temp/CPU&since=100.5")
+            assert status == 200 and ctype.startswith("application/json")
+            result = json.loads(body.decode("utf-8"))
+            assert list(result["series"]) == ["level/0", "temp/CPU"]
+            assert [p[0] for p in result["series"]["temp/CPU"]["points"]] == [101.0, 102.0]
+            result = json.loads(_get(url)[2].decode("utf-8"))
+            assert list(result["series"]) == history.names()
+            req = urllib.request.Request(url, method="GET", headers={"Accept-Encoding": "gzip"})
+            with urllib.request.urlopen(req, timeout=2.0) as resp:
+                assert resp.headers.get("Content-Encoding") == "gzip"
+                assert json.loads(gzip.decompress(resp.read()).decode("utf-8")) == result
+            for query, code in (("series=temp/NONE", 404), ("since=abc", 400), ("since=nan", 400)):
+                with pytest.raises(urllib.error.HTTPError) as cm:
+                    _get(f"{url}?{query}")
+                assert cm.value.code == code
+                cm.value.close()
+        finally:
+            exporter.stop()
+        host, port = running_exporter.bound_address()
+        with pytest.raises(urllib.error.HTTPError) as cm:
+            _get(f"http://{host}:{port}{HISTORY_PATH}")
+        assert cm.value.code == 404
+        cm.value.close()
+
     def test_stop_is_idempotent(self) -> None:
         """Positive unit test for Exporter.stop() method idempotency. It contains the following steps:
         - construct an Exporter with snapshot_fn=_sample_snapshot on an ephemeral port
@@ -596,4 +997,128 @@ class TestExporterHTTP:
             "expected the per-request access log line to be routed through Log.msg"
 
 
+class TestResponseCache:
+    """Unit tests for smfc.exporter._ResponseCache class."""
+
+    def test_get(self) -> None:
+        """Positive/negative unit test for _ResponseCache.get() method. It contains the following steps:
+        - create a cache and a counting render function
+        - get the /metrics body twice with generation 1, then with generation 2
+        - ASSERT: the body is rendered once per generation
+        - get the /snapshot body with a failing render, then with a working render
+        - ASSERT: the exception of the render is raised, and the failed render is not cached
+        """
+        cache = _ResponseCache()
+        renders: List[int] = []
+
+        def render() -> bytes:
+            renders.append(1)
+            return f"body{len(renders)}".encode("utf-8")
+
+        assert cache.get(METRICS_PATH, 1, render) == b"body1"
+        assert cache.get(METRICS_PATH, 1, render) == b"body1"
+        assert cache.get(METRICS_PATH, 2, render) == b"body2"
+        assert len(renders) == 2
+        with pytest.raises(RuntimeError):
+            cache.get(SNAPSHOT_PATH, 1, lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        assert cache.get(SNAPSHOT_PATH, 1, render) == b"body3"
+
+    def test_get_compressed(self) -> None:
+        """Positive unit test for _ResponseCache.get() method with content codings. It contains the following
+        steps:
+        - create a cache and a counting render function
+        - get the /metrics body of generation 1 in gzip (twice) and in deflate coding, then in gzip coding for
+          generation 2
+        - ASSERT: the body is rendered once per generation, and compressed once per generation and content coding
+        - ASSERT: the compressed bodies decompress to the rendered body
+        """
+        cache = _ResponseCache()
+        renders: List[int] = []
+
+        def render() -> bytes:
+            renders.append(1)
+            return b"smfc_up 1\n" * (100 + len(renders))
+
+        first = cache.get(METRICS_PATH, 1, render, "gzip")
+        assert cache.get(METRICS_PATH, 1, render, "gzip") is first
+        assert gzip.decompress(first) == b"smfc_up 1\n" * 101
+        assert zlib.decompress(cache.get(METRICS_PATH, 1, render, "deflate")) == b"smfc_up 1\n" * 101
+        assert len(renders) == 1
+        assert gzip.decompress(cache.get(METRICS_PATH, 2, render, "gzip")) == b"smfc_up 1\n" * 102
+        assert len(renders) == 2
+
+    def test_concurrent_get_shares_one_render(self) -> None:
+        """Positive unit test for _ResponseCache.get() method with concurrent readers. It contains the following
+        steps:
+        - create a cache and a slow, counting render function
+        - call get() with the same generation from 8 threads at the same time
+        - ASSERT: the body is rendered only once, and every thread receives the same body
+        """
+        cache = _ResponseCache()
+        renders: List[int] = []
+        results: List[bytes] = []
+
+        def render() -> bytes:
+            renders.append(1)
+            time.sleep(0.05)
+            return b"shared"
+
+        threads = [threading.Thread(target=lambda: results.append(cache.get(METRICS_PATH, 5, render)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(renders) == 1
+        assert results == [b"shared"] * 8
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        pytest.param(None, "identity", id="no-header"),
+        pytest.param("", "identity", id="empty"),
+        pytest.param("gzip", "gzip", id="gzip"),
+        pytest.param("deflate", "deflate", id="deflate"),
+        pytest.param("gzip, deflate, br", "gzip", id="gzip-preferred"),
+        pytest.param("deflate;q=1.0, gzip;q=0.5", "deflate", id="q-value"),
+        pytest.param("GZIP ; Q=0.8", "gzip", id="case-insensitive"),
+        pytest.param("gzip;q=0", "identity", id="gzip-refused"),
+        pytest.param("gzip;q=x", "identity", id="invalid-q"),
+        pytest.param("*", "gzip", id="wildcard"),
+        pytest.param("*;q=0.5, gzip;q=0", "deflate", id="wildcard-without-gzip"),
+        pytest.param("br", "identity", id="unsupported"),
+        pytest.param("identity;q=1, gzip;q=0.5", "identity", id="identity-preferred"),
+    ],
+)
+def test_negotiate_coding(accept_encoding: str, expected: str) -> None:
+    """Positive unit test for _negotiate_coding() function. It contains the following steps:
+    - select the content coding of the Accept-Encoding header
+    - ASSERT: the expected content coding is selected
+    """
+    assert _negotiate_coding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        pytest.param(None, False, id="no-header"),
+        pytest.param("*/*", False, id="wildcard"),
+        pytest.param("text/plain", False, id="text"),
+        pytest.param("application/openmetrics-text", True, id="openmetrics"),
+        pytest.param("application/openmetrics-text;version=1.0.0,text/plain;version=0.0.4;q=0.5", True,
+                     id="prometheus"),
+        pytest.param("application/openmetrics-text;q=0.5,text/plain", False, id="text-preferred"),
+        pytest.param("application/openmetrics-text,text/plain", False, id="tie"),
+        pytest.param("application/openmetrics-text;q=0", False, id="refused"),
+    ],
+)
+def test_negotiate_openmetrics(accept: str, expected: bool) -> None:
+    """Positive unit test for _negotiate_openmetrics() function. It contains the following steps:
+    - select the format of the Accept header
+    - ASSERT: OpenMetrics is selected only if the client prefers it
+    """
+    assert _negotiate_openmetrics(accept) == expected
+
+
 # End.
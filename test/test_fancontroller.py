@@ -3,15 +3,21 @@
 #   test_fancontroller.py (C) 2021-2026, Peter Sulyok
 #   Unit tests for smfc.FanController() class.
 #
+import asyncio
+import subprocess
 import time
-from collections import deque
 from typing import List, Tuple
 import pytest
 import pyudev
 from mock import MagicMock, call
 from pytest_mock import MockerFixture
-from smfc import FanController, Log, Ipmi
+from smfc import FanController, Log, Ipmi, clock
+from smfc.clock import VirtualClock
 from smfc.config import Config
+from smfc.filters import KalmanFilter, MedianFilter, MovingAverageFilter
+from smfc.sensorproc import SensorHangError, SensorProcess
+from smfc.sensors import SensorRegistry
+from smfc.timing import ControllerTiming
 from .test_config_builders import create_cpu_config
 from .test_mocks import MockDevice, MockContext
 
@@ -110,8 +116,8 @@ class TestFanController:
         - ASSERT: level_step equals (max_level - min_level) / steps
         - ASSERT: last_temp is initialised to 0
         - ASSERT: last_level is initialised to 0
-        - ASSERT: _temp_history is a deque instance
-        - ASSERT: _temp_history maxlen equals the smoothing window size
+        - ASSERT: temp_filter is a MovingAverageFilter instance (default filter)
+        - ASSERT: the window size of the filter equals the smoothing window size
         """
         cfg = create_cpu_config(ipmi_zone=ipmi_zone, temp_calc=temp_calc, steps=steps, sensitivity=sensitivity,
                                 polling=polling, min_temp=min_temp, max_temp=max_temp, min_level=min_level,
@@ -134,8 +140,8 @@ class TestFanController:
         assert my_fc.level_step == (max_level - min_level) / steps
         assert my_fc.last_temp == 0
         assert my_fc.last_level == 0
-        assert isinstance(my_fc._temp_history, deque)  # pylint: disable=protected-access
-        assert my_fc._temp_history.maxlen == smoothing  # pylint: disable=protected-access
+        assert isinstance(my_fc.temp_filter, MovingAverageFilter)
+        assert my_fc.temp_filter.window.maxlen == smoothing
 
     @pytest.mark.parametrize(
         "count",
@@ -487,6 +493,53 @@ class TestFanController:
         my_fc.count = 3
         assert my_fc.device_names() == ["dev0", "dev1", "dev2"]
 
+    @pytest.mark.parametrize(
+        "old_paths, new_paths, changed, expected",
+        [
+            pytest.param(["/a/hwmon1/t", "/a/hwmon2/t"], ["/a/hwmon1/t", "/a/hwmon7/t"], True,
+                         ["/a/hwmon1/t", "/a/hwmon7/t"], id="index-changed"),
+            pytest.param(["/a/hwmon1/t", "/a/hwmon2/t"], ["/a/hwmon1/t", "/a/hwmon2/t"], False,
+                         ["/a/hwmon1/t", "/a/hwmon2/t"], id="unchanged"),
+            pytest.param(["/a/hwmon1/t", "/a/hwmon2/t"], ["", "/a/hwmon2/t"], False,
+                         ["/a/hwmon1/t", "/a/hwmon2/t"], id="removed-keeps-old"),
+            pytest.param(["", "/a/hwmon2/t"], ["/a/hwmon9/t", "/a/hwmon2/t"], True,
+                         ["/a/hwmon9/t", "/a/hwmon2/t"], id="smartctl-to-hwmon"),
+            pytest.param(["/a/hwmon1/t", "/a/hwmon2/t"], ["/a/hwmon1/t"], False,
+                         ["/a/hwmon1/t", "/a/hwmon2/t"], id="count-mismatch"),
+        ],
+    )
+    def test_refresh_hwmon_paths(self, mocker: MockerFixture, old_paths: List[str], new_paths: List[str],
+                                 changed: bool, expected: List[str]) -> None:
+        """Positive/negative unit test for FanController.refresh_hwmon_paths() method. It contains the following
+        steps:
+        - build a FanController with two devices (via _make_fc) and a shared sensor registry
+        - mock resolve_hwmon_paths() to return the new paths
+        - call refresh_hwmon_paths()
+        - ASSERT: the return value reports whether any path has changed
+        - ASSERT: unresolved devices keep their old path, a device count mismatch changes nothing
+        - ASSERT: a changed path is swapped as a new list object and subscribed in the sensor registry
+        """
+        cfg = create_cpu_config()
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=2)
+        my_fc.hwmon_path = old_paths
+        my_fc.attach_sensors(SensorRegistry(1.0))
+        mocker.patch("smfc.FanController.resolve_hwmon_paths", MagicMock(return_value=new_paths))
+        assert my_fc.refresh_hwmon_paths(MagicMock()) is changed
+        assert my_fc.hwmon_path == expected
+        assert (my_fc.hwmon_path is not old_paths) is changed
+        keys = [s["key"] for s in my_fc.sensors.stats()["sensors"]]
+        assert all(f"hwmon:{p}" in keys for p in expected)
+
+    def test_resolve_hwmon_paths_default(self) -> None:
+        """Positive unit test for FanController.resolve_hwmon_paths() method. It contains the following steps:
+        - instantiate FanController via FanController.__new__ with two hwmon paths
+        - ASSERT: the default implementation returns a copy of the current hwmon paths
+        """
+        my_fc = FanController.__new__(FanController)
+        my_fc.hwmon_path = ["/a", "/b"]
+        paths = my_fc.resolve_hwmon_paths(MagicMock())
+        assert paths == ["/a", "/b"] and paths is not my_fc.hwmon_path
+
     @pytest.mark.parametrize(
         "zones, level",
         [
@@ -500,16 +553,17 @@ class TestFanController:
         """Positive unit test for FanController.set_fan_level() method. It contains the following steps:
         - mock smfc.Ipmi.set_multiple_fan_levels via mocker.patch
         - instantiate Ipmi via Ipmi.__new__ and FanController via FanController.__new__
-        - set config, ipmi and deferred_apply=False on the FanController instance
+        - set config, ipmi, timing and deferred_apply=False on the FanController instance
         - call FanController.set_fan_level(level)
         - ASSERT: Ipmi.set_multiple_fan_levels was called with (zones, level)
-        - ASSERT: Ipmi.set_multiple_fan_levels was called exactly once
+        - ASSERT: Ipmi.set_multiple_fan_levels was called exactly once, and its duration was recorded
         """
         my_ipmi = Ipmi.__new__(Ipmi)
         cfg = create_cpu_config(ipmi_zone=zones)
         my_fc = FanController.__new__(FanController)
         my_fc.config = cfg
         my_fc.ipmi = my_ipmi
+        my_fc.timing = ControllerTiming()
         my_fc.deferred_apply = False
         mock_set_multiple_fan_levels = MagicMock()
         mocker.patch("smfc.Ipmi.set_multiple_fan_levels", mock_set_multiple_fan_levels)
@@ -519,6 +573,7 @@ class TestFanController:
             calls.append(call(z, level))
         mock_set_multiple_fan_levels.assert_called_with(zones, level)
         assert mock_set_multiple_fan_levels.call_count == 1
+        assert my_fc.timing.apply.count == 1
 
     @pytest.mark.parametrize(
         "steps, sensitivity, polling, min_temp, max_temp, min_level, max_level, temp, level",
@@ -869,21 +924,21 @@ class TestFanController:
                                            max_level: int, steps: int) -> None:
         """Positive unit test for FanController.create_legacy_lut() static method. It contains the following steps:
         - call FanController.create_legacy_lut(min_temp, max_temp, min_level, max_level, steps) directly
-        - ASSERT: the resulting LUT has length 101 (covers temperatures 0..100)
+        - ASSERT: the resulting LUT has length 151 (covers temperatures 0..150)
         - ASSERT: LUT[int(min_temp)] equals min_level
         - ASSERT: LUT[int(max_temp)] equals max_level
         - ASSERT: LUT[0] equals min_level (head padding)
-        - ASSERT: LUT[100] equals max_level (tail padding)
+        - ASSERT: LUT[150] equals max_level (tail padding)
         - ASSERT: the LUT is non-decreasing across the full temperature range
         """
         lut = FanController.create_legacy_lut(min_temp, max_temp, min_level, max_level, steps)
-        assert len(lut) == 101
+        assert len(lut) == 151
         assert lut[int(min_temp)] == min_level
         assert lut[int(max_temp)] == max_level
         assert lut[0] == min_level
-        assert lut[100] == max_level
+        assert lut[150] == max_level
         # Non-decreasing.
-        for t in range(1, 101):
+        for t in range(1, 151):
             assert lut[t] >= lut[t - 1], f"LUT not non-decreasing at T={t}"
 
     def test_create_legacy_lut_reproduces_run_formula(self) -> None:
@@ -912,7 +967,7 @@ class TestFanController:
         """Positive unit test for FanController.create_control_function() static method. Contains the following steps:
         - call FanController.create_control_function(pairs, steps) directly with the parametrized breakpoints
         - inspect LUT length, endpoint pinning, head/tail padding, and plateau run-length count
-        - ASSERT: the resulting LUT has length 101
+        - ASSERT: the resulting LUT has length 151
         - ASSERT: LUT[t_first] equals the first breakpoint's level
         - ASSERT: LUT[t_last] equals the last breakpoint's level
         - ASSERT: all entries before t_first equal the first level (head padding)
@@ -922,7 +977,7 @@ class TestFanController:
         lut = FanController.create_control_function(pairs, steps)
         t_first, l_first = pairs[0]
         t_last, l_last = pairs[-1]
-        assert len(lut) == 101
+        assert len(lut) == 151
         assert lut[t_first] == l_first
         assert lut[t_last] == l_last
         assert all(v == l_first for v in lut[:t_first])
@@ -931,7 +986,7 @@ class TestFanController:
         # the constant head and tail merge with their neighbouring endpoints, so the run-length
         # encoding of the LUT yields the same count.
         plateau_count = 1
-        for t in range(1, 101):
+        for t in range(1, 151):
             if lut[t] != lut[t - 1]:
                 plateau_count += 1
         assert plateau_count == steps + 2
@@ -953,7 +1008,7 @@ class TestFanController:
         """Positive unit test for FanController.create_control_function() static method when steps exceeds interior_len.
         Contains the following steps:
         - call FanController.create_control_function([(30, 35), (32, 100)], 5) so interior_len=1 and steps=5 (4 of 5 iterations hit the size==0 continue branch)
-        - ASSERT: the resulting LUT has length 101
+        - ASSERT: the resulting LUT has length 151
         - ASSERT: LUT[30] equals 35 (first breakpoint pinned)
         - ASSERT: LUT[31] equals 68 (single interior plateau value)
         - ASSERT: LUT[32] equals 100 (last breakpoint pinned)
@@ -962,7 +1017,7 @@ class TestFanController:
         """
         # t_last - t_first - 1 = 32 - 30 - 1 = 1 interior slot; steps=5 > 1
         lut = FanController.create_control_function([(30, 35), (32, 100)], 5)
-        assert len(lut) == 101
+        assert len(lut) == 151
         assert lut[30] == 35
         assert lut[31] == 68
         assert lut[32] == 100
@@ -1012,17 +1067,17 @@ class TestFanController:
         """Positive unit test for FanController.build_lut() static method. It contains the following steps:
         - build a CPU config with the parametrized control_function (empty for legacy path, populated for new path)
         - call FanController.build_lut(cfg) directly
-        - ASSERT: the resulting LUT has length 101
+        - ASSERT: the resulting LUT has length 151
         - ASSERT: when the new control_function path is taken, LUT[30]=35 and LUT[65]=100 (endpoints pinned)
         - ASSERT: when the legacy staircase path is taken, the same endpoints LUT[30]=35 and LUT[65]=100 hold
         - ASSERT: LUT[0] equals min_level=35 (head padding)
-        - ASSERT: LUT[100] equals max_level=100 (tail padding)
+        - ASSERT: LUT[150] equals max_level=100 (tail padding)
         """
         # Use steps=5 so the cross-field constraint is satisfied for the 2-point new-path case.
         cfg = create_cpu_config(steps=5, min_temp=30, max_temp=65, min_level=35, max_level=100,
                                 control_function=control_function)
         lut = FanController.build_lut(cfg)
-        assert len(lut) == 101
+        assert len(lut) == 151
         if expect_new_path:
             # Endpoint pinning: LUT[30]=35 and LUT[65]=100 exactly.
             assert lut[30] == 35 and lut[65] == 100
@@ -1030,7 +1085,7 @@ class TestFanController:
             # Legacy staircase has same endpoints.
             assert lut[30] == 35 and lut[65] == 100
         assert lut[0] == 35
-        assert lut[100] == 100
+        assert lut[150] == 100
 
     def test_run_with_control_function_drives_level_via_lut(self, mocker: MockerFixture) -> None:
         """Positive unit test for FanController.run() method driven by a control_function LUT. Contains the following steps:
@@ -1057,6 +1112,261 @@ class TestFanController:
             assert my_fc.last_level == expected_level, \
                 f"control_function run(): T={temp} -> level={my_fc.last_level}, expected {expected_level}"
 
+    @pytest.mark.parametrize("resolution", [
+        pytest.param(0.5, id="res-0.5"),
+        pytest.param(0.1, id="res-0.1"),
+        pytest.param(0.01, id="res-0.01"),
+    ])
+    def test_lut_fractional_resolution(self, resolution: float) -> None:
+        """Positive unit test for FanController.create_legacy_lut() and create_control_function() static methods
+        with a fractional resolution. It contains the following steps:
+        - build the legacy and the control function LUTs at 1 C and at the parametrized resolution
+        - ASSERT: the LUTs are byte arrays covering [0..150] C with round(150 / resolution) + 1 elements
+        - ASSERT: the fractional legacy LUT equals the 1 C LUT at every integer temperature
+        - ASSERT: the fractional control function LUT keeps the pinned endpoints, the head/tail padding and
+          the number of plateaus
+        """
+        legacy = FanController.create_legacy_lut(30.0, 50.0, 35, 100, 5)
+        legacy_fine = FanController.create_legacy_lut(30.0, 50.0, 35, 100, 5, resolution)
+        size = int(round(150 / resolution)) + 1
+        assert legacy_fine.typecode == "B" and len(legacy_fine) == size
+        for t in range(151):
+            assert legacy_fine[int(round(t / resolution))] == legacy[t]
+        pairs = [(30, 35), (50, 40), (60, 90), (65, 100)]
+        cf = FanController.create_control_function(pairs, 5, resolution)
+        assert cf.typecode == "B" and len(cf) == size
+        i_first, i_last = int(round(30 / resolution)), int(round(65 / resolution))
+        assert cf[i_first] == 35 and cf[i_last] == 100
+        assert all(v == 35 for v in cf[:i_first]) and all(v == 100 for v in cf[i_last:])
+        assert sum(1 for i in range(1, size) if cf[i] != cf[i - 1]) + 1 == 5 + 2
+
+    def test_run_fractional_resolution(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController.run() method with a 0.1 C LUT. It contains the following steps:
+        - mock builtins.print, smfc.FanController.set_fan_level, smfc.FanController._get_nth_temp via _make_fc
+        - build a CPU config with a control function (90, 40) - (130, 100), steps=2 and lut_resolution=0.1
+        - drive run() with temperatures around a plateau boundary and above 100 C
+        - ASSERT: the boundary is resolved at 0.1 C (not rounded to a whole degree)
+        - ASSERT: temperatures above 100 C are mapped by the LUT, temperatures above 150 C are clamped
+        - ASSERT: the logged plateaus show fractional temperatures
+        """
+        cfg = create_cpu_config(steps=2, sensitivity=0.05, polling=1, lut_resolution=0.1,
+                                control_function=[(90, 40), (130, 100)])
+        my_fc, _, _, mock_temp = _make_fc(mocker, cfg, count=1)
+        assert len(my_fc.levels_lut) == 1501
+        # Interior 90.1..129.9 C is split into two plateaus: [90.1..110]C and [110.1..129.9]C.
+        for temp, expected_level in [(110.0, 55), (110.1, 85), (129.9, 85), (130.0, 100), (180.0, 100)]:
+            mock_temp.return_value = temp
+            my_fc.last_level = 0
+            my_fc.last_temp = 0.0
+            my_fc.last_time = time.monotonic() - 2
+            my_fc.run()
+            assert my_fc.last_level == expected_level, f"T={temp} -> level={my_fc.last_level}"
+        plateaus = my_fc._level_plateaus()  # pylint: disable=protected-access
+        assert plateaus == [("T=[0..90]C", 40), ("T=[90.1..110]C", 55), ("T=[110.1..129.9]C", 85),
+                            ("T=[130..150]C", 100)]
+
+    def test_hysteresis(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._limit_level() method with hysteresis. It contains the following
+        steps:
+        - build a FanController with the 30..50C -> 35..100% staircase (steps=5) and hysteresis=2
+        - feed temperatures hovering on the 35/36C plateau boundary, then clearly below it, then above it
+        - ASSERT: the level is lowered only when the temperature is 2C below the current plateau
+        - ASSERT: the held back changes are counted in suppressed_writes, increases are applied immediately
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=0.5, polling=1, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, hysteresis=2.0)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        # pylint: disable=protected-access
+        for temp, expected_level, suppressed in [(36.0, 61, 0), (35.0, 61, 1), (36.0, 61, 1), (35.0, 61, 2),
+                                                 (33.0, 48, 2), (36.0, 61, 2)]:
+            my_fc._process_temp(temp)
+            assert my_fc.last_level == expected_level, f"T={temp}"
+            assert my_fc.suppressed_writes == suppressed, f"T={temp}"
+
+    def test_min_dwell(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._limit_level() method with min_dwell. It contains the following
+        steps:
+        - build a FanController with the 30..50C -> 35..100% staircase (steps=5) and min_dwell=10
+        - lower the temperature right after a level change, poll again with the same temperature, then
+          shift the time of the last level change 11 sec back and poll again
+        - ASSERT: the lower level is held back (counted once) and re-evaluated at the next polls, without a new
+          temperature, and it is applied when the dwell time has elapsed
+        - ASSERT: an increase is applied immediately after a level change
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=0.5, polling=1, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, min_dwell=10.0)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        # pylint: disable=protected-access
+        my_fc._process_temp(40.0)
+        assert my_fc.last_level == 61
+        my_fc._process_temp(30.0)
+        assert my_fc.last_level == 61 and my_fc.suppressed_writes == 1
+        my_fc._process_temp(30.0)
+        assert my_fc.last_level == 61 and my_fc.suppressed_writes == 1
+        my_fc._level_changed_at -= 11.0
+        my_fc._process_temp(30.0)
+        assert my_fc.last_level == 35
+        my_fc._process_temp(45.0)
+        assert my_fc.last_level == 87 and my_fc.suppressed_writes == 1
+
+    def test_ramp_limits(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._limit_level() method with ramp limits. It contains the following
+        steps:
+        - build a FanController with the 30..50C -> 35..100% staircase (steps=5), ramp_up=5 and ramp_down=1 %/sec
+        - jump the temperature from 30C to 50C 4 sec after the last level change, then re-evaluate it 2 sec later
+          and again much later; finally drop the temperature 10 sec after the last change
+        - ASSERT: the level rises by 5%/sec, the rest of the change is applied at the next polls without a new
+          temperature, and the decrease is limited to 1%/sec
+        - ASSERT: a new temperature without a whole percent of allowed change is counted in suppressed_writes
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=0.5, polling=1, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, ramp_up=5.0, ramp_down=1.0)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        mock_set_fan_level = mocker.patch("smfc.FanController.set_fan_level")
+        # pylint: disable=protected-access
+        my_fc._process_temp(30.0)
+        assert my_fc.last_level == 35
+        my_fc._level_changed_at = time.monotonic() - 4.0
+        my_fc._process_temp(50.0)
+        assert my_fc.last_level == 55
+        my_fc._level_changed_at = time.monotonic() - 2.0
+        my_fc._process_temp(50.0)
+        assert my_fc.last_level == 65
+        my_fc._level_changed_at = time.monotonic() - 100.0
+        my_fc._process_temp(50.0)
+        assert my_fc.last_level == 100
+        my_fc._level_changed_at = time.monotonic() - 10.0
+        my_fc._process_temp(30.0)
+        assert my_fc.last_level == 90
+        assert mock_set_fan_level.call_args_list == [call(35), call(55), call(65), call(100), call(90)]
+        assert my_fc.suppressed_writes == 0
+        my_fc._process_temp(40.0)
+        assert my_fc.last_level == 90 and my_fc.suppressed_writes == 1
+
+    def test_temp_filter(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._process_temp() method with the temperature filters. It contains
+        the following steps:
+        - build a FanController with a 3-sample median filter and feed 40C, 40C, then a 90C spike
+        - build a FanController with a Kalman filter
+        - ASSERT: the filter of the section is created, the spike is rejected by the median filter
+        - ASSERT: raw_temp holds the last aggregated temperature, filtered_temp the output of the filter
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=1, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, smoothing=3, temp_filter=Config.FILTER_MEDIAN)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        assert isinstance(my_fc.temp_filter, MedianFilter)
+        # pylint: disable=protected-access
+        for temp in (40.0, 40.0, 90.0):
+            my_fc._process_temp(temp)
+        assert (my_fc.raw_temp, my_fc.filtered_temp, my_fc.last_temp) == (90.0, 40.0, 40.0)
+        cfg = create_cpu_config(temp_filter=Config.FILTER_KALMAN, kalman_process_noise=0.1,
+                                kalman_measurement_noise=2.0)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        assert isinstance(my_fc.temp_filter, KalmanFilter)
+        assert my_fc.temp_filter.process_noise == 0.1 and my_fc.temp_filter.measurement_noise == 2.0
+
+    def test_feedforward(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._process_temp() method with the feed-forward term. It contains the
+        following steps:
+        - build a FanController with the 30..50C -> 35..100% staircase (steps=5), sensitivity=5,
+          feedforward_rate=1 C/sec and feedforward_horizon=10 sec
+        - raise the temperature from 30C to 34C in 2 sec, then to 40C in 20 sec
+        - ASSERT: the steep rise is evaluated below the sensitivity gap, and the level of the temperature
+          predicted 10 sec ahead (54C) is applied
+        - ASSERT: the slow rise does not activate the feed-forward term, the level follows the LUT again
+        - ASSERT: without feedforward_rate the same steep rise is below the sensitivity gap
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=5, polling=1, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, feedforward_rate=1.0, feedforward_horizon=10.0)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        mock_set_fan_level = mocker.patch("smfc.FanController.set_fan_level")
+        # pylint: disable=protected-access
+        my_fc._process_temp(30.0)
+        assert my_fc.last_level == 35 and my_fc.temp_slope == 0.0
+        my_fc._slope_samples[-1] = (my_fc._slope_samples[-1][0] - 2.0, 30.0)
+        my_fc._process_temp(34.0)
+        assert my_fc.temp_slope == pytest.approx(2.0, rel=0.01)
+        assert my_fc.last_level == 100
+        my_fc._slope_samples[-1] = (my_fc._slope_samples[-1][0] - 20.0, 34.0)
+        my_fc._process_temp(40.0)
+        assert my_fc.temp_slope == pytest.approx(0.3, rel=0.01)
+        assert my_fc.last_level == my_fc._lookup_level(40.0)
+        assert mock_set_fan_level.call_args_list == [call(35), call(100), call(my_fc._lookup_level(40.0))]
+        cfg.feedforward_rate = 0.0
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        my_fc._process_temp(30.0)
+        my_fc._process_temp(34.0)
+        assert my_fc.last_level == 35 and my_fc.temp_slope == 0.0
+
+    def test_pid_mode(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._process_temp() method in PID control mode. It contains the following
+        steps:
+        - build a FanController with control_mode=pid, pid_target=45, pid_kp=5, pid_ki=0, 35..90% output range,
+          a large sensitivity and hysteresis, and deferred apply
+        - feed temperatures below, above and far above the target, then a small drop
+        - ASSERT: the PID controller is created, the level is min_level + kp * error clamped to [35..90]
+        - ASSERT: the sensitivity gap and the hysteresis are not applied, the level is only stored (deferred apply)
+        - ASSERT: a hung sensor read applies max_level as safe level
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=10, polling=1, min_level=35, max_level=90, hysteresis=5.0,
+                                control_mode=Config.CONTROL_PID, pid_target=45.0, pid_kp=5.0, pid_ki=0.0,
+                                pid_kd=0.0)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        assert my_fc.pid is not None and my_fc.pid.target == 45.0
+        my_fc.deferred_apply = True
+        mock_set_multiple_fan_levels = mocker.patch("smfc.Ipmi.set_multiple_fan_levels")
+        # pylint: disable=protected-access
+        for temp, expected_level in [(40.0, 35), (47.0, 45), (60.0, 90), (49.0, 55), (48.0, 50)]:
+            my_fc._process_temp(temp)
+            assert my_fc.last_level == expected_level, f"T={temp}"
+        assert my_fc.suppressed_writes == 0
+        mock_set_multiple_fan_levels.assert_not_called()
+        my_fc._apply_safe_level(SensorHangError("hung"))
+        assert my_fc.last_level == 90
+
+    def test_save_restore_state(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController.save_state() and restore_state() methods. It contains the following
+        steps:
+        - build a FanController with 2 devices and a 3-sample moving average, feed 2 temperatures and count a read
+          error of the second device
+        - save its state and restore it into a new FanController with the same configuration
+        - ASSERT: the last level and temperatures, the filter window and the error counters are restored, so the
+          same temperature does not change (or set) the fan level
+        - ASSERT: a state without the last level restores the filter only, the error counters of a different
+          number of devices are not restored
+        - ASSERT: the integral term of the PID controller is restored (clamped to the output range)
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=1, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, smoothing=3)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=2)
+        # pylint: disable=protected-access
+        my_fc._process_temp(40.0)
+        my_fc._process_temp(44.0)
+        my_fc._temp_read_errors_total[1] = 3
+        state = my_fc.save_state()
+        new_fc, _, _, _ = _make_fc(mocker, cfg, count=2)
+        new_fc.restore_state(state)
+        assert (new_fc.last_level, new_fc.last_temp) == (my_fc.last_level, my_fc.last_temp)
+        assert (new_fc.raw_temp, new_fc.filtered_temp) == (44.0, 42.0)
+        assert list(new_fc.temp_filter.window) == [40.0, 44.0]
+        assert new_fc._temp_read_errors_total == [0, 3]
+        mock_set_fan_level = mocker.patch("smfc.FanController.set_fan_level")
+        new_fc._process_temp(42.0)
+        mock_set_fan_level.assert_not_called()
+        other_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        other_fc.restore_state({k: v for k, v in state.items() if k not in ("last_level", "last_temp")})
+        assert (other_fc.last_level, other_fc.last_temp) == (0, 0)
+        assert list(other_fc.temp_filter.window) == [40.0, 44.0]
+        assert other_fc._temp_read_errors_total == [0]
+        cfg = create_cpu_config(min_level=35, max_level=90, control_mode=Config.CONTROL_PID, pid_target=45.0)
+        pid_fc, _, _, _ = _make_fc(mocker, cfg, count=1)
+        pid_fc.pid.integral = 60.0
+        state = pid_fc.save_state()
+        assert state["pid_integral"] == 60.0
+        state["pid_integral"] = 120.0
+        pid_fc.restore_state(state)
+        assert pid_fc.pid.integral == 90.0
+
     def test_run_polling_skipped(self, mocker: MockerFixture) -> None:
         """Positive unit test for FanController.run() method when polling interval has not elapsed. Contains the following steps:
         - mock builtins.print, smfc.FanController.set_fan_level, smfc.FanController._get_nth_temp via _make_fc
@@ -1078,5 +1388,302 @@ class TestFanController:
         assert mock_temp.call_count == initial_temp_calls
         assert mock_set_fan_level.call_count == 0
 
+    @pytest.mark.parametrize("temp_calc, expected", [
+        (Config.CALC_MIN, 30.0),
+        (Config.CALC_AVG, 40.0),
+        (Config.CALC_MAX, 50.0),
+    ])
+    def test_get_temp_async(self, mocker: MockerFixture, temp_calc: int, expected: float) -> None:
+        """Positive unit test for FanController.get_temp_async() method. It contains the following steps:
+        - build a FanController with 3 devices via _make_fc, attached to a SensorRegistry
+        - let _get_nth_temp return 30/40/50C for the devices
+        - call get_temp_async() in an event loop
+        - ASSERT: the result is aggregated the same way as in get_temp() and every device was read once
+        """
+        cfg = create_cpu_config(temp_calc=temp_calc, sensitivity=1, polling=1)
+        my_fc, _, _, mock_temp = _make_fc(mocker, cfg, count=3)
+        mock_temp.reset_mock()
+        mock_temp.side_effect = lambda i: [30.0, 40.0, 50.0][i]
+        my_fc.hwmon_path = ["/a", "/b", "/c"]
+        my_fc.attach_sensors(SensorRegistry(0))
+        assert asyncio.run(my_fc.get_temp_async()) == expected
+        assert my_fc.last_per_device_temps == [30.0, 40.0, 50.0]
+        assert sorted(c.args[0] for c in mock_temp.call_args_list) == [0, 1, 2]
+
+    def test_get_temp_async_concurrent(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController.get_temp_async() method (concurrent reads). It contains the
+        following steps:
+        - build a FanController with 4 devices via _make_fc
+        - replace _get_nth_temp_async with a coroutine tracking the number of reads in progress
+        - ASSERT: all 4 reads were in progress at the same time
+        """
+        cfg = create_cpu_config(temp_calc=Config.CALC_MAX, sensitivity=1, polling=1)
+        my_fc, _, _, _ = _make_fc(mocker, cfg, count=4)
+        active = [0, 0]  # reads in progress, peak
+
+        async def slow_read(index: int) -> float:
+            active[0] += 1
+            active[1] = max(active)
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            return 30.0 + index
+
+        my_fc._get_nth_temp_async = slow_read  # pylint: disable=protected-access
+        assert asyncio.run(my_fc.get_temp_async()) == 33.0
+        assert active == [0, 4]
+
+    def test_get_temp_async_tolerates_failure(self, mocker: MockerFixture) -> None:
+        """Negative unit test for FanController.get_temp_async() method. It contains the following steps:
+        - build a FanController via _create_tolerance_fc with error_tolerance=1 whose constructor read 30.0C
+        - let _get_nth_temp raise OSError twice
+        - ASSERT: the first call reuses 30.0C, the second call raises the OSError (budget exhausted)
+        """
+        my_fc, mock_temp = self._create_tolerance_fc(mocker, error_tolerance=1)
+        mock_temp.side_effect = OSError(5, "Input/output error")
+        assert asyncio.run(my_fc.get_temp_async()) == 30.0
+        assert my_fc._temp_read_errors == [1]  # pylint: disable=protected-access
+        with pytest.raises(OSError):
+            asyncio.run(my_fc.get_temp_async())
+
+    def test_run_async(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController.run_async() method. It contains the following steps:
+        - build a FanController via _make_fc returning 55.0C and mock set_fan_level
+        - call run_async() twice: once with an elapsed polling interval, once without
+        - ASSERT: the level is set to max_level=100 only once, the second call skips polling
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=10, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100)
+        my_fc, _, _, mock_temp = _make_fc(mocker, cfg, count=1, temp_return=55.0)
+        mock_set_fan_level = mocker.patch("smfc.FanController.set_fan_level")
+        mock_temp.reset_mock()
+        asyncio.run(my_fc.run_async())
+        asyncio.run(my_fc.run_async())
+        assert my_fc.last_level == 100
+        mock_set_fan_level.assert_called_once_with(100)
+        assert mock_temp.call_count == 1
+
+    def test_poll(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController.poll() and poll_async() methods. It contains the following steps:
+        - build a FanController via _make_fc returning 55.0C with a polling timer that has not expired
+        - call run(), poll() and poll_async()
+        - ASSERT: run() skips the read, poll() and poll_async() read the temperature regardless of the timer
+        - ASSERT: the level is set to max_level=100 once (the second read does not change the level)
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=1000, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100)
+        my_fc, _, _, mock_temp = _make_fc(mocker, cfg, count=1, temp_return=55.0)
+        mock_set_fan_level = mocker.patch("smfc.FanController.set_fan_level")
+        mock_temp.reset_mock()
+        my_fc.last_time = time.monotonic()
+        my_fc.run()
+        assert mock_temp.call_count == 0
+        my_fc.poll()
+        assert mock_temp.call_count == 1
+        asyncio.run(my_fc.poll_async())
+        assert mock_temp.call_count == 2
+        mock_set_fan_level.assert_called_once_with(100)
+
+    def test_poll_timing(self, mocker: MockerFixture) -> None:
+        """Positive unit test for the timing instrumentation of FanController.poll() method. It contains the
+        following steps:
+        - install a virtual clock, build a FanController via _make_fc (polling=10) with a 0.2 sec temperature read
+          and a 0.5 sec IPMI write
+        - poll at 100 sec (new level), then at 110.3 sec (unchanged level)
+        - ASSERT: the lateness of the second poll is 0.3 sec, both reads took 0.2 sec, the level calculation
+          excludes the IPMI write, and only the first poll wrote the fan level
+        """
+        set_fan_level = FanController.set_fan_level
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=10, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100)
+        previous = clock.get_clock()
+        virtual = VirtualClock(100.0)
+        clock.set_clock(virtual)
+        try:
+            my_fc, _, my_ipmi, mock_temp = _make_fc(mocker, cfg, count=1, temp_return=55.0)
+            mocker.patch("smfc.FanController.set_fan_level", set_fan_level)
+            my_ipmi.set_multiple_fan_levels = MagicMock(side_effect=lambda zones, level: virtual.sleep(0.5))
+            mock_temp.side_effect = lambda *args: (virtual.sleep(0.2), 55.0)[1]
+            my_fc.poll()
+            virtual.sleep(110.3 - virtual.now)
+            my_fc.poll()
+        finally:
+            clock.set_clock(previous)
+        assert my_fc.last_level == 100
+        assert my_fc.timing.lateness.count == 1 and my_fc.timing.lateness.sum == pytest.approx(0.3)
+        assert my_fc.timing.read.count == 2 and my_fc.timing.read.sum == pytest.approx(0.4)
+        assert my_fc.timing.decide.count == 2 and my_fc.timing.decide.sum == pytest.approx(0.0)
+        assert my_fc.timing.apply.count == 1 and my_fc.timing.apply.sum == pytest.approx(0.5)
+
+    def test_churn_counters(self, mocker: MockerFixture) -> None:
+        """Positive unit test for the churn counters of FanController._process_temp() method. It contains the
+        following steps:
+        - install a virtual clock, build a FanController via _make_fc (polling=0, sensitivity=1)
+        - poll at 35C (first level), 50C (up), 35C (down: reversal), 35.5C (sensitivity gap), then 50C (up) after
+          REVERSAL_WINDOW + 100 sec
+        - ASSERT: the first level has no direction, only the quick down move is a reversal, and the poll within
+          the sensitivity gap is counted
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=0, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100)
+        previous = clock.get_clock()
+        virtual = VirtualClock(100.0)
+        clock.set_clock(virtual)
+        try:
+            my_fc, _, _, mock_temp = _make_fc(mocker, cfg, count=1, temp_return=35.0)
+            levels = []
+            for temp, delay in ((35.0, 2.0), (50.0, 2.0), (35.0, 2.0), (35.5, FanController.REVERSAL_WINDOW + 100),
+                                (50.0, 2.0)):
+                mock_temp.return_value = temp
+                my_fc.poll()
+                levels.append(my_fc.last_level)
+                virtual.sleep(delay)
+        finally:
+            clock.set_clock(previous)
+        assert levels[0] < levels[1] == 100 and levels[2] == levels[3] == levels[0] and levels[4] == 100
+        assert my_fc.direction_reversals == 1
+        assert my_fc.sensitivity_skips == 1
+
+    @pytest.mark.parametrize("timeout", [
+        pytest.param(5.0, id="deadline"),
+        pytest.param(0, id="no-deadline"),
+    ])
+    def test_run_command(self, timeout: float) -> None:
+        """Positive unit test for FanController.run_command() and run_command_async() methods. It contains the
+        following steps:
+        - execute `echo 42` with and without a deadline in both the blocking and the coroutine version
+        - ASSERT: both versions return a CompletedProcess with return code 0 and stdout "42"
+        """
+        r = FanController.run_command(["echo", "42"], timeout)
+        assert r.returncode == 0 and r.stdout == "42\n"
+        r = asyncio.run(FanController.run_command_async(["echo", "42"], timeout))
+        assert r.returncode == 0 and r.stdout == "42\n"
+
+    def test_run_command_timeout(self) -> None:
+        """Negative unit test for FanController.run_command() and run_command_async() methods. It contains the
+        following steps:
+        - execute `sleep 5` with a 0.2 second deadline in both the blocking and the coroutine version
+        - ASSERT: both versions raise TimeoutError well before the command would finish (the command is killed)
+        """
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            FanController.run_command(["sleep", "5"], 0.2)
+        with pytest.raises(TimeoutError):
+            asyncio.run(FanController.run_command_async(["sleep", "5"], 0.2))
+        assert time.monotonic() - start < 4.0
+
+    def test_run_command_not_found(self) -> None:
+        """Negative unit test for FanController.run_command() and run_command_async() methods. It contains the
+        following steps:
+        - execute a non-existent command in both the blocking and the coroutine version
+        - ASSERT: both versions raise FileNotFoundError
+        """
+        with pytest.raises(FileNotFoundError):
+            FanController.run_command(["/nonexistent/command"], 1.0)
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(FanController.run_command_async(["/nonexistent/command"], 1.0))
+
+    def test_sensor_process_reads(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController._get_nth_temp(), exec_command() and exec_command_async() methods
+        with an attached sensor process. It contains the following steps:
+        - build a FanController with a hwmon path and a mocked sensor process
+        - ASSERT: the hwmon file is read by the sensor process (millidegrees converted to C)
+        - ASSERT: both versions of exec_command() execute the command in the sensor process
+        - ASSERT: the requests are sent on the channel of the fan controller
+        - detach the sensor process
+        - ASSERT: exec_command() falls back to run_command()
+        """
+        mocker.patch("builtins.print", MagicMock())
+        fc = FanController.__new__(FanController)
+        fc.name = "CPU"
+        fc.hwmon_path = ["/sys/class/hwmon/hwmon1/temp1_input"]
+        proc = MagicMock()
+        proc.read_file.return_value = "42500\n"
+        proc.run_command.return_value = subprocess.CompletedProcess(["smartctl"], 0, "out", "")
+        fc.sensor_process = proc
+        assert fc._get_nth_temp(0) == 42.5  # pylint: disable=protected-access
+        proc.read_file.assert_called_once_with("/sys/class/hwmon/hwmon1/temp1_input", "CPU")
+        assert fc.exec_command(["smartctl"], 10.0).stdout == "out"
+        assert asyncio.run(fc.exec_command_async(["smartctl"], 10.0)).stdout == "out"
+        assert proc.run_command.call_count == 2
+        proc.run_command.assert_called_with(["smartctl"], 10.0, "CPU")
+        fc.sensor_process = None
+        mock_run = mocker.patch("smfc.FanController.run_command", MagicMock(return_value="local"))
+        assert fc.exec_command(["smartctl"], 10.0) == "local"
+        mock_run.assert_called_once_with(["smartctl"], 10.0)
+
+    def test_get_temp_async_sensor_process_queue(self, mocker: MockerFixture) -> None:
+        """Positive unit test for FanController.get_temp_async() method with a sensor process. It contains the
+        following steps:
+        - build a FanController via _make_fc with 6 devices, attach a real sensor process with 0.5 sec deadline
+        - every device read executes a 0.15 sec command without deadline in the channel of the controller
+        - ASSERT: the reads take longer than one deadline together, still no read exceeds its deadline: no
+          SensorHangError is raised, no hang is counted and the temperature is aggregated
+        """
+        cfg = create_cpu_config(polling=0)
+        fc, _, _, mock_temp = _make_fc(mocker, cfg, count=6)
+        sp = SensorProcess(0.5)
+        mock_temp.side_effect = lambda i: float(sp.run_command(["sh", "-c", "sleep 0.15; echo 40"], 0,
+                                                               fc.name).stdout)
+        try:
+            sp.start([fc.name])
+            fc.sensor_process = sp
+            mock_temp.reset_mock()
+            start = time.monotonic()
+            assert asyncio.run(fc.get_temp_async()) == 40.0
+            assert time.monotonic() - start > sp.timeout
+            assert sp.hangs == 0
+            assert mock_temp.call_count == 6
+        finally:
+            sp.stop()
+
+    def test_get_temp_async_sensor_process_errors(self, mocker: MockerFixture) -> None:
+        """Negative unit test for FanController.get_temp_async() method with a sensor process. It contains the
+        following steps:
+        - build a FanController via _make_fc with 3 devices at 40C and a mocked sensor process
+        - let the second read fail with OSError
+        - ASSERT: the last value of the failed device is reused, every device is read
+        - let the first read raise SensorHangError
+        - ASSERT: SensorHangError is raised and the other devices are not read any more
+        """
+        cfg = create_cpu_config(polling=0, error_tolerance=3)
+        fc, _, _, mock_temp = _make_fc(mocker, cfg, count=3, temp_return=40.0)
+        fc.sensor_process = MagicMock()
+        mock_temp.reset_mock()
+        mock_temp.side_effect = [43.0, OSError("read error"), 43.0]
+        assert asyncio.run(fc.get_temp_async()) == pytest.approx(42.0)
+        assert mock_temp.call_count == 3
+        mock_temp.reset_mock()
+        mock_temp.side_effect = [SensorHangError("hung"), 40.0, 40.0]
+        with pytest.raises(SensorHangError):
+            asyncio.run(fc.get_temp_async())
+        assert mock_temp.call_count == 1
+
+    def test_poll_applies_safe_level_on_hang(self, mocker: MockerFixture) -> None:
+        """Negative unit test for FanController.poll() and poll_async() methods when a read hangs in the sensor
+        process. It contains the following steps:
+        - build a FanController via _make_fc (error_tolerance=3) and poll it once at 35C
+        - let _get_nth_temp() raise SensorHangError, call poll() and poll_async()
+        - ASSERT: the hang bypasses the error_tolerance budget: the highest level of the LUT (100%) is applied
+          once and last_temp is reset
+        - let the read succeed again at 35C
+        - ASSERT: the fan level of 35C is calculated again
+        """
+        cfg = create_cpu_config(steps=5, sensitivity=1, polling=0, min_temp=30, max_temp=50, min_level=35,
+                                max_level=100, error_tolerance=3)
+        my_fc, _, _, mock_temp = _make_fc(mocker, cfg, count=1, temp_return=35.0)
+        mock_set_fan_level = mocker.patch("smfc.FanController.set_fan_level")
+        my_fc.poll()
+        level = my_fc.last_level
+        mock_set_fan_level.reset_mock()
+        mock_temp.side_effect = SensorHangError("hung")
+        my_fc.poll()
+        asyncio.run(my_fc.poll_async())
+        mock_set_fan_level.assert_called_once_with(100)
+        assert my_fc.last_level == 100
+        assert my_fc.last_temp == 0.0
+        mock_temp.side_effect = None
+        my_fc.poll()
+        assert my_fc.last_level == level < 100
+
 
 # End.
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+#
+#   test_filters.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.filters module (temperature filters).
+#
+import json
+import pytest
+from smfc.config import Config
+from smfc.filters import EwmaFilter, KalmanFilter, MedianFilter, MovingAverageFilter, create_filter
+from .test_config_builders import create_cpu_config
+
+
+class TestMovingAverageFilter:
+    """Unit test class for smfc.MovingAverageFilter() class"""
+
+    def test_update(self) -> None:
+        """Positive unit test for MovingAverageFilter.update() method. It contains the following steps:
+        - feed 6 samples into a 3-sample moving average, then reset it
+        - ASSERT: the output is the average of the available samples (partially filled window) and of the last
+          3 samples (full window)
+        - ASSERT: the running sum matches the sum of the window, reset() drops the samples
+        """
+        f = MovingAverageFilter(3)
+        results = [f.update(t) for t in (30.0, 36.0, 33.0, 45.0, 30.0, 60.0)]
+        assert results == pytest.approx([30.0, 33.0, 33.0, 38.0, 36.0, 45.0])
+        assert f._sum == pytest.approx(sum(f.window))  # pylint: disable=protected-access
+        f.reset()
+        assert f.update(40.0) == 40.0
+
+    @pytest.mark.parametrize("window", [0, -1])
+    def test_init_n(self, window: int) -> None:
+        """Negative unit test for MovingAverageFilter.__init__() method. It contains the following steps:
+        - ASSERT: a window smaller than 1 raises ValueError
+        """
+        with pytest.raises(ValueError):
+            MovingAverageFilter(window)
+
+
+class TestEwmaFilter:
+    """Unit test class for smfc.EwmaFilter() class"""
+
+    def test_update(self) -> None:
+        """Positive unit test for EwmaFilter.update() method. It contains the following steps:
+        - feed samples into an EWMA filter with alpha=0.5, then reset it
+        - ASSERT: the first sample initializes the output, the next ones move it by alpha * (x - y)
+        """
+        f = EwmaFilter(0.5)
+        assert [f.update(t) for t in (40.0, 50.0, 50.0, 30.0)] == pytest.approx([40.0, 45.0, 47.5, 38.75])
+        f.reset()
+        assert f.update(60.0) == 60.0
+
+    @pytest.mark.parametrize("alpha", [0.0, -0.5, 1.5])
+    def test_init_n(self, alpha: float) -> None:
+        """Negative unit test for EwmaFilter.__init__() method. It contains the following steps:
+        - ASSERT: an alpha out of (0..1] raises ValueError
+        """
+        with pytest.raises(ValueError):
+            EwmaFilter(alpha)
+
+
+class TestMedianFilter:
+    """Unit test class for smfc.MedianFilter() class"""
+
+    @pytest.mark.parametrize("window, samples, expected", [
+        pytest.param(3, [40.0, 40.0, 90.0, 41.0, 42.0], [40.0, 40.0, 40.0, 41.0, 42.0], id="spike-rejected"),
+        pytest.param(4, [40.0, 44.0, 38.0, 50.0, 50.0], [40.0, 42.0, 40.0, 42.0, 47.0], id="even-window"),
+        pytest.param(1, [40.0, 90.0], [40.0, 90.0], id="disabled"),
+        pytest.param(3, [40.0, 40.0, 40.0, 40.0], [40.0, 40.0, 40.0, 40.0], id="duplicates"),
+    ])
+    def test_update(self, window: int, samples, expected) -> None:
+        """Positive unit test for MedianFilter.update() method. It contains the following steps:
+        - feed samples into a median filter
+        - ASSERT: the output is the median of the last `window` samples (the mean of the two middle samples in
+          case of an even number of samples), a single spike is rejected
+        - ASSERT: the sorted list holds the samples of the window
+        """
+        f = MedianFilter(window)
+        assert [f.update(t) for t in samples] == pytest.approx(expected)
+        assert f._sorted == sorted(f.window)  # pylint: disable=protected-access
+
+    def test_init_n(self) -> None:
+        """Negative unit test for MedianFilter.__init__() method. It contains the following steps:
+        - ASSERT: a window smaller than 1 raises ValueError
+        """
+        with pytest.raises(ValueError):
+            MedianFilter(0)
+
+
+class TestKalmanFilter:
+    """Unit test class for smfc.KalmanFilter() class"""
+
+    def test_update(self) -> None:
+        """Positive unit test for KalmanFilter.update() method. It contains the following steps:
+        - feed a noisy constant temperature (40C +/- 2C) into a Kalman filter, then a step to 50C
+        - ASSERT: the first sample initializes the estimate, the estimate converges to 40C with a decreasing
+          variance, and it follows the step gradually
+        """
+        f = KalmanFilter(0.05, 4.0)
+        assert f.update(42.0) == 42.0
+        for i in range(50):
+            f.update(40.0 + (2.0 if i % 2 else -2.0))
+        assert f.value == pytest.approx(40.0, abs=0.5)
+        assert f.variance < 4.0
+        first = f.update(50.0)
+        assert 40.0 < first < 45.0
+        for _ in range(100):
+            f.update(50.0)
+        assert f.value == pytest.approx(50.0, abs=0.1)
+        f.reset()
+        assert f.value is None and f.update(30.0) == 30.0
+
+    @pytest.mark.parametrize("process_noise, measurement_noise", [(0.0, 1.0), (0.1, 0.0), (-1.0, 1.0)])
+    def test_init_n(self, process_noise: float, measurement_noise: float) -> None:
+        """Negative unit test for KalmanFilter.__init__() method. It contains the following steps:
+        - ASSERT: a zero or negative noise raises ValueError
+        """
+        with pytest.raises(ValueError):
+            KalmanFilter(process_noise, measurement_noise)
+
+
+class TestFilterState:
+    """Unit test class for the state() and restore() methods of the temperature filters"""
+
+    @pytest.mark.parametrize("factory", [
+        pytest.param(lambda: MovingAverageFilter(3), id="sma"),
+        pytest.param(lambda: EwmaFilter(0.3), id="ewma"),
+        pytest.param(lambda: MedianFilter(3), id="median"),
+        pytest.param(lambda: KalmanFilter(0.05, 1.0), id="kalman"),
+    ])
+    def test_state_restore(self, factory) -> None:
+        """Positive unit test for state() and restore() methods. It contains the following steps:
+        - feed 4 samples into a filter, restore its state into a new filter, then feed the same sample into both
+        - ASSERT: the state is JSON serializable, the restored filter continues exactly like the original one
+        - ASSERT: the state of an empty filter restores an empty filter
+        """
+        f = factory()
+        for t in (40.0, 44.0, 41.0, 47.0):
+            f.update(t)
+        state = json.loads(json.dumps(f.state()))
+        g = factory()
+        g.restore(state)
+        assert g.update(45.0) == pytest.approx(f.update(45.0))
+        g.restore(factory().state())
+        assert g.update(30.0) == 30.0
+
+    @pytest.mark.parametrize("f", [MovingAverageFilter(3), EwmaFilter(0.3), MedianFilter(3), KalmanFilter(0.05, 1.0)],
+                             ids=["sma", "ewma", "median", "kalman"])
+    def test_restore_n(self, f) -> None:
+        """Negative unit test for restore() method. It contains the following steps:
+        - ASSERT: a state without the keys of the filter raises KeyError
+        """
+        with pytest.raises(KeyError):
+            f.restore({})
+
+
+class TestCreateFilter:
+    """Unit test class for smfc.create_filter() function"""
+
+    @pytest.mark.parametrize("temp_filter, cls", [
+        pytest.param(Config.FILTER_SMA, MovingAverageFilter, id="sma"),
+        pytest.param(Config.FILTER_EWMA, EwmaFilter, id="ewma"),
+        pytest.param(Config.FILTER_MEDIAN, MedianFilter, id="median"),
+        pytest.param(Config.FILTER_KALMAN, KalmanFilter, id="kalman"),
+    ])
+    def test_create_filter(self, temp_filter: str, cls) -> None:
+        """Positive unit test for create_filter() function. It contains the following steps:
+        - create the filter of a section with smoothing=5, ewma_alpha=0.2 and Kalman noises 0.1 and 3.0
+        - ASSERT: the filter class and its parameters match the section
+        """
+        cfg = create_cpu_config(smoothing=5, temp_filter=temp_filter, ewma_alpha=0.2, kalman_process_noise=0.1,
+                                kalman_measurement_noise=3.0)
+        f = create_filter(cfg)
+        assert isinstance(f, cls)
+        if cls in (MovingAverageFilter, MedianFilter):
+            assert f.window.maxlen == 5
+        elif cls is EwmaFilter:
+            assert f.alpha == 0.2
+        else:
+            assert (f.process_noise, f.measurement_noise) == (0.1, 3.0)
+
+    def test_create_filter_n(self) -> None:
+        """Negative unit test for create_filter() function. It contains the following steps:
+        - ASSERT: an unknown filter raises ValueError
+        """
+        with pytest.raises(ValueError):
+            create_filter(create_cpu_config(temp_filter="lowpass"))
+
+
+# End.
@@ -3,6 +3,7 @@
 #   test_gpufc.py (C) 2021-2026, Peter Sulyok
 #   Unit tests for smfc.GpuFc() class.
 #
+import asyncio
 import subprocess
 from typing import List
 import pytest
@@ -123,15 +124,17 @@ class TestGpuFc:
         - mock subprocess.run (MagicMock returning a CompletedProcess with stdout="40")
         - build a bare GpuFc via make_bare_gpu_fc() (no super().__init__())
         - call fc._exec_smi(smi_path, args) with the parametrized argument list
-        - ASSERT: subprocess.run is called with ([smi_path] + args, capture_output=True, check=False, text=True)
+        - ASSERT: subprocess.run is called with ([smi_path] + args, capture_output=True, check=False, text=True,
+          timeout=read_timeout)
         - ASSERT: subprocess.run is called exactly once
         """
-        fc = make_bare_gpu_fc()
+        fc = make_bare_gpu_fc(config=create_gpu_config())
         smi_path = "nvidia-smi"
         mock_run = MagicMock(return_value=subprocess.CompletedProcess([], returncode=0, stdout="40", stderr=""))
         mocker.patch("subprocess.run", mock_run)
         fc._exec_smi(smi_path, args)
-        mock_run.assert_called_with([smi_path] + args, capture_output=True, check=False, text=True)
+        mock_run.assert_called_with([smi_path] + args, capture_output=True, check=False, text=True,
+                                    timeout=fc.config.read_timeout)
         assert mock_run.call_count == 1
 
     def test_exec_smi_raises_on_missing_command(self):
@@ -141,7 +144,7 @@ class TestGpuFc:
         - call fc._exec_smi("/nonexistent/command", ["0", "1"])
         - ASSERT: FileNotFoundError is raised
         """
-        fc = make_bare_gpu_fc()
+        fc = make_bare_gpu_fc(config=create_gpu_config())
         with pytest.raises(FileNotFoundError):
             fc._exec_smi("/nonexistent/command", ["0", "1"])
 
@@ -179,6 +182,48 @@ class TestGpuFc:
         for i in range(count):
             assert fc._get_nth_temp(i) == temperatures[i] + offset
 
+    @pytest.mark.parametrize("gpu_type", ["nvidia", "amd"])
+    def test_get_nth_temp_async_shares_smi_call(self, td: TestData, gpu_type: str):
+        """Positive unit test for GpuFc._get_nth_temp_async() method. It contains the following steps:
+        - create a fake smi command (nvidia or rocm) for 3 GPUs that also counts its executions in a file
+        - build a bare GpuFc via make_bare_gpu_fc(config=...)
+        - read all GPUs concurrently in an event loop, then once more within the polling interval
+        - ASSERT: the temperatures are returned in the order of the GPU device ids
+        - ASSERT: the smi command was executed only once
+        """
+        temperatures = [41.0, 42.0, 43.0]
+        if gpu_type == "nvidia":
+            smi_cmd = td.create_nvidia_smi_command(3, temperatures)
+            cfg = create_gpu_config(gpu_type=gpu_type, gpu_device_ids=[0, 1, 2], polling=60, nvidia_smi_path=smi_cmd)
+        else:
+            smi_cmd = td.create_rocm_smi_command(3, temperatures)
+            cfg = create_gpu_config(gpu_type=gpu_type, gpu_device_ids=[0, 1, 2], polling=60, rocm_smi_path=smi_cmd)
+        with open(smi_cmd, "r", encoding="UTF-8") as f:
+            script = f.read()
+        with open(smi_cmd, "w", encoding="UTF-8") as f:
+            f.write(script.replace("#!/bin/bash\n", '#!/bin/bash\necho x >> "${0}.calls"\n', 1))
+        fc = make_bare_gpu_fc(config=cfg)
+
+        async def read_all():
+            first = await asyncio.gather(*(fc._get_nth_temp_async(i) for i in range(3)))
+            return first, await fc._get_nth_temp_async(2)
+
+        first, again = asyncio.run(read_all())
+        assert first == temperatures
+        assert again == 43.0
+        with open(smi_cmd + ".calls", "r", encoding="UTF-8") as f:
+            assert f.read().count("x") == 1
+
+    def test_get_nth_temp_async_raises_on_missing_command(self):
+        """Negative unit test for GpuFc._get_nth_temp_async() method. It contains the following steps:
+        - build a bare GpuFc via make_bare_gpu_fc(config=...) with a non-existent nvidia-smi path
+        - ASSERT: FileNotFoundError is raised and no SMI execution remains pending
+        """
+        fc = make_bare_gpu_fc(config=create_gpu_config(gpu_device_ids=[0], nvidia_smi_path="/nonexistent/command"))
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(fc._get_nth_temp_async(0))
+        assert fc._smi_pending is None
+
     @pytest.mark.parametrize(
         "stdout, gpu_device_ids, amd_temp",
         [
@@ -3,6 +3,7 @@
 #   test_hdfc.py (C) 2021-2026, Peter Sulyok
 #   Unit tests for smfc.HdFc() class.
 #
+import asyncio
 import errno
 import os
 import random
@@ -12,7 +13,7 @@ from typing import List, Any
 import pytest
 from mock import MagicMock
 from pytest_mock import MockerFixture
-from smfc import Log
+from smfc import Log, HdFc
 from smfc.config import Config
 from .test_config_builders import create_hd_config
 from .test_fixtures import TestData
@@ -140,6 +141,19 @@ class TestHdFc:
         with pytest.raises(ValueError):
             build_hd_fc(mocker, td, count=1, names=hd_names)
 
+    def test_resolve_hwmon_paths(self, mocker: MockerFixture, td: TestData):
+        """Positive unit test for HdFc.resolve_hwmon_paths() method. It contains the following steps:
+        - construct an HdFc with two disks via build_hd_fc
+        - replace the name of the second disk with one not found in the udev database
+        - mock smfc.FanController.get_hwmon_path to return a new hwmon path
+        - call resolve_hwmon_paths()
+        - ASSERT: the first disk gets the new hwmon path, the missing disk an empty string (no exception)
+        """
+        h = build_hd_fc(mocker, td, count=2)
+        h.fc.hd_device_names = [td.hd_name_list[0], "raise"]
+        mocker.patch("smfc.FanController.get_hwmon_path", MagicMock(return_value="/sys/class/hwmon/hwmon9/temp1"))
+        assert h.fc.resolve_hwmon_paths(MagicMock()) == ["/sys/class/hwmon/hwmon9/temp1", ""]
+
     # pylint: disable=protected-access
     @pytest.mark.parametrize(
         "args, sudo",
@@ -158,7 +172,7 @@ class TestHdFc:
         - build a bare HdFc via make_bare_hd_fc with smartctl_path="smartctl" and the parametrized sudo flag
         - invoke fc._exec_smartctl(args) with the parametrized smartctl arguments
         - ASSERT: subprocess.run is called with (["sudo"] if sudo else []) + [smartctl_path] + args plus
-          capture_output=True, check=False, text=True
+          capture_output=True, check=False, text=True and the configured read_timeout
         - ASSERT: subprocess.run is called exactly once
         """
         fc = make_bare_hd_fc(config=create_hd_config(smartctl_path="smartctl"), sudo=sudo)
@@ -166,7 +180,8 @@ class TestHdFc:
         mocker.patch("subprocess.run", mock_run)
         fc._exec_smartctl(args)
         expected_args = (["sudo"] if sudo else []) + [fc.config.smartctl_path] + args
-        mock_run.assert_called_with(expected_args, capture_output=True, check=False, text=True)
+        mock_run.assert_called_with(expected_args, capture_output=True, check=False, text=True,
+                                    timeout=fc.config.read_timeout)
         assert mock_run.call_count == 1
 
     @pytest.mark.parametrize(
@@ -403,6 +418,32 @@ class TestHdFc:
         assert h.fc.last_per_device_temps == [37.0]
         assert h.fc._temp_read_errors == [0]
 
+    def test_run_tolerates_smartctl_timeout(self, mocker: MockerFixture, td: TestData):
+        """Positive unit test for HdFc.run() method with a hung smartctl command. It contains the following steps:
+        - build an HdFc via build_hd_fc with one disk at 35C, error_tolerance=1 and a 0.2 sec read_timeout
+        - clear fc.hwmon_path so the smartctl branch of HdFc._get_nth_temp() is taken
+        - restore the real HdFc._exec_smartctl and mock smfc.HdFc._smartctl_args to execute `sleep 5`, so the
+          command never finishes within the deadline
+        - call HdFc.run() twice with the polling timer expired
+        - ASSERT: the first run() reuses the last known good 35C well before the command would finish
+        - ASSERT: the second run() raises TimeoutError (error tolerance budget exhausted)
+        """
+        exec_smartctl = HdFc._exec_smartctl
+        h = build_hd_fc(mocker, td, count=1, temps=[35], error_tolerance=1, polling=0, read_timeout=0.2)
+        mocker.patch("smfc.FanController.set_fan_level", MagicMock())
+        mocker.patch("smfc.HdFc._exec_smartctl", exec_smartctl)
+        mocker.patch("smfc.HdFc._smartctl_args", MagicMock(return_value=["sleep", "5"]))
+        h.fc.hwmon_path = [""]
+        h.fc.last_time = time.monotonic() - (h.cfg.polling + 1)
+        start = time.monotonic()
+        h.fc.run()
+        assert time.monotonic() - start < 4.0
+        assert h.fc.last_per_device_temps == [35.0]
+        assert h.fc._temp_read_errors == [1]
+        h.fc.last_time = time.monotonic() - (h.cfg.polling + 1)
+        with pytest.raises(TimeoutError):
+            h.fc.run()
+
     @pytest.mark.parametrize(
         "states, result",
         [
@@ -504,6 +545,28 @@ class TestHdFc:
         assert mock_exec.call_count == expected_calls
         assert fc.standby_array_states == [True] * 8
 
+    def test_standby_guard_tolerates_timeout(self, mocker: MockerFixture, td: TestData):
+        """Negative unit test for HdFc.check_standby_state() and go_standby_state() methods. It contains the
+        following steps:
+        - create two HD hwmon files via td.create_hd_data and build a bare HdFc via make_bare_hd_fc
+        - mock smfc.HdFc._exec_smartctl via mocker.patch: the first drive reports STANDBY, the second times out
+        - call fc.check_standby_state(), then fc.go_standby_state() with a timing out smartctl
+        - ASSERT: the hung drive is considered ACTIVE and only the first drive is counted in STANDBY
+        - ASSERT: go_standby_state() does not raise and leaves the hung drive in ACTIVE state
+        """
+        td.create_hd_data(2)
+        log = Log(Log.LOG_ERROR, Log.LOG_STDOUT)
+        mocker.patch("builtins.print", MagicMock())
+        fc = make_bare_hd_fc(count=2, hd_device_names=td.hd_name_list, hwmon_path=[""] * 2,
+                             standby_array_states=[False] * 2, log=log)
+        standby = subprocess.CompletedProcess([], returncode=0, stdout="Device is in STANDBY mode, exit(2)\n")
+        mocker.patch("smfc.HdFc._exec_smartctl", MagicMock(side_effect=[standby, TimeoutError("timed out")]))
+        assert fc.check_standby_state() == 1
+        assert fc.standby_array_states == [True, False]
+        mocker.patch("smfc.HdFc._exec_smartctl", MagicMock(side_effect=TimeoutError("timed out")))
+        fc.go_standby_state()
+        assert fc.standby_array_states == [True, False]
+
     @pytest.mark.parametrize(
         "old_state, states, new_state",
         [
@@ -558,6 +621,42 @@ class TestHdFc:
         fc = make_bare_hd_fc(hwmon_path=[""], hd_device_names=["/dev/sda"], log=log)
         assert fc._get_nth_temp(0) == 37.0
 
+    def test_get_nth_temp_async_reads_smartctl(self, td: TestData):
+        """Positive unit test for HdFc._get_nth_temp_async() method. It contains the following steps:
+        - mock nothing in-process; uses a real on-disk smartctl fake command printing an SCSI temperature line
+        - build a bare HdFc via make_bare_hd_fc with two disks: one with a HWMON file, one with the smartctl fallback
+        - read both disks concurrently in an event loop
+        - ASSERT: the HWMON disk returns its file value, the smartctl disk returns the parsed 37.0C
+        """
+        td.create_hd_data(1, [45.0])
+        cmd = td.create_command_file('echo "Current Drive Temperature:     37 C"')
+        fc = make_bare_hd_fc(config=create_hd_config(smartctl_path=cmd), hwmon_path=[td.hd_files[0], ""],
+                             hd_device_names=["/dev/sda", "/dev/sdb"], log=Log(Log.LOG_DEBUG, Log.LOG_STDOUT))
+
+        async def read_all():
+            return await asyncio.gather(fc._get_nth_temp_async(0), fc._get_nth_temp_async(1))
+
+        assert asyncio.run(read_all()) == [45.0, 37.0]
+
+    @pytest.mark.parametrize(
+        "content, exception",
+        [
+            pytest.param(None, FileNotFoundError, id="missing-command"),
+            pytest.param('echo "Temperature Warning:  Enabled"', ValueError, id="no-temperature"),
+        ],
+    )
+    def test_get_nth_temp_async_raises_on_smartctl_errors(self, td: TestData, content: str, exception: Any):
+        """Negative unit test for HdFc._get_nth_temp_async() method. It contains the following steps:
+        - create a fake smartctl command with the parametrized content (or use a non-existent path)
+        - build a bare HdFc via make_bare_hd_fc with the smartctl fallback
+        - ASSERT: the read raises the expected exception type, like _get_nth_temp()
+        """
+        cmd = td.create_command_file(content) if content else "/nonexistent/smartctl"
+        fc = make_bare_hd_fc(config=create_hd_config(smartctl_path=cmd), hwmon_path=[""],
+                             hd_device_names=["/dev/sda"], log=Log(Log.LOG_INFO, Log.LOG_STDOUT))
+        with pytest.raises(exception):
+            asyncio.run(fc._get_nth_temp_async(0))
+
     # pylint: enable=protected-access
 
 
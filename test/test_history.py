@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+#
+#   test_history.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.history module (in-memory time-series history).
+#
+import json
+import threading
+import pytest
+from smfc import clock
+from smfc.clock import VirtualClock
+from smfc.history import BUCKET_FIELDS, History, RAW_FIELDS, RingBuffer, SeriesHistory, TIER_RESOLUTIONS
+
+
+def _snapshot(time: float, cpu: float, level: int) -> dict:
+    """Return a minimal snapshot with a CPU controller (one device), a CONST controller and an IPMI zone."""
+    return {"generated_at": time,
+            "fan_controllers": [
+                {"section": "CPU", "type": "cpu", "last_temp_c": cpu,
+                 "devices": [{"name": "cpu0", "temp_c": cpu + 1.0}]},
+                {"section": "CONST", "type": "const", "last_temp_c": 0.0, "devices": []}],
+            "zones": {"0": {"applied_level_pct": level}}}
+
+
+class TestRingBuffer:
+    """Unit test class for smfc.history.RingBuffer() class"""
+
+    def test_append(self) -> None:
+        """Positive unit test for RingBuffer.append(), points() and oldest() methods. It contains the following
+        steps:
+        - append 5 points (time, value) to a ring buffer of 3 points
+        - ASSERT: the buffer is full, it keeps the last 3 points in chronological order
+        - ASSERT: points() returns the points after since, a point covers its resolution
+        """
+        rb = RingBuffer(3, 2)
+        assert rb.oldest() is None and not rb.full()
+        for t in range(5):
+            rb.append(float(t), t * 10.0)
+        assert rb.full() and rb.count == 3
+        assert rb.oldest() == 2.0
+        assert rb.points(0.0) == [[2.0, 20.0], [3.0, 30.0], [4.0, 40.0]]
+        assert rb.points(3.0) == [[4.0, 40.0]]
+        assert rb.points(3.0, resolution=1.0) == [[3.0, 30.0], [4.0, 40.0]]
+
+    @pytest.mark.parametrize("size, fields", [(0, 2), (3, 0)], ids=["size", "fields"])
+    def test_init_n(self, size: int, fields: int) -> None:
+        """Negative unit test for RingBuffer.__init__() method. It contains the following steps:
+        - ASSERT: a non-positive size or number of fields raises ValueError
+        """
+        with pytest.raises(ValueError):
+            RingBuffer(size, fields)
+
+
+class TestSeriesHistory:
+    """Unit test class for smfc.history.SeriesHistory() class"""
+
+    def test_downsampling(self) -> None:
+        """Positive unit test for SeriesHistory.add() and query() methods. It contains the following steps:
+        - add a sample every 10 sec for 2 hours (values 0, 1, 2, ...) to a history of 100 points per tier
+        - ASSERT: the raw tier serves a time range inside the last 100 samples
+        - ASSERT: the 1 minute tier serves an older time range, its buckets hold the average, minimum and maximum
+          of 6 samples, the open bucket is included
+        - ASSERT: the 15 minute tier serves a time range older than the 1 minute tier
+        """
+        s = SeriesHistory(100)
+        for i in range(720):
+            s.add(i * 10.0, float(i))
+        raw = s.query(7000.0)
+        assert raw["resolution"] == TIER_RESOLUTIONS[0] and raw["fields"] == list(RAW_FIELDS)
+        assert raw["points"][0] == [7010.0, 701.0] and len(raw["points"]) == 19
+        minute = s.query(3000.0)
+        assert minute["resolution"] == 60.0 and minute["fields"] == list(BUCKET_FIELDS)
+        assert minute["points"][0] == [3000.0, 302.5, 300.0, 305.0]
+        assert minute["points"][-1] == [7140.0, 716.5, 714.0, 719.0]
+        coarse = s.query(0.0)
+        assert coarse["resolution"] == 900.0
+        assert coarse["points"][0] == [0.0, 44.5, 0.0, 89.0] and len(coarse["points"]) == 8
+
+    def test_memory(self) -> None:
+        """Positive unit test for SeriesHistory.memory() method. It contains the following steps:
+        - ASSERT: the memory of a series is the size of its raw (2 fields) and bucket (4 fields) ring buffers
+        """
+        assert SeriesHistory.memory(720) == 8 * 720 * (2 + 4 * 2)
+
+
+class TestHistory:
+    """Unit test class for smfc.history.History() class"""
+
+    def test_record(self) -> None:
+        """Positive unit test for History.record(), names() and query() methods. It contains the following steps:
+        - record 3 snapshots
+        - ASSERT: the series of the controller temperature, the device temperature and the zone level are created,
+          the CONST controller has no temperature series
+        - ASSERT: a query returns the selected series (all series without names), it is JSON serializable
+        """
+        h = History(10)
+        for t in range(3):
+            h.record(_snapshot(100.0 + t, 40.0 + t, 30 + t))
+        assert h.names() == ["temp/CPU", "temp/CPU/cpu0", "level/0"]
+        result = h.query(["temp/CPU/cpu0"], 100.5)
+        assert result == {"version": 1, "since": 100.5,
+                          "series": {"temp/CPU/cpu0": {"resolution": 0.0, "fields": ["time", "value"],
+                                                       "points": [[101.0, 42.0], [102.0, 43.0]]}}}
+        assert list(h.query([])["series"]) == h.names()
+        assert h.query(["level/0"])["series"]["level/0"]["points"][-1] == [102.0, 32.0]
+        assert json.loads(json.dumps(result)) == result
+
+    def test_record_not_polled(self) -> None:
+        """Positive unit test for History.record() method with controllers without temperature. It contains the
+        following steps:
+        - record a startup snapshot (the CPU controller has not polled yet: 0 C, no zone level), then 2 snapshots
+        - ASSERT: the temperature series start with the first polled sample, no 0 C sample is recorded
+        - ASSERT: the 1 minute bucket is not dragged down by the startup snapshot
+        """
+        h = History(10)
+        startup = _snapshot(100.0, 0.0, 0)
+        startup["fan_controllers"][0]["devices"][0]["temp_c"] = 0.0
+        startup["zones"] = {}
+        h.record(startup)
+        assert not h.names()
+        h.record(_snapshot(101.0, 40.0, 30))
+        h.record(_snapshot(102.0, 42.0, 35))
+        assert h.query(["temp/CPU"])["series"]["temp/CPU"]["points"] == [[101.0, 40.0], [102.0, 42.0]]
+        assert h.query(["temp/CPU/cpu0"])["series"]["temp/CPU/cpu0"]["points"][0] == [101.0, 41.0]
+        assert h.query(["level/0"])["series"]["level/0"]["points"][0] == [101.0, 30.0]
+        assert h._series["temp/CPU"].tiers[0].points(0.0) == [[60.0, 41.0, 40.0, 42.0]]  # pylint: disable=protected-access
+
+    def test_record_layout_changed(self) -> None:
+        """Positive unit test for History.record() method when the series of the snapshots change. It contains the
+        following steps:
+        - record 2 snapshots, then a snapshot where the CPU section is renamed to CPU:1 (zone 1 instead of zone 0)
+          and its device has no temperature yet
+        - ASSERT: the series of CPU, its device and zone 0 are dropped, the new series are created
+        - record a snapshot with the device temperature
+        - ASSERT: the device series of CPU:1 is created
+        """
+        h = History(10)
+        h.record(_snapshot(100.0, 40.0, 30))
+        h.record(_snapshot(101.0, 41.0, 30))
+        renamed = _snapshot(102.0, 42.0, 35)
+        renamed["fan_controllers"][0]["section"] = "CPU:1"
+        renamed["fan_controllers"][0]["devices"][0]["temp_c"] = 0.0
+        renamed["zones"] = {"1": renamed["zones"]["0"]}
+        h.record(renamed)
+        assert h.names() == ["temp/CPU:1", "level/1"]
+        renamed["generated_at"] = 103.0
+        renamed["fan_controllers"][0]["devices"][0]["temp_c"] = 43.0
+        h.record(renamed)
+        assert h.names() == ["temp/CPU:1", "level/1", "temp/CPU:1/cpu0"]
+        assert h.query(["temp/CPU:1"])["series"]["temp/CPU:1"]["points"] == [[102.0, 42.0], [103.0, 42.0]]
+
+    def test_query_relative(self) -> None:
+        """Positive unit test for History.query() method. It contains the following steps:
+        - install a virtual clock at Unix time 1000, record snapshots at 900, 950 and 990
+        - ASSERT: a negative since is relative to the current time
+        """
+        previous = clock.get_clock()
+        clock.set_clock(VirtualClock(epoch=1000.0))
+        try:
+            h = History(10)
+            for t in (900.0, 950.0, 990.0):
+                h.record(_snapshot(t, 40.0, 30))
+            result = h.query(["temp/CPU"], -60.0)
+        finally:
+            clock.set_clock(previous)
+        assert result["since"] == 940.0
+        assert [p[0] for p in result["series"]["temp/CPU"]["points"]] == [950.0, 990.0]
+
+    def test_query_n(self) -> None:
+        """Negative unit test for History.__init__() and query() methods. It contains the following steps:
+        - ASSERT: a non-positive size raises ValueError
+        - ASSERT: an unknown series name raises KeyError
+        """
+        with pytest.raises(ValueError):
+            History(0)
+        h = History(10)
+        h.record(_snapshot(100.0, 40.0, 30))
+        with pytest.raises(KeyError):
+            h.query(["temp/CPU", "temp/HD"])
+
+    def test_concurrent_query(self) -> None:
+        """Positive unit test for History class. It contains the following steps:
+        - record 2000 snapshots in the main thread while 4 threads query the history
+        - ASSERT: every query returns the points of the series in chronological order
+        """
+        h = History(50)
+        h.record(_snapshot(0.0, 40.0, 30))
+        errors = []
+        done = threading.Event()
+
+        def reader() -> None:
+            while not done.is_set():
+                points = h.query(["temp/CPU"])["series"]["temp/CPU"]["points"]
+                times = [p[0] for p in points]
+                if times != sorted(times):
+                    errors.append(times)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for t in range(1, 2000):
+            h.record(_snapshot(float(t), 40.0, 30))
+        done.set()
+        for thread in threads:
+            thread.join()
+        assert not errors
+
+
+# End.
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+#
+#   test_hotplug.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.HotplugMonitor() class.
+#
+# pylint: disable=protected-access
+import pytest
+from mock import MagicMock
+from pytest_mock import MockerFixture
+from smfc import Log, FanController, ConstFc
+from smfc.hotplug import HotplugMonitor
+
+
+def _make_fc(changed: bool = True, error: Exception = None) -> MagicMock:
+    """Build a fake FanController whose refresh_hwmon_paths() reports a change, no change or raises."""
+    fc = MagicMock(spec=FanController)
+    fc.name = "HD"
+    fc.refresh_hwmon_paths.return_value = changed
+    if error is not None:
+        fc.refresh_hwmon_paths.side_effect = error
+    return fc
+
+
+class TestHotplugMonitor:
+    """Unit test class for smfc.HotplugMonitor() class"""
+
+    def test_start_stop(self, mocker: MockerFixture) -> None:
+        """Positive unit test for HotplugMonitor.start() and stop() methods. It contains the following steps:
+        - mock print(), pyudev.Monitor.from_netlink() and pyudev.MonitorObserver
+        - create a HotplugMonitor and call start()
+        - ASSERT: the monitor is filtered to the hwmon and block subsystems
+        - ASSERT: the observer thread is a daemon, started once, and calls _handle_event()
+        - call stop() twice
+        - ASSERT: the observer thread is stopped only once
+        """
+        mocker.patch("builtins.print", MagicMock())
+        monitor = MagicMock()
+        mocker.patch("smfc.hotplug.Monitor.from_netlink", MagicMock(return_value=monitor))
+        observer = MagicMock()
+        observer_cls = MagicMock(return_value=observer)
+        mocker.patch("smfc.hotplug.MonitorObserver", observer_cls)
+        hm = HotplugMonitor(Log(Log.LOG_INFO, Log.LOG_STDOUT), MagicMock(), [])
+        hm.start()
+        assert [c.args[0] for c in monitor.filter_by.call_args_list] == ["hwmon", "block"]
+        assert observer_cls.call_args.kwargs["callback"] == hm._handle_event  # pylint: disable=comparison-with-callable
+        assert observer.daemon is True
+        observer.start.assert_called_once()
+        hm.stop()
+        hm.stop()
+        observer.stop.assert_called_once()
+
+    def test_start_error(self, mocker: MockerFixture) -> None:
+        """Negative unit test for HotplugMonitor.start() method. It contains the following steps:
+        - mock pyudev.Monitor.from_netlink() to raise OSError (e.g. no netlink permission)
+        - ASSERT: start() raises OSError and stop() is a no-op afterwards
+        """
+        mocker.patch("smfc.hotplug.Monitor.from_netlink", MagicMock(side_effect=OSError("permission denied")))
+        hm = HotplugMonitor(Log(Log.LOG_NONE, Log.LOG_STDOUT), MagicMock(), [])
+        with pytest.raises(OSError):
+            hm.start()
+        hm.stop()
+
+    @pytest.mark.parametrize("action, events, refreshes", [
+        ("add", 1, 1),
+        ("remove", 1, 1),
+        ("change", 1, 1),
+        ("bind", 0, 0),
+        ("move", 0, 0),
+    ])
+    def test_handle_event(self, mocker: MockerFixture, action: str, events: int, refreshes: int) -> None:
+        """Positive unit test for HotplugMonitor._handle_event() method. It contains the following steps:
+        - mock print() and create a HotplugMonitor with one fan controller
+        - call _handle_event() with a udev device of the given action
+        - ASSERT: only add/remove/change events are counted and trigger a refresh of the hwmon paths
+        """
+        mocker.patch("builtins.print", MagicMock())
+        fc = _make_fc()
+        hm = HotplugMonitor(Log(Log.LOG_DEBUG, Log.LOG_STDOUT), MagicMock(), [fc])
+        device = MagicMock(action=action, subsystem="hwmon", sys_path="/sys/devices/hwmon/hwmon5")
+        hm._handle_event(device)
+        assert hm.events == events
+        assert hm.refreshes == refreshes
+        assert fc.refresh_hwmon_paths.call_count == refreshes
+
+    def test_refresh(self, mocker: MockerFixture) -> None:
+        """Positive/negative unit test for HotplugMonitor.refresh() method. It contains the following steps:
+        - mock print() and create a HotplugMonitor with a changed, an unchanged, a failing and a CONST controller
+        - call refresh()
+        - ASSERT: every FanController is refreshed with the udev context, the CONST controller is skipped
+        - ASSERT: the exception of the failing controller is logged and only the changed controller is counted
+        """
+        mock_print = MagicMock()
+        mocker.patch("builtins.print", mock_print)
+        udevc = MagicMock()
+        changed, unchanged, failing = _make_fc(True), _make_fc(False), _make_fc(error=ValueError("udev error"))
+        const = MagicMock(spec=ConstFc)
+        hm = HotplugMonitor(Log(Log.LOG_ERROR, Log.LOG_STDOUT), udevc, [changed, const, unchanged, failing])
+        assert hm.refresh() == 1
+        for fc in (changed, unchanged, failing):
+            fc.refresh_hwmon_paths.assert_called_once_with(udevc)
+        assert hm.refreshes == 1
+        assert "cannot refresh hwmon paths" in mock_print.call_args.args[0]
+
+
+    def test_refresh_rebuilds_hwmon_index(self, mocker: MockerFixture) -> None:
+        """Positive/negative unit test for HotplugMonitor.refresh() method with a shared hwmon index. It contains the
+        following steps:
+        - mock print() and create a HotplugMonitor with a hwmon index and one fan controller
+        - call refresh()
+        - ASSERT: the hwmon index is rebuilt once before the controller is refreshed
+        - make the rebuild raise and call refresh() again
+        - ASSERT: the error is logged and no controller is refreshed
+        """
+        mock_print = MagicMock()
+        mocker.patch("builtins.print", mock_print)
+        order = MagicMock()
+        fc = _make_fc()
+        order.attach_mock(fc.refresh_hwmon_paths, "refresh")
+        index = MagicMock()
+        order.attach_mock(index.rebuild, "rebuild")
+        hm = HotplugMonitor(Log(Log.LOG_ERROR, Log.LOG_STDOUT), MagicMock(), [fc], index)
+        assert hm.refresh() == 1
+        assert [c[0] for c in order.mock_calls] == ["rebuild", "refresh"]
+        index.rebuild.side_effect = OSError("udev error")
+        assert hm.refresh() == 0
+        assert fc.refresh_hwmon_paths.call_count == 1
+        assert "Cannot rebuild the hwmon index" in mock_print.call_args.args[0]
+
+
+# End.
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+#   test_hwmon.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.HwmonIndex() class.
+#
+# pylint: disable=protected-access
+import pytest
+from mock import MagicMock
+from smfc import FanController
+from smfc.hwmon import HwmonIndex
+
+# hwmon devices of a typical host: 2 CPU packages, 2 SATA disks behind one AHCI controller, 1 NVMe drive.
+HWMON_DEVICES = [
+    "/sys/devices/platform/coretemp.0/hwmon/hwmon1",
+    "/sys/devices/platform/coretemp.1/hwmon/hwmon2",
+    "/sys/devices/pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0/hwmon/hwmon3",
+    "/sys/devices/pci0000:00/0000:00:17.0/ata2/host1/target1:0:0/1:0:0:0/hwmon/hwmon4",
+    "/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/hwmon5",
+]
+
+
+def _make_udevc(sys_paths=None) -> MagicMock:
+    """Build a fake pyudev Context whose list_devices(subsystem="hwmon") returns the given hwmon devices."""
+    udevc = MagicMock()
+    udevc.list_devices.return_value = [MagicMock(sys_path=p) for p in (sys_paths or HWMON_DEVICES)]
+    return udevc
+
+
+class TestHwmonIndex:
+    """Unit test class for smfc.HwmonIndex() class"""
+
+    @pytest.mark.parametrize(
+        "parent, result",
+        [
+            pytest.param("/sys/devices/platform/coretemp.0",
+                         "/sys/devices/platform/coretemp.0/hwmon/hwmon1/temp1_input", id="cpu-package"),
+            pytest.param("/sys/devices/pci0000:00/0000:00:17.0/ata2/host1/target1:0:0/1:0:0:0",
+                         "/sys/devices/pci0000:00/0000:00:17.0/ata2/host1/target1:0:0/1:0:0:0/hwmon/hwmon4/temp1_input",
+                         id="sata-disk"),
+            pytest.param("/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0",
+                         "/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/hwmon5/temp1_input",
+                         id="nvme-drive"),
+            pytest.param("/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/hwmon5",
+                         "/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/hwmon5/temp1_input",
+                         id="hwmon-itself"),
+            pytest.param("/sys/devices/pci0000:00/0000:00:17.0", "", id="multiple-hwmon"),
+            pytest.param("/sys/devices/pci0000:00/0000:00:18.0/host5/target5:0:0/5:0:0:0", "", id="sas-no-hwmon"),
+        ],
+    )
+    def test_get_hwmon_path(self, parent: str, result: str) -> None:
+        """Positive unit test for HwmonIndex.get_hwmon_path() method. It contains the following steps:
+        - mock a pyudev Context listing five hwmon devices (via _make_udevc)
+        - look up the hwmon path of the parametrized parent device
+        - ASSERT: the path of the single hwmon device of the parent's subtree is returned, or an empty string if
+          there is none or more than one (same contract as FanController.get_hwmon_path())
+        """
+        index = HwmonIndex(_make_udevc())
+        assert index.get_hwmon_path(MagicMock(sys_path=parent)) == result
+
+    def test_single_enumeration(self) -> None:
+        """Positive unit test for HwmonIndex lazy build. It contains the following steps:
+        - create a HwmonIndex with a mocked pyudev Context
+        - ASSERT: no udev enumeration happens at construction time
+        - look up the hwmon path of every device
+        - ASSERT: the hwmon subsystem was enumerated exactly once
+        - call rebuild() with a changed device list
+        - ASSERT: the second enumeration is used for the next lookup
+        """
+        udevc = _make_udevc()
+        index = HwmonIndex(udevc)
+        udevc.list_devices.assert_not_called()
+        for path in HWMON_DEVICES:
+            assert index.get_hwmon_path(MagicMock(sys_path=path)) == path + "/temp1_input"
+        udevc.list_devices.assert_called_once_with(subsystem="hwmon")
+        udevc.list_devices.return_value = [MagicMock(sys_path="/sys/devices/platform/coretemp.0/hwmon/hwmon9")]
+        index.rebuild()
+        assert index.get_hwmon_path(MagicMock(sys_path="/sys/devices/platform/coretemp.0")) == \
+            "/sys/devices/platform/coretemp.0/hwmon/hwmon9/temp1_input"
+        assert udevc.list_devices.call_count == 2
+
+    def test_fan_controller_uses_index(self) -> None:
+        """Positive unit test for FanController.get_hwmon_path() method with a hwmon index. It contains the
+        following steps:
+        - create a HwmonIndex with a mocked pyudev Context
+        - call FanController.get_hwmon_path() with the index for a disk device
+        - ASSERT: the path comes from the index and no per-device udev query is issued
+        """
+        udevc = _make_udevc()
+        index = HwmonIndex(udevc)
+        parent = MagicMock(sys_path="/sys/devices/pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0")
+        assert FanController.get_hwmon_path(udevc, parent, index) == HWMON_DEVICES[2] + "/temp1_input"
+        udevc.list_devices.assert_called_once_with(subsystem="hwmon")
+
+
+# End.
@@ -47,8 +47,8 @@ SDR_NOTREADY_OUTPUT = (
 def _make_bare_ipmi(mocker: MockerFixture, mock_ipmi_exec: MagicMock, **cfg_kwargs) -> Ipmi:
     """Build a bare Ipmi instance (no __init__) wired with the given exec mock and a default config.
 
-    Removes the repeated `Ipmi.__new__(Ipmi) / .platform = / .config = / .sudo =` boilerplate that appears in
-    nearly every non-init test below. `_exec_ipmitool` is patched at class level so any path through Ipmi
+    Removes the repeated `Ipmi.__new__(Ipmi) / .platform = / .config = / .sudo = / .zone_writes =` boilerplate that
+    appears in nearly every non-init test below. `_exec_ipmitool` is patched at class level so any path through Ipmi
     routes to the supplied mock; `platform` is wired to a real GenericPlatform that uses the same mock for
     its own exec calls.
     """
@@ -57,6 +57,7 @@ def _make_bare_ipmi(mocker: MockerFixture, mock_ipmi_exec: MagicMock, **cfg_kwar
     ipmi.platform = GenericPlatform("test", mock_ipmi_exec)
     ipmi.config = create_ipmi_config(**cfg_kwargs)
     ipmi.sudo = False
+    ipmi.zone_writes = {}
     return ipmi
 
 
@@ -81,7 +82,7 @@ class TestIpmi:
         - ASSERT: config.fan_mode_delay equals mode_delay
         - ASSERT: config.fan_level_delay equals level_delay
         - ASSERT: config.remote_parameters equals remote_pars
-        - ASSERT: print was called exactly 12 times (Ipmi-12 init messages)
+        - ASSERT: print was called exactly 14 times (Ipmi-14 init messages)
         - ASSERT: sudo attribute equals the sudo argument
         - ASSERT: bmc_device_id, bmc_device_rev, bmc_firmware_rev, bmc_ipmi_version, bmc_manufacturer_id,
           bmc_manufacturer_name, bmc_product_id, bmc_product_name are parsed from BMC_INFO_OUTPUT
@@ -103,7 +104,7 @@ class TestIpmi:
         assert my_ipmi.config.fan_mode_delay == mode_delay
         assert my_ipmi.config.fan_level_delay == level_delay
         assert my_ipmi.config.remote_parameters == remote_pars
-        assert mock_print.call_count == 13  # Ipmi-13
+        assert mock_print.call_count == 14  # Ipmi-14
         assert my_ipmi.sudo == sudo
         assert my_ipmi.bmc_device_id == 32
         assert my_ipmi.bmc_device_rev == 1
@@ -201,7 +202,7 @@ class TestIpmi:
         - build a bare Ipmi via Ipmi.__new__ with create_ipmi_config(command, remote_parameters) and sudo flag
         - call Ipmi._exec_ipmitool(args)
         - ASSERT: subprocess.run was called with the expected argv (optional 'sudo', command, remote args, args)
-          plus check=False, capture_output=True, text=True
+          plus check=False, capture_output=True, text=True and the configured command_timeout
         - ASSERT: subprocess.run was called exactly once
         """
         expected: List[str]  # Expected argument list.
@@ -222,7 +223,8 @@ class TestIpmi:
         if remote_args:
             expected.extend(remote_args.split())
         expected.extend(args)
-        mock_subprocess_run.assert_called_with(expected, check=False, capture_output=True, text=True)
+        mock_subprocess_run.assert_called_with(expected, check=False, capture_output=True, text=True,
+                                               timeout=my_ipmi.config.command_timeout)
         assert mock_subprocess_run.call_count == 1
 
     @pytest.mark.parametrize(
@@ -259,6 +261,23 @@ class TestIpmi:
             my_ipmi._exec_ipmitool(["1", "2", "3"])
         assert cm.type == exception
 
+    def test_exec_ipmitool_raises_on_timeout(self, mocker: MockerFixture) -> None:
+        """Negative unit test for Ipmi.exec_ipmitool() method. It contains the following steps:
+        - mock subprocess.run to raise subprocess.TimeoutExpired (hung ipmitool, e.g. unresponsive BMC)
+        - build a bare Ipmi via Ipmi.__new__ with create_ipmi_config(command_timeout=5)
+        - call Ipmi._exec_ipmitool(["1", "2", "3"]) inside pytest.raises
+        - ASSERT: RuntimeError is raised with an 'ipmitool timed out' message
+        - ASSERT: subprocess.run was called with timeout=5
+        """
+        mock_subprocess_run = MagicMock(side_effect=subprocess.TimeoutExpired(["ipmitool"], 5))
+        mocker.patch("subprocess.run", mock_subprocess_run)
+        my_ipmi = Ipmi.__new__(Ipmi)
+        my_ipmi.config = create_ipmi_config(command_timeout=5)
+        my_ipmi.sudo = False
+        with pytest.raises(RuntimeError, match="ipmitool timed out"):
+            my_ipmi._exec_ipmitool(["1", "2", "3"])
+        assert mock_subprocess_run.call_args.kwargs["timeout"] == 5
+
     # pylint: enable=duplicate-code, protected-access
 
     @pytest.mark.parametrize(
@@ -395,6 +414,7 @@ class TestIpmi:
         - ASSERT: _exec_ipmitool was called exactly once
         - ASSERT: time.sleep was called with config.fan_level_delay
         - ASSERT: time.sleep was called exactly once
+        - ASSERT: the write is counted in zone_writes
         """
         mock_ipmi_exec = MagicMock()
         my_ipmi = _make_bare_ipmi(mocker, mock_ipmi_exec, fan_level_delay=0)
@@ -407,6 +427,7 @@ class TestIpmi:
         assert mock_ipmi_exec.call_count == 1
         mock_time_sleep.assert_called_with(my_ipmi.config.fan_level_delay)
         assert mock_time_sleep.call_count == 1
+        assert my_ipmi.zone_writes == {zone: 1}
 
     @pytest.mark.parametrize(
         "zone, level",
@@ -450,6 +471,7 @@ class TestIpmi:
         - ASSERT: _exec_ipmitool was called exactly len(zones) times
         - ASSERT: time.sleep was called with config.fan_level_delay
         - ASSERT: time.sleep was called exactly once (regardless of zone count)
+        - ASSERT: one write is counted in zone_writes for every zone, an invalid level is not counted
         """
         mock_ipmi_exec = MagicMock()
         my_ipmi = _make_bare_ipmi(mocker, mock_ipmi_exec, fan_level_delay=0)
@@ -465,6 +487,10 @@ class TestIpmi:
         assert mock_ipmi_exec.call_count == len(zones)
         mock_time_sleep.assert_called_with(my_ipmi.config.fan_level_delay)
         assert mock_time_sleep.call_count == 1
+        assert my_ipmi.zone_writes == {z: 1 for z in zones}
+        with pytest.raises(ValueError):
+            my_ipmi.set_multiple_fan_levels(zones, 101)
+        assert my_ipmi.zone_writes == {z: 1 for z in zones}
 
     @pytest.mark.parametrize(
         "zones, level",
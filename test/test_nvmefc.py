@@ -6,6 +6,7 @@
 import os
 from typing import List
 import pytest
+from mock import MagicMock
 from pytest_mock import MockerFixture
 from smfc.config import Config
 from .test_fixtures import TestData
@@ -114,6 +115,19 @@ class TestNvmeFc:
         with pytest.raises(ValueError):
             build_nvme_fc(mocker, td, count=1, hwmon="empty")
 
+    def test_resolve_hwmon_paths(self, mocker: MockerFixture, td: TestData):
+        """Positive unit test for NvmeFc.resolve_hwmon_paths() method. It contains the following steps:
+        - construct an NvmeFc with two devices via build_nvme_fc
+        - replace the name of the second device with one not found in the udev database
+        - mock smfc.FanController.get_hwmon_path to return a new hwmon path
+        - call resolve_hwmon_paths()
+        - ASSERT: the first device gets the new hwmon path, the missing device an empty string (no exception)
+        """
+        h = build_nvme_fc(mocker, td, count=2)
+        h.fc.nvme_device_names = [td.nvme_name_list[0], "raise"]
+        mocker.patch("smfc.FanController.get_hwmon_path", MagicMock(return_value="/sys/class/hwmon/hwmon9/temp1"))
+        assert h.fc.resolve_hwmon_paths(MagicMock()) == ["/sys/class/hwmon/hwmon9/temp1", ""]
+
     # pylint: disable=protected-access
     @pytest.mark.parametrize(
         "count, temperatures",
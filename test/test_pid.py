@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+#
+#   test_pid.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.PidController() class.
+#
+import pytest
+from smfc.pid import PidController
+
+
+class TestPidController:
+    """Unit test class for smfc.PidController() class"""
+
+    def test_init(self) -> None:
+        """Positive unit test for PidController.__init__() method. It contains the following steps:
+        - create a PID controller
+        - ASSERT: the parameters are stored, the integral term starts from the minimum output
+        """
+        pid = PidController(45.0, 4.0, 0.1, 2.0, 5.0, 35, 100)
+        assert (pid.target, pid.kp, pid.ki, pid.kd, pid.d_filter) == (45.0, 4.0, 0.1, 2.0, 5.0)
+        assert (pid.out_min, pid.out_max) == (35, 100)
+        assert pid.integral == 35 and pid.derivative == 0.0
+
+    def test_init_n(self) -> None:
+        """Negative unit test for PidController.__init__() method. It contains the following steps:
+        - ASSERT: out_max < out_min raises ValueError
+        """
+        with pytest.raises(ValueError):
+            PidController(45.0, 4.0, 0.1, 0.0, 0.0, 60, 40)
+
+    @pytest.mark.parametrize("temp, expected", [
+        pytest.param(45.0, 35.0, id="at-target"),
+        pytest.param(50.0, 55.0, id="above-target"),
+        pytest.param(70.0, 100.0, id="clamped-to-max"),
+        pytest.param(30.0, 35.0, id="clamped-to-min"),
+    ])
+    def test_proportional(self, temp: float, expected: float) -> None:
+        """Positive unit test for PidController.update() method with the proportional term. It contains the
+        following steps:
+        - call update() once (no integral and derivative contribution at the first update)
+        - ASSERT: the output is min_level + kp * (temp - target) clamped to [out_min..out_max]
+        """
+        pid = PidController(45.0, 4.0, 0.1, 2.0, 0.0, 35, 100)
+        assert pid.update(temp, 100.0) == pytest.approx(expected)
+
+    def test_integral(self) -> None:
+        """Positive unit test for PidController.update() method with the integral term. It contains the following
+        steps:
+        - update an I-only controller with a constant error of 2C every 10 sec, then at the target
+        - ASSERT: the output grows by ki * error * dt per update and it is held at the target
+        """
+        pid = PidController(45.0, 0.0, 0.5, 0.0, 0.0, 35, 100)
+        assert pid.update(47.0, 0.0) == pytest.approx(35.0)
+        assert pid.update(47.0, 10.0) == pytest.approx(45.0)
+        assert pid.update(47.0, 20.0) == pytest.approx(55.0)
+        assert pid.update(45.0, 30.0) == pytest.approx(55.0)
+
+    def test_anti_windup(self) -> None:
+        """Positive unit test for PidController.update() method with a saturated output. It contains the following
+        steps:
+        - keep the temperature far above the target for a long time, so the output is saturated at out_max
+        - drop the temperature just below the target
+        - ASSERT: the integral term is not wound up beyond out_max while saturated
+        - ASSERT: the output leaves the saturation at the first update below the target
+        """
+        pid = PidController(45.0, 2.0, 1.0, 0.0, 0.0, 35, 100)
+        pid.update(60.0, 0.0)
+        t = 10.0
+        for _ in range(100):
+            assert pid.update(60.0, t) == pytest.approx(100.0)
+            t += 10.0
+        assert pid.integral <= 100.0
+        assert pid.update(44.0, t) < 100.0
+
+    def test_derivative_filter(self) -> None:
+        """Positive unit test for PidController.update() method with the derivative term. It contains the following
+        steps:
+        - update a D-only controller with a 2C temperature step in 1 sec, without and with a 9 sec filter
+        - ASSERT: the unfiltered derivative is the full slope, the filtered one is a tenth of it
+        """
+        unfiltered = PidController(45.0, 0.0, 0.0, 10.0, 0.0, 0, 100)
+        filtered = PidController(45.0, 0.0, 0.0, 10.0, 9.0, 0, 100)
+        for pid in (unfiltered, filtered):
+            pid.update(45.0, 0.0)
+        assert unfiltered.update(47.0, 1.0) == pytest.approx(20.0)
+        assert filtered.update(47.0, 1.0) == pytest.approx(2.0)
+        assert filtered.derivative == pytest.approx(0.2)
+
+    def test_reset(self) -> None:
+        """Positive unit test for PidController.reset() method. It contains the following steps:
+        - update the controller, then reset it
+        - ASSERT: the integral and the derivative terms are restored, the next update is a first update
+        """
+        pid = PidController(45.0, 0.0, 1.0, 1.0, 0.0, 35, 100)
+        pid.update(50.0, 0.0)
+        pid.update(55.0, 10.0)
+        pid.reset()
+        assert pid.integral == 35 and pid.derivative == 0.0
+        assert pid.update(45.0, 20.0) == pytest.approx(35.0)
+
+
+# End.
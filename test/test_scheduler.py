@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+#
+#   test_scheduler.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.Scheduler() class.
+#
+from typing import List
+import pytest
+from mock import MagicMock
+from pytest_mock import MockerFixture
+from smfc.scheduler import Scheduler
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Fake monotonic clock: time.sleep() advances time.monotonic() by the requested delay."""
+
+    now: float              # Current time (sec)
+    sleeps: List[float]     # Requested sleep delays (sec)
+
+    def __init__(self, mocker: MockerFixture) -> None:
+        self.now = 0.0
+        self.sleeps = []
+        mocker.patch("time.monotonic", MagicMock(side_effect=lambda: self.now))
+        mocker.patch("time.sleep", MagicMock(side_effect=self.sleep))
+
+    def sleep(self, delay: float) -> None:
+        """Mocked time.sleep()."""
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class TestScheduler:
+    """Unit test class for smfc.Scheduler() class"""
+
+    def test_add_p(self, mocker: MockerFixture) -> None:
+        """Positive unit test for Scheduler.add() method. It contains the following steps:
+        - mock the clock with FakeClock at 100.0 sec
+        - add three jobs with different offsets
+        - ASSERT: the first deadlines are now + offset and jobs() lists them in deadline order
+        - ASSERT: next_deadline() is the earliest deadline
+        """
+        clock = FakeClock(mocker)
+        clock.now = 100.0
+        s = Scheduler()
+        s.add("HD", 10.0, "hd", 3.0)
+        s.add("CPU", 2.0, "cpu")
+        s.add("NVME", 2.0, "nvme", 1.0)
+        assert [(j.name, j.deadline) for j in s.jobs()] == [("CPU", 100.0), ("NVME", 101.0), ("HD", 103.0)]
+        assert s.next_deadline() == 100.0
+
+    @pytest.mark.parametrize("period, offset", [
+        pytest.param(-1.0, 0.0, id="negative-period"),
+        pytest.param(1.0, -0.5, id="negative-offset"),
+    ])
+    def test_add_n(self, period: float, offset: float) -> None:
+        """Negative unit test for Scheduler.add() method. It contains the following steps:
+        - ASSERT: a negative period or offset raises ValueError
+        """
+        with pytest.raises(ValueError):
+            Scheduler().add("job", period, None, offset)
+
+    def test_wait_sleeps_until_deadlines(self, mocker: MockerFixture) -> None:
+        """Positive unit test for Scheduler.wait() method. It contains the following steps:
+        - mock the clock with FakeClock
+        - add a 2 sec CPU job and a 10 sec HD job with 1 sec offset
+        - call wait() until 12 sec elapsed
+        - ASSERT: every wakeup happens exactly at a deadline (no idle wakeups between the polls)
+        - ASSERT: the due targets match the expected poll timeline
+        """
+        clock = FakeClock(mocker)
+        s = Scheduler()
+        s.add("CPU", 2.0, "cpu")
+        s.add("HD", 10.0, "hd", 1.0)
+        timeline = []
+        while clock.now < 12.0:
+            targets = s.wait()
+            timeline.append((targets, clock.now))
+        assert timeline == [
+            (["cpu"], 0.0), (["hd"], 1.0), (["cpu"], 2.0), (["cpu"], 4.0), (["cpu"], 6.0), (["cpu"], 8.0),
+            (["cpu"], 10.0), (["hd"], 11.0), (["cpu"], 12.0),
+        ]
+        assert s.wakeups == 9
+        assert s.max_lateness == 0.0
+
+    def test_wait_equal_deadlines(self, mocker: MockerFixture) -> None:
+        """Positive unit test for Scheduler.wait() method. It contains the following steps:
+        - mock the clock with FakeClock
+        - add three jobs with the same period and offset
+        - ASSERT: one wakeup returns all three targets in insertion order
+        """
+        FakeClock(mocker)
+        s = Scheduler()
+        for name in ("a", "b", "c"):
+            s.add(name, 5.0, name)
+        assert s.wait() == ["a", "b", "c"]
+        assert s.wait() == ["a", "b", "c"]
+        assert s.wakeups == 2
+
+    def test_wait_keeps_phase_and_skips_missed(self, mocker: MockerFixture) -> None:
+        """Positive unit test for Scheduler.wait() method. It contains the following steps:
+        - mock the clock with FakeClock
+        - add a 2 sec job with 0.5 sec offset
+        - delay the dispatch by 0.3 sec, then by 5 sec (an overrunning loop iteration)
+        - ASSERT: a late dispatch does not shift the later deadlines (fixed rate)
+        - ASSERT: the missed slots are skipped and the next deadline stays in phase
+        - ASSERT: max_lateness holds the largest delay
+        """
+        clock = FakeClock(mocker)
+        s = Scheduler()
+        job = s.add("CPU", 2.0, "cpu", 0.5)
+        s.wait()
+        assert job.deadline == 2.5
+        clock.now = 2.8
+        assert s.wait() == ["cpu"]
+        assert job.deadline == 4.5
+        clock.now = 9.5
+        assert s.wait() == ["cpu"]
+        assert job.deadline == 10.5
+        assert job.runs == 3
+        assert s.max_lateness == 5.0
+
+    def test_wait_zero_period(self, mocker: MockerFixture) -> None:
+        """Positive unit test for Scheduler.wait() method. It contains the following steps:
+        - mock the clock with FakeClock
+        - add a job with zero period next to a 1 sec job
+        - ASSERT: the zero period job is due at every wakeup and wait() still calls time.sleep() every time
+        """
+        clock = FakeClock(mocker)
+        s = Scheduler()
+        s.add("fast", 0.0, "fast")
+        s.add("slow", 1.0, "slow", 1.0)
+        assert s.wait() == ["fast"]
+        assert s.wait() == ["fast"]
+        clock.now = 1.0
+        assert s.wait() == ["fast", "slow"]
+        assert clock.sleeps == [0.0, 0.0, 0.0]
+
+    def test_wait_early_wakeup(self, mocker: MockerFixture) -> None:
+        """Positive unit test for Scheduler.wait() method. It contains the following steps:
+        - mock time.sleep() to return immediately without advancing the clock (e.g. an interrupted sleep)
+        - ASSERT: wait() still returns the earliest job and advances its deadline by one period
+        """
+        mocker.patch("time.monotonic", MagicMock(return_value=0.0))
+        mocker.patch("time.sleep", MagicMock())
+        s = Scheduler()
+        job = s.add("HD", 10.0, "hd", 5.0)
+        assert s.wait() == ["hd"]
+        assert job.deadline == 15.0
+
+    def test_next_deadline_n(self) -> None:
+        """Negative unit test for Scheduler.next_deadline() and wait() methods. It contains the following steps:
+        - ASSERT: an empty scheduler raises IndexError
+        """
+        with pytest.raises(IndexError):
+            Scheduler().next_deadline()
+        with pytest.raises(IndexError):
+            Scheduler().wait()
+
+
+# End.
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+#
+#   test_sensorproc.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.SensorProcess() class.
+#
+import os
+import signal
+import threading
+import time
+import pytest
+from smfc.sensorproc import SensorHangError, SensorProcess
+
+
+@pytest.fixture(name="sensor_process")
+def fixture_sensor_process():
+    """Create a SensorProcess with 1 sec deadline and stop it after the test."""
+    sp = SensorProcess(1.0)
+    yield sp
+    sp.stop()
+
+
+class TestSensorProcess:
+    """Unit test class for smfc.SensorProcess() class"""
+
+    @pytest.mark.parametrize("timeout", [0, -1.0])
+    def test_init_n(self, timeout: float) -> None:
+        """Negative unit test for SensorProcess.__init__() method. It contains the following steps:
+        - ASSERT: a zero or negative deadline raises ValueError
+        """
+        with pytest.raises(ValueError):
+            SensorProcess(timeout)
+
+    def test_read_file(self, sensor_process: SensorProcess, tmp_path) -> None:
+        """Positive and negative unit test for SensorProcess.read_file() method. It contains the following steps:
+        - start the sensor process and read a temperature file and a missing file
+        - ASSERT: the sensor process runs in another process and returns the content of the file
+        - ASSERT: the FileNotFoundError of the missing file is raised in the service, the process is not replaced
+        """
+        path = tmp_path / "temp1_input"
+        path.write_text("38000\n")
+        sensor_process.start()
+        pid = sensor_process.pids[SensorProcess.DEFAULT_CHANNEL]
+        assert pid != os.getpid()
+        assert sensor_process.read_file(str(path)) == "38000\n"
+        with pytest.raises(FileNotFoundError):
+            sensor_process.read_file(str(tmp_path / "missing"))
+        assert sensor_process.pids == {SensorProcess.DEFAULT_CHANNEL: pid}
+        assert sensor_process.hangs == sensor_process.respawns == 0
+
+    def test_run_command(self, sensor_process: SensorProcess) -> None:
+        """Positive and negative unit test for SensorProcess.run_command() method. It contains the following steps:
+        - execute `echo 42`, a command exceeding its deadline and a non-existent command in the sensor process
+        - ASSERT: the CompletedProcess of `echo` is returned
+        - ASSERT: the command deadline raises TimeoutError (not a hang), a missing command FileNotFoundError
+        """
+        r = sensor_process.run_command(["echo", "42"], 5.0)
+        assert r.returncode == 0 and r.stdout == "42\n"
+        with pytest.raises(TimeoutError) as cm:
+            sensor_process.run_command(["sleep", "5"], 0.2)
+        assert not isinstance(cm.value, SensorHangError)
+        with pytest.raises(FileNotFoundError):
+            sensor_process.run_command(["/nonexistent/command"], 1.0)
+        assert sensor_process.hangs == 0
+
+    def test_hang_respawns(self, tmp_path) -> None:
+        """Negative unit test for SensorProcess.read_file() method when the read blocks. It contains the
+        following steps:
+        - read a FIFO without a writer (the open() blocks forever, like a read of a dying disk)
+        - ASSERT: SensorHangError is raised after the deadline and the stuck process is replaced
+        - ASSERT: the next request is served by the new process
+        """
+        fifo = tmp_path / "fifo"
+        os.mkfifo(fifo)
+        path = tmp_path / "temp1_input"
+        path.write_text("41000\n")
+        sp = SensorProcess(0.3)
+        try:
+            sp.start()
+            pid = sp.pids[SensorProcess.DEFAULT_CHANNEL]
+            start = time.monotonic()
+            with pytest.raises(SensorHangError):
+                sp.read_file(str(fifo))
+            assert time.monotonic() - start < 3.0
+            assert sp.hangs == 1 and sp.respawns == 1
+            assert sp.pids[SensorProcess.DEFAULT_CHANNEL] != pid
+            assert sp.read_file(str(path)) == "41000\n"
+        finally:
+            sp.stop()
+
+    def test_crash_respawns(self, sensor_process: SensorProcess, tmp_path) -> None:
+        """Negative unit test for SensorProcess.read_file() method when the sensor process was killed. It contains
+        the following steps:
+        - start the sensor process and kill it
+        - ASSERT: the next request starts a new process and it is served
+        """
+        path = tmp_path / "temp1_input"
+        path.write_text("36000\n")
+        sensor_process.start()
+        pid = sensor_process.pids[SensorProcess.DEFAULT_CHANNEL]
+        os.kill(pid, signal.SIGKILL)
+        time.sleep(0.2)
+        assert sensor_process.read_file(str(path)) == "36000\n"
+        assert sensor_process.respawns == 1
+        assert sensor_process.pids[SensorProcess.DEFAULT_CHANNEL] != pid
+
+    def test_stop(self, sensor_process: SensorProcess) -> None:
+        """Positive unit test for SensorProcess.stop() method. It contains the following steps:
+        - start and stop the sensor process
+        - ASSERT: the process is terminated and stop() can be called again
+        """
+        sensor_process.start()
+        pid = sensor_process.pids[SensorProcess.DEFAULT_CHANNEL]
+        sensor_process.stop()
+        assert not sensor_process.pids
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+        sensor_process.stop()
+
+    def test_command_without_deadline_hangs(self) -> None:
+        """Negative unit test for SensorProcess.run_command() method when a command without deadline does not
+        finish. It contains the following steps:
+        - execute `sleep 5` with no command deadline (timeout=0) in a sensor process with 0.3 sec deadline
+        - ASSERT: SensorHangError is raised after the deadline of the sensor process and the process is replaced
+        """
+        sp = SensorProcess(0.3)
+        try:
+            start = time.monotonic()
+            with pytest.raises(SensorHangError):
+                sp.run_command(["sleep", "5"], 0)
+            assert time.monotonic() - start < 3.0
+            assert sp.hangs == 1 and sp.respawns == 1
+        finally:
+            sp.stop()
+
+    def test_channels(self, tmp_path) -> None:
+        """Positive and negative unit test for the channels of SensorProcess. It contains the following steps:
+        - start the channels of two fan controllers and read a file on both
+        - ASSERT: the channels run in different processes
+        - block the HD channel with a `sleep 5` command (2 sec deadline) in a thread
+        - ASSERT: the CPU channel is served while the HD channel is blocked
+        - ASSERT: a read on the blocked HD channel raises SensorHangError after the deadline of the sensor
+          process (the wait for the channel is limited), the HD process is not replaced
+        - ASSERT: the blocking command raises TimeoutError, then the HD channel serves the requests again
+        """
+        path = tmp_path / "temp1_input"
+        path.write_text("40000\n")
+        sp = SensorProcess(0.5)
+        errors = []
+
+        def blocking_command():
+            try:
+                sp.run_command(["sleep", "5"], 2.0, "HD")
+            except TimeoutError as e:
+                errors.append(e)
+
+        try:
+            sp.start(["CPU", "HD"])
+            pids = sp.pids
+            assert pids["CPU"] != pids["HD"]
+            assert sp.read_file(str(path), "CPU") == sp.read_file(str(path), "HD") == "40000\n"
+            thread = threading.Thread(target=blocking_command)
+            thread.start()
+            time.sleep(0.1)
+            start = time.monotonic()
+            assert sp.read_file(str(path), "CPU") == "40000\n"
+            assert time.monotonic() - start < 0.3
+            start = time.monotonic()
+            with pytest.raises(SensorHangError):
+                sp.read_file(str(path), "HD")
+            assert 0.4 < time.monotonic() - start < 1.5
+            thread.join(5.0)
+            assert len(errors) == 1 and not isinstance(errors[0], SensorHangError)
+            assert sp.hangs == 1 and sp.respawns == 0
+            assert sp.pids == pids
+            assert sp.read_file(str(path), "HD") == "40000\n"
+        finally:
+            sp.stop()
+
+# End.
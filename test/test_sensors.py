@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+#
+#   test_sensors.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.SensorRegistry() class.
+#
+import asyncio
+import threading
+import time
+import pytest
+import pyudev
+from mock import MagicMock
+from pytest_mock import MockerFixture
+from smfc import CpuFc, clock
+from smfc.sensors import SensorRegistry
+from .test_fc_helpers import build_cpu_fc, build_hd_fc, build_gpu_fc, make_bare_hd_fc
+from .test_fixtures import TestData
+
+
+class TestSensorRegistry:
+    """Unit test class for smfc.SensorRegistry() class"""
+
+    def test_init_p(self) -> None:
+        """Positive unit test for SensorRegistry.__init__() method. It contains the following steps:
+        - create a SensorRegistry with max_age=2.5
+        - ASSERT: max_age is stored, created_at is the current wall-clock time and the registry has no sensors
+        """
+        before = clock.time()
+        sr = SensorRegistry(2.5)
+        assert sr.max_age == 2.5
+        assert before <= sr.created_at <= clock.time()
+        assert sr.stats() == {"max_age_s": 2.5, "created_at": sr.created_at, "reads": 0, "hits": 0, "errors": 0,
+                              "sensors": []}
+
+    def test_init_n(self) -> None:
+        """Negative unit test for SensorRegistry.__init__() method. It contains the following steps:
+        - ASSERT: a negative max_age raises ValueError
+        """
+        with pytest.raises(ValueError):
+            SensorRegistry(-1.0)
+
+    def test_subscribe(self) -> None:
+        """Positive unit test for SensorRegistry.subscribe() method. It contains the following steps:
+        - subscribe two controllers to the same key (one of them twice)
+        - ASSERT: one entry exists with both subscribers listed once
+        """
+        sr = SensorRegistry(1.0)
+        e1 = sr.subscribe("hwmon:/a", "HD:0")
+        e2 = sr.subscribe("hwmon:/a", "HD:1")
+        sr.subscribe("hwmon:/a", "HD:0")
+        assert e1 is e2
+        assert e1.subscribers == ["HD:0", "HD:1"]
+
+    @pytest.mark.parametrize("max_age, times, reads, hits, error", [
+        (2.0, [0.0, 1.0, 1.9], 1, 2, "1 read and 2 hits within the window"),
+        (2.0, [0.0, 2.0, 4.5], 3, 0, "every request outside the window is a physical read"),
+        (2.0, [0.0, 0.0, 2.1, 3.0], 2, 2, "window restarts at the second read"),
+        (0.0, [0.0, 0.0, 0.0], 3, 0, "max_age=0 disables caching"),
+    ])
+    def test_read(self, mocker: MockerFixture, max_age: float, times, reads: int, hits: int, error: str) -> None:
+        """Positive unit test for SensorRegistry.read() method. It contains the following steps:
+        - mock time.monotonic() to return the given timestamps
+        - read the same sensor from alternating controllers at every timestamp
+        - ASSERT: the number of physical reads and cache hits match the expected values
+        - ASSERT: every request returns the value of the last physical read
+        """
+        mocker.patch("time.monotonic", MagicMock(side_effect=times))
+        values = iter(range(100))
+        reader = MagicMock(side_effect=lambda: float(next(values)))
+        sr = SensorRegistry(max_age)
+        for i in range(len(times)):
+            assert sr.read("hwmon:/a", f"CPU:{i % 2}", reader) == float(reader.call_count - 1), error
+        st = sr.stats()
+        assert st["reads"] == reads, error
+        assert st["hits"] == hits, error
+        assert reader.call_count == reads, error
+        assert st["sensors"][0]["subscribers"] == (["CPU:0", "CPU:1"] if len(times) > 1 else ["CPU:0"])
+
+    def test_read_error(self, mocker: MockerFixture) -> None:
+        """Negative unit test for SensorRegistry.read() method. It contains the following steps:
+        - mock time.monotonic() and a reader failing at its first call
+        - ASSERT: the exception is propagated and counted as an error
+        - ASSERT: the failed read is not cached, the next request issues a physical read
+        """
+        mocker.patch("time.monotonic", MagicMock(return_value=10.0))
+        reader = MagicMock(side_effect=[OSError("read error"), 35.0])
+        sr = SensorRegistry(5.0)
+        with pytest.raises(OSError):
+            sr.read("smartctl:/dev/sda", "HD:0", reader)
+        assert sr.read("smartctl:/dev/sda", "HD:1", reader) == 35.0
+        assert sr.read("smartctl:/dev/sda", "HD:0", reader) == 35.0
+        assert sr.stats()["sensors"] == [{"key": "smartctl:/dev/sda", "reads": 2, "hits": 1, "errors": 1,
+                                          "subscribers": ["HD:0", "HD:1"]}]
+
+    def test_read_threads(self) -> None:
+        """Positive unit test for SensorRegistry.read() method called from several threads. It contains the
+        following steps:
+        - start four threads requesting the same sensor while a slow physical read (0.2 sec) is in progress
+        - ASSERT: the sensor is read only once, the other threads wait for it and get its value
+        """
+        started = threading.Event()
+
+        def slow_reader() -> float:
+            started.set()
+            time.sleep(0.2)
+            return 42.0
+
+        sr = SensorRegistry(10.0)
+        results = []
+        threads = [threading.Thread(target=lambda i=i: results.append(sr.read("hwmon:/a", f"HD:{i}", slow_reader)))
+                   for i in range(4)]
+        threads[0].start()
+        started.wait(1.0)
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join(2.0)
+        assert results == [42.0] * 4
+        st = sr.stats()
+        assert st["reads"] == 1
+        assert st["hits"] == 3
+
+    def test_read_async(self, mocker: MockerFixture) -> None:
+        """Positive unit test for SensorRegistry.read_async() method. It contains the following steps:
+        - mock time.monotonic() and a slow coroutine reader
+        - request the same sensor concurrently from three controllers, then once more within the window
+        - ASSERT: the concurrent requests share one physical read, the last request is served from the cache
+        """
+        mocker.patch("time.monotonic", MagicMock(return_value=10.0))
+        calls = []
+
+        async def reader() -> float:
+            calls.append(1)
+            await asyncio.sleep(0)
+            return 42.0
+
+        async def scenario():
+            sr = SensorRegistry(5.0)
+            values = await asyncio.gather(*(sr.read_async("hwmon:/a", f"HD:{i}", reader) for i in range(3)))
+            values.append(await sr.read_async("hwmon:/a", "HD:0", reader))
+            return sr, values
+
+        sr, values = asyncio.run(scenario())
+        assert values == [42.0] * 4
+        assert len(calls) == 1
+        st = sr.stats()
+        assert (st["reads"], st["hits"], st["errors"]) == (1, 3, 0)
+        assert st["sensors"][0]["subscribers"] == ["HD:0", "HD:1", "HD:2"]
+
+    def test_read_async_error(self, mocker: MockerFixture) -> None:
+        """Negative unit test for SensorRegistry.read_async() method. It contains the following steps:
+        - mock time.monotonic() and a coroutine reader failing at its first call
+        - ASSERT: the exception is propagated to both concurrent requests and counted as one error
+        - ASSERT: the failed read is not cached, the next request issues a physical read
+        """
+        mocker.patch("time.monotonic", MagicMock(return_value=10.0))
+        results = [OSError("read error"), 35.0]
+
+        async def reader() -> float:
+            await asyncio.sleep(0)
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        async def scenario():
+            sr = SensorRegistry(5.0)
+            errors = await asyncio.gather(sr.read_async("smartctl:/dev/sda", "HD:0", reader),
+                                          sr.read_async("smartctl:/dev/sda", "HD:1", reader),
+                                          return_exceptions=True)
+            value = await sr.read_async("smartctl:/dev/sda", "HD:0", reader)
+            return sr, errors, value
+
+        sr, errors, value = asyncio.run(scenario())
+        assert all(isinstance(e, OSError) for e in errors)
+        assert value == 35.0
+        st = sr.stats()
+        assert (st["reads"], st["hits"], st["errors"]) == (2, 1, 1)
+
+
+class TestSensorSharing:
+    """Unit tests for the shared sensor registry integration of the fan controllers."""
+
+    def test_shared_cpu_sensors(self, mocker: MockerFixture, td: TestData) -> None:
+        """Positive unit test for FanController.attach_sensors() and _read_nth_temp() methods. It contains the
+        following steps:
+        - build two CpuFc instances on the same hwmon files (via build_cpu_fc)
+        - attach both controllers to the same SensorRegistry
+        - call get_temp() on both controllers within the freshness window
+        - ASSERT: both controllers report the same temperature
+        - ASSERT: every hwmon file was read physically once and served once from the cache
+        """
+        h1 = build_cpu_fc(mocker, td, count=2, temps=[40.0, 50.0], temp_calc=2)
+        files = list(td.cpu_files)
+        mocker.patch("smfc.FanController.get_hwmon_path", MagicMock(side_effect=files))
+        cpu1 = CpuFc(h1.log, pyudev.Context.__new__(pyudev.Context), h1.ipmi, h1.cfg)
+        cpu0 = h1.fc
+        sr = SensorRegistry(10.0)
+        cpu0.attach_sensors(sr)
+        cpu1.attach_sensors(sr)
+        assert cpu0.get_temp() == cpu1.get_temp() == 50.0
+        st = sr.stats()
+        assert (st["reads"], st["hits"], st["errors"]) == (2, 2, 0)
+        assert [s["key"] for s in st["sensors"]] == sorted(f"hwmon:{f}" for f in files)
+        assert st["sensors"][0]["subscribers"] == [cpu0.name]
+
+    def test_hd_sensor_key(self, mocker: MockerFixture, td: TestData) -> None:
+        """Positive unit test for HdFc.sensor_key() method. It contains the following steps:
+        - build an HdFc with hwmon files and another one with the smartctl fallback
+        - ASSERT: the hwmon based key is the hwmon file, the smartctl based key is the resolved device path
+        """
+        h = build_hd_fc(mocker, td, count=1)
+        assert h.fc.sensor_key(0) == f"hwmon:{td.hd_files[0]}"
+        fc = make_bare_hd_fc(hwmon_path=[""], hd_device_names=["/dev/disk/by-id/ata-WDC_1"])
+        mocker.patch("os.path.realpath", MagicMock(return_value="/dev/sda"))
+        assert fc.sensor_key(0) == "smartctl:/dev/sda"
+
+    def test_gpu_sensor_key(self, mocker: MockerFixture) -> None:
+        """Positive unit test for GpuFc.sensor_key() method. It contains the following steps:
+        - build a GpuFc with two AMD GPUs (via build_gpu_fc)
+        - ASSERT: the keys contain the GPU type and the GPU device ids
+        """
+        h = build_gpu_fc(mocker, gpu_type="amd", gpu_device_ids=[0, 3])
+        assert [h.fc.sensor_key(i) for i in range(2)] == ["gpu:amd:0", "gpu:amd:3"]
+
+
+# End.
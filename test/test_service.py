@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from typing import List
 import signal
 import sys
+import threading
 import time
 from configparser import ConfigParser
 import pytest
@@ -15,11 +16,17 @@ from pyudev import Context
 from mock import MagicMock
 from pytest_mock import MockerFixture
 from smfc import Log, Ipmi, FanController, ConstFc, Service
+from smfc.arbiter import ZoneArbiter
 from smfc.config import Config
+from smfc.hwmon import HwmonIndex
+from smfc.scheduler import Scheduler
+from smfc.state import StateStore
+from smfc.timing import ControllerTiming, LoopTiming
+from smfc.worker import ControllerRecord
 from .test_fixtures import TestData
 from .test_mocks import MockedContextError, MockedContextGood
 from .test_ipmi import BMC_INFO_OUTPUT
-from .test_config_builders import create_ipmi_config
+from .test_config_builders import create_ipmi_config, create_cpu_config, create_hd_config, create_const_config
 
 
 @dataclass
@@ -49,11 +56,35 @@ def create_exit_config(exit_level: int = Config.DV_IPMI_EXIT_LEVEL, zones: List[
     return config
 
 
+def called_from_subprocess() -> bool:
+    """Check whether the mocked time.sleep() was called by the poll loop of subprocess.run(timeout=...).
+
+    Returns:
+        bool: True if a caller frame of the mocked function belongs to the subprocess module
+    """
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None:
+        if frame.f_globals.get("__name__") == "subprocess":
+            return True
+        frame = frame.f_back
+    return False
+
+
 class TestService:
     """Unit test for smfc.Service() class"""
 
     sleep_counter: int
 
+    def test_init(self) -> None:
+        """Positive unit test for Service.__init__() method. It contains the following steps:
+        - instantiate Service
+        - ASSERT: the zone level change counters are empty, the loop timing is created, no snapshot is published
+        """
+        service = Service()
+        assert isinstance(service.zone_level_changes, dict) and not service.zone_level_changes
+        assert isinstance(service.timing, LoopTiming) and service.timing.period.count == 0
+        assert service.publisher is None
+
     @pytest.mark.parametrize(
         "ipmi, log",
         [
@@ -641,22 +672,26 @@ class TestService:
         assert cm.value.code == exit_code
 
     @pytest.mark.parametrize(
-        "cpufc, hdfc, nvmefc, gpufc, constfc, exit_code",
+        "cpufc, hdfc, nvmefc, gpufc, constfc, execution_mode, exit_code",
         [
             # CPU and GPU enabled
-            pytest.param(True, False, False, True, False, 100, id="cpu-gpu"),
+            pytest.param(True, False, False, True, False, "sequential", 100, id="cpu-gpu"),
             # HD and CONST enabled
-            pytest.param(False, True, False, False, True, 100, id="hd-const"),
+            pytest.param(False, True, False, False, True, "sequential", 100, id="hd-const"),
             # CPU and GPU enabled (duplicate)
-            pytest.param(True, False, False, True, False, 100, id="cpu-gpu-alt"),
+            pytest.param(True, False, False, True, False, "sequential", 100, id="cpu-gpu-alt"),
             # CPU and NVME enabled
-            pytest.param(True, False, True, False, False, 100, id="cpu-nvme"),
+            pytest.param(True, False, True, False, False, "sequential", 100, id="cpu-nvme"),
             # All controllers enabled
-            pytest.param(True, True, True, True, True, 100, id="all-controllers"),
+            pytest.param(True, True, True, True, True, "sequential", 100, id="all-controllers"),
+            # HD and CONST enabled in asyncio mode
+            pytest.param(False, True, False, False, True, "asyncio", 100, id="hd-const-asyncio"),
+            # All controllers enabled in asyncio mode
+            pytest.param(True, True, True, True, True, "asyncio", 100, id="all-controllers-asyncio"),
         ],
     )
     def test_run_happy_path(self, mocker: MockerFixture, td: TestData, cpufc: bool, hdfc: bool, nvmefc: bool,
-                            gpufc: bool, constfc: bool, exit_code: int):
+                            gpufc: bool, constfc: bool, execution_mode: str, exit_code: int):
         """Positive unit test for Service.run() method. It contains the following steps:
         - mock print(), time.sleep() (exits with code 100 after 10 iterations), smfc.service.Exporter
         - mock pyudev.Context.__init__ via MockedContextGood and CpuFc/HdFc/NvmeFc/GpuFc/ConstFc.__init__
@@ -664,22 +699,30 @@ class TestService:
           enabling the parametrized combination of controllers
         - instantiate Service and call Service.run() inside pytest.raises(SystemExit)
         - ASSERT: sys.exit() code equals 100 (the main loop ran 10 iterations and exited via mocked sleep)
+        - ASSERT: every temperature based controller is attached to the shared sensor registry
+        - ASSERT: the hotplug monitor (smfc.service.HotplugMonitor mocked, enabled in [Service]) is started
+        - ASSERT: a shared hwmon index is created
+        - ASSERT: the temperature based controllers are polled with poll_async() only in asyncio execution mode
+        - ASSERT: the scheduler has one job per controller plus the fan mode check, and it woke up
         """
 
         # pylint: disable=unused-argument
         def mocked_sleep(*args):
-            """Mocked time.sleep() function. Exists at the 10th call."""
+            """Mocked time.sleep() function. Exists at the 10th call (polls of subprocess.run() are ignored)."""
+            if called_from_subprocess():
+                return
             self.sleep_counter += 1
             if self.sleep_counter >= 10:
                 sys.exit(100)
 
-        def mocked_cpufc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg) -> None:
+        def mocked_cpufc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg, hwmon_index=None) -> None:
             nonlocal td
             self.hwmon_path = td.cpu_files
             self.config = cfg
             FanController.__init__(self, log, ipmi, cfg.section, len(td.cpu_files))
 
-        def mocked_hdfc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg, sudo: bool) -> None:
+        def mocked_hdfc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg, sudo: bool,
+                             hwmon_index=None) -> None:
             nonlocal td
             self.hd_device_names = td.hd_name_list
             self.hwmon_path = td.hd_files
@@ -698,7 +741,7 @@ class TestService:
             self.config = cfg
             FanController.__init__(self, log, ipmi, cfg.section, len(cfg.gpu_device_ids))
 
-        def mocked_nvmefc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg) -> None:
+        def mocked_nvmefc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg, hwmon_index=None) -> None:
             nonlocal td
             self.nvme_device_names = td.nvme_name_list
             self.hwmon_path = td.nvme_files
@@ -714,6 +757,7 @@ class TestService:
             self.last_temp = 0.0
             self.last_level = cfg.level
             self.deferred_apply = False
+            self.timing = ControllerTiming()
 
         # pragma pylint: enable=unused-argument
 
@@ -807,6 +851,10 @@ class TestService:
             Config.CV_EXPORTER_BIND_ADDRESS: "127.0.0.1",
             Config.CV_EXPORTER_PORT: "9099",
         }
+        my_config[Config.CS_SERVICE] = {
+            Config.CV_SERVICE_HOTPLUG_MONITOR: "1",
+            Config.CV_SERVICE_EXECUTION_MODE: execution_mode,
+        }
         conf_file = td.create_config_file(my_config)
         mock_print = MagicMock()
         mocker.patch("builtins.print", mock_print)
@@ -814,6 +862,8 @@ class TestService:
         mock_time_sleep.side_effect = mocked_sleep
         mocker.patch("time.sleep", mock_time_sleep)
         mocker.patch("smfc.service.Exporter", MagicMock())
+        mock_hotplug = MagicMock()
+        mocker.patch("smfc.service.HotplugMonitor", MagicMock(return_value=mock_hotplug))
         # pylint: disable=R0801
         mocker.patch("pyudev.Context.__init__", MockedContextGood.__init__)
         mocker.patch("smfc.CpuFc.__init__", mocked_cpufc_init)
@@ -822,29 +872,46 @@ class TestService:
         mocker.patch("smfc.GpuFc.__init__", mocked_gpufc_init)
         mocker.patch("smfc.ConstFc.__init__", mocked_constfc_init)
         # pylint: enable=R0801
+        spy_poll = mocker.spy(FanController, "poll")
+        spy_poll_async = mocker.spy(FanController, "poll_async")
         self.sleep_counter = 0
         sys.argv = ("smfc.py -o 0 -l 4 -ne -nd -c " + conf_file).split()
         service = Service()
         with pytest.raises(SystemExit) as cm:
             service.run()
         assert cm.value.code == exit_code
+        if execution_mode == Config.MODE_ASYNCIO:
+            assert spy_poll.call_count == 0
+            assert spy_poll_async.call_count > 0
+        else:
+            assert spy_poll.call_count > 0
+            assert spy_poll_async.call_count == 0
+        assert service.scheduler.wakeups > 0
+        assert {job.name for job in service.scheduler.jobs()} == {fc.name for fc in service.controllers} | \
+            {"fan mode check"}
+        subscribers = {n for sensor in service.sensors.stats()["sensors"] for n in sensor["subscribers"]}
+        assert subscribers == {fc.name for fc in service.controllers if isinstance(fc, FanController)}
+        assert all(fc.sensors is service.sensors for fc in service.controllers if isinstance(fc, FanController))
+        assert service.hotplug is mock_hotplug
+        mock_hotplug.start.assert_called_once()
+        assert isinstance(service.hwmon_index, HwmonIndex)
 
     def test_run_propagates_controller_exception(self, mocker: MockerFixture, td: TestData):
-        """Negative unit test for Service.run() method when a controller's fc.run() raises mid-loop. It contains the
+        """Negative unit test for Service.run() method when a controller's fc.poll() raises mid-loop. It contains the
         following steps:
         - mock print(), time.sleep() (counted but not exited), smfc.service.Exporter, pyudev.Context.__init__ via
           MockedContextGood, and CpuFc.__init__ to skip real hwmon discovery
-        - mock smfc.CpuFc.run via mocker.patch with a MagicMock whose side_effect raises RuntimeError("sensor gone")
+        - mock smfc.CpuFc.poll via mocker.patch with a MagicMock whose side_effect raises RuntimeError("sensor gone")
           on the very first call from the main loop
         - build a minimal CPU-only config via `td` (fake ipmitool + one CPU hwmon file) and write it to disk
         - instantiate Service and invoke Service.run()
         - ASSERT: RuntimeError("sensor gone") propagates out of Service.run() unhandled (the main loop has no
-          exception handler around fc.run(), so a single controller fault terminates the daemon)
-        - ASSERT: smfc.CpuFc.run was called exactly once before the exception escaped
+          exception handler around fc.poll(), so a single controller fault terminates the daemon)
+        - ASSERT: smfc.CpuFc.poll was called exactly once before the exception escaped
         """
 
         # pylint: disable=unused-argument
-        def mocked_cpufc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg) -> None:
+        def mocked_cpufc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg, hwmon_index=None) -> None:
             nonlocal td
             self.hwmon_path = td.cpu_files
             self.config = cfg
@@ -891,7 +958,7 @@ class TestService:
         mocker.patch("pyudev.Context.__init__", MockedContextGood.__init__)
         mocker.patch("smfc.CpuFc.__init__", mocked_cpufc_init)
         mock_run = MagicMock(side_effect=RuntimeError("sensor gone"))
-        mocker.patch("smfc.CpuFc.run", mock_run)
+        mocker.patch("smfc.CpuFc.poll", mock_run)
         sys.argv = ("smfc.py -o 0 -l 4 -ne -nd -c " + conf_file).split()
         service = Service()
         with pytest.raises(RuntimeError, match="sensor gone"):
@@ -926,14 +993,16 @@ class TestService:
         """
 
         # pylint: disable=unused-argument
-        def mocked_cpufc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg) -> None:
+        def mocked_cpufc_init(self, log: Log, udevc: Context, ipmi: Ipmi, cfg, hwmon_index=None) -> None:
             nonlocal td
             self.hwmon_path = td.cpu_files
             self.config = cfg
             FanController.__init__(self, log, ipmi, cfg.section, len(td.cpu_files))
 
         def mocked_sleep(*args):
-            """Mocked time.sleep() function. Exits at the 3rd call."""
+            """Mocked time.sleep() function. Exits at the 3rd call (polls of subprocess.run() are ignored)."""
+            if called_from_subprocess():
+                return
             self.sleep_counter += 1
             if self.sleep_counter >= 3:
                 sys.exit(100)
@@ -1016,6 +1085,580 @@ class TestService:
         service.fan_mode_enforced_count = 0
         return service
 
+    def test_create_scheduler(self, mocker: MockerFixture):
+        """Positive unit test for Service._create_scheduler() method. It contains the following steps:
+        - mock print() and time.monotonic() (returns 0.0)
+        - build a Service with three stub controllers: CPU (polling 2), HD (polling 10, offset 3) and
+          CONST (polling 30, offset 7)
+        - call Service._create_scheduler()
+        - ASSERT: the scheduler has one job per controller with its polling and phase offset, plus the fan mode
+          check with the shortest polling interval
+        """
+        mocker.patch("builtins.print", MagicMock())
+        mocker.patch("time.monotonic", MagicMock(return_value=0.0))
+        service = Service()
+        service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
+        service.controllers = [
+            MagicMock(config=create_cpu_config(polling=2.0)),
+            MagicMock(config=create_hd_config(polling=10.0, polling_offset=3.0)),
+            MagicMock(config=create_const_config(polling=30.0, polling_offset=7.0)),
+        ]
+        for fc, name in zip(service.controllers, ["CPU", "HD", "CONST"]):
+            fc.name = name
+        scheduler = service._create_scheduler()  # pylint: disable=protected-access
+        assert [(j.name, j.period, j.deadline) for j in scheduler.jobs()] == [
+            ("CPU", 2.0, 0.0), ("fan mode check", 2.0, 0.0), ("HD", 10.0, 3.0), ("CONST", 30.0, 7.0)]
+        # pylint: disable=protected-access,comparison-with-callable
+        assert scheduler.jobs()[1].target == service._check_fan_mode
+
+    def test_create_scheduler_threaded(self, mocker: MockerFixture):
+        """Positive unit test for Service._create_scheduler() method in threaded mode. It contains the following
+        steps:
+        - mock print() and time.monotonic() (returns 0.0)
+        - build a Service with two stub controllers: CPU (polling 2) and HD (polling 10)
+        - call Service._create_scheduler(False)
+        - ASSERT: the scheduler has only the fan mode check job (the controllers are scheduled by their workers)
+        """
+        mocker.patch("builtins.print", MagicMock())
+        mocker.patch("time.monotonic", MagicMock(return_value=0.0))
+        service = Service()
+        service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
+        service.controllers = [MagicMock(config=create_cpu_config(polling=2.0)),
+                               MagicMock(config=create_hd_config(polling=10.0))]
+        scheduler = service._create_scheduler(False)  # pylint: disable=protected-access
+        assert [(j.name, j.period) for j in scheduler.jobs()] == [("fan mode check", 2.0)]
+
+    def _make_threaded_service(self, mocker: MockerFixture) -> Service:
+        """Build a minimally-initialized Service for unit-testing _run_threaded() with two deferred CONST
+        controllers: CONST:0 (zones 0 and 1, 40%) and CONST:1 (zone 1, 70%)."""
+        mocker.patch("builtins.print", MagicMock())
+        service = Service()
+        service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
+        service.ipmi = MagicMock()
+        service.applied_levels = {}
+        service.arbiter = ZoneArbiter()
+        service.controllers = []
+        for name, zones, level, polling in [("CONST:0", [0, 1], 40, 0.01), ("CONST:1", [1], 70, 0.02)]:
+            fc = ConstFc.__new__(ConstFc)
+            fc.name = name
+            fc.config = create_const_config(section=name, ipmi_zone=zones, polling=polling, level=level)
+            fc.last_level = 0
+            fc.last_temp = 0.0
+            fc.deferred_apply = True
+            fc.timing = ControllerTiming()
+            service.controllers.append(fc)
+        service.scheduler = Scheduler()
+        service.scheduler.add("fan mode check", 0.01, MagicMock())
+        service.reload_requested = False
+        service.timing = LoopTiming()
+        return service
+
+    def test_run_threaded(self, mocker: MockerFixture):
+        """Positive unit test for Service._run_threaded() method. It contains the following steps:
+        - build a Service via _make_threaded_service()
+        - mock ipmi.set_fan_level() to record the calling thread, and the fan mode check job to exit with code 100
+          when both zones reached their arbitrated level
+        - call Service._run_threaded() inside pytest.raises(SystemExit)
+        - ASSERT: the zones are set to the maximum desired level (zone 0: 40%, shared zone 1: 70%)
+        - ASSERT: every IPMI call was made in the main thread (single IPMI writer)
+        - ASSERT: the worker threads are stopped
+        """
+        service = self._make_threaded_service(mocker)
+        threads = []
+
+        def check_fan_mode() -> None:
+            if service.applied_levels == {0: 40, 1: 70}:
+                sys.exit(100)
+
+        service.ipmi.set_fan_level.side_effect = lambda zone, level: threads.append(threading.current_thread())
+        service.scheduler.jobs()[0].target.side_effect = check_fan_mode
+        with pytest.raises(SystemExit) as cm:
+            service._run_threaded()  # pylint: disable=protected-access
+        assert cm.value.code == 100
+        assert service.applied_levels == {0: 40, 1: 70}
+        assert threads and all(t is threading.main_thread() for t in threads)
+        assert not [t for t in threading.enumerate() if t.name.startswith("smfc-CONST")]
+
+    def test_run_threaded_propagates_worker_exception(self, mocker: MockerFixture):
+        """Negative unit test for Service._run_threaded() method. It contains the following steps:
+        - build a Service via _make_threaded_service() and mock ConstFc.poll() to raise RuntimeError
+        - ASSERT: the exception of the worker is re-raised by Service._run_threaded() in the main thread
+        - ASSERT: no fan level was set and the worker threads are stopped
+        """
+        service = self._make_threaded_service(mocker)
+        mocker.patch("smfc.ConstFc.poll", MagicMock(side_effect=RuntimeError("worker failed")))
+        with pytest.raises(RuntimeError, match="worker failed"):
+            service._run_threaded()  # pylint: disable=protected-access
+        service.ipmi.set_fan_level.assert_not_called()
+        assert not [t for t in threading.enumerate() if t.name.startswith("smfc-CONST")]
+
+    def test_run_threaded_reload(self, mocker: MockerFixture):
+        """Positive unit test for Service._run_threaded() method with a requested configuration reload. It contains
+        the following steps:
+        - build a Service via _make_threaded_service() with a pending reload request
+        - mock Service.reload_config() and the fan mode check job to exit with code 100 when both zones reached
+          their arbitrated level
+        - ASSERT: the configuration is reloaded once, new workers are started and they apply the levels
+        - ASSERT: the worker threads are stopped
+        """
+        service = self._make_threaded_service(mocker)
+        service.reload_requested = True
+
+        def reload_config() -> bool:
+            assert not [t for t in threading.enumerate() if t.name.startswith("smfc-CONST")]
+            service.reload_requested = False
+            return True
+
+        def check_fan_mode() -> None:
+            if service.applied_levels == {0: 40, 1: 70}:
+                sys.exit(100)
+
+        mock_reload = MagicMock(side_effect=reload_config)
+        mocker.patch.object(service, "reload_config", mock_reload)
+        service.scheduler.jobs()[0].target.side_effect = check_fan_mode
+        with pytest.raises(SystemExit) as cm:
+            service._run_threaded()  # pylint: disable=protected-access
+        assert cm.value.code == 100
+        mock_reload.assert_called_once()
+        assert not [t for t in threading.enumerate() if t.name.startswith("smfc-CONST")]
+
+    def test_run_threaded_reload_stuck_worker(self, mocker: MockerFixture):
+        """Negative unit test for Service._run_threaded() method with a worker stuck in a read at a configuration
+        reload. It contains the following steps:
+        - build a Service via _make_threaded_service(), the first poll() of CONST:1 requests a reload and blocks
+          until the end of the test, the other polls set the level of the section
+        - mock Service.reload_config() and the fan mode check job to exit with code 100 when both zones reached
+          their arbitrated level
+        - ASSERT: the stuck worker is logged and abandoned after Service.WORKER_STOP_TIMEOUT, the configuration is
+          reloaded and the new workers apply the levels
+        """
+        service = self._make_threaded_service(mocker)
+        release = threading.Event()
+        blocked = []
+
+        def poll(fc) -> None:
+            if fc.name == "CONST:1" and not blocked:
+                blocked.append(fc)
+                service.reload_requested = True
+                release.wait(10.0)
+            fc.last_level = fc.config.level
+
+        def reload_config() -> bool:
+            service.reload_requested = False
+            return True
+
+        def check_fan_mode() -> None:
+            if service.applied_levels == {0: 40, 1: 70}:
+                sys.exit(100)
+
+        mocker.patch.object(ConstFc, "poll", autospec=True, side_effect=poll)
+        mock_reload = MagicMock(side_effect=reload_config)
+        mocker.patch.object(service, "reload_config", mock_reload)
+        mock_msg = MagicMock()
+        mocker.patch.object(service.log, "msg", mock_msg)
+        service.scheduler.jobs()[0].target.side_effect = check_fan_mode
+        start = time.monotonic()
+        try:
+            with pytest.raises(SystemExit) as cm:
+                service._run_threaded()  # pylint: disable=protected-access
+        finally:
+            release.set()
+        assert cm.value.code == 100
+        assert time.monotonic() - start < 5.0
+        mock_reload.assert_called_once()
+        mock_msg.assert_any_call(Log.LOG_ERROR, "Worker thread(s) ['smfc-CONST:1'] did not stop in "
+                                                f"{Service.WORKER_STOP_TIMEOUT}s (stuck in a read?), abandoned")
+
+    def test_run_threaded_own_zone_drop_to_zero(self, mocker: MockerFixture):
+        """Positive unit test for Service._run_threaded() method with a controller dropping to 0% in its own zone.
+        It contains the following steps:
+        - build a Service via _make_threaded_service() with CONST:1 (zone 1) only, its poll() returns 60% first,
+          then 0% (e.g. min_level=0)
+        - mock the fan mode check job to exit with code 100 when zone 1 is set to 0% (101 after 5 sec)
+        - ASSERT: zone 1 is written with 60%, then with 0% like in the other execution modes
+        """
+        service = self._make_threaded_service(mocker)
+        service.controllers = service.controllers[1:]
+        levels = iter([60])
+
+        def poll(fc) -> None:
+            fc.last_level = next(levels, 0)
+
+        deadline = time.monotonic() + 5.0
+
+        def check_fan_mode() -> None:
+            if service.applied_levels == {1: 0}:
+                sys.exit(100)
+            if time.monotonic() > deadline:
+                sys.exit(101)
+
+        mocker.patch.object(ConstFc, "poll", autospec=True, side_effect=poll)
+        service.scheduler.jobs()[0].target.side_effect = check_fan_mode
+        with pytest.raises(SystemExit) as cm:
+            service._run_threaded()  # pylint: disable=protected-access
+        assert cm.value.code == 100
+        assert [c.args for c in service.ipmi.set_fan_level.call_args_list] == [(1, 60), (1, 0)]
+
+    def test_sighup_handler(self) -> None:
+        """Positive unit test for Service._sighup_handler() method. It contains the following steps:
+        - instantiate Service and call Service._sighup_handler() directly
+        - ASSERT: a configuration reload is requested (and nothing else happens in the signal handler)
+        """
+        service = Service()
+        service.reload_requested = False
+        service._sighup_handler(signal.SIGHUP, None)  # pylint: disable=protected-access
+        assert service.reload_requested is True
+
+    @staticmethod
+    def _create_const_config_file(td: TestData, consts: List[tuple], fan_mode_delay: int = 10) -> str:
+        """Create a configuration file with CONST fan controllers only.
+        Args:
+            td (TestData): test data
+            consts (List[tuple]): list of (section, ipmi_zone, level) tuples
+            fan_mode_delay (int): value of the [Ipmi] fan_mode_delay= parameter
+        Returns:
+            str: path of the configuration file
+        """
+        my_config = ConfigParser()
+        my_config[Config.CS_IPMI] = {Config.CV_IPMI_COMMAND: td.create_ipmi_command(),
+                                     Config.CV_IPMI_FAN_MODE_DELAY: str(fan_mode_delay)}
+        for section, zone, level in consts:
+            my_config[section] = {Config.CV_ENABLED: "1", Config.CV_IPMI_ZONE: zone, Config.CV_CONST_LEVEL: str(level)}
+        return td.create_config_file(my_config)
+
+    def _make_reload_service(self, mocker: MockerFixture, td: TestData) -> Service:
+        """Build a Service running two CONST controllers for unit-testing reload_config(): CONST (zone 0, 40%) and
+        CONST:1 (zone 1, 50%)."""
+        mocker.patch("builtins.print", MagicMock())
+        service = Service()
+        service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
+        service.ipmi = MagicMock()
+        service.config_file = self._create_const_config_file(td, [("CONST", "0", 40), ("CONST:1", "1", 50)])
+        service.config = Config(service.config_file)
+        service.controllers = [service._create_controller(cfg)  # pylint: disable=protected-access
+                               for cfg in service._enabled_configs(service.config)]  # pylint: disable=protected-access
+        service.applied_levels = {0: 40, 1: 50}
+        service.arbiter = ZoneArbiter()
+        service.sensor_process = None
+        service._setup_controllers()  # pylint: disable=protected-access
+        service.scheduler = service._create_scheduler()  # pylint: disable=protected-access
+        service.reload_requested = True
+        return service
+
+    def test_reload_config(self, mocker: MockerFixture, td: TestData):
+        """Positive unit test for Service.reload_config() method. It contains the following steps:
+        - build a Service via _make_reload_service() with a cached level of a zone 3 too
+        - reload a configuration where CONST is changed to 45%, CONST:1 is unchanged, a new CONST:2 (zone 2, 70%)
+          is added and the [Ipmi] section is changed
+        - ASSERT: the reload is applied, the request is cleared, the controller list is updated in place
+        - ASSERT: the CONST:1 controller is kept (the same instance), CONST and CONST:2 are new instances
+        - ASSERT: the cached levels of the controlled zones are kept, the level of zone 3 is dropped, and the
+          Ipmi instance is not used (no fan mode change, no fan level write)
+        - ASSERT: the [Ipmi] change is reported and ignored
+        - ASSERT: the scheduler has the jobs of the new controllers
+        """
+        service = self._make_reload_service(mocker, td)
+        service.applied_levels[3] = 30
+        controllers = service.controllers
+        const0, const1 = controllers
+        ipmi_config = service.config.ipmi
+        mock_log = MagicMock()
+        mocker.patch.object(service.log, "msg", mock_log)
+        service.config_file = self._create_const_config_file(
+            td, [("CONST", "0", 45), ("CONST:1", "1", 50), ("CONST:2", "2", 70)], fan_mode_delay=5)
+        assert service.reload_config() is True
+        assert service.reload_requested is False
+        assert service.controllers is controllers
+        assert [fc.name for fc in controllers] == ["CONST", "CONST:1", "CONST:2"]
+        assert controllers[0] is not const0 and controllers[0].config.level == 45
+        assert controllers[1] is const1
+        assert not service.shared_zones
+        assert not [fc for fc in controllers if fc.deferred_apply]
+        assert service.applied_levels == {0: 40, 1: 50}
+        service.ipmi.set_fan_level.assert_not_called()
+        service.ipmi.set_fan_mode.assert_not_called()
+        assert service.config.ipmi is ipmi_config
+        assert "[Ipmi] section are ignored" in str(mock_log.call_args_list)
+        assert "1 fan controller(s) kept, 1 changed, 1 added, 0 removed" in str(mock_log.call_args_list)
+        assert {job.name for job in service.scheduler.jobs()} == {"CONST", "CONST:1", "CONST:2", "fan mode check"}
+
+    def test_reload_config_rebuilds_hwmon_index(self, mocker: MockerFixture, td: TestData):
+        """Positive unit test for Service.reload_config() method with new fan controllers reading hwmon files. It
+        contains the following steps:
+        - build a Service via _make_reload_service() with a mocked hwmon index and a mocked CpuFc class
+        - reload a configuration where CONST is changed to 45%
+        - ASSERT: the hwmon index is not rebuilt (no new controller reads hwmon files)
+        - reload a configuration where a new CPU section (zone 2) is added
+        - ASSERT: the hwmon index is rebuilt once, before the CPU fan controller is created with it
+        - let the rebuild fail and reload the configuration with a changed CPU section
+        - ASSERT: the error is logged and the CPU fan controller is created with the previous index
+        """
+        service = self._make_reload_service(mocker, td)
+        service.udevc = MagicMock()
+        service.hwmon_index = MagicMock()
+
+        def create_cpufc(log, udevc, ipmi, cfg, hwmon_index):  # pylint: disable=unused-argument
+            fc = MagicMock(config=cfg, last_level=0)
+            fc.name = cfg.section
+            return fc
+
+        mock_cpufc = mocker.patch("smfc.service.CpuFc", MagicMock(side_effect=create_cpufc))
+        manager = MagicMock()
+        manager.attach_mock(service.hwmon_index.rebuild, "rebuild")
+        manager.attach_mock(mock_cpufc, "CpuFc")
+        service.config_file = self._create_const_config_file(td, [("CONST", "0", 45), ("CONST:1", "1", 50)])
+        assert service.reload_config() is True
+        service.hwmon_index.rebuild.assert_not_called()
+        my_config = ConfigParser()
+        my_config.read(service.config_file)
+        my_config[Config.CS_CPU] = {Config.CV_ENABLED: "1", Config.CV_IPMI_ZONE: "2"}
+        service.config_file = td.create_config_file(my_config)
+        assert service.reload_config() is True
+        assert [c[0] for c in manager.mock_calls] == ["rebuild", "CpuFc"]
+        assert mock_cpufc.call_args.args[4] is service.hwmon_index
+        service.hwmon_index.rebuild.side_effect = OSError("udev failed")
+        mock_log = MagicMock()
+        mocker.patch.object(service.log, "msg", mock_log)
+        my_config[Config.CS_CPU][Config.CV_IPMI_ZONE] = "3"
+        service.config_file = td.create_config_file(my_config)
+        assert service.reload_config() is True
+        mock_log.assert_any_call(Log.LOG_ERROR, "Cannot rebuild the hwmon index (udev failed).")
+        assert mock_cpufc.call_count == 2
+
+    def test_reload_config_zone_not_shared(self, mocker: MockerFixture, td: TestData):
+        """Positive unit test for Service.reload_config() method with a kept controller that is not deferred
+        anymore. It contains the following steps:
+        - build a Service via _make_reload_service(), add a stub CPU controller at 60% on zone 0, so CONST (40%)
+          shares zone 0 and the zone is applied at 60% (the level of the winner CPU)
+        - reload a configuration where CONST and CONST:1 are unchanged and CPU is removed
+        - ASSERT: CONST is kept and it applies its own level again
+        - ASSERT: its last level (40%) is written to zone 0 right away, so the BMC, the cached applied levels and
+          the snapshot agree, the level of zone 1 is not written again
+        """
+        service = self._make_reload_service(mocker, td)
+        const0, const1 = service.controllers
+        cpu = MagicMock(last_level=60, last_temp=50.0)
+        cpu.name = "CPU"
+        cpu.config = create_const_config(section="CPU", ipmi_zone=[0])
+        service.controllers.append(cpu)
+        service._setup_controllers()  # pylint: disable=protected-access
+        assert const0.deferred_apply and not const1.deferred_apply
+        const0.poll()
+        service.applied_levels = {0: 60, 1: 50}
+        service.config_file = self._create_const_config_file(td, [("CONST", "0", 40), ("CONST:1", "1", 50)])
+        assert service.reload_config() is True
+        assert service.controllers == [const0, const1]
+        assert not const0.deferred_apply
+        service.ipmi.set_fan_level.assert_called_once_with(0, 40)
+        assert service.applied_levels == {0: 40, 1: 50}
+        assert service.zone_level_changes == {0: 1}
+
+    @pytest.mark.parametrize("error", ["invalid", "missing", "disabled", "controller"])
+    def test_reload_config_n(self, mocker: MockerFixture, td: TestData, error: str):
+        """Negative unit test for Service.reload_config() method. It contains the following steps:
+        - build a Service via _make_reload_service()
+        - reload an invalid configuration, a missing file, a configuration without an enabled fan controller, or
+          a configuration where a new fan controller cannot be created
+        - ASSERT: the reload fails, the request is cleared, the running configuration and controllers are kept
+        """
+        service = self._make_reload_service(mocker, td)
+        config = service.config
+        controllers = list(service.controllers)
+        if error == "invalid":
+            service.config_file = self._create_const_config_file(td, [("CONST", "0", 200)])
+        elif error == "missing":
+            service.config_file = "/nonexistent/smfc.conf"
+        elif error == "disabled":
+            service.config_file = self._create_const_config_file(td, [])
+        else:
+            service.config_file = self._create_const_config_file(td, [("CONST", "0", 40), ("CONST:1", "1", 60)])
+            mocker.patch("smfc.service.ConstFc", MagicMock(side_effect=RuntimeError("no device")))
+        assert service.reload_config() is False
+        assert service.reload_requested is False
+        assert service.config is config
+        assert service.controllers == controllers
+        assert service.applied_levels == {0: 40, 1: 50}
+
+    @staticmethod
+    def _make_state_service(mocker: MockerFixture, tmp_path) -> Service:
+        """Build a Service with a state store and three stub controllers for unit-testing the warm start: CONST
+        (zone 0, applies its own level), CONST:1 (zone 1, deferred) and CONST:2 (zone 2, applies its own level)."""
+        mocker.patch("builtins.print", MagicMock())
+        service = Service()
+        service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
+        service.state = StateStore(str(tmp_path / "state.json"), 60.0)
+        service.applied_levels = {}
+        service.controllers = []
+        for name, zones, deferred in [("CONST", [0], False), ("CONST:1", [1], True), ("CONST:2", [2], False)]:
+            fc = MagicMock(deferred_apply=deferred)
+            fc.name = name
+            fc.config = create_const_config(section=name, ipmi_zone=zones)
+            service.controllers.append(fc)
+        return service
+
+    @pytest.mark.parametrize("keep_levels", [True, False], ids=["fan-mode-kept", "fan-mode-changed"])
+    def test_restore_state(self, mocker: MockerFixture, tmp_path, keep_levels: bool):
+        """Positive unit test for Service._restore_state() method. It contains the following steps:
+        - build a Service via _make_state_service() and save a checkpoint with the applied levels of zones 0, 1, 2
+          and 5: CONST at 40% (zone 0 holds 40%), CONST:1 at 60% (zone 1 holds 70%), CONST:2 at 50% (zone 2
+          holds 30%), and a controller of an unknown section
+        - change the configuration of CONST:2, then call Service._restore_state() with and without kept levels
+        - ASSERT: with kept levels the applied levels of the controlled zones are restored; CONST gets its last
+          level back, the deferred CONST:1 gets its last (desired) level back
+        - ASSERT: without kept levels no applied level is restored and CONST gets its state without the last level
+        - ASSERT: CONST:2 with a changed configuration is not restored
+        """
+        service = self._make_state_service(mocker, tmp_path)
+        for fc, level in zip(service.controllers, [40, 60, 50]):
+            fc.save_state.return_value = {"last_level": level, "last_temp": 0.0}
+        unknown = MagicMock(config=create_const_config(section="CONST:9"))
+        unknown.name = "CONST:9"
+        unknown.save_state.return_value = {"last_level": 90}
+        service.state.save(service.controllers + [unknown], {0: 40, 1: 70, 2: 30, 5: 20})
+        service.controllers[2].config = create_const_config(section="CONST:2", ipmi_zone=[2], level=55)
+        service._restore_state(keep_levels)  # pylint: disable=protected-access
+        const0, const1, const2 = service.controllers
+        const1.restore_state.assert_called_once()
+        assert const1.restore_state.call_args[0][0]["last_level"] == 60
+        const2.restore_state.assert_not_called()
+        if keep_levels:
+            assert service.applied_levels == {0: 40, 1: 70, 2: 30}
+            assert const0.restore_state.call_args[0][0]["last_level"] == 40
+        else:
+            assert not service.applied_levels
+            assert "last_level" not in const0.restore_state.call_args[0][0]
+
+    def test_restore_state_level_not_held(self, mocker: MockerFixture, tmp_path):
+        """Positive unit test for Service._restore_state() method. It contains the following steps:
+        - build a Service via _make_state_service() and save a checkpoint where CONST is at 45% but zone 0 holds
+          40%, and an invalid state of CONST:1
+        - ASSERT: CONST gets its state without the last level (its first poll applies the level)
+        - ASSERT: the invalid state is logged and skipped
+        - ASSERT: a missing checkpoint is a cold start (nothing is restored)
+        """
+        service = self._make_state_service(mocker, tmp_path)
+        for fc, level in zip(service.controllers, [45, 60, 50]):
+            fc.save_state.return_value = {"last_level": level, "last_temp": 0.0}
+        service.state.save(service.controllers, {0: 40, 1: 60, 2: 50})
+        service.controllers[1].restore_state.side_effect = KeyError("filter")
+        mock_log = MagicMock()
+        mocker.patch.object(service.log, "msg", mock_log)
+        service._restore_state(True)  # pylint: disable=protected-access
+        assert "last_level" not in service.controllers[0].restore_state.call_args[0][0]
+        assert "CONST:1: invalid state" in str(mock_log.call_args_list)
+        assert "['CONST', 'CONST:2'] restored" in str(mock_log.call_args_list)
+        service = self._make_state_service(mocker, tmp_path / "missing")
+        service._restore_state(True)  # pylint: disable=protected-access
+        assert not service.applied_levels
+        service.controllers[0].restore_state.assert_not_called()
+
+    def test_save_state(self, mocker: MockerFixture, tmp_path):
+        """Positive and negative unit test for Service._save_state() method. It contains the following steps:
+        - build a Service via _make_state_service() with applied levels, save a checkpoint with and without the
+          applied levels, then with a failing write
+        - ASSERT: the checkpoint holds the applied levels only if they are not dropped
+        - ASSERT: a failed write is logged, no exception is raised
+        """
+        service = self._make_state_service(mocker, tmp_path)
+        for fc in service.controllers:
+            fc.save_state.return_value = {"last_level": 40}
+        service.applied_levels = {0: 40, 1: 40}
+        service._save_state()  # pylint: disable=protected-access
+        assert service.state.load()["applied_levels"] == {0: 40, 1: 40}
+        service._save_state(True)  # pylint: disable=protected-access
+        assert service.state.load()["applied_levels"] == {}
+        mocker.patch("os.replace", MagicMock(side_effect=OSError("read-only file system")))
+        mock_log = MagicMock()
+        mocker.patch.object(service.log, "msg", mock_log)
+        service._save_state()  # pylint: disable=protected-access
+        assert "Cannot write the state file" in str(mock_log.call_args_list)
+
+    def test_save_state_threaded(self, mocker: MockerFixture, tmp_path):
+        """Positive unit test for Service._save_state() method in threaded mode. It contains the following steps:
+        - build a Service via _make_state_service() and attach a stub worker with a record to every controller
+        - save a checkpoint
+        - ASSERT: the states of the records are saved, the live controllers are not accessed
+        """
+        service = self._make_state_service(mocker, tmp_path)
+        service.workers = [MagicMock(fc=fc, record=ControllerRecord({}, {"last_level": 55}))
+                           for fc in service.controllers]
+        service._save_state()  # pylint: disable=protected-access
+        for fc in service.controllers:
+            fc.save_state.assert_not_called()
+        assert all(c["last_level"] == 55 for c in service.state.load()["controllers"].values())
+
+    @pytest.mark.parametrize("exit_level", [Config.DV_IPMI_EXIT_LEVEL, Config.EXIT_LEVEL_NONE])
+    def test_exit_func_saves_state(self, mocker: MockerFixture, exit_level: int):
+        """Positive unit test for Service.exit_func() method with a state store. It contains the following steps:
+        - mock atexit.unregister() and print()
+        - instantiate Service with a Log, a Config, an Ipmi stub, one controller and a mocked Service._save_state()
+        - call Service.exit_func() with the default exit level and with exit_level=-1
+        - ASSERT: the last checkpoint is written, the applied levels are dropped only if the exit level is applied
+        """
+        mocker.patch("atexit.unregister", MagicMock())
+        mocker.patch("builtins.print", MagicMock())
+        service = Service()
+        service.log = Log(Log.LOG_INFO, Log.LOG_STDOUT)
+        service.config = create_exit_config(exit_level=exit_level)
+        service.ipmi = MagicMock()
+        service.controllers = [MagicMock(config=MockControllerConfig(ipmi_zone=[0]))]
+        service.state = MagicMock()
+        mock_save_state = MagicMock()
+        mocker.patch.object(service, "_save_state", mock_save_state)
+        service.exit_func()
+        mock_save_state.assert_called_once_with(exit_level != Config.EXIT_LEVEL_NONE)
+
+    def test_create_scheduler_state_checkpoint(self, mocker: MockerFixture, tmp_path):
+        """Positive unit test for Service._create_scheduler() method with a state store. It contains the following
+        steps:
+        - mock print() and time.monotonic() (returns 0.0)
+        - build a Service via _make_state_service() with state_interval=15 and call Service._create_scheduler()
+        - ASSERT: the state checkpoint job runs every 15 sec, first after 15 sec
+        """
+        service = self._make_state_service(mocker, tmp_path)
+        mocker.patch("time.monotonic", MagicMock(return_value=0.0))
+        service.config = MagicMock()
+        service.config.service.state_interval = 15.0
+        scheduler = service._create_scheduler()  # pylint: disable=protected-access
+        job = [j for j in scheduler.jobs() if j.name == "state checkpoint"][0]
+        assert (job.period, job.deadline) == (15.0, 15.0)
+        # pylint: disable=protected-access,comparison-with-callable
+        assert job.target == service._save_state
+
+    @pytest.mark.parametrize("error", [False, True], ids=["started", "start-failed"])
+    def test_start_sensor_process(self, mocker: MockerFixture, error: bool):
+        """Positive and negative unit test for Service._start_sensor_process() method. It contains the following
+        steps:
+        - mock print() and smfc.service.SensorProcess (its start() raises OSError in the negative case)
+        - build a Service with a FanController and a ConstFc, call Service._start_sensor_process()
+        - ASSERT: the sensor process is created with [Service] sensor_timeout, the channel of the FanController is
+          started and the sensor process is attached to the FanController only
+        - ASSERT: a start failure is logged and the service continues without a sensor process
+        """
+        mocker.patch("builtins.print", MagicMock())
+        mock_proc = MagicMock(pids={"CPU": 1234}, timeout=2.0)
+        if error:
+            mock_proc.start.side_effect = OSError("fork failed")
+        mock_class = mocker.patch("smfc.service.SensorProcess", MagicMock(return_value=mock_proc))
+        service = Service()
+        service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
+        service.config = MagicMock()
+        service.config.service.sensor_timeout = 2.0
+        fc = FanController.__new__(FanController)
+        fc.name = "CPU"
+        const_fc = ConstFc.__new__(ConstFc)
+        service.controllers = [fc, const_fc]
+        service._start_sensor_process()  # pylint: disable=protected-access
+        mock_class.assert_called_once_with(2.0)
+        mock_proc.start.assert_called_once_with(["CPU"])
+        if error:
+            assert service.sensor_process is None
+            assert fc.sensor_process is None
+        else:
+            assert service.sensor_process is mock_proc
+            assert fc.sensor_process is mock_proc
+        assert not hasattr(const_fc, "sensor_process")
+
     def test_check_fan_mode_no_drift(self, mocker: MockerFixture):
         """Positive unit test for Service._check_fan_mode() method. It contains the following steps:
         - mock print(), Ipmi.get_fan_mode() returning FULL_MODE, Ipmi.set_fan_mode(), Ipmi.set_fan_level()
@@ -1150,16 +1793,23 @@ class TestService:
         assert service.exporter is None, f"{f}: exporter must be None when disabled"
         assert mock_start.called is False, f"{f}: _start_exporter() must not be called when disabled"
 
-    def test_exporter_enabled_started(self, mocker: MockerFixture):
+    @pytest.mark.parametrize("history_size", [720, 0])
+    def test_exporter_enabled_started(self, mocker: MockerFixture, history_size: int):
         """Positive unit test for Service._start_exporter() method. It contains the following steps:
         - mock smfc.service.Exporter class to return a MagicMock instance
-        - instantiate Service with a Log and a MagicMock config (exporter.enabled=True, bind_address, port)
+        - instantiate Service with a Log and a MagicMock config (exporter.enabled=True, bind_address, port,
+          history_size)
         - call Service._start_exporter()
         - ASSERT: Exporter class is constructed exactly once
         - ASSERT: Exporter.start() is called exactly once on the constructed instance
         - ASSERT: Exporter is constructed with kwargs bind_address="127.0.0.1"
         - ASSERT: Exporter is constructed with kwargs port=9099
         - ASSERT: service.exporter is the Exporter instance returned by the mocked class
+        - ASSERT: the exporter serves the snapshot of the publisher of the service and caches its responses per
+          generation of the publisher
+        - ASSERT: the publisher records its snapshots in a history of history_size points per tier, which is
+          served on /history (no history with history_size=0)
+        - ASSERT: the startup snapshot is published without recording it in the history
         """
         f = "TestService.test_exporter_enabled_started"
         mock_exporter = MagicMock()
@@ -1171,20 +1821,33 @@ class TestService:
         service.config.exporter.enabled = True
         service.config.exporter.bind_address = "127.0.0.1"
         service.config.exporter.port = 9099
+        service.config.exporter.history_size = history_size
+        mock_publish = MagicMock()
+        mocker.patch.object(service, "_publish_snapshot", mock_publish)
         service._start_exporter()  # pylint: disable=protected-access
+        mock_publish.assert_called_once_with(record=False)
         assert mock_exporter_cls.call_count == 1, f"{f}: Exporter() must be constructed once"
         assert mock_exporter.start.call_count == 1, f"{f}: start() must be called once"
         kwargs = mock_exporter_cls.call_args.kwargs
         assert kwargs["bind_address"] == "127.0.0.1"
         assert kwargs["port"] == 9099
         assert service.exporter is mock_exporter
+        assert kwargs["snapshot_fn"] == service.publisher.snapshot, f"{f}: the published snapshot must be served"
+        assert kwargs["generation_fn"] == service.publisher.generation, f"{f}: responses cached per generation"
+        if history_size:
+            assert service.publisher.history.size == history_size, f"{f}: history of history_size points"
+            assert kwargs["history_fn"] == service.publisher.history.query, f"{f}: the history must be served"
+        else:
+            assert service.publisher.history is None, f"{f}: no history with history_size=0"
+            assert kwargs["history_fn"] is None, f"{f}: no /history endpoint without history"
 
     def test_exporter_bind_failure_does_not_kill_service(self, mocker: MockerFixture):
         """Negative unit test for Service._start_exporter() method. It contains the following steps:
         - mock smfc.service.Exporter to return an instance whose start() raises OSError("port already in use")
         - instantiate Service with a Log and a MagicMock config (exporter.enabled=True)
         - call Service._start_exporter() (no exception should propagate)
-        - ASSERT: service.exporter is None after the bind failure (error swallowed, daemon continues)
+        - ASSERT: service.exporter is None after the bind failure (error swallowed, daemon continues), and no
+          snapshot is published
         """
         f = "TestService.test_exporter_bind_failure_does_not_kill_service"
         mock_exporter = MagicMock()
@@ -1197,8 +1860,51 @@ class TestService:
         service.config.exporter.enabled = True
         service.config.exporter.bind_address = "0.0.0.0"
         service.config.exporter.port = 9099
+        service.config.exporter.history_size = 720
         service._start_exporter()  # pylint: disable=protected-access
         assert service.exporter is None, f"{f}: exporter must be None after a bind failure"
+        assert service.publisher is None, f"{f}: no snapshot is published without an exporter"
+
+    def test_publish_snapshot(self, mocker: MockerFixture):
+        """Positive/negative unit test for Service._publish_snapshot() method. It contains the following steps:
+        - instantiate Service with a Log (mocked msg()) and no publisher
+        - call Service._publish_snapshot()
+        - ASSERT: nothing happens without a publisher
+        - attach a MagicMock publisher and call Service._publish_snapshot()
+        - ASSERT: the state of the service is published
+        - let publish() raise RuntimeError and call Service._publish_snapshot() (no exception should propagate)
+        - ASSERT: the error is logged
+        """
+        f = "TestService.test_publish_snapshot"
+        service = Service()
+        service.log = Log(Log.LOG_ERROR, Log.LOG_STDOUT)
+        mock_msg = MagicMock()
+        mocker.patch.object(service.log, "msg", mock_msg)
+        service._publish_snapshot()  # pylint: disable=protected-access
+        assert mock_msg.call_count == 0, f"{f}: nothing to do without a publisher"
+        service.publisher = MagicMock()
+        service._publish_snapshot()  # pylint: disable=protected-access
+        service.publisher.publish.assert_called_once_with(service, None, True)
+        service.publisher.publish.side_effect = RuntimeError("broken state")
+        service._publish_snapshot()  # pylint: disable=protected-access
+        mock_msg.assert_called_once_with(Log.LOG_ERROR, "Snapshot publication failed: broken state")
+
+    def test_publish_snapshot_threaded(self):
+        """Positive unit test for Service._publish_snapshot() method in threaded mode. It contains the following
+        steps:
+        - instantiate Service with a MagicMock publisher and two stub workers with records
+        - call Service._publish_snapshot()
+        - ASSERT: the controller entries of the records are published instead of the live controllers
+        """
+        service = Service()
+        service.publisher = MagicMock()
+        service.workers = [MagicMock(fc=MagicMock(), record=ControllerRecord({"section": name}, {}))
+                           for name in ("CPU", "HD")]
+        for worker, name in zip(service.workers, ("CPU", "HD")):
+            worker.fc.name = name
+        service._publish_snapshot()  # pylint: disable=protected-access
+        service.publisher.publish.assert_called_once_with(service, {"CPU": {"section": "CPU"},
+                                                                    "HD": {"section": "HD"}}, True)
 
     def test_exit_func_stops_running_exporter(self, mocker: MockerFixture):
         """Positive unit test for Service.exit_func() method. It contains the following steps:
@@ -1238,14 +1944,77 @@ class TestService:
         # The exit level is still applied even though stop() raised.
         service.ipmi.platform.end.assert_called_once_with([0, 1], Config.DV_IPMI_EXIT_LEVEL)
 
+    def test_hotplug_monitor_started(self, mocker: MockerFixture):
+        """Positive unit test for Service._start_hotplug_monitor() method. It contains the following steps:
+        - mock smfc.service.HotplugMonitor class to return a MagicMock instance
+        - instantiate Service with a Log, a udev context, a hwmon index and a controller list
+        - call Service._start_hotplug_monitor()
+        - ASSERT: HotplugMonitor is constructed with the log, the udev context, the controllers and the hwmon index
+        - ASSERT: HotplugMonitor.start() is called once and service.hotplug is the instance
+        """
+        mock_hotplug = MagicMock()
+        mock_hotplug_cls = MagicMock(return_value=mock_hotplug)
+        mocker.patch("smfc.service.HotplugMonitor", mock_hotplug_cls)
+        service = Service()
+        service.log = Log(Log.LOG_NONE, Log.LOG_STDOUT)
+        service.udevc = MagicMock()
+        service.hwmon_index = MagicMock()
+        service.controllers = []
+        service._start_hotplug_monitor()  # pylint: disable=protected-access
+        mock_hotplug_cls.assert_called_once_with(service.log, service.udevc, service.controllers,
+                                                 service.hwmon_index)
+        mock_hotplug.start.assert_called_once()
+        assert service.hotplug is mock_hotplug
+
+    def test_hotplug_monitor_start_failure_does_not_kill_service(self, mocker: MockerFixture):
+        """Negative unit test for Service._start_hotplug_monitor() method. It contains the following steps:
+        - mock smfc.service.HotplugMonitor to return an instance whose start() raises OSError
+        - call Service._start_hotplug_monitor() (no exception should propagate)
+        - ASSERT: service.hotplug is None and the error is logged
+        """
+        mock_print = MagicMock()
+        mocker.patch("builtins.print", mock_print)
+        mock_hotplug = MagicMock()
+        mock_hotplug.start.side_effect = OSError("permission denied")
+        mocker.patch("smfc.service.HotplugMonitor", MagicMock(return_value=mock_hotplug))
+        service = Service()
+        service.log = Log(Log.LOG_ERROR, Log.LOG_STDOUT)
+        service.udevc = MagicMock()
+        service.hwmon_index = MagicMock()
+        service.controllers = []
+        service._start_hotplug_monitor()  # pylint: disable=protected-access
+        assert service.hotplug is None
+        assert "Hotplug monitor failed to start" in mock_print.call_args.args[0]
+
+    @pytest.mark.parametrize("stop_error", [None, RuntimeError("stop failed")], ids=["stop-ok", "stop-raises"])
+    def test_exit_func_stops_hotplug_monitor(self, mocker: MockerFixture, stop_error):
+        """Positive/negative unit test for Service.exit_func() method. It contains the following steps:
+        - mock print()
+        - instantiate Service with a Log, a Config, a MagicMock ipmi and a MagicMock hotplug monitor
+          (its stop() raises in the negative case)
+        - call Service.exit_func()
+        - ASSERT: hotplug.stop() is called exactly once
+        - ASSERT: platform.end() is called with the default exit level in both cases
+        """
+        mocker.patch("builtins.print", MagicMock())
+        service = Service()
+        service.log = Log(Log.LOG_INFO, Log.LOG_STDOUT)
+        service.config = create_exit_config()
+        service.ipmi = MagicMock()
+        service.hotplug = MagicMock()
+        service.hotplug.stop.side_effect = stop_error
+        service.exit_func()
+        assert service.hotplug.stop.call_count == 1
+        service.ipmi.platform.end.assert_called_once_with([0, 1], Config.DV_IPMI_EXIT_LEVEL)
+
     def test_collect_desired_levels(self, mocker: MockerFixture):
         """Positive unit test for Service._collect_desired_levels() method. It contains the following steps:
         - mock print()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi), set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi), set applied_levels={} and a new ZoneArbiter
         - attach three controllers: CPU (last_level=60), HD (last_level=0), CONST (last_level=50)
         - call Service._collect_desired_levels()
         - ASSERT: CPU controller is present in the collected names (level > 0)
-        - ASSERT: HD controller is absent from the collected names (last_level=0 is skipped)
+        - ASSERT: HD controller is present with level 0 (the arbiter removes it from its zones)
         - ASSERT: CONST controller is present in the collected names (ConstFc with level > 0)
         """
         f = "TestService.test_collect_desired_levels"
@@ -1255,7 +2024,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Create mock controllers
         cpu_fc = FanController.__new__(FanController)
@@ -1268,7 +2037,7 @@ class TestService:
         hd_fc = FanController.__new__(FanController)
         hd_fc.name = Config.CS_HD
         hd_fc.config = MockControllerConfig(ipmi_zone=[1])
-        hd_fc.last_level = 0  # Should be skipped (not yet computed)
+        hd_fc.last_level = 0  # Not yet computed, or dropped to 0 (min_level=0)
         hd_fc.last_temp = 0.0
         hd_fc.deferred_apply = True
 
@@ -1284,18 +2053,20 @@ class TestService:
         levels = service._collect_desired_levels()  # pylint: disable=protected-access
         names = [name for name, _, _, _ in levels]
         assert Config.CS_CPU in names, f"{f}: CPU controller should be collected"
-        assert Config.CS_HD not in names, f"{f}: HD controller with level 0 should be skipped"
+        assert (Config.CS_HD, [1], 0, 0.0) in levels, f"{f}: HD controller with level 0 should be collected"
         assert Config.CS_CONST in names, f"{f}: ConstFc with level > 0 should be collected"
 
     def test_apply_fan_levels_shared_zone(self, mocker: MockerFixture):
         """Positive unit test for Service._apply_fan_levels() method with shared zone arbitration. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach two deferred controllers on zone 1: HD at 45%/38.0C and NVME at 70%/42.5C
-        - call Service._apply_fan_levels()
+        - call Service._apply_fan_levels() with a LoopTiming instance
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 70) — the higher level wins
-        - ASSERT: service.applied_levels[1] is cached as 70
+        - ASSERT: service.applied_levels[1] is cached as 70, the IPMI write is recorded in the loop timing
+        - lower the NVME level to 60% and call Service._apply_fan_levels() again
+        - ASSERT: the level change of zone 1 is counted (the first level was not a change)
         - ASSERT: log output contains "winner: NVME=70%/42.5C"
         - ASSERT: log output contains "losers: HD=45%/38.0C"
         """
@@ -1309,7 +2080,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Two controllers on zone 1: HD at 45%, NVME at 70%
         hd_fc = FanController.__new__(FanController)
@@ -1327,12 +2098,20 @@ class TestService:
         nvme_fc.deferred_apply = True
 
         service.controllers = [hd_fc, nvme_fc]
+        service.timing = LoopTiming()
+        service.zone_level_changes = {}
 
         service._apply_fan_levels()  # pylint: disable=protected-access
         # Zone 1 should be set to 70% (the higher level wins)
         mock_set_fan_level.assert_called_once_with(1, 70)
         f = "TestService.test_apply_fan_levels_shared_zone"
         assert service.applied_levels[1] == 70, f"{f}: zone 1 should cache level 70"
+        assert service.timing.apply.count == 1, f"{f}: the IPMI write should be timed"
+        assert not service.zone_level_changes, f"{f}: the first level of a zone is not a change"
+        nvme_fc.last_level = 60
+        service._apply_fan_levels()  # pylint: disable=protected-access
+        assert service.applied_levels[1] == 60, f"{f}: zone 1 should cache level 60"
+        assert service.zone_level_changes == {1: 1}, f"{f}: the level change of zone 1 should be counted"
         # Log should mention the winner and losers for shared zones with temperatures
         log_output = str(mock_log_msg.call_args_list)
         assert "winner: NVME=70%/42.5C" in log_output, f"{f}: shared zone log should mention winner with temp"
@@ -1342,7 +2121,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with single-controller zone. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach a single deferred CPU controller on zone 0 at 60%/45.0C
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (0, 60)
@@ -1360,7 +2139,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Single controller on zone 0
         cpu_fc = FanController.__new__(FanController)
@@ -1383,7 +2162,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with single CONST controller. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach a single deferred CONST controller on zone 0 at level=50
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (0, 50)
@@ -1401,7 +2180,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Single CONST controller on zone 0
         const_fc = ConstFc.__new__(ConstFc)
@@ -1424,7 +2203,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with CONST winning a shared zone. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach two deferred controllers on zone 1: HD at 45%/38.0C and CONST at 80%
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 80) — CONST wins
@@ -1443,7 +2222,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # CONST at 80% wins over HD at 45% on zone 1
         hd_fc = FanController.__new__(FanController)
@@ -1473,7 +2252,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with CONST losing a shared zone. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach two deferred controllers on zone 1: HD at 70%/55.0C and CONST at 40%
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 70) — HD wins
@@ -1492,7 +2271,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # HD at 70% wins over CONST at 40% on zone 1
         hd_fc = FanController.__new__(FanController)
@@ -1522,7 +2301,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with mixed deferred/non-deferred controllers. It
         contains the following steps:
         - mock print(), Ipmi.set_fan_level()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach CPU (deferred=True) on zone 0 at 60% and HD (deferred=False) on zone 1 at 40%
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (0, 60) — only deferred CPU triggers IPMI
@@ -1538,7 +2317,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # CPU deferred on shared zone 0, HD non-deferred on non-shared zone 1
         cpu_fc = FanController.__new__(FanController)
@@ -1567,7 +2346,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with level caching. It contains the following
         steps:
         - mock print(), Ipmi.set_fan_level()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); pre-seed applied_levels={1: 70} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); pre-seed applied_levels={1: 70} and a new ZoneArbiter
         - attach a single deferred HD controller on zone 1 at 70% (same as cached level)
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is not called (level unchanged, IPMI call skipped by cache)
@@ -1580,7 +2359,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {1: 70}  # Already applied 70% to zone 1
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         hd_fc = FanController.__new__(FanController)
         hd_fc.name = Config.CS_HD
@@ -1600,7 +2379,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with three controllers on a shared zone. It
         contains the following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach three deferred controllers on zone 1: CPU 40%/50.0C, HD 60%/38.0C, NVME 50%/42.0C
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 60) — HD wins as highest
@@ -1620,7 +2399,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Three controllers on zone 1: CPU 40%, HD 60%, NVME 50%
         cpu_fc = FanController.__new__(FanController)
@@ -1658,7 +2437,7 @@ class TestService:
     def test_apply_fan_levels_equal_levels(self, mocker: MockerFixture):
         """Positive unit test for Service._apply_fan_levels() method with tied levels. It contains the following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach two deferred controllers on zone 1 with identical 70%: CPU at 55.0C and HD at 40.0C
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 70)
@@ -1677,7 +2456,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Two controllers on zone 1 with identical levels (70%)
         cpu_fc = FanController.__new__(FanController)
@@ -1709,7 +2488,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with partial multi-zone overlap. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach CPU on zones [0, 1] at 55%/48.0C and HD on zone [1] at 70%/42.0C, both deferred
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly twice (zone 0 and zone 1)
@@ -1731,7 +2510,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # CPU on zones [0, 1] at 55%, HD on zone [1] at 70%
         cpu_fc = FanController.__new__(FanController)
@@ -1769,7 +2548,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method exercising oscillation across calls. It contains
         the following steps:
         - mock print(), Ipmi.set_fan_level()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach a single deferred HD controller on zone 1 and run three calls with last_level 70 -> 50 -> 70
         - ASSERT: first call (level 70) triggers exactly 1 IPMI call
         - ASSERT: after step 1, service.applied_levels[1] is cached as 70
@@ -1787,7 +2566,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         hd_fc = FanController.__new__(FanController)
         hd_fc.name = Config.CS_HD
@@ -1992,7 +2771,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with four controllers on a shared zone. It
         contains the following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach four deferred controllers on zone 1: CPU 40%/45.0C, HD 60%/38.0C, NVME 50%/42.0C, GPU 75%/65.0C
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 75) — GPU wins
@@ -2012,7 +2791,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Four controllers on zone 1: CPU 40%, HD 60%, NVME 50%, GPU 75%
         cpu_fc = FanController.__new__(FanController)
@@ -2060,7 +2839,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with five controllers including CONST winner. It
         contains the following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach five deferred controllers on zone 1: CPU 40%, HD 60%, NVME 50%, GPU 55%, CONST 80%
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly once with (1, 80) — CONST wins
@@ -2081,7 +2860,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Five controllers on zone 1: CPU 40%, HD 60%, NVME 50%, GPU 55%, CONST 80%
         cpu_fc = FanController.__new__(FanController)
@@ -2138,7 +2917,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with three-zone overlap. It contains the
         following steps:
         - mock print(), Ipmi.set_fan_level(), Log.msg_to_stdout()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach CPU on zones [0,1,2] at 50%, HD on zones [1,2] at 65%, NVME on zone [2] at 80%, all deferred
         - call Service._apply_fan_levels()
         - ASSERT: Ipmi.set_fan_level() is called exactly three times (one per zone)
@@ -2159,7 +2938,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # CPU on zones [0, 1, 2] at 50%
         cpu_fc = FanController.__new__(FanController)
@@ -2202,14 +2981,51 @@ class TestService:
         assert service.applied_levels[1] == 65, f"{f}: zone 1 should cache 65"
         assert service.applied_levels[2] == 80, f"{f}: zone 2 should cache 80"
 
+    def test_apply_fan_levels_shared_zone_drop_to_zero(self, mocker: MockerFixture):
+        """Positive unit test for Service._apply_fan_levels() method with a controller dropping to level 0 in a
+        shared zone (min_level=0). It contains the following steps:
+        - mock print(), Ipmi.set_fan_level()
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
+        - attach two deferred controllers on zone 0: CPU at 60% and HD at 30%, call Service._apply_fan_levels()
+        - ASSERT: zone 0 is set to 60%
+        - drop the CPU level to 0% and call Service._apply_fan_levels() with the polled CPU controller only
+        - ASSERT: zone 0 is set to 30% (the level of HD), the CPU controller no longer contributes to the zone
+        """
+        f = "TestService.test_apply_fan_levels_shared_zone_drop_to_zero"
+        mocker.patch("builtins.print", MagicMock())
+        mock_set_fan_level = MagicMock()
+        mocker.patch("smfc.Ipmi.set_fan_level", mock_set_fan_level)
+        service = Service()
+        service.log = Log(Log.LOG_INFO, Log.LOG_STDOUT)
+        service.ipmi = Ipmi.__new__(Ipmi)
+        service.applied_levels = {}
+        service.arbiter = ZoneArbiter()
+        controllers = []
+        for name, level in ((Config.CS_CPU, 60), (Config.CS_HD, 30)):
+            fc = FanController.__new__(FanController)
+            fc.name = name
+            fc.config = MockControllerConfig(ipmi_zone=[0])
+            fc.last_level = level
+            fc.last_temp = 40.0
+            fc.deferred_apply = True
+            controllers.append(fc)
+        service.controllers = controllers
+        service._apply_fan_levels()  # pylint: disable=protected-access
+        mock_set_fan_level.assert_called_once_with(0, 60)
+        controllers[0].last_level = 0
+        service._apply_fan_levels(service._collect_desired_levels([controllers[0]]))  # pylint: disable=protected-access
+        assert mock_set_fan_level.call_args_list[-1].args == (0, 30), f"{f}: zone 0 should fall back to HD's level"
+        assert service.applied_levels[0] == 30, f"{f}: zone 0 should cache level 30"
+        assert service.arbiter.contributors(0) == [(Config.CS_HD, 30, 40.0)], f"{f}: CPU should not contribute"
+
     def test_apply_fan_levels_all_controllers_last_level_zero(self, mocker: MockerFixture):
         """Positive unit test for Service._apply_fan_levels() method with all controllers at last_level=0. It contains
         the following steps:
         - mock print(), Ipmi.set_fan_level()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach two deferred controllers on zone 1 (CPU and HD), both with last_level=0 (not yet computed)
         - call Service._apply_fan_levels()
-        - ASSERT: Ipmi.set_fan_level() is not called (all level-zero controllers skipped by _collect_desired_levels())
+        - ASSERT: Ipmi.set_fan_level() is not called (level-zero controllers do not contribute to the zone)
         """
         mock_print = MagicMock()
         mocker.patch("builtins.print", mock_print)
@@ -2219,7 +3035,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # Two controllers on zone 1, both with last_level=0 (not yet computed)
         cpu_fc = FanController.__new__(FanController)
@@ -2239,8 +3055,7 @@ class TestService:
         service.controllers = [cpu_fc, hd_fc]
 
         service._apply_fan_levels()  # pylint: disable=protected-access
-        # Both controllers have last_level=0, so they should be skipped in _collect_desired_levels
-        # No IPMI call should be made
+        # Both controllers have last_level=0, so the zone has no contributor: no IPMI call should be made
         f = "TestService.test_apply_fan_levels_all_controllers_last_level_zero"
         assert mock_set_fan_level.call_count == 0, f"{f}: controllers with last_level=0 should be skipped"
 
@@ -2288,7 +3103,7 @@ class TestService:
         """Positive unit test for Service._apply_fan_levels() method with multi-zone deferred caching across calls. It
         contains the following steps:
         - mock print(), Ipmi.set_fan_level()
-        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and last_desired=[]
+        - instantiate Service with a Log and Ipmi.__new__(Ipmi); set applied_levels={} and a new ZoneArbiter
         - attach a single deferred CPU controller on zones [0, 1] at 60% and run three successive calls
         - ASSERT: first call sets both zones (Ipmi.set_fan_level() called twice)
         - ASSERT: after the first call, service.applied_levels[0] equals 60
@@ -2306,7 +3121,7 @@ class TestService:
         service.log = Log(Log.LOG_DEBUG, Log.LOG_STDOUT)
         service.ipmi = Ipmi.__new__(Ipmi)
         service.applied_levels = {}
-        service.last_desired = []
+        service.arbiter = ZoneArbiter()
 
         # CPU on zones [0, 1] with deferred apply
         cpu_fc = FanController.__new__(FanController)
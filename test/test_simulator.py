@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+#
+#   test_simulator.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.simulator module (smfc-sim console script).
+#
+# pylint: disable=protected-access
+import io
+import pytest
+from mock import MagicMock
+from pytest_mock import MockerFixture
+from smfc import clock, Log
+from smfc.clock import SystemClock
+from smfc.config import Config
+from smfc.simulator import (EXIT_CONFIG_ERROR, EXIT_NO_CONTROLLER, EXIT_OK, RecordedTrace, SimulatedBmc,
+                            SimulatedFc, Simulator, SyntheticTrace, Timeline, main)
+from .test_config_builders import create_cpu_config, create_gpu_config, create_hd_config, create_nvme_config
+
+
+# Configuration of the simulation tests: a CPU controller in zone 0, an HD controller (2 disks) and a CONST
+# controller sharing zone 1, without IPMI delays.
+SIM_CONFIG = """
+[Ipmi]
+fan_mode_delay=0
+fan_level_delay=0
+[CPU]
+enabled=1
+ipmi_zone=0
+polling=2
+smoothing=1
+steps=7
+sensitivity=1
+min_temp=30
+max_temp=65
+min_level=30
+max_level=100
+[HD]
+enabled=1
+ipmi_zone=1
+polling=10
+smoothing=1
+hd_names=/dev/sda /dev/sdb
+[CONST]
+enabled=1
+ipmi_zone=1
+polling=30
+level=45
+"""
+
+# Trace of the simulation tests: the CPU jumps from 30C to 65C at 101 sec, the disks are at 40C and 50C.
+SIM_TRACE = """time,CPU,HD,HD/1
+0,30,40,50
+100,30,,
+101,65,,
+"""
+
+
+def _write(tmp_path, name: str, content: str) -> str:
+    """Write a test file and return its path."""
+    path = tmp_path / name
+    path.write_text(content, encoding="UTF-8")
+    return str(path)
+
+
+class TestSyntheticTrace:
+    """Unit test class for smfc.SyntheticTrace() class"""
+
+    def test_temperature(self) -> None:
+        """Positive unit test for SyntheticTrace.temperature() method. It contains the following steps:
+        - ASSERT: without noise the profile starts at `low`, peaks at `high` at half of the period
+        - ASSERT: the noise is repeatable with the same seed
+        """
+        trace = SyntheticTrace(30.0, 50.0, 100.0, 0.0)
+        assert trace.temperature("CPU", 0, 0.0) == pytest.approx(30.0)
+        assert trace.temperature("CPU", 0, 25.0) == pytest.approx(40.0)
+        assert trace.temperature("HD", 1, 50.0) == pytest.approx(50.0)
+        first = [SyntheticTrace(noise=1.0, seed=7).temperature("CPU", 0, t) for t in (0.0, 10.0)]
+        second = [SyntheticTrace(noise=1.0, seed=7).temperature("CPU", 0, t) for t in (0.0, 10.0)]
+        assert first == second and first[0] != 35.0
+
+    @pytest.mark.parametrize("low, high, period, noise", [(50.0, 40.0, 10.0, 0.0), (30.0, 40.0, 0.0, 0.0),
+                                                          (30.0, 40.0, 10.0, -1.0)])
+    def test_init_n(self, low: float, high: float, period: float, noise: float) -> None:
+        """Negative unit test for SyntheticTrace.__init__() method. It contains the following steps:
+        - ASSERT: high < low, a non-positive period or a negative noise raises ValueError
+        """
+        with pytest.raises(ValueError):
+            SyntheticTrace(low, high, period, noise)
+
+
+class TestRecordedTrace:
+    """Unit test class for smfc.RecordedTrace() class"""
+
+    def test_temperature(self, tmp_path) -> None:
+        """Positive unit test for RecordedTrace.temperature() method. It contains the following steps:
+        - load a trace with a section column, a device column with an empty cell and an empty line
+        - ASSERT: the temperatures are interpolated linearly, held before the first and after the last sample
+        - ASSERT: a device column takes precedence over the section column, the duration is the last time
+        """
+        trace = RecordedTrace(_write(tmp_path, "trace.csv", "time,HD,HD/1\n10,40,50\n\n20,50,\n30,30,70\n"))
+        assert trace.duration == 30.0
+        assert trace.temperature("HD", 0, 0.0) == 40.0
+        assert trace.temperature("HD", 0, 15.0) == pytest.approx(45.0)
+        assert trace.temperature("HD", 0, 25.0) == pytest.approx(40.0)
+        assert trace.temperature("HD", 0, 99.0) == 30.0
+        assert trace.temperature("HD", 1, 20.0) == pytest.approx(60.0)
+        assert trace.temperature("HD", 2, 20.0) == 50.0
+
+    @pytest.mark.parametrize("content", [
+        pytest.param("", id="empty"),
+        pytest.param("time\n0\n", id="no-temperature-column"),
+        pytest.param("time,CPU\n10,40\n5,41\n", id="not-ascending"),
+        pytest.param("time,CPU\n0,hot\n", id="invalid-value"),
+        pytest.param("time,CPU,HD\n0,40,\n", id="no-samples"),
+    ])
+    def test_init_n(self, tmp_path, content: str) -> None:
+        """Negative unit test for RecordedTrace.__init__() method. It contains the following steps:
+        - ASSERT: an empty or invalid trace raises ValueError, a missing file raises FileNotFoundError
+        """
+        with pytest.raises(ValueError):
+            RecordedTrace(_write(tmp_path, "trace.csv", content))
+        with pytest.raises(FileNotFoundError):
+            RecordedTrace(str(tmp_path / "missing.csv"))
+
+    def test_temperature_n(self, tmp_path) -> None:
+        """Negative unit test for RecordedTrace.temperature() method. It contains the following steps:
+        - ASSERT: a fan controller without a column raises ValueError
+        """
+        trace = RecordedTrace(_write(tmp_path, "trace.csv", "time,CPU\n0,40\n"))
+        with pytest.raises(ValueError):
+            trace.temperature("HD", 0, 0.0)
+
+
+class TestTimeline:  # pylint: disable=too-few-public-methods
+    """Unit test class for smfc.Timeline() class"""
+
+    def test_save_summary(self) -> None:
+        """Positive unit test for Timeline.save() and summary() methods. It contains the following steps:
+        - record two polls, three writes and a fan mode change
+        - ASSERT: the CSV output has a header and one formatted line per event
+        - ASSERT: the summary counts the polls per controller and the writes per zone with the level range
+        """
+        timeline = Timeline()
+        fc = MagicMock(spec=SimulatedFc)
+        fc.name, fc.last_level, fc.raw_temp, fc.last_temp = "CPU", 40, 41.234, 40.5
+        const = MagicMock()
+        const.name, const.last_level = "CONST", 45
+        timeline.poll(2.0, fc)
+        timeline.poll(2.0, const)
+        timeline.write(0, 40)
+        timeline.write(0, 60)
+        timeline.write(1, 45)
+        timeline.mode(1)
+        f = io.StringIO()
+        timeline.save(f)
+        lines = f.getvalue().splitlines()
+        assert lines[0] == "time,event,name,zone,level,raw_temp,temp"
+        assert lines[1] == "2.000,poll,CPU,,40,41.23,40.50"
+        assert lines[2] == "2.000,poll,CONST,,45,,"
+        assert lines[3].endswith(",write,,0,40,,")
+        assert lines[6].endswith(",mode,FULL,,1,,")
+        assert timeline.summary() == {"polls": {"CPU": 1, "CONST": 1}, "writes": {0: 2, 1: 1},
+                                      "levels": {0: (40, 60), 1: (45, 45)}}
+
+
+class TestSimulatedBmc:
+    """Unit test class for smfc.SimulatedBmc() class"""
+
+    def test_operations(self) -> None:
+        """Positive unit test for SimulatedBmc class. It contains the following steps:
+        - set the fan mode, then fan levels in one and in multiple zones, then apply an exit level
+        - ASSERT: the BMC keeps the mode and the levels (100% in an unknown zone), every change is recorded
+        """
+        timeline = Timeline()
+        bmc = SimulatedBmc(timeline)
+        bmc.start()
+        assert bmc.get_fan_mode() == 1
+        bmc.set_fan_mode(0)
+        bmc.set_fan_level(0, 40)
+        bmc.set_multiple_fan_levels([1, 2], 60)
+        assert (bmc.get_fan_mode(), bmc.get_fan_level(0), bmc.get_fan_level(2)) == (0, 40, 60)
+        assert bmc.get_fan_level(5) == 100
+        bmc.end([0, 1, 2], 100)
+        assert [row[1] for row in timeline.rows] == ["mode"] + ["write"] * 6
+        assert bmc.levels == {0: 100, 1: 100, 2: 100}
+
+    def test_operations_n(self) -> None:
+        """Negative unit test for SimulatedBmc class. It contains the following steps:
+        - ASSERT: an invalid fan mode or fan level raises ValueError, ipmitool cannot be executed
+        """
+        bmc = SimulatedBmc(Timeline())
+        with pytest.raises(ValueError):
+            bmc.set_fan_mode(9)
+        with pytest.raises(ValueError):
+            bmc.set_fan_level(0, 101)
+        with pytest.raises(RuntimeError):
+            bmc._exec(["sdr"])
+
+
+class TestSimulatedFc:  # pylint: disable=too-few-public-methods
+    """Unit test class for smfc.SimulatedFc() class"""
+
+    @pytest.mark.parametrize("cfg, count", [
+        pytest.param(create_cpu_config(), 1, id="cpu"),
+        pytest.param(create_hd_config(hd_names=["/dev/sda", "/dev/sdb"]), 2, id="hd"),
+        pytest.param(create_nvme_config(nvme_names=["/dev/nvme0", "/dev/nvme1", "/dev/nvme2"]), 3, id="nvme"),
+        pytest.param(create_gpu_config(gpu_device_ids=[0, 1]), 2, id="gpu"),
+    ])
+    def test_init(self, cfg, count: int) -> None:
+        """Positive unit test for SimulatedFc.__init__() method. It contains the following steps:
+        - create a simulated fan controller of a section with a synthetic trace
+        - ASSERT: the number of devices, the device names and the sensor keys follow the section
+        """
+        fc = SimulatedFc(Log(Log.LOG_NONE, Log.LOG_STDOUT), MagicMock(), cfg, SyntheticTrace(40.0, 40.0, noise=0.0))
+        assert fc.count == count
+        assert fc.device_names() == [f"{cfg.section}/{i}" for i in range(count)]
+        assert fc.sensor_key(0) == f"sim:{cfg.section}/0"
+        assert fc.last_per_device_temps == [40.0] * count
+
+
+class TestSimulator:
+    """Unit test class for smfc.Simulator() class"""
+
+    def test_simulate(self, tmp_path) -> None:
+        """Positive unit test for Simulator.simulate() method. It contains the following steps:
+        - simulate 200 sec of a CPU, an HD and a CONST controller with a recorded trace
+        - ASSERT: the controllers are polled at their polling rates in virtual time, the clock is restored
+        - ASSERT: zone 0 follows the CPU temperature step, the shared zone 1 gets the higher level of the HD
+          controller (the CONST controller loses the arbitration)
+        - ASSERT: the HD polls record the average of the disk temperatures
+        """
+        config = Config(_write(tmp_path, "smfc.conf", SIM_CONFIG))
+        trace = RecordedTrace(_write(tmp_path, "trace.csv", SIM_TRACE))
+        timeline = Simulator(Log(Log.LOG_DEBUG, Log.LOG_STDOUT), config, trace).simulate(200.0)
+        assert isinstance(clock.get_clock(), SystemClock)
+        summary = timeline.summary()
+        assert summary["polls"] == {"CPU": 101, "HD": 21, "CONST": 7}
+        writes = [(t, zone, level) for t, event, _, zone, level, _, _ in timeline.rows if event == "write"]
+        assert writes[0] == (0.0, 0, 30)
+        assert (102.0, 0, 100) in writes
+        assert [level for _, zone, level in writes if zone == 1] == [100]
+        hd_temps = {raw for _, event, name, _, _, raw, _ in timeline.rows if event == "poll" and name == "HD"}
+        assert hd_temps == {45.0}
+
+    def test_simulate_execution_mode(self, tmp_path) -> None:
+        """Positive unit test for Simulator.simulate() method in threaded execution mode. It contains the
+        following steps:
+        - simulate 10 sec of a configuration in threaded execution mode
+        - ASSERT: the simulation runs in sequential mode, so the CPU controller applies its level directly
+        """
+        config = Config(_write(tmp_path, "smfc.conf", SIM_CONFIG + "[Service]\nexecution_mode=threaded\n"))
+        trace = RecordedTrace(_write(tmp_path, "trace.csv", SIM_TRACE))
+        simulator = Simulator(Log(Log.LOG_INFO, Log.LOG_STDOUT), config, trace)
+        simulator.simulate(10.0)
+        assert config.service.execution_mode == Config.MODE_SEQUENTIAL
+        assert simulator.controllers[0].deferred_apply is False
+
+    def test_simulate_n(self, tmp_path) -> None:
+        """Negative unit test for Simulator.simulate() method. It contains the following steps:
+        - ASSERT: a trace without the column of a fan controller raises ValueError, the clock is restored
+        - ASSERT: a configuration without an enabled fan controller raises ValueError
+        """
+        config = Config(_write(tmp_path, "smfc.conf", SIM_CONFIG))
+        trace = RecordedTrace(_write(tmp_path, "trace.csv", "time,CPU\n0,40\n"))
+        with pytest.raises(ValueError):
+            Simulator(Log(Log.LOG_NONE, Log.LOG_STDOUT), config, trace).simulate(10.0)
+        assert isinstance(clock.get_clock(), SystemClock)
+        config.cpu[0].enabled = config.hd[0].enabled = config.const[0].enabled = False
+        with pytest.raises(ValueError):
+            Simulator(Log(Log.LOG_NONE, Log.LOG_STDOUT), config, SyntheticTrace()).simulate(10.0)
+
+
+class TestMain:
+    """Unit test class for smfc.simulator.main() function"""
+
+    def test_main(self, tmp_path, mocker: MockerFixture, capsys) -> None:
+        """Positive unit test for main() function. It contains the following steps:
+        - run a recorded trace into an output file, then a synthetic profile of 60 sec to stdout
+        - ASSERT: the exit code is EXIT_OK, the timeline is written in CSV format, the summary goes to stderr
+        - ASSERT: the default duration of a recorded trace is the length of the trace
+        """
+        mocker.patch("smfc.simulator.version", MagicMock(return_value="6.2.0"))
+        conf = _write(tmp_path, "smfc.conf", SIM_CONFIG)
+        trace = _write(tmp_path, "trace.csv", SIM_TRACE)
+        output = tmp_path / "timeline.csv"
+        assert main(["-c", conf, "-t", trace, "-o", str(output)]) == EXIT_OK
+        assert output.read_text(encoding="UTF-8").startswith("time,event,name,zone,level,raw_temp,temp\n")
+        assert "Simulated 101 sec" in capsys.readouterr().err
+        assert main(["-c", conf, "-d", "60", "--low", "30", "--high", "40", "--noise", "0"]) == EXIT_OK
+        captured = capsys.readouterr()
+        assert captured.out.startswith("time,event,name,zone,level,raw_temp,temp\n")
+        assert "Simulated 60 sec" in captured.err
+
+    @pytest.mark.parametrize("config, trace, expected", [
+        pytest.param(None, None, EXIT_CONFIG_ERROR, id="missing-config"),
+        pytest.param(SIM_CONFIG, "time\n", EXIT_CONFIG_ERROR, id="invalid-trace"),
+        pytest.param(SIM_CONFIG, "time,CPU\n0,40\n", EXIT_CONFIG_ERROR, id="missing-column"),
+        pytest.param("[Ipmi]\n[CONST]\nenabled=0\n", None, EXIT_NO_CONTROLLER, id="no-controller"),
+    ])
+    def test_main_n(self, tmp_path, capsys, config: str, trace: str, expected: int) -> None:
+        """Negative unit test for main() function. It contains the following steps:
+        - ASSERT: a configuration or trace error returns EXIT_CONFIG_ERROR, a configuration without an enabled
+          fan controller returns EXIT_NO_CONTROLLER, the error is printed to stderr
+        """
+        args = ["-c", _write(tmp_path, "smfc.conf", config) if config else str(tmp_path / "missing.conf"),
+                "-d", "10"]
+        if trace:
+            args += ["-t", _write(tmp_path, "trace.csv", trace)]
+        assert main(args) == expected
+        assert capsys.readouterr().err.startswith("ERROR: ")
+
+
+# End.
@@ -7,8 +7,12 @@
 import time
 from unittest.mock import MagicMock
 import pytest
+from pytest_mock import MockerFixture
+from smfc.history import History
 from smfc.ipmi import Ipmi
-from smfc.snapshot import SNAPSHOT_SCHEMA_VERSION, build_snapshot
+from smfc.sensors import SensorRegistry
+from smfc.snapshot import SNAPSHOT_SCHEMA_VERSION, SnapshotPublisher, _smfc_version, build_snapshot
+from smfc.timing import ControllerTiming, LoopTiming
 
 
 def _make_ipmi(enforce_fan_mode: bool = True, platform_name: str = "auto") -> MagicMock:
@@ -170,6 +174,7 @@ def _make_service(controllers=None, applied_levels=None,
     service.last_fan_mode_at = last_fan_mode_at if last_fan_mode_at is not None else time.monotonic()
     service.start_time = start_time
     service.fan_mode_enforced_count = fan_mode_enforced_count
+    service.sensors = None
     return service
 
 
@@ -200,6 +205,24 @@ class TestBuildSnapshot:
         assert "platform_name" not in snap["bmc"]
         assert "platform_class" not in snap["bmc"]
 
+    def test_version_read_once(self, mocker: MockerFixture) -> None:
+        """Positive unit test for build_snapshot() function. It contains the following steps:
+        - mock smfc.snapshot.version() and clear the cached package version
+        - call build_snapshot() three times with the fake service
+        - ASSERT: the package metadata is read only once, every snapshot carries the version
+        - clear the cached package version (the other tests read the real one)
+        """
+        mock_version = MagicMock(return_value="9.9.9")
+        mocker.patch("smfc.snapshot.version", mock_version)
+        _smfc_version.cache_clear()
+        try:
+            service = _make_service()
+            snaps = [build_snapshot(service) for _ in range(3)]
+            assert mock_version.call_count == 1
+            assert all(snap["smfc_version"] == "9.9.9" for snap in snaps)
+        finally:
+            _smfc_version.cache_clear()
+
     def test_start_time_and_enforcement_count(self) -> None:
         """Positive unit test for build_snapshot() function. It contains the following steps:
         - mock Service with start_time and fan_mode_enforced_count fields (via _make_service helper)
@@ -283,6 +306,67 @@ class TestBuildSnapshot:
         # can rely on its existence) but empty (signals legacy linear mode).
         assert entry["control_function"] == []
 
+    def test_suppressed_writes(self) -> None:
+        """Positive unit test for build_snapshot() function. It contains the following steps:
+        - mock a CpuFc controller (via _make_cpu_fc) with 7 suppressed writes, an HdFc controller without the
+          attribute and a ConstFc controller
+        - call build_snapshot() with the fake service
+        - ASSERT: entry.suppressed_writes carries the counter of the CPU controller and 0 for the HD controller
+        - ASSERT: the CONST entry has no suppressed_writes field
+        - ASSERT: the direction_reversals and sensitivity_skips counters are published the same way
+        """
+        cpu = _make_cpu_fc(zones=[0])
+        cpu.suppressed_writes = 7
+        cpu.direction_reversals = 2
+        cpu.sensitivity_skips = 31
+        hd = _make_hd_fc(zones=[1])
+        service = _make_service(controllers=[cpu, hd, _make_const_fc(zones=[2])])
+        entries = build_snapshot(service)["fan_controllers"]
+        assert entries[0]["suppressed_writes"] == 7
+        assert entries[1]["suppressed_writes"] == 0
+        assert "suppressed_writes" not in entries[2]
+        assert (entries[0]["direction_reversals"], entries[0]["sensitivity_skips"]) == (2, 31)
+        assert (entries[1]["direction_reversals"], entries[1]["sensitivity_skips"]) == (0, 0)
+        assert "direction_reversals" not in entries[2] and "sensitivity_skips" not in entries[2]
+
+    def test_filtered_temperatures(self) -> None:
+        """Positive unit test for build_snapshot() function. It contains the following steps:
+        - mock a CpuFc controller (via _make_cpu_fc) with a median filter and raw/filtered temperatures, an HdFc
+          controller without them and a ConstFc controller
+        - call build_snapshot() with the fake service
+        - ASSERT: the CPU entry carries its filter and both temperatures
+        - ASSERT: the HD entry falls back to the default filter and 0.0, the CONST entry has no filter fields
+        """
+        cpu = _make_cpu_fc(zones=[0])
+        cpu.config.temp_filter = "median"
+        cpu.raw_temp = 71.0
+        cpu.filtered_temp = 48.5
+        service = _make_service(controllers=[cpu, _make_hd_fc(zones=[1]), _make_const_fc(zones=[2])])
+        cpu_entry, hd_entry, const_entry = build_snapshot(service)["fan_controllers"]
+        assert (cpu_entry["temp_filter"], cpu_entry["raw_temp_c"], cpu_entry["filtered_temp_c"]) == \
+            ("median", 71.0, 48.5)
+        assert (hd_entry["temp_filter"], hd_entry["raw_temp_c"], hd_entry["filtered_temp_c"]) == ("sma", 0.0, 0.0)
+        assert "temp_filter" not in const_entry and "raw_temp_c" not in const_entry
+
+    def test_pid_controller_entry(self) -> None:
+        """Positive unit test for build_snapshot() function. It contains the following steps:
+        - mock a CpuFc controller (via _make_cpu_fc) in PID control mode with a control_function, and an HdFc
+          controller in LUT control mode
+        - call build_snapshot() with the fake service
+        - ASSERT: the CPU entry has control_mode "pid", its target temperature, and its level window is the
+          min_level/max_level output range (not the curve envelope)
+        - ASSERT: the HD entry has control_mode "lut" and no pid_target_c field
+        """
+        cpu = _make_cpu_fc(zones=[0])
+        cpu.config.control_mode = "pid"
+        cpu.config.pid_target = 55.0
+        cpu.config.control_function = [(30, 40), (70, 90)]
+        service = _make_service(controllers=[cpu, _make_hd_fc(zones=[1])])
+        cpu_entry, hd_entry = build_snapshot(service)["fan_controllers"]
+        assert cpu_entry["control_mode"] == "pid" and cpu_entry["pid_target_c"] == 55.0
+        assert (cpu_entry["level_min_pct"], cpu_entry["level_max_pct"]) == (25, 100)
+        assert hd_entry["control_mode"] == "lut" and "pid_target_c" not in hd_entry
+
     def test_controller_entry_curve_overrides_legacy_min_max(self) -> None:
         """Positive unit test for build_snapshot() function. It contains the following steps:
         - mock a CpuFc controller (via _make_cpu_fc) with control_function breakpoints overriding
@@ -403,15 +487,71 @@ class TestBuildSnapshot:
         - mock a CpuFc (zone 0) and an HdFc (zone 1) controller (via _make_cpu_fc / _make_hd_fc),
           and a Service (via _make_service) with applied_levels={1: 55, 0: 45}
         - call build_snapshot() with the fake service
-        - ASSERT: snapshot.zones equals {"0": {"applied_level_pct": 45}, "1": {"applied_level_pct": 55}}
-          (string keys, levels round-tripped)
+        - ASSERT: snapshot.zones has the string keys "0" and "1" with the applied levels 45 and 55, and zero
+          counters (the service and the Ipmi mock have no counters)
+        - set 3 level changes of zone 1 on the service and 2/4 IPMI writes of zones 0/1 on the Ipmi instance
+        - ASSERT: the counters of the zones are published
         """
         cpu = _make_cpu_fc(zones=[0])
         hd = _make_hd_fc(zones=[1])
         service = _make_service(controllers=[cpu, hd], applied_levels={1: 55, 0: 45})
         snap = build_snapshot(service)
         # JSON keys must be strings; entries must round-trip the levels.
-        assert snap["zones"] == {"0": {"applied_level_pct": 45}, "1": {"applied_level_pct": 55}}
+        assert snap["zones"] == {"0": {"applied_level_pct": 45, "level_changes": 0, "ipmi_writes": 0},
+                                 "1": {"applied_level_pct": 55, "level_changes": 0, "ipmi_writes": 0}}
+        service.zone_level_changes = {1: 3}
+        service.ipmi.zone_writes = {0: 2, 1: 4}
+        snap = build_snapshot(service)
+        assert snap["zones"] == {"0": {"applied_level_pct": 45, "level_changes": 0, "ipmi_writes": 2},
+                                 "1": {"applied_level_pct": 55, "level_changes": 3, "ipmi_writes": 4}}
+
+    def test_sensors_block(self) -> None:
+        """Positive unit test for build_snapshot() function. It contains the following steps:
+        - mock a Service without sensor registry (via _make_service)
+        - ASSERT: snapshot.sensors is an empty statistics block
+        - attach a SensorRegistry with one sensor read twice by two controllers
+        - ASSERT: snapshot.sensors contains the read statistics of the registry
+        """
+        service = _make_service()
+        assert build_snapshot(service)["sensors"] == {"max_age_s": 0.0, "created_at": 0.0, "reads": 0, "hits": 0,
+                                                      "errors": 0, "sensors": []}
+        service.sensors = SensorRegistry(1.0)
+        service.sensors.read("hwmon:/a", "CPU:0", lambda: 40.0)
+        service.sensors.read("hwmon:/a", "CPU:1", lambda: 40.0)
+        assert build_snapshot(service)["sensors"] == {
+            "max_age_s": 1.0, "created_at": service.sensors.created_at, "reads": 1, "hits": 1, "errors": 0,
+            "sensors": [{"key": "hwmon:/a", "reads": 1, "hits": 1, "errors": 0, "subscribers": ["CPU:0", "CPU:1"]}]}
+
+    def test_timing_block(self) -> None:
+        """Positive unit test for build_snapshot() function. It contains the following steps:
+        - mock a Service without loop timing, a CpuFc controller with a ControllerTiming (2 reads of 0.004 and
+          0.2 sec) and a creation time, and a ConstFc controller without timing and creation time
+        - ASSERT: the loop and the CONST histograms are empty, the read histogram of the CPU controller has
+          cumulative bucket counts
+        - ASSERT: the creation time of the CPU controller is published, 0.0 for the CONST controller
+        - attach a LoopTiming with an IPMI write of 0.03 sec
+        - ASSERT: snapshot.timing.loop.apply carries the write
+        """
+        cpu = _make_cpu_fc(zones=[0])
+        cpu.timing = ControllerTiming()
+        cpu.timing.read.observe(0.004)
+        cpu.timing.read.observe(0.2)
+        cpu.created_at = 1716900000.0
+        service = _make_service(controllers=[cpu, _make_const_fc(zones=[2])])
+        snap = build_snapshot(service)
+        assert set(snap["timing"]["loop"]) == {"period", "sleep", "apply"}
+        assert snap["timing"]["loop"]["period"]["count"] == 0
+        read = snap["fan_controllers"][0]["timing"]["read"]
+        buckets = dict((le, n) for le, n in read["buckets"])
+        assert (read["count"], read["sum"]) == (2, pytest.approx(0.204))
+        assert (buckets[0.0025], buckets[0.005], buckets[0.1], buckets[0.25], buckets[10.0]) == (0, 1, 1, 2, 2)
+        assert snap["fan_controllers"][1]["timing"]["lateness"]["count"] == 0
+        assert snap["fan_controllers"][0]["created_at"] == 1716900000.0
+        assert snap["fan_controllers"][1]["created_at"] == 0.0
+        service.timing = LoopTiming()
+        service.timing.apply.observe(0.03)
+        apply = build_snapshot(service)["timing"]["loop"]["apply"]
+        assert (apply["count"], apply["sum"]) == (1, pytest.approx(0.03))
 
     def test_applied_levels_copied(self) -> None:
         """Positive unit test for build_snapshot() function. It contains the following steps:
@@ -419,8 +559,7 @@ class TestBuildSnapshot:
           mutable applied_levels dict
         - call build_snapshot() with the fake service
         - mutate the original applied_levels dict after the snapshot is built
-        - ASSERT: snapshot.zones still equals {"0": {"applied_level_pct": 45}}
-          (proves the dict was copied, not aliased)
+        - ASSERT: snapshot.zones still holds only zone 0 with level 45 (proves the dict was copied, not aliased)
         """
         cpu = _make_cpu_fc(zones=[0])
         applied = {0: 45}
@@ -428,7 +567,7 @@ class TestBuildSnapshot:
         snap = build_snapshot(service)
         applied[0] = 99
         applied[1] = 100
-        assert snap["zones"] == {"0": {"applied_level_pct": 45}}
+        assert snap["zones"] == {"0": {"applied_level_pct": 45, "level_changes": 0, "ipmi_writes": 0}}
 
     def test_multiple_controllers_order_preserved(self) -> None:
         """Positive unit test for build_snapshot() function. It contains the following steps:
@@ -604,4 +743,55 @@ class TestBuildSnapshot:
         assert [d["temp_c"] for d in devices] == [0.0, 0.0]
 
 
+class TestSnapshotPublisher:
+    """Unit tests for smfc.snapshot.SnapshotPublisher class."""
+
+    def test_publish(self) -> None:
+        """Positive unit test for SnapshotPublisher.publish() method. It contains the following steps:
+        - create a publisher and a Service (via _make_service) with a CpuFc controller
+        - ASSERT: nothing is published at the beginning (generation 0), snapshot() raises RuntimeError
+        - publish the state twice, change the applied level of the service in between
+        - ASSERT: the generation starts at 1 and is incremented at every publication
+        - ASSERT: current(), generation() and snapshot() return the last publication
+        - ASSERT: the first publication is not changed by the later state of the service
+        """
+        publisher = SnapshotPublisher()
+        applied = {0: 45}
+        service = _make_service(controllers=[_make_cpu_fc(zones=[0])], applied_levels=applied)
+        assert publisher.current() is None
+        assert publisher.generation() == 0
+        with pytest.raises(RuntimeError):
+            publisher.snapshot()
+        first = publisher.publish(service)
+        applied[0] = 80
+        second = publisher.publish(service)
+        assert first.generation == 1
+        assert second.generation == 2
+        assert publisher.current() is second
+        assert publisher.generation() == 2
+        assert publisher.snapshot() is second.snapshot
+        assert first.snapshot["zones"]["0"]["applied_level_pct"] == 45
+        assert second.snapshot["zones"]["0"]["applied_level_pct"] == 80
+
+    def test_publish_history(self) -> None:
+        """Positive unit test for SnapshotPublisher.publish() method with a history. It contains the following steps:
+        - create a publisher with a History and a Service (via _make_service) with a CpuFc controller
+        - publish the state without recording it (startup snapshot), then twice, change the applied level of the
+          service in between
+        - ASSERT: every publication is recorded in the history, except the one not to be recorded
+        """
+        publisher = SnapshotPublisher(History(10))
+        applied = {0: 30}
+        service = _make_service(controllers=[_make_cpu_fc(zones=[0])], applied_levels=applied)
+        publisher.publish(service, record=False)
+        assert publisher.generation() == 1
+        assert not publisher.history.names()
+        applied[0] = 45
+        publisher.publish(service)
+        applied[0] = 80
+        publisher.publish(service)
+        points = publisher.history.query(["level/0"])["series"]["level/0"]["points"]
+        assert [p[1] for p in points] == [45.0, 80.0]
+
+
 # End.
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#
+#   test_state.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.StateStore() class.
+#
+import json
+import os
+import time
+import pytest
+from mock import MagicMock
+from pytest_mock import MockerFixture
+from smfc.state import StateStore
+from .test_config_builders import create_const_config, create_cpu_config
+
+
+def _make_controller(name: str, cfg, state: dict) -> MagicMock:
+    """Build a stub fan controller with a name, a configuration and a saved state."""
+    fc = MagicMock()
+    fc.name = name
+    fc.config = cfg
+    fc.save_state.return_value = state
+    return fc
+
+
+class TestStateStore:
+    """Unit test class for smfc.StateStore() class"""
+
+    def test_save_load(self, tmp_path) -> None:
+        """Positive unit test for StateStore.save() and load() methods. It contains the following steps:
+        - save the state of a CPU and a CONST controller and the applied levels into a not existing directory
+        - ASSERT: the directory is created, no temporary file is left behind
+        - ASSERT: load() returns the states with the fingerprints of the configurations and the applied levels
+          with int zones
+        """
+        path = str(tmp_path / "smfc" / "state.json")
+        store = StateStore(path, 60.0)
+        cpu_cfg = create_cpu_config()
+        const_cfg = create_const_config(level=50)
+        store.save([_make_controller("CPU", cpu_cfg, {"last_level": 45, "filter": {"window": [40.0]}}),
+                    _make_controller("CONST", const_cfg, {"last_level": 50})], {0: 45, 1: 50})
+        assert os.listdir(tmp_path / "smfc") == ["state.json"]
+        state = store.load()
+        assert state["applied_levels"] == {0: 45, 1: 50}
+        assert state["controllers"]["CPU"] == {"last_level": 45, "filter": {"window": [40.0]},
+                                               "config": StateStore.fingerprint(cpu_cfg)}
+        assert state["controllers"]["CONST"]["config"] == StateStore.fingerprint(const_cfg)
+
+    def test_save_states(self, tmp_path) -> None:
+        """Positive unit test for StateStore.save() method with the states taken by the worker threads. It contains
+        the following steps:
+        - save a CPU controller with a state passed by name
+        - ASSERT: the passed state is saved with the fingerprint of the configuration, save_state() is not called
+        """
+        store = StateStore(str(tmp_path / "state.json"), 60.0)
+        cpu_cfg = create_cpu_config()
+        fc = _make_controller("CPU", cpu_cfg, {"last_level": 45})
+        store.save([fc], {0: 60}, {"CPU": {"last_level": 60}})
+        fc.save_state.assert_not_called()
+        assert store.load()["controllers"]["CPU"] == {"last_level": 60, "config": StateStore.fingerprint(cpu_cfg)}
+
+    def test_save_n(self, tmp_path, mocker: MockerFixture) -> None:
+        """Negative unit test for StateStore.save() method. It contains the following steps:
+        - save a valid state, then a state that cannot be serialized
+        - ASSERT: TypeError is raised, the temporary file is removed and the previous checkpoint is kept
+        """
+        path = str(tmp_path / "state.json")
+        store = StateStore(path, 60.0)
+        store.save([], {0: 40})
+        mocker.patch("time.time", MagicMock(return_value=time.time()))
+        with pytest.raises(TypeError):
+            store.save([_make_controller("CPU", create_cpu_config(), {"bad": object()})], {})
+        assert os.listdir(tmp_path) == ["state.json"]
+        assert store.load()["applied_levels"] == {0: 40}
+
+    @pytest.mark.parametrize("content", [
+        pytest.param(None, id="missing"),
+        pytest.param("{", id="invalid-json"),
+        pytest.param('{"version": 99, "saved_at": 0, "applied_levels": {}, "controllers": {}}', id="version"),
+        pytest.param('{"version": 1, "saved_at": -1, "applied_levels": {}, "controllers": {}}', id="stale"),
+        pytest.param('{"version": 1, "saved_at": 1e12, "applied_levels": {}, "controllers": {}}', id="future"),
+        pytest.param('{"version": 1, "saved_at": "now", "applied_levels": {}, "controllers": {}}', id="timestamp"),
+        pytest.param('{"version": 1, "saved_at": 0, "applied_levels": {"x": 1}, "controllers": {}}', id="zone"),
+        pytest.param('{"version": 1, "saved_at": 0, "applied_levels": {}, "controllers": []}', id="controllers"),
+        pytest.param("[]", id="not-object"),
+    ])
+    def test_load_n(self, tmp_path, mocker: MockerFixture, content: str) -> None:
+        """Negative unit test for StateStore.load() method. It contains the following steps:
+        - write a missing, invalid, incompatible or old checkpoint (the current time is 100, max_age is 60)
+        - ASSERT: load() returns None
+        """
+        path = tmp_path / "state.json"
+        if content is not None:
+            path.write_text(content.replace('"saved_at": 0', '"saved_at": 90'), encoding="utf-8")
+        mocker.patch("time.time", MagicMock(return_value=100.0))
+        assert StateStore(str(path), 60.0).load() is None
+
+    def test_fingerprint(self) -> None:
+        """Positive unit test for StateStore.fingerprint() method. It contains the following steps:
+        - ASSERT: the fingerprint of the same configuration is the same, a changed parameter changes it
+        """
+        assert StateStore.fingerprint(create_cpu_config(smoothing=3)) == \
+            StateStore.fingerprint(create_cpu_config(smoothing=3))
+        assert StateStore.fingerprint(create_cpu_config(smoothing=3)) != \
+            StateStore.fingerprint(create_cpu_config(smoothing=4))
+
+    @pytest.mark.parametrize("path, max_age", [("", 60.0), ("/run/smfc/state.json", 0.0)])
+    def test_init_n(self, path: str, max_age: float) -> None:
+        """Negative unit test for StateStore.__init__() method. It contains the following steps:
+        - ASSERT: an empty path or a non-positive max_age raises ValueError
+        """
+        with pytest.raises(ValueError):
+            StateStore(path, max_age)
+
+    def test_json_format(self, tmp_path) -> None:
+        """Positive unit test for the checkpoint file format. It contains the following steps:
+        - save an empty checkpoint
+        - ASSERT: the file is a JSON object with version, saved_at, applied_levels and controllers keys
+        """
+        path = tmp_path / "state.json"
+        StateStore(str(path), 60.0).save([], {2: 70})
+        state = json.loads(path.read_text(encoding="utf-8"))
+        assert state["version"] == StateStore.VERSION
+        assert state["applied_levels"] == {"2": 70} and state["controllers"] == {}
+        assert abs(state["saved_at"] - time.time()) < 60
+
+
+# End.
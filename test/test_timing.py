@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+#
+#   test_timing.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.timing module (timing instrumentation).
+#
+import json
+import pytest
+from smfc import clock
+from smfc.clock import VirtualClock
+from smfc.timing import ControllerTiming, Histogram, LoopTiming, PERIOD_BUCKETS
+
+
+class TestHistogram:
+    """Unit test class for smfc.timing.Histogram() class"""
+
+    def test_observe(self) -> None:
+        """Positive unit test for Histogram.observe() and snapshot() methods. It contains the following steps:
+        - observe 0.5, 1.0 (on a bound), 3.0, 20.0 (above the last bound) and -1.0 in a histogram with the
+          bounds (1, 2, 5)
+        - ASSERT: the bucket counts are cumulative, a value on a bound falls into its bucket, a negative value is
+          counted as 0, the count includes the +Inf bucket
+        - ASSERT: the snapshot is JSON serializable
+        """
+        h = Histogram((1.0, 2.0, 5.0))
+        for value in (0.5, 1.0, 3.0, 20.0, -1.0):
+            h.observe(value)
+        snap = h.snapshot()
+        assert snap == {"buckets": [[1.0, 3], [2.0, 3], [5.0, 4]], "sum": 24.5, "count": 5}
+        assert json.loads(json.dumps(snap)) == snap
+        assert h.counts == [3, 0, 1, 1]
+
+    @pytest.mark.parametrize("bounds", [(), (1.0, 1.0), (2.0, 1.0)], ids=["empty", "duplicate", "descending"])
+    def test_init_n(self, bounds) -> None:
+        """Negative unit test for Histogram.__init__() method. It contains the following steps:
+        - ASSERT: empty or not strictly ascending bounds raise ValueError
+        """
+        with pytest.raises(ValueError):
+            Histogram(bounds)
+
+
+class TestControllerTiming:  # pylint: disable=too-few-public-methods
+    """Unit test class for smfc.timing.ControllerTiming() class"""
+
+    def test_poll(self) -> None:
+        """Positive unit test for ControllerTiming class. It contains the following steps:
+        - install a virtual clock, start 2 polls (polling=10) at 0 and 12 sec
+        - record a 1 sec IPMI write during a 1.5 sec level calculation in the second poll
+        - ASSERT: the first poll has no lateness, the second one is 2 sec late
+        - ASSERT: the IPMI write is recorded and it is excluded from the level calculation
+        """
+        previous = clock.get_clock()
+        virtual = VirtualClock()
+        clock.set_clock(virtual)
+        try:
+            t = ControllerTiming()
+            assert t.start(10.0) == 0.0
+            assert t.lateness.count == 0
+            virtual.sleep(12.0)
+            t.start(10.0)
+            decide_start = clock.monotonic()
+            virtual.sleep(0.5)
+            apply_start = clock.monotonic()
+            virtual.sleep(1.0)
+            t.applied(apply_start)
+            t.decided(decide_start)
+        finally:
+            clock.set_clock(previous)
+        assert (t.lateness.count, t.lateness.sum) == (1, pytest.approx(2.0))
+        assert (t.apply.count, t.apply.sum) == (1, pytest.approx(1.0))
+        assert (t.decide.count, t.decide.sum) == (1, pytest.approx(0.5))
+        assert set(t.snapshot()) == {"lateness", "read", "decide", "apply"}
+
+
+class TestLoopTiming:  # pylint: disable=too-few-public-methods
+    """Unit test class for smfc.timing.LoopTiming() class"""
+
+    def test_woke_up(self) -> None:
+        """Positive unit test for LoopTiming.woke_up() method. It contains the following steps:
+        - install a virtual clock, sleep 2 sec, then 3 sec in the main loop
+        - ASSERT: both sleeps are recorded, the period is measured from the second wakeup (5 - 2 = 3 sec)
+        - ASSERT: the loop histograms use the period buckets
+        """
+        previous = clock.get_clock()
+        virtual = VirtualClock()
+        clock.set_clock(virtual)
+        try:
+            t = LoopTiming()
+            for seconds in (2.0, 3.0):
+                start = clock.monotonic()
+                virtual.sleep(seconds)
+                t.woke_up(start)
+        finally:
+            clock.set_clock(previous)
+        assert (t.sleep.count, t.sleep.sum) == (2, pytest.approx(5.0))
+        assert (t.period.count, t.period.sum) == (1, pytest.approx(3.0))
+        assert t.period.bounds == PERIOD_BUCKETS
+        assert set(t.snapshot()) == {"period", "sleep", "apply"}
+
+
+# End.
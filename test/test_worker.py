@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+#
+#   test_worker.py (C) 2021-2026, Peter Sulyok
+#   Unit tests for smfc.DesiredLevels() and smfc.ControllerWorker() classes.
+#
+import threading
+from mock import MagicMock
+from smfc.constfc import ConstFc
+from smfc.worker import ControllerRecord, ControllerWorker, DesiredLevels
+from .test_config_builders import create_const_config
+
+
+def create_controller(name: str, zones, level: int, polling: float, polling_offset: float = 0.0) -> MagicMock:
+    """Create a stub fan controller for the worker tests: poll() sets the desired level and records the thread,
+    save_state() returns the last level and records the thread.
+
+    Args:
+        name (str): name of the controller
+        zones (List[int]): IPMI zones of the controller
+        level (int): desired level set by poll()
+        polling (float): polling interval (sec)
+        polling_offset (float): phase offset of the polling (sec)
+
+    Returns:
+        MagicMock: the stub controller
+    """
+    fc = MagicMock(spec=ConstFc)
+    fc.name = name
+    fc.config = create_const_config(section=name, ipmi_zone=zones, polling=polling,
+                                    polling_offset=polling_offset, level=level)
+    fc.last_level = 0
+    fc.last_temp = 0.0
+    fc.threads = []
+
+    def poll() -> None:
+        fc.threads.append(threading.current_thread())
+        fc.last_level = level
+
+    def save_state() -> dict:
+        fc.threads.append(threading.current_thread())
+        return {"last_level": fc.last_level}
+
+    fc.poll = MagicMock(side_effect=poll)
+    fc.save_state = MagicMock(side_effect=save_state)
+    return fc
+
+
+class TestDesiredLevels:
+    """Unit test class for smfc.DesiredLevels() class"""
+
+    def test_publish_snapshot(self) -> None:
+        """Positive unit test for DesiredLevels.publish(), wait() and snapshot() methods. It contains the following
+        steps:
+        - ASSERT: wait() times out and returns False when nothing was published
+        - publish the levels of three controllers (one of them with level 0) and update one of them
+        - ASSERT: wait() returns True, snapshot() lists all controllers (level 0 included) in the order of their
+          first publication with their latest level
+        - ASSERT: snapshot() clears the change flag, so the next wait() times out
+        """
+        dl = DesiredLevels()
+        assert dl.wait(0.01) is False
+        dl.publish("CPU", [0], 40, 45.0)
+        dl.publish("HD", [1], 0, 0.0)
+        dl.publish("CONST", [1], 50, 0.0)
+        dl.publish("CPU", [0], 60, 55.0)
+        assert dl.wait(0.01) is True
+        assert dl.snapshot() == [("CPU", [0], 60, 55.0), ("HD", [1], 0, 0.0), ("CONST", [1], 50, 0.0)]
+        assert dl.wait(0.01) is False
+        assert dl.error is None
+
+    def test_publish_unchanged_level(self) -> None:
+        """Positive unit test for DesiredLevels.publish() method with an unchanged level. It contains the following
+        steps:
+        - publish a level, take a snapshot, then publish the same level with a new temperature
+        - ASSERT: wait() times out (the IPMI writer is not woken up), but the next snapshot has the new temperature
+        """
+        dl = DesiredLevels()
+        dl.publish("CPU", [0], 40, 45.0)
+        dl.snapshot()
+        dl.publish("CPU", [0], 40, 46.5)
+        assert dl.wait(0.01) is False
+        assert dl.snapshot() == [("CPU", [0], 40, 46.5)]
+
+    def test_wait_wakes_up(self) -> None:
+        """Positive unit test for DesiredLevels.wait() method. It contains the following steps:
+        - wait with a long timeout while another thread publishes a level
+        - ASSERT: wait() returns True as soon as the level is published
+        """
+        dl = DesiredLevels()
+        timer = threading.Timer(0.05, dl.publish, args=("CPU", [0], 40, 45.0))
+        timer.start()
+        assert dl.wait(5.0) is True
+        timer.join()
+
+    def test_fail(self) -> None:
+        """Negative unit test for DesiredLevels.fail() method. It contains the following steps:
+        - report two exceptions
+        - ASSERT: wait() returns True and error holds the first exception
+        """
+        dl = DesiredLevels()
+        e1 = RuntimeError("first")
+        dl.fail(e1)
+        dl.fail(RuntimeError("second"))
+        assert dl.wait(0.01) is True
+        assert dl.error is e1
+
+
+class TestControllerWorker:
+    """Unit test class for smfc.ControllerWorker() class"""
+
+    def test_run(self) -> None:
+        """Positive unit test for ControllerWorker.run() method. It contains the following steps:
+        - start a worker for a stub controller with 0.01 sec polling
+        - wait for the first published level, then stop the worker
+        - ASSERT: the first record of the controller is taken before the start
+        - ASSERT: the controller was polled in the worker thread and its level was published
+        - ASSERT: the record of the controller was taken in the worker thread after the poll
+        - ASSERT: the worker thread terminates after stop()
+        """
+        dl = DesiredLevels()
+        fc = create_controller("CPU", [0, 1], 45, 0.01)
+        worker = ControllerWorker(fc, dl)
+        assert worker.daemon and worker.name == "smfc-CPU"
+        assert isinstance(worker.record, ControllerRecord)
+        assert worker.record.state == {"last_level": 0}
+        assert worker.record.entry["section"] == "CPU" and worker.record.entry["last_level_pct"] == 0
+        fc.threads.clear()
+        worker.start()
+        assert dl.wait(5.0) is True
+        worker.stop()
+        worker.join(5.0)
+        assert not worker.is_alive()
+        assert fc.poll.call_count >= 1
+        assert fc.save_state.call_count == fc.poll.call_count + 1
+        assert all(t is worker for t in fc.threads)
+        assert dl.snapshot() == [("CPU", [0, 1], 45, 0.0)]
+        assert worker.record.state == {"last_level": 45}
+        assert worker.record.entry["last_level_pct"] == 45
+        assert dl.error is None
+
+    def test_run_stops_before_first_poll(self) -> None:
+        """Positive unit test for ControllerWorker.stop() method. It contains the following steps:
+        - start a worker for a stub controller with 5 sec polling offset and stop it immediately
+        - ASSERT: the worker is not blocked by the sleep until the first deadline and the controller is not polled
+        """
+        fc = create_controller("HD", [1], 50, 10.0, 5.0)
+        worker = ControllerWorker(fc, DesiredLevels())
+        worker.start()
+        worker.stop()
+        worker.join(1.0)
+        assert not worker.is_alive()
+        fc.poll.assert_not_called()
+
+    def test_run_error(self) -> None:
+        """Negative unit test for ControllerWorker.run() method. It contains the following steps:
+        - start a worker for a stub controller whose poll() raises RuntimeError
+        - ASSERT: the exception is passed to the DesiredLevels instance and the worker terminates
+        """
+        dl = DesiredLevels()
+        fc = create_controller("GPU", [2], 60, 0.01)
+        fc.poll.side_effect = RuntimeError("smi failed")
+        worker = ControllerWorker(fc, dl)
+        worker.start()
+        worker.join(5.0)
+        assert not worker.is_alive()
+        assert isinstance(dl.error, RuntimeError)
+        assert dl.snapshot() == []
+
+
+# End.